@@ -99,6 +99,10 @@ class AppManager:
         self.logger.info(f"Successfully connected to server: {server_ip}")
         
         try:
+            # Keep the authenticated session, if the server offered one
+            session = (self.connection_presenter.session
+                       if self.connection_presenter else None)
+
             # Clean up connection components
             if self.connection_presenter:
                 self.connection_presenter.cleanup()
@@ -109,18 +113,19 @@ class AppManager:
                 self.connection_modal.modal.master.destroy()
 
             # Now create the actual app with the server IP
-            self._create_app(server_ip)
+            self._create_app(server_ip, session)
             
         except Exception as e:
             self.logger.error(f"Failed to handle connection: {e}")
             raise
 
-    def _create_app(self, server_ip):
+    def _create_app(self, server_ip, session=None):
         """
         Create and initialize the main application.
         
         Args:
             server_ip: IP address of the connected server
+            session: Optional authenticated single-port session
         """
         self.logger.info("Creating main application interface")
         
@@ -130,7 +135,12 @@ class AppManager:
             self.logger.info("Main application view created")
 
             # Create main presenter with the connected server IP
-            self.main_presenter = MainPresenter(self.app, server_ip)
+            self.main_presenter = MainPresenter(
+                self.app, server_ip, session=session,
+                multicast_group=os.getenv('ES_MULTICAST_GROUP'),
+                deadband=(int(os.environ['ES_DEADBAND'])
+                          if os.getenv('ES_DEADBAND') else None)
+            )
             self.logger.info("Main presenter initialized")
 
             # Create specialized presenters
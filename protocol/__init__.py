@@ -0,0 +1,78 @@
+"""
+Protocol Package
+Binary packet codec shared by the client application and the server.
+"""
+
+from .codec import (
+    ProtocolError,
+    checksum,
+    encode_packet,
+    encode_data_sample,
+    encode_data_batch,
+    encode_profile_state,
+    encode_quality_report,
+    encode_sequenced_samples,
+    encode_backfill_request,
+    encode_ping,
+    encode_clock_request,
+    encode_clock_response,
+    encode_compact_samples,
+    encode_stream_encoding,
+    encode_deadband_command,
+    encode_deadband_state,
+    decode_header,
+    decode_packet,
+    decode_sample,
+    decode_samples,
+    decode_profile_state,
+    decode_quality_report,
+    decode_sequenced_samples,
+    decode_backfill_request,
+    decode_ping,
+    decode_clock_request,
+    decode_clock_response,
+    decode_compact_samples,
+    decode_stream_encoding,
+    decode_deadband_command,
+    decode_deadband_state,
+    verify_checksum
+)
+from .heartbeat import RttWindow
+from .parser import FrameParser
+
+__all__ = [
+    'FrameParser',
+    'ProtocolError',
+    'RttWindow',
+    'checksum',
+    'encode_packet',
+    'encode_data_sample',
+    'encode_data_batch',
+    'encode_profile_state',
+    'encode_quality_report',
+    'encode_sequenced_samples',
+    'encode_backfill_request',
+    'encode_ping',
+    'encode_clock_request',
+    'encode_clock_response',
+    'encode_compact_samples',
+    'encode_stream_encoding',
+    'encode_deadband_command',
+    'encode_deadband_state',
+    'decode_header',
+    'decode_packet',
+    'decode_sample',
+    'decode_samples',
+    'decode_profile_state',
+    'decode_quality_report',
+    'decode_sequenced_samples',
+    'decode_backfill_request',
+    'decode_ping',
+    'decode_clock_request',
+    'decode_clock_response',
+    'decode_compact_samples',
+    'decode_stream_encoding',
+    'decode_deadband_command',
+    'decode_deadband_state',
+    'verify_checksum'
+]
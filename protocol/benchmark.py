@@ -0,0 +1,140 @@
+"""
+Protocol Codec Benchmark
+Compares the shared codec against the previous hand-written packet code.
+
+Usage:
+    python -m protocol.benchmark [--number N] [--batch K]
+"""
+
+# Standard library imports
+import argparse
+import struct
+import timeit
+from functools import reduce
+from typing import Callable, List, Tuple
+
+# Third-party imports
+
+# Local application imports
+from protocol import codec
+
+
+def _legacy_checksum_loop(data: bytes) -> int:
+    """Server checksum before the shared codec."""
+    result = 0
+    for b in data:
+        result ^= b
+    return result
+
+
+def _legacy_checksum_reduce(data: bytes) -> int:
+    """Client checksum before the shared codec."""
+    return reduce(lambda x, y: x ^ y, data)
+
+
+def _legacy_data_packet(value: int, timestamp_ms: int) -> bytes:
+    """Server data packet construction before the shared codec."""
+    payload = bytes([value]) + struct.pack('>Q', timestamp_ms)
+    packet = bytes([0x00, 0xFF, 0x01, 0x00, 0x00, 0x09]) + payload
+    return packet + bytes([_legacy_checksum_loop(packet)])
+
+
+def _legacy_batch_packet(samples: List[Tuple[int, int]]) -> bytes:
+    """Server batch packet construction before the shared codec."""
+    payload = b''.join(struct.pack('>BQ', value, timestamp_ms)
+                       for value, timestamp_ms in samples)
+    packet = bytes([0x00, 0xFF, 0x03, 0x00,
+                    len(payload) >> 8, len(payload) & 0xFF]) + payload
+    return packet + bytes([_legacy_checksum_loop(packet)])
+
+
+def _legacy_decode(packet: bytes) -> Tuple[int, int, bytes]:
+    """Client packet parsing before the shared codec."""
+    header = packet[:6]
+    payload_len = (header[4] << 8) | header[5]
+    data = packet[6:6 + payload_len + 1]
+    if _legacy_checksum_reduce(header + data[:-1]) != data[-1]:
+        raise ValueError("Checksum mismatch")
+    return header[2], header[3], data[:-1]
+
+
+def _legacy_decode_batch(payload: bytes) -> List[Tuple[int, int]]:
+    """Per-sample Python parse of a batch payload."""
+    return [(payload[i], struct.unpack('>Q', payload[i + 1:i + 9])[0])
+            for i in range(0, len(payload), 9)]
+
+
+def _measure(func: Callable[[], object], number: int) -> float:
+    """
+    Time a callable.
+
+    Args:
+        func: Zero-argument callable
+        number: Iterations per measurement
+
+    Returns:
+        float: Best microseconds per call over three runs
+    """
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def run_benchmark(number: int = 20000,
+                  batch: int = 50) -> List[Tuple[str, float, float]]:
+    """
+    Run all codec benchmarks.
+
+    Args:
+        number: Iterations per measurement
+        batch: Samples per batch packet
+
+    Returns:
+        List[Tuple[str, float, float]]: Case name, legacy and codec µs/call
+    """
+    timestamp_ms = 1_700_000_000_000
+    samples = [(i % 11, timestamp_ms + i) for i in range(batch)]
+    data_packet = codec.encode_data_sample(5, timestamp_ms)
+    batch_packet = codec.encode_data_batch(samples)
+    batch_payload = batch_packet[codec.HEADER_SIZE:-1]
+    large = bytes(range(256)) * 64
+
+    assert _legacy_data_packet(5, timestamp_ms) == data_packet
+    assert _legacy_batch_packet(samples) == batch_packet
+    assert _legacy_decode_batch(batch_payload) == codec.decode_samples(batch_payload)
+
+    cases = [
+        ('encode data sample',
+         lambda: _legacy_data_packet(5, timestamp_ms),
+         lambda: codec.encode_data_sample(5, timestamp_ms)),
+        (f'encode batch x{batch}',
+         lambda: _legacy_batch_packet(samples),
+         lambda: codec.encode_data_batch(samples)),
+        ('decode data packet',
+         lambda: _legacy_decode(data_packet),
+         lambda: codec.decode_packet(data_packet)),
+        (f'decode batch x{batch}',
+         lambda: _legacy_decode_batch(_legacy_decode(batch_packet)[2]),
+         lambda: codec.decode_samples(codec.decode_packet(batch_packet)[2])),
+        ('checksum 16 KiB',
+         lambda: _legacy_checksum_loop(large),
+         lambda: codec.checksum(large)),
+    ]
+    return [(name, _measure(legacy, number), _measure(fast, number))
+            for name, legacy, fast in cases]
+
+
+def main() -> None:
+    """Parse arguments and print benchmark results."""
+    parser = argparse.ArgumentParser(description="Benchmark the protocol codec")
+    parser.add_argument('--number', type=int, default=20000, help="iterations per case")
+    parser.add_argument('--batch', type=int, default=50,
+                        help="samples per batch packet")
+    args = parser.parse_args()
+
+    print(f"{'case':<24}{'legacy us':>12}{'codec us':>12}{'speedup':>10}")
+    for name, legacy_us, codec_us in run_benchmark(args.number, args.batch):
+        print(f"{name:<24}{legacy_us:>12.2f}{codec_us:>12.2f}"
+              f"{legacy_us / codec_us:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,838 @@
+"""
+Protocol Codec Module
+Encodes and decodes the binary packet format shared by client and server.
+
+Packet layout:
+    [0x00][0xFF][ID][TYPE][LEN_HIGH][LEN_LOW][PAYLOAD...][CHECKSUM]
+where CHECKSUM is the XOR of every preceding byte.
+"""
+
+# Standard library imports
+import struct
+from itertools import starmap
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+# Third-party imports
+
+# Local application imports
+
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+# Packet markers
+MAGIC_P = 0x00
+MAGIC_N = 0xFF
+MAGIC = bytes([MAGIC_P, MAGIC_N])
+
+# Frame geometry
+HEADER_SIZE = 6
+CHECKSUM_SIZE = 1
+FRAME_OVERHEAD = HEADER_SIZE + CHECKSUM_SIZE
+MAX_PAYLOAD_SIZE = 0xFFFF
+
+# Packet IDs
+ID_AUTH = 0x00
+ID_DATA = 0x01
+ID_SETTINGS = 0x02
+ID_DATA_BATCH = 0x03
+ID_PROFILE = 0x04
+ID_QUALITY = 0x05
+ID_DATA_SEQUENCED = 0x06  # Sequence-numbered samples, one multicast datagram each
+ID_BACKFILL = 0x07  # Recent sample history, requested on (re)connect
+ID_PING = 0x08  # Heartbeat on any channel; the response echoes the command's token
+ID_CLOCK = 0x09  # Clock sync exchange on any channel, answered with server timestamps
+ID_DATA_COMPACT = 0x0A  # Delta/varint-coded samples; the command picks the encoding
+ID_DEADBAND = 0x0B  # Change-only data stream; the response reports the applied mode
+
+# Packet types
+TYPE_RESPONSE = 0x00
+TYPE_COMMAND = 0x01
+TYPE_ERROR = 0x02
+
+# Profile command operations
+PROFILE_OP_QUERY = 0x00
+PROFILE_OP_SELECT = 0x01
+PROFILE_OP_ADAPTIVE = 0x02
+
+# Data subscription commands on a multiplexed session; empty also subscribes
+DATA_UNSUBSCRIBE = 0x00
+DATA_SUBSCRIBE = 0x01
+
+# Backfill request kinds
+BACKFILL_LAST = 0x00  # Value is a window in milliseconds before the newest sample
+BACKFILL_SINCE = 0x01  # Value is a timestamp_ms, only newer samples are sent
+
+# Data stream encodings (ID_DATA_COMPACT command payload)
+ENCODING_PLAIN = 0x00  # ID_DATA / ID_DATA_BATCH packets of 9-byte samples
+ENCODING_COMPACT = 0x01  # ID_DATA_COMPACT packets
+DATA_ENCODINGS = (ENCODING_PLAIN, ENCODING_COMPACT)
+
+# Compact payload flags
+COMPACT_KEY = 0x01  # Carries its reference timestamp, else the previous packet's last
+COMPACT_RLE = 0x02  # Values are (value, run length) pairs
+
+# Precompiled layouts
+HEADER_STRUCT = struct.Struct('>BBBBH')
+SAMPLE_STRUCT = struct.Struct('>BQ')  # value, timestamp_ms
+SAMPLE_SIZE = SAMPLE_STRUCT.size
+MAX_BATCH_SAMPLES = MAX_PAYLOAD_SIZE // SAMPLE_SIZE
+_DATA_PACKET_STRUCT = struct.Struct('>BBBBHBQB')  # full single-sample frame
+PROFILE_STATE_STRUCT = struct.Struct('>BBBB')  # camera, active, adaptive, count
+PROFILE_STRUCT = struct.Struct('>HHBHHB')  # width, height, fps, kbps, gop, name length
+QUALITY_STRUCT = struct.Struct('>BHHH')  # camera, fps * 10, dropped, decoded
+SEQUENCE_STRUCT = struct.Struct('>I')  # datagram sequence number
+SEQUENCE_MODULO = 1 << 32
+BACKFILL_STRUCT = struct.Struct('>BQ')  # kind, window ms or timestamp_ms
+PING_STRUCT = struct.Struct('>Q')  # token, the sender's monotonic clock in ns
+CLOCK_REQUEST_STRUCT = struct.Struct('>Q')  # client transmit time, us since the epoch
+# client transmit, server receive, server transmit
+CLOCK_RESPONSE_STRUCT = struct.Struct('>QQQ')
+DEADBAND_STRUCT = struct.Struct('>BBH')  # enabled, deadband, keepalive ms
+# enabled, deadband, keepalive ms, sample period us
+DEADBAND_STATE_STRUCT = struct.Struct('>BBHI')
+
+# XOR of the constant header of a single-sample data packet
+_DATA_HEADER_XOR = MAGIC_P ^ MAGIC_N ^ ID_DATA ^ TYPE_RESPONSE ^ SAMPLE_SIZE
+
+# Below this size a plain byte loop beats the big-integer fold
+_SMALL_CHECKSUM_LIMIT = 32
+
+
+class ProtocolError(Exception):
+    """Raised when communication protocol errors occur."""
+    pass
+
+
+def _fold_u64(value: int) -> int:
+    """
+    XOR the eight bytes of a 64-bit integer together.
+
+    Args:
+        value: Unsigned 64-bit integer
+
+    Returns:
+        int: XOR of the integer's bytes
+    """
+    value ^= value >> 32
+    value ^= value >> 16
+    value ^= value >> 8
+    return value & 0xFF
+
+
+def checksum(data: BytesLike, initial: int = 0) -> int:
+    """
+    Calculate the XOR checksum of a byte sequence.
+
+    Short inputs use a byte loop; longer inputs are folded as one big
+    integer so the work happens in C.
+
+    Args:
+        data: Bytes to checksum
+        initial: Checksum of preceding bytes to continue from
+
+    Returns:
+        int: XOR of all bytes combined with initial
+    """
+    size = len(data)
+    if size < _SMALL_CHECKSUM_LIMIT:
+        result = initial
+        for byte in data:
+            result ^= byte
+        return result
+
+    value = int.from_bytes(data, 'little')
+    while size > 8:
+        half = (size + 1) >> 1
+        bits = half << 3
+        value = (value >> bits) ^ (value & ((1 << bits) - 1))
+        size = half
+    return _fold_u64(value) ^ initial
+
+
+def encode_packet(id_: int, typ: int, payload: BytesLike = b'') -> bytes:
+    """
+    Encode a complete packet with header and checksum.
+
+    Args:
+        id_: Packet ID
+        typ: Packet type
+        payload: Payload bytes
+
+    Returns:
+        bytes: Encoded packet
+
+    Raises:
+        ProtocolError: If the payload exceeds the 16-bit length field
+    """
+    length = len(payload)
+    if length > MAX_PAYLOAD_SIZE:
+        raise ProtocolError(f"Payload too large: {length} bytes")
+
+    frame = bytearray(length + FRAME_OVERHEAD)
+    HEADER_STRUCT.pack_into(frame, 0, MAGIC_P, MAGIC_N, id_, typ, length)
+    frame[HEADER_SIZE:HEADER_SIZE + length] = payload
+    frame[-1] = checksum(memoryview(frame)[:-1])
+    return bytes(frame)
+
+
+def encode_data_sample(value: int, timestamp_ms: int) -> bytes:
+    """
+    Encode a single-sample data packet (ID 0x01).
+
+    Args:
+        value: Sample value (0-255)
+        timestamp_ms: Sample timestamp in milliseconds
+
+    Returns:
+        bytes: Encoded 16-byte packet
+    """
+    check = _DATA_HEADER_XOR ^ value ^ _fold_u64(timestamp_ms)
+    return _DATA_PACKET_STRUCT.pack(
+        MAGIC_P, MAGIC_N, ID_DATA, TYPE_RESPONSE, SAMPLE_SIZE,
+        value, timestamp_ms, check
+    )
+
+
+def encode_data_batch(samples: Iterable[Tuple[int, int]]) -> bytes:
+    """
+    Encode a batch data packet (ID 0x03).
+
+    Args:
+        samples: (value, timestamp_ms) pairs in time order
+
+    Returns:
+        bytes: Encoded packet
+
+    Raises:
+        ProtocolError: If there are more samples than fit one packet
+    """
+    return encode_packet(ID_DATA_BATCH, TYPE_RESPONSE,
+                         b''.join(starmap(SAMPLE_STRUCT.pack, samples)))
+
+
+def decode_header(header: BytesLike) -> Tuple[int, int, int]:
+    """
+    Decode and validate a packet header.
+
+    Args:
+        header: At least HEADER_SIZE bytes
+
+    Returns:
+        Tuple[int, int, int]: Packet ID, type and payload length
+
+    Raises:
+        ProtocolError: If the packet markers are invalid
+    """
+    p, n, id_, typ, length = HEADER_STRUCT.unpack_from(header)
+    if p != MAGIC_P or n != MAGIC_N:
+        raise ProtocolError("Invalid packet markers")
+    return id_, typ, length
+
+
+def decode_packet(frame: BytesLike) -> Tuple[int, int, memoryview]:
+    """
+    Decode and validate one complete frame without copying the payload.
+
+    Args:
+        frame: Header, payload and checksum bytes
+
+    Returns:
+        Tuple[int, int, memoryview]: Packet ID, type and payload view
+
+    Raises:
+        ProtocolError: If the frame is truncated or markers/checksum are invalid
+    """
+    view = memoryview(frame)
+    id_, typ, length = decode_header(view)
+    end = HEADER_SIZE + length
+    if len(view) < end + CHECKSUM_SIZE:
+        raise ProtocolError("Truncated packet")
+    if checksum(view[:end]) != view[end]:
+        raise ProtocolError("Checksum mismatch")
+    return id_, typ, view[HEADER_SIZE:end]
+
+
+def verify_checksum(header: BytesLike, payload: BytesLike, received: int) -> bool:
+    """
+    Check a received checksum against header and payload.
+
+    Args:
+        header: Header bytes
+        payload: Payload bytes
+        received: Checksum byte received from the peer
+
+    Returns:
+        bool: True if the checksum matches
+    """
+    return checksum(payload, checksum(header)) == received
+
+
+def decode_sample(payload: BytesLike) -> Tuple[int, int]:
+    """
+    Decode a single-sample data payload.
+
+    Args:
+        payload: SAMPLE_SIZE bytes
+
+    Returns:
+        Tuple[int, int]: Sample value and timestamp in milliseconds
+    """
+    return SAMPLE_STRUCT.unpack(payload)
+
+
+def decode_samples(payload: BytesLike) -> List[Tuple[int, int]]:
+    """
+    Decode a batch data payload.
+
+    Args:
+        payload: Multiple of SAMPLE_SIZE bytes
+
+    Returns:
+        List[Tuple[int, int]]: (value, timestamp_ms) pairs
+
+    Raises:
+        ProtocolError: If the payload is not a whole number of samples
+    """
+    if len(payload) % SAMPLE_SIZE:
+        raise ProtocolError(f"Batch payload of {len(payload)} bytes "
+                            f"is not whole samples")
+    return list(SAMPLE_STRUCT.iter_unpack(payload))
+
+
+def encode_profile_state(camera: int, active: int, adaptive: bool,
+                         profiles: Iterable[Dict[str, Any]]) -> bytes:
+    """
+    Encode a profile state response (ID 0x04).
+
+    Args:
+        camera: Camera index
+        active: Index of the active profile
+        adaptive: Whether adaptive quality is enabled
+        profiles: Profiles with name, width, height, framerate, bitrate
+            (bits per second) and gop
+
+    Returns:
+        bytes: Encoded packet
+    """
+    parts = []
+    for profile in profiles:
+        name = profile['name'].encode('utf-8')[:255]
+        parts.append(PROFILE_STRUCT.pack(
+            profile['width'], profile['height'], profile['framerate'],
+            min(0xFFFF, (profile.get('bitrate') or 0) // 1000),
+            profile.get('gop') or 0, len(name)
+        ))
+        parts.append(name)
+    header = PROFILE_STATE_STRUCT.pack(camera, active, int(adaptive), len(parts) // 2)
+    return encode_packet(ID_PROFILE, TYPE_RESPONSE, header + b''.join(parts))
+
+
+def decode_profile_state(payload: BytesLike) -> Dict[str, Any]:
+    """
+    Decode a profile state response payload.
+
+    Args:
+        payload: Profile state payload
+
+    Returns:
+        Dict[str, Any]: Camera index, active profile index, adaptive flag
+        and the list of profiles
+
+    Raises:
+        ProtocolError: If the payload is truncated
+    """
+    try:
+        camera, active, adaptive, count = PROFILE_STATE_STRUCT.unpack_from(payload)
+        offset = PROFILE_STATE_STRUCT.size
+        profiles = []
+        for _ in range(count):
+            width, height, framerate, kbps, gop, name_len = PROFILE_STRUCT.unpack_from(
+                payload, offset)
+            offset += PROFILE_STRUCT.size
+            name = bytes(payload[offset:offset + name_len]).decode('utf-8', 'replace')
+            offset += name_len
+            profiles.append({'name': name, 'width': width, 'height': height,
+                             'framerate': framerate, 'bitrate': kbps * 1000,
+                             'gop': gop})
+    except struct.error as e:
+        raise ProtocolError(f"Truncated profile state: {e}")
+    return {'camera': camera, 'active': active, 'adaptive': bool(adaptive),
+            'profiles': profiles}
+
+
+def encode_quality_report(camera: int, decode_fps: float, dropped: int,
+                          decoded: int) -> bytes:
+    """
+    Encode a client playback quality report (ID 0x05).
+
+    Args:
+        camera: Camera index the report is about
+        decode_fps: Frames decoded per second
+        dropped: Frames dropped since the previous report
+        decoded: Frames decoded since the previous report
+
+    Returns:
+        bytes: Encoded packet
+    """
+    payload = QUALITY_STRUCT.pack(camera, min(0xFFFF, int(decode_fps * 10)),
+                                  min(0xFFFF, dropped), min(0xFFFF, decoded))
+    return encode_packet(ID_QUALITY, TYPE_COMMAND, payload)
+
+
+def decode_quality_report(payload: BytesLike) -> Tuple[int, float, int, int]:
+    """
+    Decode a quality report payload.
+
+    Args:
+        payload: QUALITY_STRUCT.size bytes
+
+    Returns:
+        Tuple[int, float, int, int]: Camera, decode fps, dropped and decoded frames
+
+    Raises:
+        ProtocolError: If the payload size is wrong
+    """
+    if len(payload) != QUALITY_STRUCT.size:
+        raise ProtocolError(f"Quality report of {len(payload)} bytes")
+    camera, fps_x10, dropped, decoded = QUALITY_STRUCT.unpack(payload)
+    return camera, fps_x10 / 10.0, dropped, decoded
+
+
+def encode_sequenced_samples(sequence: int,
+                             samples: Iterable[Tuple[int, int]]) -> bytes:
+    """
+    Encode sequence-numbered samples (ID 0x06) for a multicast datagram.
+
+    Args:
+        sequence: Datagram sequence number, wrapping at 2**32
+        samples: (value, timestamp_ms) pairs in time order
+
+    Returns:
+        bytes: Encoded packet
+
+    Raises:
+        ProtocolError: If there are more samples than fit one packet
+    """
+    payload = SEQUENCE_STRUCT.pack(sequence % SEQUENCE_MODULO) + b''.join(
+        starmap(SAMPLE_STRUCT.pack, samples))
+    return encode_packet(ID_DATA_SEQUENCED, TYPE_RESPONSE, payload)
+
+
+def decode_sequenced_samples(payload: BytesLike) -> Tuple[int, List[Tuple[int, int]]]:
+    """
+    Decode a sequence-numbered samples payload.
+
+    Args:
+        payload: Sequence number followed by whole samples
+
+    Returns:
+        Tuple[int, List[Tuple[int, int]]]: Sequence number and samples
+
+    Raises:
+        ProtocolError: If the payload is truncated or not whole samples
+    """
+    if len(payload) < SEQUENCE_STRUCT.size:
+        raise ProtocolError(f"Sequenced payload of {len(payload)} bytes")
+    (sequence,) = SEQUENCE_STRUCT.unpack_from(payload)
+    return sequence, decode_samples(payload[SEQUENCE_STRUCT.size:])
+
+
+def encode_backfill_request(kind: int, value: int) -> bytes:
+    """
+    Encode a backfill request (ID 0x07).
+
+    Args:
+        kind: BACKFILL_LAST or BACKFILL_SINCE
+        value: Window in milliseconds, or timestamp_ms of the newest sample held
+
+    Returns:
+        bytes: Encoded packet
+    """
+    return encode_packet(ID_BACKFILL, TYPE_COMMAND, BACKFILL_STRUCT.pack(kind, value))
+
+
+def decode_backfill_request(payload: BytesLike) -> Tuple[int, int]:
+    """
+    Decode a backfill request payload.
+
+    Args:
+        payload: BACKFILL_STRUCT.size bytes
+
+    Returns:
+        Tuple[int, int]: Request kind and value
+
+    Raises:
+        ProtocolError: If the payload size or kind is wrong
+    """
+    if len(payload) != BACKFILL_STRUCT.size:
+        raise ProtocolError(f"Backfill request of {len(payload)} bytes")
+    kind, value = BACKFILL_STRUCT.unpack(payload)
+    if kind not in (BACKFILL_LAST, BACKFILL_SINCE):
+        raise ProtocolError(f"Unknown backfill request kind {kind}")
+    return kind, value
+
+
+def encode_ping(token: int, typ: int = TYPE_COMMAND) -> bytes:
+    """
+    Encode a heartbeat ping (ID 0x08) or its response.
+
+    Args:
+        token: Value echoed by the response, e.g. the send time in ns
+        typ: TYPE_COMMAND for a ping, TYPE_RESPONSE for its answer
+
+    Returns:
+        bytes: Encoded packet
+    """
+    return encode_packet(ID_PING, typ, PING_STRUCT.pack(token % (1 << 64)))
+
+
+def decode_ping(payload: BytesLike) -> int:
+    """
+    Decode a heartbeat payload.
+
+    Args:
+        payload: PING_STRUCT.size bytes
+
+    Returns:
+        int: Ping token
+
+    Raises:
+        ProtocolError: If the payload size is wrong
+    """
+    if len(payload) != PING_STRUCT.size:
+        raise ProtocolError(f"Ping of {len(payload)} bytes")
+    return PING_STRUCT.unpack(payload)[0]
+
+
+def encode_clock_request(t1_us: int) -> bytes:
+    """
+    Encode a clock sync request (ID 0x09).
+
+    Args:
+        t1_us: Client wall clock at transmission, microseconds since the epoch
+
+    Returns:
+        bytes: Encoded packet
+    """
+    return encode_packet(ID_CLOCK, TYPE_COMMAND, CLOCK_REQUEST_STRUCT.pack(t1_us))
+
+
+def decode_clock_request(payload: BytesLike) -> int:
+    """
+    Decode a clock sync request payload.
+
+    Args:
+        payload: CLOCK_REQUEST_STRUCT.size bytes
+
+    Returns:
+        int: Client transmit time in microseconds
+
+    Raises:
+        ProtocolError: If the payload size is wrong
+    """
+    if len(payload) != CLOCK_REQUEST_STRUCT.size:
+        raise ProtocolError(f"Clock request of {len(payload)} bytes")
+    return CLOCK_REQUEST_STRUCT.unpack(payload)[0]
+
+
+def encode_clock_response(t1_us: int, t2_us: int, t3_us: int) -> bytes:
+    """
+    Encode a clock sync response.
+
+    Args:
+        t1_us: Client transmit time copied from the request
+        t2_us: Server wall clock when the request was received
+        t3_us: Server wall clock when the response is sent
+
+    Returns:
+        bytes: Encoded packet
+    """
+    return encode_packet(ID_CLOCK, TYPE_RESPONSE,
+                         CLOCK_RESPONSE_STRUCT.pack(t1_us, t2_us, t3_us))
+
+
+def decode_clock_response(payload: BytesLike) -> Tuple[int, int, int]:
+    """
+    Decode a clock sync response payload.
+
+    Args:
+        payload: CLOCK_RESPONSE_STRUCT.size bytes
+
+    Returns:
+        Tuple[int, int, int]: Client transmit, server receive and server
+        transmit times in microseconds
+
+    Raises:
+        ProtocolError: If the payload size is wrong
+    """
+    if len(payload) != CLOCK_RESPONSE_STRUCT.size:
+        raise ProtocolError(f"Clock response of {len(payload)} bytes")
+    return CLOCK_RESPONSE_STRUCT.unpack(payload)
+
+
+def _append_varint(buffer: bytearray, value: int) -> None:
+    """
+    Append an unsigned LEB128 varint, 7 bits per byte, low bits first.
+
+    Args:
+        buffer: Buffer to append to
+        value: Non-negative integer
+    """
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(payload: BytesLike, pos: int) -> Tuple[int, int]:
+    """
+    Read an unsigned LEB128 varint.
+
+    Args:
+        payload: Bytes to read from
+        pos: Offset of the varint's first byte
+
+    Returns:
+        Tuple[int, int]: Value and offset after the varint
+
+    Raises:
+        ProtocolError: If the varint is truncated or longer than 64 bits
+    """
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(payload):
+            raise ProtocolError("Truncated varint")
+        if shift > 63:
+            raise ProtocolError("Varint longer than 64 bits")
+        byte = payload[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode_compact_samples(samples: List[Tuple[int, int]],
+                           reference: Optional[int] = None) -> bytes:
+    """
+    Encode samples as a compact data packet (ID 0x0A).
+
+    Payload layout:
+        [FLAGS][REFERENCE varint, key packets only][COUNT varint][VALUES][DELTAS]
+    VALUES holds one byte per sample, or (value, run length varint) pairs
+    with COMPACT_RLE, whichever is shorter. DELTAS holds one zigzag varint
+    per sample: its timestamp minus the previous one, the first relative
+    to the reference. Without COMPACT_KEY the reference is the last
+    timestamp of the previous compact packet on the stream.
+
+    Args:
+        samples: (value, timestamp_ms) pairs in time order, at least one
+        reference: Last timestamp of the previous packet, or None for a key
+            packet referenced to its first sample
+
+    Returns:
+        bytes: Encoded packet
+
+    Raises:
+        ProtocolError: If there are no samples or the encoded samples do
+            not fit one packet
+    """
+    if not samples:
+        raise ProtocolError("Compact packet without samples")
+    payload = bytearray()
+    if reference is None:
+        reference = samples[0][1]
+        payload.append(COMPACT_KEY)
+        _append_varint(payload, reference)
+    else:
+        payload.append(0)
+    _append_varint(payload, len(samples))
+
+    runs = []
+    for value, _ in samples:
+        if runs and runs[-1][0] == value:
+            runs[-1][1] += 1
+        else:
+            runs.append([value, 1])
+    if 2 * len(runs) < len(samples):
+        payload[0] |= COMPACT_RLE
+        for value, length in runs:
+            payload.append(value)
+            _append_varint(payload, length)
+    else:
+        payload.extend(value for value, _ in samples)
+
+    previous = reference
+    for _, timestamp_ms in samples:
+        delta = timestamp_ms - previous
+        _append_varint(payload, (delta << 1) if delta >= 0 else ((-delta << 1) - 1))
+        previous = timestamp_ms
+    return encode_packet(ID_DATA_COMPACT, TYPE_RESPONSE, payload)
+
+
+def decode_compact_samples(payload: BytesLike,
+                           reference: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Decode a compact data payload.
+
+    Args:
+        payload: Compact data payload
+        reference: Last timestamp of the previous compact packet on the
+            stream, needed unless the payload is a key packet
+
+    Returns:
+        List[Tuple[int, int]]: (value, timestamp_ms) pairs
+
+    Raises:
+        ProtocolError: If the payload is truncated or malformed, or a
+            non-key payload arrives without a reference
+    """
+    if not payload:
+        raise ProtocolError("Empty compact payload")
+    flags = payload[0]
+    pos = 1
+    if flags & COMPACT_KEY:
+        reference, pos = _read_varint(payload, pos)
+    elif reference is None:
+        raise ProtocolError("Compact payload without a reference timestamp")
+    count, pos = _read_varint(payload, pos)
+    if count == 0:
+        raise ProtocolError("Compact payload without samples")
+    if count > len(payload) - pos:
+        raise ProtocolError("Truncated compact deltas")  # At least one byte per sample
+
+    if flags & COMPACT_RLE:
+        values: List[int] = []
+        while len(values) < count:
+            if pos >= len(payload):
+                raise ProtocolError("Truncated compact values")
+            value = payload[pos]
+            length, pos = _read_varint(payload, pos + 1)
+            if len(values) + length > count:
+                raise ProtocolError("Compact runs exceed the sample count")
+            values.extend([value] * length)
+    else:
+        if pos + count > len(payload):
+            raise ProtocolError("Truncated compact values")
+        values = list(payload[pos:pos + count])
+        pos += count
+
+    samples = []
+    timestamp_ms = reference
+    for value in values:
+        zigzag, pos = _read_varint(payload, pos)
+        timestamp_ms += (zigzag >> 1) if not zigzag & 1 else -((zigzag + 1) >> 1)
+        samples.append((value, timestamp_ms))
+    if pos != len(payload):
+        raise ProtocolError(f"{len(payload) - pos} trailing bytes in compact payload")
+    return samples
+
+
+def encode_stream_encoding(encoding: int) -> bytes:
+    """
+    Encode a data stream encoding command (ID 0x0A).
+
+    Args:
+        encoding: ENCODING_PLAIN or ENCODING_COMPACT
+
+    Returns:
+        bytes: Encoded packet
+    """
+    return encode_packet(ID_DATA_COMPACT, TYPE_COMMAND, bytes([encoding]))
+
+
+def decode_stream_encoding(payload: BytesLike) -> int:
+    """
+    Decode a data stream encoding command payload.
+
+    Args:
+        payload: One byte
+
+    Returns:
+        int: Requested encoding
+
+    Raises:
+        ProtocolError: If the payload size or encoding is wrong
+    """
+    if len(payload) != 1:
+        raise ProtocolError(f"Encoding command of {len(payload)} bytes")
+    if payload[0] not in DATA_ENCODINGS:
+        raise ProtocolError(f"Unknown data encoding {payload[0]}")
+    return payload[0]
+
+
+def encode_deadband_command(enabled: bool, deadband: int = 0,
+                            keepalive_ms: int = 1000) -> bytes:
+    """
+    Encode a change-only mode command (ID 0x0B).
+
+    Args:
+        enabled: Send only samples changing beyond the deadband
+        deadband: Largest value change that is not sent (0-255)
+        keepalive_ms: Longest time without a sent sample, 0 for none
+
+    Returns:
+        bytes: Encoded packet
+    """
+    return encode_packet(ID_DEADBAND, TYPE_COMMAND,
+                         DEADBAND_STRUCT.pack(bool(enabled), deadband, keepalive_ms))
+
+
+def decode_deadband_command(payload: BytesLike) -> Tuple[bool, int, int]:
+    """
+    Decode a change-only mode command payload.
+
+    Args:
+        payload: DEADBAND_STRUCT.size bytes
+
+    Returns:
+        Tuple[bool, int, int]: Enabled, deadband and keepalive in ms
+
+    Raises:
+        ProtocolError: If the payload size is wrong
+    """
+    if len(payload) != DEADBAND_STRUCT.size:
+        raise ProtocolError(f"Deadband command of {len(payload)} bytes")
+    enabled, deadband, keepalive_ms = DEADBAND_STRUCT.unpack(payload)
+    return bool(enabled), deadband, keepalive_ms
+
+
+def encode_deadband_state(enabled: bool, deadband: int, keepalive_ms: int,
+                          period_us: int) -> bytes:
+    """
+    Encode the response to a change-only mode command.
+
+    Args:
+        enabled: Whether the stream is in change-only mode
+        deadband: Applied deadband
+        keepalive_ms: Applied keepalive in ms
+        period_us: Sample period in microseconds, the spacing of the
+            samples a held value stands for
+
+    Returns:
+        bytes: Encoded packet
+    """
+    return encode_packet(ID_DEADBAND, TYPE_RESPONSE,
+                         DEADBAND_STATE_STRUCT.pack(bool(enabled), deadband,
+                                                    keepalive_ms, period_us))
+
+
+def decode_deadband_state(payload: BytesLike) -> Tuple[bool, int, int, int]:
+    """
+    Decode a change-only mode response payload.
+
+    Args:
+        payload: DEADBAND_STATE_STRUCT.size bytes
+
+    Returns:
+        Tuple[bool, int, int, int]: Enabled, deadband, keepalive in ms and
+        sampler period in microseconds
+
+    Raises:
+        ProtocolError: If the payload size is wrong
+    """
+    if len(payload) != DEADBAND_STATE_STRUCT.size:
+        raise ProtocolError(f"Deadband state of {len(payload)} bytes")
+    enabled, deadband, keepalive_ms, period_us = DEADBAND_STATE_STRUCT.unpack(payload)
+    return bool(enabled), deadband, keepalive_ms, period_us
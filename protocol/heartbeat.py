@@ -0,0 +1,111 @@
+"""
+Protocol Heartbeat Module
+Rolling round-trip time statistics of ping/pong heartbeats on a link.
+"""
+
+# Standard library imports
+import bisect
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Sequence
+
+# Third-party imports
+
+# Local application imports
+
+
+# Upper bounds of the RTT histogram buckets in seconds
+RTT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class RttWindow:
+    """
+    Round-trip times of the latest heartbeats on one link.
+
+    Keeps the last `size` measurements, so the histogram and percentiles
+    follow current link conditions instead of averaging over the whole
+    connection.
+    """
+
+    def __init__(self, size: int = 128, buckets: Sequence[float] = RTT_BUCKETS):
+        """
+        Initialize RTT window.
+
+        Args:
+            size: Number of measurements kept
+            buckets: Ascending bucket upper bounds in seconds
+        """
+        self.buckets = tuple(buckets)
+        self._samples: Deque[float] = deque(maxlen=size)
+        self.count = 0  # Measurements ever added
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, rtt: float) -> None:
+        """
+        Record one round-trip time.
+
+        Args:
+            rtt: Round-trip time in seconds
+        """
+        self._samples.append(max(0.0, rtt))
+        self.count += 1
+
+    @property
+    def last(self) -> Optional[float]:
+        """
+        Get the most recent round-trip time.
+
+        Returns:
+            Optional[float]: Seconds, or None before the first measurement
+        """
+        return self._samples[-1] if self._samples else None
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Get a percentile of the windowed round-trip times.
+
+        Args:
+            fraction: Percentile as a fraction, e.g. 0.99
+
+        Returns:
+            Optional[float]: Seconds, or None before the first measurement
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def histogram(self) -> Dict[str, int]:
+        """
+        Count the windowed round-trip times per bucket.
+
+        Returns:
+            Dict[str, int]: Count by bucket upper bound in ms, '+Inf' last
+        """
+        counts = [0] * (len(self.buckets) + 1)
+        for rtt in self._samples:
+            counts[bisect.bisect_left(self.buckets, rtt)] += 1
+        labels = [f"{bound * 1000:g}" for bound in self.buckets] + ['+Inf']
+        return dict(zip(labels, counts))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Summarise the windowed round-trip times in milliseconds.
+
+        Returns:
+            Dict[str, Any]: Last, min, median, p99 and max RTT in ms (None
+            before the first measurement), window and total counts
+        """
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 3) if value is not None else None
+
+        return {
+            'last_ms': ms(self.last),
+            'min_ms': ms(min(self._samples) if self._samples else None),
+            'p50_ms': ms(self.percentile(0.5)),
+            'p99_ms': ms(self.percentile(0.99)),
+            'max_ms': ms(max(self._samples) if self._samples else None),
+            'window': len(self._samples),
+            'count': self.count
+        }
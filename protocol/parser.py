@@ -0,0 +1,207 @@
+"""
+Protocol Parser Module
+Incrementally extracts frames from a byte stream of any segmentation.
+"""
+
+# Standard library imports
+import socket
+from typing import Iterator, Optional, Tuple
+
+# Third-party imports
+
+# Local application imports
+from .codec import (
+    BytesLike,
+    CHECKSUM_SIZE,
+    FRAME_OVERHEAD,
+    HEADER_SIZE,
+    MAGIC,
+    MAGIC_N,
+    MAGIC_P,
+    checksum
+)
+
+
+Frame = Tuple[int, int, memoryview]
+
+# Default amount of free space requested per socket read
+READ_CHUNK_SIZE = 4096
+
+
+class FrameParser:
+    """
+    Streaming frame parser with resynchronisation on the 0x00 0xFF magic.
+
+    Bytes are accumulated in a growable buffer, so frames split across any
+    number of TCP segments are reassembled. Garbage and frames failing the
+    checksum are skipped by searching for the next packet marker.
+
+    Payloads are returned as memoryview slices of the internal buffer and
+    are only valid until more data is fed or received.
+    """
+
+    def __init__(self, initial_size: int = 8192):
+        """
+        Initialize frame parser.
+
+        Args:
+            initial_size: Initial buffer size in bytes
+        """
+        self._buffer = bytearray(initial_size)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+        self.frames_parsed = 0
+        self.checksum_errors = 0
+        self.discarded_bytes = 0
+
+    def reset(self) -> None:
+        """Drop buffered bytes, e.g. after reconnecting."""
+        self._start = 0
+        self._end = 0
+
+    @property
+    def buffered(self) -> int:
+        """
+        Get the number of bytes waiting to be parsed.
+
+        Returns:
+            int: Buffered byte count
+        """
+        return self._end - self._start
+
+    def _reserve(self, size: int) -> None:
+        """
+        Ensure at least size free bytes after the buffered data.
+
+        Args:
+            size: Free bytes required
+        """
+        if len(self._buffer) - self._end >= size:
+            return
+        pending = self._end - self._start
+        if pending + size <= len(self._buffer):
+            # Compact in place; same-length slice assignment never resizes
+            self._buffer[0:pending] = self._buffer[self._start:self._end]
+        else:
+            # Grow into a fresh buffer so outstanding views stay valid
+            grown = bytearray(max(len(self._buffer) * 2, pending + size))
+            grown[0:pending] = self._buffer[self._start:self._end]
+            self._buffer = grown
+            self._view = memoryview(grown)
+        self._start = 0
+        self._end = pending
+
+    def feed(self, data: BytesLike) -> None:
+        """
+        Append received bytes to the parser.
+
+        Args:
+            data: Bytes received from the stream
+        """
+        size = len(data)
+        self._reserve(size)
+        self._buffer[self._end:self._end + size] = data
+        self._end += size
+
+    def recv_from(self, sock: socket.socket, size: int = READ_CHUNK_SIZE) -> int:
+        """
+        Receive directly into the parser buffer with recv_into.
+
+        Args:
+            sock: Connected socket
+            size: Maximum bytes to receive
+
+        Returns:
+            int: Number of bytes received
+
+        Raises:
+            ConnectionError: If the peer closed the connection
+            socket.timeout: If nothing arrived before the socket timeout
+        """
+        self._reserve(size)
+        count = sock.recv_into(self._view[self._end:self._end + size])
+        if count == 0:
+            raise ConnectionError("Connection closed by peer")
+        self._end += count
+        return count
+
+    def _resync(self) -> None:
+        """Discard bytes up to the next packet marker."""
+        index = self._buffer.find(MAGIC, self._start + 1, self._end)
+        if index < 0:
+            # Keep a trailing 0x00 that may start the next marker
+            index = self._end
+            if self._end > self._start and self._buffer[self._end - 1] == MAGIC_P:
+                index -= 1
+        self.discarded_bytes += index - self._start
+        self._start = index
+
+    def next_frame(self) -> Optional[Frame]:
+        """
+        Extract the next complete, valid frame.
+
+        Returns:
+            Optional[Frame]: Packet ID, type and payload view, or None if
+            more bytes are needed
+        """
+        buffer = self._buffer
+        while self._end - self._start >= HEADER_SIZE:
+            start = self._start
+            if buffer[start] != MAGIC_P or buffer[start + 1] != MAGIC_N:
+                self._resync()
+                continue
+
+            length = (buffer[start + 4] << 8) | buffer[start + 5]
+            total = length + FRAME_OVERHEAD
+            if self._end - start < total:
+                return None
+
+            end = start + total - CHECKSUM_SIZE
+            if checksum(self._view[start:end]) != buffer[end]:
+                # Corrupt frame or a false marker inside another payload
+                self.checksum_errors += 1
+                self._resync()
+                continue
+
+            self._start = start + total
+            self.frames_parsed += 1
+            payload = self._view[start + HEADER_SIZE:end]
+            return buffer[start + 2], buffer[start + 3], payload
+        return None
+
+    def frames(self) -> Iterator[Frame]:
+        """
+        Iterate over all complete frames currently buffered.
+
+        Yields:
+            Frame: Packet ID, type and payload view
+        """
+        while True:
+            frame = self.next_frame()
+            if frame is None:
+                return
+            yield frame
+
+    def read_frame(self, sock: socket.socket) -> Frame:
+        """
+        Block until one complete frame has been received from a socket.
+
+        Partially received frames survive socket timeouts and are completed
+        by the next call.
+
+        Args:
+            sock: Connected socket
+
+        Returns:
+            Frame: Packet ID, type and payload view
+
+        Raises:
+            ConnectionError: If the peer closed the connection
+            socket.timeout: If the socket timed out before a frame completed
+        """
+        while True:
+            frame = self.next_frame()
+            if frame is not None:
+                return frame
+            self.recv_from(sock)
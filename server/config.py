@@ -4,8 +4,10 @@ Contains configuration settings and constants for the server application.
 """
 
 # Standard library imports
+import copy
+import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
 # Third-party imports
 
@@ -18,14 +20,44 @@ DEFAULT_CONFIG = {
         'host': '0.0.0.0',
         'data_port': 5000,
         'settings_port': 5001,
-        'auth_port': 5002
+        'auth_port': 5002,
+        # Single port carrying auth, data and settings for one session
+        'mux_enabled': True,
+        'mux_port': 5003,
+        'backlog': 128,
+        # Processes sharing the ports with SO_REUSEPORT; 1 serves from one process
+        'workers': 1,
+        'worker_restart_delay': 1.0
+    },
+    'heartbeat': {
+        # Ping every client; drop those that answered once and then went silent
+        'interval': 1.0,
+        'timeout': 10.0
     },
     'camera': {
+        # Disable to run the TCP servers without libcamera/ffmpeg (load tests)
+        'enabled': True,
         'width': 640,
         'height': 480,
         'framerate': 24,
         'codec': 'h264',
         'rtsp_url': 'rtsp://localhost:8554/ES_MTX',
+        'health_check_interval': 1.0,
+        'stall_timeout': 5.0,
+        'restart_backoff_initial': 1.0,
+        'restart_backoff_max': 30.0,
+        'stable_after': 30.0,
+        'command_interval': 0.5,
+        # Encoding profile (low, medium, high, full) and adaptive quality
+        'profile': 'medium',
+        'adaptive': False,
+        'adaptive_fps_ratio': 0.8,
+        'adaptive_drop_threshold': 0.05,
+        'adaptive_down_after': 2,
+        'adaptive_up_after': 30.0,
+        'adaptive_cooldown': 10.0,
+        # Per-camera overrides, e.g. [{'device': 0}, {'device': 1, 'width': 1280}]
+        'cameras': [],
         'default_settings': {
             'shutter': 10000,
             'gain': 1,
@@ -35,13 +67,70 @@ DEFAULT_CONFIG = {
             'brightness': 0.0
         }
     },
+    'data': {
+        'sample_rate': 24,
+        'missed_tick_policy': 'skip',
+        'max_catch_up_ticks': 10,
+        'latency_budget_ms': 50,
+        'ring_capacity': 256,
+        # Recent samples kept for backfill requests, 0 disables; the capacity
+        # in samples is derived from the sample rate unless history_capacity is set
+        'history_seconds': 60,
+        'history_capacity': 0,
+        # Sample source: synthetic (waveform random/sine/square/triangle/sawtooth,
+        # low, high, period, rate_hz, seed), replay (path, rate_hz, speed, loop),
+        # log (recorded path, speed, loop, max_gap), fifo (path) or unix (path)
+        'source': {
+            'type': 'synthetic',
+            'waveform': 'random',
+            'low': 0,
+            'high': 10
+        },
+        # Slow clients: backlog bound in packets, then drop_oldest, conflate or
+        # disconnect
+        'client_queue_size': 48,
+        'slow_client_policy': 'drop_oldest',
+        'max_client_lag': 1.0,
+        'slow_client_timeout': 10.0
+    },
+    'recording': {
+        # Append every emitted sample to rotating fixed-record logs (9 bytes each)
+        'enabled': False,
+        'directory': 'recordings',
+        'prefix': 'samples',
+        'max_bytes': 64 * 1024 * 1024,
+        'max_files': 16,
+        'flush_interval': 1.0
+    },
+    'multicast': {
+        # Also send every sample once to a UDP multicast group (ID 0x06 datagrams)
+        'enabled': False,
+        'group': '239.255.0.1',
+        'port': 5004,
+        'ttl': 1,
+        'interface': '0.0.0.0',
+        'loopback': True
+    },
     'auth': {
         'default_password': '1111'
     },
+    'metrics': {
+        # Prometheus text format at http://host:port/metrics
+        'enabled': True,
+        'host': '127.0.0.1',
+        'port': 9100
+    },
     'paths': {
         'config_dir': 'config',
+        # JSON file overriding these defaults; environment variables override both
+        'config_file': 'config/server.json',
         'camera_settings': 'config/camera_settings.json'
     },
+    'reload': {
+        # Poll the config file and apply changes to the running servers
+        'watch': True,
+        'interval': 2.0
+    },
     'logging': {
         'level': 'INFO',
         'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -50,46 +139,260 @@ DEFAULT_CONFIG = {
 }
 
 
+class ConfigError(Exception):
+    """Raised when the configuration file cannot be read or parsed."""
+    pass
+
+
+def _merge(base: Dict[str, Any], overrides: Dict[str, Any]) -> None:
+    """
+    Merge nested overrides into a configuration dictionary in place.
+    
+    Args:
+        base: Configuration to update
+        overrides: Values replacing those of base, sections merged recursively
+    """
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge(base[key], value)
+        else:
+            base[key] = value
+
+
+def _flatten(config: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """
+    Flatten nested sections into dot-separated key paths.
+    
+    Args:
+        config: Configuration dictionary
+        prefix: Key path of config
+        
+    Returns:
+        Dict[str, Any]: Leaf values by key path
+    """
+    flat = {}
+    for key, value in config.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            flat.update(_flatten(value, f"{path}."))
+        else:
+            flat[path] = value
+    return flat
+
+
 class ServerConfig:
     """
     Server configuration manager.
     
-    Provides centralized access to configuration settings with
-    environment variable override support.
+    Provides centralized access to configuration settings. Defaults are
+    overridden by an optional JSON file (paths.config_file, or
+    CONFIG_FILE), then by environment variables, then by values set with
+    update() at runtime. reload() re-reads the file and reports which
+    values changed, so running servers can apply them.
     """
 
-    def __init__(self, config_dict: Dict[str, Any] = None):
+    def __init__(self, config_dict: Dict[str, Any] = None, path: Optional[str] = None):
         """
         Initialize configuration.
         
+        A configuration file that cannot be read leaves the defaults in
+        place and is reported through the error attribute.
+        
         Args:
             config_dict: Optional custom configuration dictionary
+            path: Optional configuration file path
         """
-        self.config = config_dict or DEFAULT_CONFIG.copy()
-        self._load_environment_overrides()
+        self._base = copy.deepcopy(config_dict or DEFAULT_CONFIG)
+        self._updates: Dict[str, Any] = {}
+        self.path = (path or os.getenv('CONFIG_FILE')
+                     or self._base.get('paths', {}).get('config_file'))
+        self.error: Optional[str] = None
+        self._mtime: Optional[float] = None
+        try:
+            self.config = self._build()
+        except ConfigError as e:
+            self.error = str(e)
+            self.config = copy.deepcopy(self._base)
+            self._load_environment_overrides(self.config)
 
-    def _load_environment_overrides(self) -> None:
-        """Load configuration overrides from environment variables."""
+    def _build(self) -> Dict[str, Any]:
+        """
+        Build the configuration from defaults, file, environment and updates.
+        
+        Returns:
+            Dict[str, Any]: New configuration dictionary
+            
+        Raises:
+            ConfigError: If the configuration file is invalid
+        """
+        config = copy.deepcopy(self._base)
+        self._mtime = self._get_mtime()
+        if self._mtime is not None:
+            try:
+                with open(self.path, 'r') as f:
+                    overrides = json.load(f)
+            except (OSError, ValueError) as e:
+                raise ConfigError(f"Cannot load {self.path}: {e}")
+            if not isinstance(overrides, dict):
+                raise ConfigError(f"{self.path} must hold a JSON object")
+            _merge(config, overrides)
+        self._load_environment_overrides(config)
+        for key_path, value in self._updates.items():
+            self._set(config, key_path, value)
+        return config
+
+    def _get_mtime(self) -> Optional[float]:
+        """
+        Get the modification time of the configuration file.
+        
+        Returns:
+            Optional[float]: Modification time, or None if there is no file
+        """
+        if not self.path:
+            return None
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def file_changed(self) -> bool:
+        """
+        Check whether the configuration file changed since it was loaded.
+        
+        Returns:
+            bool: True if the file was modified, created or deleted
+        """
+        return self._get_mtime() != self._mtime
+
+    def reload(self) -> Dict[str, Tuple[Any, Any]]:
+        """
+        Re-read the configuration file and replace the configuration.
+        
+        Returns:
+            Dict[str, Tuple[Any, Any]]: Old and new value of every changed key path
+            
+        Raises:
+            ConfigError: If the file is invalid; the configuration is unchanged
+        """
+        config = self._build()
+        old = _flatten(self.config)
+        new = _flatten(config)
+        self.config = config
+        self.error = None
+        return {key: (old.get(key), new.get(key))
+                for key in sorted(old.keys() | new.keys())
+                if old.get(key) != new.get(key)}
+
+    def use_file(self, path: str) -> Dict[str, Tuple[Any, Any]]:
+        """
+        Load the configuration from another file.
+        
+        Args:
+            path: Configuration file path
+            
+        Returns:
+            Dict[str, Tuple[Any, Any]]: Old and new value of every changed key path
+            
+        Raises:
+            ConfigError: If the file cannot be read or parsed
+        """
+        if not os.path.exists(path):
+            raise ConfigError(f"Configuration file {path} not found")
+        self.path = path
+        return self.reload()
+
+    def _load_environment_overrides(self, config: Dict[str, Any]) -> None:
+        """
+        Load configuration overrides from environment variables.
+        
+        Args:
+            config: Configuration dictionary to update
+        """
         # Server configuration
         if os.getenv('SERVER_HOST'):
-            self.config['server']['host'] = os.getenv('SERVER_HOST')
+            config['server']['host'] = os.getenv('SERVER_HOST')
         
         if os.getenv('DATA_PORT'):
-            self.config['server']['data_port'] = int(os.getenv('DATA_PORT'))
+            config['server']['data_port'] = int(os.getenv('DATA_PORT'))
             
         if os.getenv('SETTINGS_PORT'):
-            self.config['server']['settings_port'] = int(os.getenv('SETTINGS_PORT'))
+            config['server']['settings_port'] = int(os.getenv('SETTINGS_PORT'))
             
         if os.getenv('AUTH_PORT'):
-            self.config['server']['auth_port'] = int(os.getenv('AUTH_PORT'))
+            config['server']['auth_port'] = int(os.getenv('AUTH_PORT'))
+
+        if os.getenv('MUX_PORT'):
+            config['server']['mux_port'] = int(os.getenv('MUX_PORT'))
+
+        if os.getenv('SERVER_BACKLOG'):
+            config['server']['backlog'] = int(os.getenv('SERVER_BACKLOG'))
+
+        if os.getenv('SERVER_WORKERS'):
+            config['server']['workers'] = int(os.getenv('SERVER_WORKERS'))
+
+        # Camera
+        if os.getenv('CAMERA_ENABLED'):
+            config['camera']['enabled'] = (os.getenv('CAMERA_ENABLED').lower()
+                                           not in ('0', 'false', 'no'))
+
+        # Data stream
+        if os.getenv('SAMPLE_RATE'):
+            config['data']['sample_rate'] = float(os.getenv('SAMPLE_RATE'))
+
+        if os.getenv('HISTORY_SECONDS'):
+            config['data']['history_seconds'] = float(os.getenv('HISTORY_SECONDS'))
+
+        if os.getenv('SAMPLE_SOURCE'):
+            config['data']['source'] = self._parse_source(os.getenv('SAMPLE_SOURCE'))
+
+        # Sample recording
+        if os.getenv('RECORDING_DIR'):
+            config['recording']['enabled'] = True
+            config['recording']['directory'] = os.getenv('RECORDING_DIR')
+
+        # Multicast data channel
+        if os.getenv('MULTICAST_GROUP'):
+            config['multicast']['enabled'] = True
+            config['multicast']['group'] = os.getenv('MULTICAST_GROUP')
+
+        if os.getenv('MULTICAST_PORT'):
+            config['multicast']['port'] = int(os.getenv('MULTICAST_PORT'))
 
         # Authentication
         if os.getenv('AUTH_PASSWORD'):
-            self.config['auth']['default_password'] = os.getenv('AUTH_PASSWORD')
+            config['auth']['default_password'] = os.getenv('AUTH_PASSWORD')
+
+        # Heartbeat
+        if os.getenv('HEARTBEAT_INTERVAL'):
+            config['heartbeat']['interval'] = float(os.getenv('HEARTBEAT_INTERVAL'))
+
+        # Metrics endpoint
+        if os.getenv('METRICS_PORT'):
+            config['metrics']['port'] = int(os.getenv('METRICS_PORT'))
 
         # Logging
         if os.getenv('LOG_LEVEL'):
-            self.config['logging']['level'] = os.getenv('LOG_LEVEL')
+            config['logging']['level'] = os.getenv('LOG_LEVEL')
+
+    def _parse_source(self, spec: str) -> Dict[str, Any]:
+        """
+        Parse a sample source given as 'type:key=value,key=value'.
+        
+        Args:
+            spec: Source specification, e.g. 'synthetic:waveform=sine,rate_hz=1000'
+            
+        Returns:
+            Dict[str, Any]: Source configuration with numeric values converted
+        """
+        kind, _, options = spec.partition(':')
+        source: Dict[str, Any] = {'type': kind}
+        for option in filter(None, options.split(',')):
+            key, _, value = option.partition('=')
+            try:
+                source[key] = float(value) if '.' in value else int(value)
+            except ValueError:
+                source[key] = {'true': True, 'false': False}.get(value.lower(), value)
+        return source
 
     def get(self, key_path: str, default: Any = None) -> Any:
         """
@@ -162,12 +465,26 @@ class ServerConfig:
         """
         Update configuration value by dot-separated key path.
         
+        The value is kept across reloads of the configuration file.
+        
+        Args:
+            key_path: Dot-separated configuration key path
+            value: New value to set
+        """
+        self._updates[key_path] = value
+        self._set(self.config, key_path, value)
+
+    def _set(self, config: Dict[str, Any], key_path: str, value: Any) -> None:
+        """
+        Set a configuration value by dot-separated key path.
+        
         Args:
+            config: Configuration dictionary to update
             key_path: Dot-separated configuration key path
             value: New value to set
         """
         keys = key_path.split('.')
-        config_ref = self.config
+        config_ref = config
         
         # Navigate to parent dictionary
         for key in keys[:-1]:
@@ -0,0 +1,431 @@
+"""
+Server Load Test
+Drives concurrent data, settings and auth clients over the wire protocol
+and reports throughput, delivery rate and latency.
+
+Usage:
+    python server/load_test.py --local [--data-clients N] [--settings-clients N]
+                               [--auth-clients N] [--duration S]
+    python server/load_test.py --host 192.168.137.112 ...
+
+With --local a server is started as a subprocess with the camera disabled,
+so only the TCP servers are measured. Data latency is the receive time
+minus the sample's embedded timestamp_ms; against a remote server it also
+contains the clock offset between both hosts.
+"""
+
+# Standard library imports
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Sequence
+
+# Third-party imports
+
+# Make the shared protocol package importable when running from the repository
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+# Local application imports
+from protocol import codec
+from protocol.parser import FrameParser, READ_CHUNK_SIZE
+
+
+# Seconds to wait for a local server to accept connections
+SERVER_START_TIMEOUT = 15.0
+
+# Seconds to wait for a settings or auth reply before counting an error
+REPLY_TIMEOUT = 5.0
+
+
+class ClientStats:
+    """Results collected by the clients of one kind."""
+
+    def __init__(self, kind: str):
+        """
+        Initialize empty statistics.
+
+        Args:
+            kind: Client kind, 'data', 'settings' or 'auth'
+        """
+        self.kind = kind
+        self.latencies_ms: List[float] = []
+        self.rates_hz: List[float] = []
+        self.packets = 0
+        self.bytes = 0
+        self.samples = 0
+        self.requests = 0
+        self.failures = 0
+        self.errors = 0
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """
+    Get a percentile by nearest rank.
+
+    Args:
+        values: Sorted values
+        pct: Percentile between 0 and 100
+
+    Returns:
+        float: Percentile value, 0.0 for no values
+    """
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(pct / 100.0 * len(values))) - 1))
+    return values[index]
+
+
+async def read_frame(reader: asyncio.StreamReader, parser: FrameParser):
+    """
+    Read the next complete frame from a stream, skipping server heartbeats.
+
+    Args:
+        reader: Stream reader
+        parser: Frame parser of the connection
+
+    Returns:
+        Frame: Packet ID, type and payload
+
+    Raises:
+        ConnectionError: If the server closed the connection
+    """
+    while True:
+        frame = parser.next_frame()
+        if frame is None:
+            chunk = await reader.read(READ_CHUNK_SIZE)
+            if not chunk:
+                raise ConnectionError("Server closed the connection")
+            parser.feed(chunk)
+        elif frame[0] != codec.ID_PING:
+            return frame
+
+
+async def run_data_client(host: str, port: int, deadline: float, stats: ClientStats,
+                          compact: bool = False) -> None:
+    """
+    Receive the data stream until the deadline.
+
+    Args:
+        host: Server address
+        port: Data port
+        deadline: time.monotonic() at which to stop
+        stats: Data client statistics
+        compact: Select the compact stream encoding
+    """
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        stats.errors += 1
+        return
+    if compact:
+        writer.write(codec.encode_stream_encoding(codec.ENCODING_COMPACT))
+    reference = None  # Last timestamp of the previous compact packet
+    parser = FrameParser()
+    first_sample = None
+    last_sample = None
+    samples = 0
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                chunk = await asyncio.wait_for(reader.read(READ_CHUNK_SIZE), remaining)
+            except asyncio.TimeoutError:
+                break
+            if not chunk:
+                stats.errors += 1
+                break
+            received_ms = time.time() * 1000
+            stats.bytes += len(chunk)
+            parser.feed(chunk)
+            for id_, _, payload in parser.frames():
+                if id_ == codec.ID_DATA:
+                    batch = [codec.decode_sample(payload)]
+                elif id_ == codec.ID_DATA_BATCH:
+                    batch = codec.decode_samples(payload)
+                elif id_ == codec.ID_DATA_COMPACT:
+                    batch = codec.decode_compact_samples(payload, reference)
+                    reference = batch[-1][1]
+                else:
+                    continue
+                stats.packets += 1
+                for _, timestamp_ms in batch:
+                    stats.latencies_ms.append(received_ms - timestamp_ms)
+                samples += len(batch)
+                now = time.monotonic()
+                if first_sample is None:
+                    first_sample = now
+                last_sample = now
+    except (OSError, codec.ProtocolError):
+        stats.errors += 1
+    finally:
+        writer.close()
+    stats.samples += samples
+    if first_sample is not None and last_sample > first_sample:
+        stats.rates_hz.append((samples - 1) / (last_sample - first_sample))
+
+
+async def run_settings_client(host: str, port: int, deadline: float, interval: float,
+                              update_ratio: float, stats: ClientStats) -> None:
+    """
+    Send settings queries and updates until the deadline.
+
+    Args:
+        host: Server address
+        port: Settings port
+        deadline: time.monotonic() at which to stop
+        interval: Seconds between requests
+        update_ratio: Fraction of requests that are updates
+        stats: Settings client statistics
+    """
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        stats.errors += 1
+        return
+    parser = FrameParser()
+    try:
+        while time.monotonic() < deadline:
+            if random.random() < update_ratio:
+                # Shutter, gain, AWB red/blue, contrast, brightness
+                payload = bytes([100, random.randint(1, 16), 10, 10, 10, 127])
+            else:
+                payload = b''
+            start = time.perf_counter()
+            writer.write(codec.encode_packet(codec.ID_SETTINGS, codec.TYPE_COMMAND,
+                                             payload))
+            stats.requests += 1
+            id_, typ, _ = await asyncio.wait_for(read_frame(reader, parser),
+                                                 REPLY_TIMEOUT)
+            stats.latencies_ms.append((time.perf_counter() - start) * 1000)
+            if id_ != codec.ID_SETTINGS or typ != codec.TYPE_RESPONSE:
+                stats.failures += 1
+            await asyncio.sleep(interval)
+    except (OSError, ConnectionError, asyncio.TimeoutError):
+        stats.errors += 1
+    finally:
+        writer.close()
+
+
+async def run_auth_client(host: str, port: int, deadline: float, interval: float,
+                          password: str, stats: ClientStats) -> None:
+    """
+    Authenticate on a fresh connection repeatedly until the deadline.
+
+    Args:
+        host: Server address
+        port: Auth port
+        deadline: time.monotonic() at which to stop
+        interval: Seconds between attempts
+        password: Password to send
+        stats: Auth client statistics
+    """
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        stats.requests += 1
+        writer = None
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(codec.encode_packet(codec.ID_AUTH, codec.TYPE_COMMAND,
+                                             password.encode('ascii')))
+            id_, typ, payload = await asyncio.wait_for(
+                read_frame(reader, FrameParser()), REPLY_TIMEOUT)
+            stats.latencies_ms.append((time.perf_counter() - start) * 1000)
+            if (id_ != codec.ID_AUTH or typ != codec.TYPE_RESPONSE
+                    or bytes(payload) != b'ready'):
+                stats.failures += 1
+        except (OSError, ConnectionError, asyncio.TimeoutError):
+            stats.errors += 1
+        finally:
+            if writer is not None:
+                writer.close()
+        await asyncio.sleep(interval)
+
+
+async def run_load(args: argparse.Namespace) -> Dict[str, ClientStats]:
+    """
+    Run every client concurrently for the configured duration.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Dict[str, ClientStats]: Statistics by client kind
+    """
+    stats = {kind: ClientStats(kind) for kind in ('data', 'settings', 'auth')}
+    deadline = time.monotonic() + args.duration
+    tasks = []
+    for _ in range(args.data_clients):
+        tasks.append(run_data_client(args.host, args.data_port, deadline, stats['data'],
+                                     args.compact))
+    for _ in range(args.settings_clients):
+        tasks.append(run_settings_client(args.host, args.settings_port, deadline,
+                                         args.settings_interval, args.update_ratio,
+                                         stats['settings']))
+    for _ in range(args.auth_clients):
+        tasks.append(run_auth_client(args.host, args.auth_port, deadline,
+                                     args.auth_interval, args.password, stats['auth']))
+    await asyncio.gather(*tasks)
+    return stats
+
+
+def print_report(stats: Dict[str, ClientStats], args: argparse.Namespace) -> None:
+    """
+    Print throughput, delivery rate and latency percentiles.
+
+    Args:
+        stats: Statistics by client kind
+        args: Parsed command line arguments
+    """
+    duration = args.duration
+    print(f"\nLoad test: {args.data_clients} data, {args.settings_clients} settings, "
+          f"{args.auth_clients} auth clients for {duration:g} s against {args.host}")
+
+    for kind, result in stats.items():
+        latencies = sorted(result.latencies_ms)
+        if not latencies and not result.errors:
+            continue
+        print(f"\n[{kind}]")
+        if kind == 'data':
+            print(f"  throughput   {result.samples / duration:10.1f} samples/s  "
+                  f"{result.packets / duration:8.1f} packets/s  "
+                  f"{result.bytes / duration / 1024:8.1f} KiB/s")
+            if result.rates_hz:
+                target = args.sample_rate
+                deviations = [(rate - target) / target * 100
+                              for rate in result.rates_hz]
+                print(f"  rate         mean {statistics.mean(result.rates_hz):.2f} Hz "
+                      f"(target {target:g}), "
+                      f"deviation mean {statistics.mean(deviations):+.2f}% "
+                      f"min {min(deviations):+.2f}% max {max(deviations):+.2f}%")
+        else:
+            print(f"  throughput   {result.requests / duration:10.1f} requests/s  "
+                  f"failures {result.failures}")
+        if latencies:
+            print(f"  latency ms   p50 {percentile(latencies, 50):.2f}  "
+                  f"p90 {percentile(latencies, 90):.2f}  "
+                  f"p99 {percentile(latencies, 99):.2f}  "
+                  f"max {latencies[-1]:.2f}")
+        print(f"  errors       {result.errors}")
+
+
+def wait_for_port(host: str, port: int, timeout: float) -> bool:
+    """
+    Wait until a TCP port accepts connections.
+
+    Args:
+        host: Server address
+        port: TCP port
+        timeout: Maximum seconds to wait
+
+    Returns:
+        bool: True once connected, False on timeout
+    """
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def start_local_server(args: argparse.Namespace, workdir: str) -> subprocess.Popen:
+    """
+    Start server/main.py with the camera disabled.
+
+    Args:
+        args: Parsed command line arguments
+        workdir: Scratch directory receiving the server's log and settings files
+
+    Returns:
+        subprocess.Popen: Server process
+
+    Raises:
+        RuntimeError: If the server does not come up in time
+    """
+    env = dict(os.environ, CAMERA_ENABLED='0', SAMPLE_RATE=str(args.sample_rate),
+               AUTH_PASSWORD=args.password, LOG_LEVEL='WARNING')
+    main_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+    process = subprocess.Popen([sys.executable, main_path], env=env, cwd=workdir,
+                               stdout=subprocess.DEVNULL)
+    if not wait_for_port(args.host, args.auth_port, SERVER_START_TIMEOUT):
+        process.terminate()
+        raise RuntimeError("Local server did not start")
+    # Let the sampler settle before measuring its rate
+    time.sleep(0.5)
+    return process
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv: Arguments, sys.argv[1:] if omitted
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Load test the ES stream servers")
+    parser.add_argument('--host', default='127.0.0.1', help="server address")
+    parser.add_argument('--local', action='store_true',
+                        help="start a local server with the camera disabled")
+    parser.add_argument('--data-port', type=int, default=5000)
+    parser.add_argument('--settings-port', type=int, default=5001)
+    parser.add_argument('--auth-port', type=int, default=5002)
+    parser.add_argument('--data-clients', type=int, default=50)
+    parser.add_argument('--compact', action='store_true',
+                        help="data clients select the compact stream encoding")
+    parser.add_argument('--settings-clients', type=int, default=5)
+    parser.add_argument('--auth-clients', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds to run")
+    parser.add_argument('--sample-rate', type=float, default=24.0,
+                        help="server sample rate in Hz (set on --local servers)")
+    parser.add_argument('--settings-interval', type=float, default=0.5,
+                        help="seconds between settings requests per client")
+    parser.add_argument('--update-ratio', type=float, default=0.1,
+                        help="fraction of settings requests that are updates")
+    parser.add_argument('--auth-interval', type=float, default=1.0,
+                        help="seconds between auth attempts per client")
+    parser.add_argument('--password', default='1111')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the load test.
+
+    Args:
+        argv: Command line arguments
+
+    Returns:
+        int: Exit status, non-zero if any client hit an error
+    """
+    args = parse_args(argv)
+    # Local servers run in a scratch directory so logs stay out of the tree
+    with tempfile.TemporaryDirectory(prefix='es_load_test_') as workdir:
+        server = start_local_server(args, workdir) if args.local else None
+        try:
+            stats = asyncio.run(run_load(args))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=10)
+    print_report(stats, args)
+    return 1 if any(result.errors for result in stats.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
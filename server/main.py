@@ -4,6 +4,7 @@ Entry point for the TCP server application with camera streaming functionality.
 """
 
 # Standard library imports
+import argparse
 import logging
 import logging.handlers
 import os
@@ -11,9 +12,14 @@ import sys
 
 # Third-party imports
 
+# Make the shared protocol package importable when running from the repository
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
 # Local application imports
 from src.presenter.server_presenter import ServerPresenter, ServerPresenterError
-from config import config
+from config import ConfigError, config
 
 
 def setup_logging() -> None:
@@ -45,6 +51,62 @@ def setup_logging() -> None:
     logging.getLogger('src.presenter.server_presenter').setLevel(logging.INFO)
 
 
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line options.
+    
+    Returns:
+        argparse.Namespace: Parsed options
+    """
+    parser = argparse.ArgumentParser(description="ES IoT TCP server")
+    parser.add_argument('--config', metavar='PATH',
+                        help="JSON configuration file, watched for changes "
+                             "(default: $CONFIG_FILE or config/server.json)")
+    parser.add_argument('--replay', metavar='PATH',
+                        help="serve a recorded sample log (file or directory) "
+                             "instead of live samples, without the camera")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="replay speed factor (default: 1.0)")
+    parser.add_argument('--loop', action='store_true',
+                        help="restart the replay after the last recorded sample")
+    parser.add_argument('--workers', type=int, metavar='N',
+                        help="serve the ports from N processes with SO_REUSEPORT "
+                             "(default: $SERVER_WORKERS or 1)")
+    args = parser.parse_args()
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.config:
+        # Loaded before logging, which is configured from it
+        try:
+            config.use_file(args.config)
+        except ConfigError as e:
+            parser.error(str(e))
+    return args
+
+
+def apply_replay(args: argparse.Namespace) -> None:
+    """
+    Configure the data server to replay a sample log.
+    
+    Args:
+        args: Parsed command line options
+    """
+    if not args.replay:
+        return
+    config.update('data.source', {
+        'type': 'log',
+        'path': args.replay,
+        'speed': args.speed,
+        'loop': args.loop
+    })
+    # A replay must not record over the logs it reads
+    config.update('recording.enabled', False)
+    config.update('camera.enabled', False)
+    logging.info(f"Replay mode: {args.replay} at {args.speed:g}x")
+
+
 def create_config_directory() -> None:
     """Create configuration directory if it doesn't exist."""
     config_dir = config.get('paths.config_dir', 'config')
@@ -68,6 +130,9 @@ def validate_environment() -> None:
             logger.warning(f"System platform '{sys.platform}' may not support camera operations")
         
         # Validate configuration
+        if config.error:
+            raise ValueError(config.error)
+        
         server_config = config.get_server_config()
         if not server_config:
             raise ValueError("Server configuration is missing")
@@ -90,6 +155,8 @@ def main() -> None:
     Initializes and runs the TCP server application with proper error handling
     and resource cleanup.
     """
+    args = parse_args()
+    
     # Setup logging first
     setup_logging()
     logger = logging.getLogger(__name__)
@@ -100,6 +167,9 @@ def main() -> None:
         
         # Validate environment
         validate_environment()
+        apply_replay(args)
+        if args.workers is not None:
+            config.update('server.workers', args.workers)
         
         # Create necessary directories
         create_config_directory()
@@ -109,7 +179,10 @@ def main() -> None:
         
         # Initialize server presenter
         logger.info("Initializing server presenter")
-        server_presenter = ServerPresenter(config_path=camera_settings_path)
+        server_presenter = ServerPresenter(
+            config_path=camera_settings_path,
+            server_config=config
+        )
         
         # Display configuration information
         server_config = config.get_server_config()
@@ -117,6 +190,10 @@ def main() -> None:
         logger.info(f"  - Data server: {server_config['host']}:{server_config['data_port']}")
         logger.info(f"  - Settings server: {server_config['host']}:{server_config['settings_port']}")
         logger.info(f"  - Auth server: {server_config['host']}:{server_config['auth_port']}")
+        if config.path and os.path.exists(config.path):
+            logger.info(f"  - Configuration file: {config.path}")
+        if server_config.get('workers', 1) > 1:
+            logger.info(f"  - Processes: {server_config['workers']}")
         
         # Run servers
         server_presenter.run_forever()
@@ -3,13 +3,72 @@ Model Package
 Contains all data models and business logic for the server application.
 """
 
+from .broadcast_model import BroadcastModel, PacketRingBuffer
 from .camera_model import CameraModel
-from .tcp_server_model import TCPServerModel, DataServerModel, SettingsServerModel, AuthServerModel
+from .camera_pool_model import CameraPipeline, CameraPool
+from .command_model import CameraCommandQueue
+from .deadband_model import DeadbandFilter
+from .event_loop_model import EventLoopModel
+from .history_model import SampleHistory
+from .metrics_model import MetricsHTTPServer, MetricsRegistry
+from .multicast_model import MulticastPublisher
+from .process_model import StderrDrain
+from .profile_model import AdaptiveQualityController, DEFAULT_PROFILES
+from .recorder_model import SampleLog, SampleRecorder
+from .scheduler_model import DeadlineScheduler
+from .source_model import (
+    FifoSource,
+    FileReplaySource,
+    LogReplaySource,
+    SampleSource,
+    SyntheticSource,
+    UnixSocketSource,
+    create_source
+)
+from .supervisor_model import CameraSupervisor
+from .tcp_server_model import (
+    TCPServerModel,
+    DataServerModel,
+    SettingsServerModel,
+    RemoteSettingsServerModel,
+    AuthServerModel,
+    MuxServerModel
+)
+from .worker_model import WorkerHub, WorkerLink
 
 __all__ = [
+    'AdaptiveQualityController',
+    'BroadcastModel',
+    'PacketRingBuffer',
     'CameraModel',
+    'CameraPipeline',
+    'CameraPool',
+    'CameraCommandQueue',
+    'CameraSupervisor',
+    'DEFAULT_PROFILES',
+    'DeadbandFilter',
+    'DeadlineScheduler',
+    'EventLoopModel',
+    'FifoSource',
+    'FileReplaySource',
+    'LogReplaySource',
+    'MetricsHTTPServer',
+    'MetricsRegistry',
+    'MulticastPublisher',
+    'SampleHistory',
+    'SampleLog',
+    'SampleRecorder',
+    'SampleSource',
+    'StderrDrain',
+    'SyntheticSource',
     'TCPServerModel',
+    'UnixSocketSource',
+    'WorkerHub',
+    'WorkerLink',
+    'create_source',
     'DataServerModel', 
     'SettingsServerModel',
-    'AuthServerModel'
+    'RemoteSettingsServerModel',
+    'AuthServerModel',
+    'MuxServerModel'
 ]
\ No newline at end of file
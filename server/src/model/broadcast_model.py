@@ -0,0 +1,340 @@
+"""
+Broadcast Model Module
+Shares encoded data packets between one producer and many client streams.
+"""
+
+# Standard library imports
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+
+# Third-party imports
+
+# Local application imports
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Slow subscriber policies
+POLICY_DROP_OLDEST = 'drop_oldest'
+POLICY_CONFLATE = 'conflate'
+POLICY_DISCONNECT = 'disconnect'
+SLOW_CONSUMER_POLICIES = (POLICY_DROP_OLDEST, POLICY_CONFLATE, POLICY_DISCONNECT)
+
+
+class SlowConsumerError(Exception):
+    """Raised when a subscriber falls further behind than its policy allows."""
+    pass
+
+
+class PacketRingBuffer:
+    """
+    Fixed-capacity ring of encoded packets addressed by sequence number.
+
+    The producer appends packets with increasing sequence numbers. Readers
+    keep their own cursor and fetch everything between the cursor and the
+    head; packets older than the ring capacity are overwritten.
+    """
+
+    def __init__(self, capacity: int = 256):
+        """
+        Initialize ring buffer.
+
+        Args:
+            capacity: Maximum number of packets retained
+
+        Raises:
+            ValueError: If capacity is not positive
+        """
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive")
+        self.capacity = capacity
+        self._slots: List[Optional[bytes]] = [None] * capacity
+        self.head_seq = 0
+
+    @property
+    def tail_seq(self) -> int:
+        """
+        Get the oldest sequence number still held in the ring.
+
+        Returns:
+            int: Oldest available sequence number
+        """
+        return max(0, self.head_seq - self.capacity)
+
+    def append(self, packet: bytes) -> int:
+        """
+        Append an encoded packet to the ring.
+
+        Args:
+            packet: Encoded packet bytes
+
+        Returns:
+            int: Sequence number assigned to the packet
+        """
+        seq = self.head_seq
+        self._slots[seq % self.capacity] = packet
+        self.head_seq = seq + 1
+        return seq
+
+    def read_from(self, seq: int) -> Tuple[List[bytes], int, int]:
+        """
+        Read all packets from a sequence number up to the head.
+
+        Args:
+            seq: Sequence number of the first packet wanted
+
+        Returns:
+            Tuple[List[bytes], int, int]: Packets, next cursor and number of
+            packets skipped because they were already overwritten
+        """
+        tail = self.tail_seq
+        skipped = 0
+        if seq < tail:
+            skipped = tail - seq
+            seq = tail
+        head = self.head_seq
+        if seq >= head:
+            return [], head, skipped
+
+        start = seq % self.capacity
+        end = head % self.capacity
+        if start < end:
+            packets = self._slots[start:end]
+        else:
+            packets = self._slots[start:] + self._slots[:end]
+        return packets, head, skipped
+
+
+class BroadcastModel:
+    """
+    Single-producer fan-out of encoded packets to many subscribers.
+
+    The producer publishes each packet exactly once; every subscriber
+    coroutine waits on the same wake-up event and sends the shared bytes.
+    Must be used from a single event loop thread.
+    """
+
+    def __init__(self, capacity: int = 256):
+        """
+        Initialize broadcast model.
+
+        Args:
+            capacity: Number of packets kept in the shared ring buffer
+        """
+        self.ring = PacketRingBuffer(capacity)
+        # Monotonic publish time of each ring slot, for send latency
+        self._publish_times: List[float] = [0.0] * capacity
+        self._new_packet = asyncio.Event()
+
+    @property
+    def head_seq(self) -> int:
+        """
+        Get the sequence number the next packet will receive.
+
+        Returns:
+            int: Next sequence number
+        """
+        return self.ring.head_seq
+
+    def publish(self, packet: bytes) -> int:
+        """
+        Publish an encoded packet to all subscribers.
+
+        Args:
+            packet: Encoded packet bytes
+
+        Returns:
+            int: Sequence number assigned to the packet
+        """
+        seq = self.ring.append(packet)
+        self._publish_times[seq % self.ring.capacity] = time.monotonic()
+        # Wake every waiting subscriber, then re-arm for the next packet
+        self._new_packet.set()
+        self._new_packet.clear()
+        return seq
+
+    def get_publish_time(self, seq: int) -> float:
+        """
+        Get when a packet still held in the ring was published.
+
+        Args:
+            seq: Sequence number of the packet
+
+        Returns:
+            float: time.monotonic() at publication
+        """
+        return self._publish_times[seq % self.ring.capacity]
+
+    async def wait_for(self, cursor: int) -> None:
+        """
+        Wait until a packet at or after the cursor is available.
+
+        Args:
+            cursor: Sequence number the subscriber wants next
+        """
+        while cursor >= self.ring.head_seq:
+            await self._new_packet.wait()
+
+    def read_from(self, cursor: int) -> Tuple[List[bytes], int, int]:
+        """
+        Read all packets available from the cursor.
+
+        Args:
+            cursor: Sequence number the subscriber wants next
+
+        Returns:
+            Tuple[List[bytes], int, int]: Packets, next cursor and skip count
+        """
+        return self.ring.read_from(cursor)
+
+
+class BroadcastSubscriber:
+    """
+    One client's cursor into the broadcast ring with a bounded backlog.
+
+    The backlog holds packets published but not yet taken. When it grows
+    beyond max_queue, drop_oldest discards the oldest packets over the
+    bound, conflate keeps only the newest packet and disconnect raises
+    SlowConsumerError. Taken packets are remembered until the socket has
+    sent them, so the lag also covers data still queued in socket buffers.
+    Other bytes written to the same socket, such as replies and pings,
+    must be counted with count_bytes() for the lag to stay right.
+    """
+
+    def __init__(self, broadcaster: BroadcastModel, max_queue: int = 48,
+                 policy: str = POLICY_DROP_OLDEST):
+        """
+        Initialize subscriber at the live head of the broadcast.
+
+        Args:
+            broadcaster: Broadcast to follow
+            max_queue: Maximum backlog in packets, at most the ring capacity
+            policy: 'drop_oldest', 'conflate' or 'disconnect'
+
+        Raises:
+            ValueError: If the policy is unknown or max_queue out of range
+        """
+        if policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {policy}")
+        if not 1 <= max_queue <= broadcaster.ring.capacity:
+            raise ValueError(f"Queue size must be 1-{broadcaster.ring.capacity} "
+                             f"packets")
+        self.broadcaster = broadcaster
+        self.max_queue = max_queue
+        self.policy = policy
+        self.cursor = broadcaster.head_seq
+        self.dropped = 0
+        self.bytes_written = 0  # Every byte written to the client's socket
+        self.lag = 0.0  # Last value returned by get_lag
+        # (byte offset after the write, publish time of its oldest packet)
+        self._writes: Deque[Tuple[int, float]] = deque()
+
+    def follow(self, broadcaster: BroadcastModel) -> None:
+        """
+        Switch to another broadcast published in lockstep with this one.
+
+        The cursor is kept, so the subscriber continues with the other
+        broadcast's packet for the same samples.
+
+        Args:
+            broadcaster: Broadcast with the same capacity and sequence numbers
+        """
+        self.broadcaster = broadcaster
+
+    def backlog(self) -> int:
+        """
+        Get the number of published packets not yet taken.
+
+        Returns:
+            int: Backlog in packets
+        """
+        return self.broadcaster.head_seq - self.cursor
+
+    async def wait(self) -> None:
+        """Wait until the backlog is not empty."""
+        await self.broadcaster.wait_for(self.cursor)
+
+    def trim(self) -> int:
+        """
+        Apply the overflow policy to the backlog.
+
+        Returns:
+            int: Number of packets dropped
+
+        Raises:
+            SlowConsumerError: If the backlog overflowed under 'disconnect'
+        """
+        backlog = self.backlog()
+        if backlog <= self.max_queue:
+            return 0
+        if self.policy == POLICY_DISCONNECT:
+            raise SlowConsumerError(f"{backlog} packets behind")
+        keep = 1 if self.policy == POLICY_CONFLATE else self.max_queue
+        self.dropped += backlog - keep
+        self.cursor = self.broadcaster.head_seq - keep
+        return backlog - keep
+
+    def take(self, rewrite: Optional[Callable[[int, List[bytes]], List[bytes]]] = None
+             ) -> List[bytes]:
+        """
+        Take the backlog for sending, applying the overflow policy.
+
+        Args:
+            rewrite: Optional function of the first packet's sequence
+                number and the packets, returning the packets to write
+                instead, e.g. re-encoded for this client; byte counts and
+                lag follow what it returns
+
+        Returns:
+            List[bytes]: Packets to write, oldest first
+
+        Raises:
+            SlowConsumerError: If the backlog overflowed under 'disconnect'
+        """
+        self.trim()
+        packets, self.cursor, skipped = self.broadcaster.read_from(self.cursor)
+        self.dropped += skipped
+        first = self.cursor - len(packets)
+        if packets and rewrite is not None:
+            packets = rewrite(first, packets)
+        if packets:
+            self.bytes_written += sum(map(len, packets))
+            self._writes.append((self.bytes_written,
+                                 self.broadcaster.get_publish_time(first)))
+        return packets
+
+    def count_bytes(self, size: int) -> None:
+        """
+        Count bytes written to the client's socket outside the stream.
+
+        Args:
+            size: Bytes written
+        """
+        self.bytes_written += size
+
+    def get_lag(self, unsent_bytes: int = 0, now: Optional[float] = None) -> float:
+        """
+        Measure the age of the oldest packet the client has not received.
+
+        Args:
+            unsent_bytes: Bytes written but still queued in socket buffers
+            now: Current time.monotonic()
+
+        Returns:
+            float: Lag in seconds, 0.0 when fully caught up
+        """
+        now = time.monotonic() if now is None else now
+        sent = self.bytes_written - unsent_bytes
+        while self._writes and self._writes[0][0] <= sent:
+            self._writes.popleft()
+        if self._writes:
+            self.lag = now - self._writes[0][1]
+        elif self.cursor < self.broadcaster.head_seq:
+            self.lag = now - self.broadcaster.get_publish_time(self.cursor)
+        else:
+            self.lag = 0.0
+        return self.lag
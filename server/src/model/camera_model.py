@@ -7,17 +7,36 @@ Handles camera configuration and process management.
 import json
 import logging
 import subprocess
+import threading
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 # Third-party imports
 
 # Local application imports
+from .process_model import StderrDrain
 
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Image settings libcamera can take on a capture restart alone
+LIVE_SETTINGS = frozenset({'shutter', 'gain', 'awb_red', 'awb_blue', 'contrast',
+                           'brightness'})
+
+# Stream settings; all but the encoder rate controls need a full restart
+PIPELINE_SETTINGS = frozenset({'device', 'width', 'height', 'framerate', 'codec',
+                               'rtsp_url', 'bitrate', 'gop'})
+
+# Stream settings only libcamera uses, applied with a capture restart
+CAPTURE_STREAM_SETTINGS = frozenset({'bitrate', 'gop'})
+
+# Bytes moved per read from libcamera to ffmpeg
+RELAY_CHUNK_SIZE = 65536
+
+# Seconds to wait for a terminated process before killing it
+PROCESS_STOP_TIMEOUT = 2.0
+
 
 class CameraConfigurationError(Exception):
     """Raised when camera configuration fails."""
@@ -31,33 +50,45 @@ class CameraProcessError(Exception):
 
 class CameraModel:
     """
-    Manages camera settings and streaming processes.
+    Manages settings and streaming processes of one camera.
     
-    Implements singleton pattern to ensure only one camera instance.
     Handles libcamera and ffmpeg process management for RTSP streaming.
+    Several instances may run side by side, one per capture device.
+    
+    libcamera output is relayed into a long-lived ffmpeg publisher, so
+    image settings are applied by restarting only the capture process
+    while the RTSP session stays up. Stream settings such as resolution
+    or codec restart the whole pipeline.
     """
     
-    _instance = None
-    _initialized = False
-
-    def __new__(cls):
+    def __init__(self, index: int = 0, stream_config: Optional[Dict[str, Any]] = None,
+                 settings: Optional[Dict[str, Any]] = None):
         """
-        Create singleton instance.
+        Initialize camera model.
         
-        Returns:
-            CameraModel: The singleton camera model instance
+        Args:
+            index: Camera index, also the default libcamera device number
+            stream_config: Optional stream configuration overriding defaults
+            settings: Optional image settings overriding defaults
         """
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-
-    def __init__(self):
-        """Initialize camera model with default settings."""
-        if not CameraModel._initialized:
-            self.settings = self._load_default_settings()
-            self.libcamera_proc: Optional[subprocess.Popen] = None
-            self.ffmpeg_proc: Optional[subprocess.Popen] = None
-            CameraModel._initialized = True
+        self.index = index
+        self.name = f"camera{index}"
+        self.settings = self._load_default_settings()
+        self.settings.update(settings or {})
+        self.stream_config = self._load_default_stream_config()
+        self.stream_config.update({key: value
+                                   for key, value in (stream_config or {}).items()
+                                   if key in PIPELINE_SETTINGS})
+        self.libcamera_proc: Optional[subprocess.Popen] = None
+        self.ffmpeg_proc: Optional[subprocess.Popen] = None
+        self._relay_thread: Optional[threading.Thread] = None
+        self.libcamera_drain: Optional[StderrDrain] = None
+        self.ffmpeg_drain: Optional[StderrDrain] = None
+        self.relay_bytes = 0
+        self.last_relay_time: Optional[float] = None
+        self._lock = threading.RLock()
+        self.capture_restarts = 0
+        self.pipeline_restarts = 0
 
     def _load_default_settings(self) -> Dict[str, Any]:
         """
@@ -75,6 +106,41 @@ class CameraModel:
             'brightness': 0.0
         }
 
+    def _load_default_stream_config(self) -> Dict[str, Any]:
+        """
+        Load default stream configuration.
+        
+        The first camera publishes on the original ES_MTX path; further
+        cameras get their index appended.
+        
+        Returns:
+            Dict[str, Any]: Default device, resolution, framerate, codec and RTSP URL
+        """
+        path = "ES_MTX" if self.index == 0 else f"ES_MTX_{self.index}"
+        return {
+            'device': self.index,
+            'width': 640,
+            'height': 480,
+            'framerate': 24,
+            'codec': 'h264',
+            'bitrate': None,
+            'gop': None,
+            'rtsp_url': f'rtsp://localhost:8554/{path}'
+        }
+
+    def configure_stream(self, stream_config: Dict[str, Any]) -> None:
+        """
+        Set stream configuration, e.g. from the server config camera section.
+        
+        Unknown keys are ignored. Takes effect on the next start, or restarts
+        the pipeline if streaming is already running.
+        
+        Args:
+            stream_config: Stream configuration values
+        """
+        self.update_settings({key: value for key, value in stream_config.items()
+                              if key in PIPELINE_SETTINGS})
+
     def load_settings(self, config_path: str) -> None:
         """
         Load camera settings from configuration file.
@@ -124,16 +190,24 @@ class CameraModel:
         Returns:
             list[str]: Complete libcamera-vid command
         """
-        return [
+        stream = self.stream_config
+        command = [
             "libcamera-vid",
             "-t", "0",
-            "--width", "640",
-            "--height", "480",
-            "--framerate", "24",
-            "--codec", "h264",
-            "--inline",
-            "--profile", "baseline",
-            "--level", "4.2",
+            "--camera", str(stream['device']),
+            "--width", str(stream['width']),
+            "--height", str(stream['height']),
+            "--framerate", str(stream['framerate']),
+            "--codec", stream['codec']
+        ]
+        if stream['codec'] == 'h264':
+            # Inline headers let ffmpeg pick up a restarted capture
+            command += ["--inline", "--profile", "baseline", "--level", "4.2"]
+        if stream.get('bitrate'):
+            command += ["--bitrate", str(stream['bitrate'])]
+        if stream.get('gop'):
+            command += ["--intra", str(stream['gop'])]
+        return command + [
             "--vflip",
             "--nopreview",
             "--shutter", str(self.settings['shutter']),
@@ -151,20 +225,31 @@ class CameraModel:
         Returns:
             list[str]: Complete ffmpeg command
         """
+        stream = self.stream_config
+        input_format = "h264" if stream['codec'] == 'h264' else "mjpeg"
         return [
             "ffmpeg",
             "-fflags", "nobuffer",
             "-flags", "low_delay",
             "-probesize", "32",
             "-analyzeduration", "0",
-            "-r", "24",
-            "-f", "h264",
+            "-r", str(stream['framerate']),
+            "-f", input_format,
             "-i", "-",
             "-c:v", "copy",
             "-f", "rtsp",
-            "rtsp://localhost:8554/ES_MTX"
+            stream['rtsp_url']
         ]
 
+    def is_streaming(self) -> bool:
+        """
+        Check whether the ffmpeg publisher is running.
+        
+        Returns:
+            bool: True if the RTSP publisher process is alive
+        """
+        return self.ffmpeg_proc is not None and self.ffmpeg_proc.poll() is None
+
     def start_camera(self) -> None:
         """
         Start camera streaming processes.
@@ -172,52 +257,242 @@ class CameraModel:
         Raises:
             CameraProcessError: If camera processes fail to start
         """
+        with self._lock:
+            try:
+                logger.info(f"Starting {self.name} streaming")
+                self.ffmpeg_proc = subprocess.Popen(
+                    self.get_ffmpeg_command(),
+                    stdin=subprocess.PIPE,
+                    stderr=subprocess.PIPE
+                )
+                self.ffmpeg_drain = StderrDrain(self.ffmpeg_proc.stderr,
+                                                f"{self.name}-ffmpeg")
+                self._start_capture()
+                logger.info(f"{self.name} streaming started at "
+                            f"{self.stream_config['rtsp_url']}")
+            except OSError as e:
+                logger.error(f"Failed to start {self.name} processes: {e}")
+                self.stop_camera()
+                raise CameraProcessError(f"Failed to start camera: {e}")
+
+    def _start_capture(self) -> None:
+        """
+        Start libcamera and relay its output into the running ffmpeg.
+        
+        Raises:
+            OSError: If libcamera cannot be started
+        """
+        self.libcamera_proc = subprocess.Popen(
+            self.get_camera_command(),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        self.libcamera_drain = StderrDrain(self.libcamera_proc.stderr,
+                                           f"{self.name}-libcamera")
+        self.last_relay_time = time.monotonic()
+        self._relay_thread = threading.Thread(
+            target=self._relay_capture,
+            args=(self.libcamera_proc.stdout, self.ffmpeg_proc.stdin),
+            name=f"{self.name}-relay",
+            daemon=True
+        )
+        self._relay_thread.start()
+
+    def _relay_capture(self, source, sink) -> None:
+        """
+        Copy encoded video from libcamera to ffmpeg until the capture ends.
+        
+        Args:
+            source: libcamera stdout pipe
+            sink: ffmpeg stdin pipe
+        """
         try:
-            logger.info("Starting camera streaming")
-            self.libcamera_proc = subprocess.Popen(
-                self.get_camera_command(), 
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            self.ffmpeg_proc = subprocess.Popen(
-                self.get_ffmpeg_command(), 
-                stdin=self.libcamera_proc.stdout,
-                stderr=subprocess.PIPE
-            )
-            logger.info("Camera streaming started successfully")
-        except OSError as e:
-            logger.error(f"Failed to start camera processes: {e}")
-            raise CameraProcessError(f"Failed to start camera: {e}")
+            while True:
+                chunk = source.read1(RELAY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                sink.write(chunk)
+                sink.flush()
+                self.relay_bytes += len(chunk)
+                self.last_relay_time = time.monotonic()
+        except (OSError, ValueError) as e:
+            # ffmpeg exited or its stdin was closed during shutdown
+            logger.debug(f"Camera relay stopped: {e}")
+        finally:
+            source.close()
+
+    def _stop_process(self, proc: Optional[subprocess.Popen], name: str,
+                      drain: Optional[StderrDrain] = None) -> None:
+        """
+        Terminate a process and wait for it, killing it if it hangs.
+        
+        Args:
+            proc: Process to stop
+            name: Process name for logging
+            drain: Stderr drain to join once the process has exited
+        """
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=PROCESS_STOP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                logger.warning(f"{self.name} {name} did not exit, killing it")
+                proc.kill()
+                proc.wait()
+            logger.debug(f"Terminated {name} process")
+        if drain is not None:
+            drain.join(timeout=PROCESS_STOP_TIMEOUT)
+
+    def _stop_capture(self) -> None:
+        """Stop libcamera and wait for the relay to drain."""
+        self._stop_process(self.libcamera_proc, "libcamera", self.libcamera_drain)
+        if self._relay_thread is not None:
+            self._relay_thread.join(timeout=PROCESS_STOP_TIMEOUT)
+            self._relay_thread = None
+        self.libcamera_proc = None
 
     def stop_camera(self) -> None:
         """Stop camera streaming processes."""
-        try:
-            if self.libcamera_proc:
-                self.libcamera_proc.terminate()
-                logger.debug("Terminated libcamera process")
-            if self.ffmpeg_proc:
-                self.ffmpeg_proc.terminate()
-                logger.debug("Terminated ffmpeg process")
-            logger.info("Camera streaming stopped")
-        except Exception as e:
-            logger.error(f"Error stopping camera processes: {e}")
+        with self._lock:
+            try:
+                self._stop_capture()
+                if self.ffmpeg_proc:
+                    try:
+                        self.ffmpeg_proc.stdin.close()
+                    except OSError:
+                        pass
+                    self._stop_process(self.ffmpeg_proc, "ffmpeg", self.ffmpeg_drain)
+                    self.ffmpeg_proc = None
+                logger.info(f"{self.name} streaming stopped")
+            except Exception as e:
+                logger.error(f"Error stopping camera processes: {e}")
+
+    def get_failed_processes(self) -> List[str]:
+        """
+        Poll the pipeline processes, reaping any that have exited.
+        
+        Returns:
+            List[str]: Names of processes that are no longer running, with
+            ffmpeg first since it takes libcamera down with it
+        """
+        with self._lock:
+            failed = []
+            processes = (("ffmpeg", self.ffmpeg_proc, self.ffmpeg_drain),
+                         ("libcamera", self.libcamera_proc, self.libcamera_drain))
+            for name, proc, drain in processes:
+                if proc is None:
+                    failed.append(name)
+                elif proc.poll() is not None:
+                    logger.warning(f"{self.name} {name} exited with code "
+                                   f"{proc.returncode}")
+                    if drain is not None and drain.get_tail():
+                        logger.warning(f"Last {self.name} {name} output:\n"
+                                       f"{drain.get_tail()}")
+                    failed.append(name)
+            return failed
+
+    def get_relay_idle_time(self) -> float:
+        """
+        Get seconds since libcamera last produced video.
+        
+        Returns:
+            float: Idle seconds, 0.0 if the capture is not running
+        """
+        if self.last_relay_time is None or self.libcamera_proc is None:
+            return 0.0
+        return time.monotonic() - self.last_relay_time
+
+    def get_pipeline_stats(self) -> Dict[str, Any]:
+        """
+        Get process IDs and stderr statistics of the pipeline.
+        
+        Returns:
+            Dict[str, Any]: Per-process status plus relayed byte count
+        """
+        stats: Dict[str, Any] = {'relay_bytes': self.relay_bytes}
+        processes = (("ffmpeg", self.ffmpeg_proc, self.ffmpeg_drain),
+                     ("libcamera", self.libcamera_proc, self.libcamera_drain))
+        for name, proc, drain in processes:
+            entry: Dict[str, Any] = {
+                'pid': proc.pid if proc is not None else None,
+                'alive': proc is not None and proc.poll() is None
+            }
+            if drain is not None:
+                entry.update(drain.get_stats())
+            stats[name] = entry
+        return stats
+
+    def restart_capture(self) -> None:
+        """
+        Restart only libcamera so new image settings take effect.
+        
+        The ffmpeg publisher and its RTSP session keep running; viewers see
+        a short freeze until the next inline keyframe instead of a reconnect.
+        
+        Raises:
+            CameraProcessError: If libcamera fails to start
+        """
+        with self._lock:
+            if not self.is_streaming():
+                self.start_camera()
+                return
+            self._stop_capture()
+            try:
+                self._start_capture()
+            except OSError as e:
+                logger.error(f"Failed to restart capture: {e}")
+                raise CameraProcessError(f"Failed to restart capture: {e}")
+            self.capture_restarts += 1
+            logger.info(f"{self.name} capture restarted with new settings")
+
+    def restart_pipeline(self) -> None:
+        """
+        Restart libcamera and ffmpeg, dropping the RTSP session.
+        
+        Raises:
+            CameraProcessError: If the processes fail to start
+        """
+        with self._lock:
+            self.stop_camera()
+            self.start_camera()
+            self.pipeline_restarts += 1
+            logger.info(f"{self.name} streaming pipeline restarted")
 
     def update_settings(self, new_settings: Dict[str, Any]) -> None:
         """
-        Update camera settings and restart streaming.
+        Update camera settings with the least disruptive restart.
+        
+        Unchanged values are ignored. Image settings, bitrate and GOP restart
+        only the capture process; other stream settings restart the whole
+        pipeline. Nothing is restarted while streaming is stopped.
         
         Args:
-            new_settings: Dictionary with new camera settings
+            new_settings: Dictionary with new camera or stream settings
             
         Raises:
             CameraConfigurationError: If settings update fails
         """
         try:
-            logger.info(f"Updating camera settings: {new_settings}")
-            self.settings.update(new_settings)
-            self.stop_camera()
-            time.sleep(0.5)  # Wait for processes to close
-            self.start_camera()
+            with self._lock:
+                live = {key: value for key, value in new_settings.items()
+                        if key not in PIPELINE_SETTINGS
+                        and self.settings.get(key) != value}
+                pipeline = {key: value for key, value in new_settings.items()
+                            if key in PIPELINE_SETTINGS
+                            and self.stream_config.get(key) != value}
+                if not live and not pipeline:
+                    logger.debug("Camera settings unchanged")
+                    return
+
+                logger.info(f"Updating {self.name} settings: {dict(live, **pipeline)}")
+                self.settings.update(live)
+                self.stream_config.update(pipeline)
+                if not self.is_streaming():
+                    return
+                if set(pipeline) - CAPTURE_STREAM_SETTINGS:
+                    self.restart_pipeline()
+                else:
+                    self.restart_capture()
             logger.info("Camera settings updated successfully")
         except Exception as e:
             logger.error(f"Failed to update camera settings: {e}")
@@ -0,0 +1,260 @@
+"""
+Camera Pool Model Module
+Manages independent streaming pipelines for several cameras by index.
+"""
+
+# Standard library imports
+import logging
+from concurrent.futures import Future
+from typing import Any, Dict, Iterator, List, Optional
+
+# Third-party imports
+
+# Local application imports
+from .camera_model import CameraModel
+from .command_model import CameraCommandQueue
+from .profile_model import AdaptiveQualityController
+from .supervisor_model import CameraSupervisor
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class CameraPoolError(Exception):
+    """Raised when a camera index is not part of the pool."""
+    pass
+
+
+class CameraPipeline:
+    """
+    One camera with its own supervisor, command queue and profile control.
+    """
+
+    def __init__(self, camera: CameraModel,
+                 supervisor_options: Optional[Dict[str, Any]] = None,
+                 command_interval: float = 0.5,
+                 quality: Optional[AdaptiveQualityController] = None):
+        """
+        Initialize camera pipeline.
+
+        Args:
+            camera: Camera model owning the streaming processes
+            supervisor_options: Keyword arguments for CameraSupervisor
+            command_interval: Minimum seconds between applied setting changes
+            quality: Optional profile controller (default profiles, adaptive off)
+        """
+        self.camera = camera
+        self.supervisor = CameraSupervisor(camera, **(supervisor_options or {}))
+        self.commands = CameraCommandQueue(camera, min_interval=command_interval)
+        self.quality = quality or AdaptiveQualityController()
+
+    def select_profile(self, profile_index: int) -> Future:
+        """
+        Switch to an encoding profile and turn adaptive quality off.
+
+        Args:
+            profile_index: Profile index
+
+        Returns:
+            Future: Resolves once the profile has been applied
+
+        Raises:
+            ProfileError: If the profile does not exist
+        """
+        settings = self.quality.select(profile_index)
+        if self.quality.adaptive:
+            self.quality.set_adaptive(False)
+        return self.commands.submit(settings)
+
+    def report_quality(self, client: Any, decode_fps: float, dropped: int,
+                       decoded: int) -> Optional[Future]:
+        """
+        Feed a client quality report to the adaptive controller.
+
+        Args:
+            client: Client identifier
+            decode_fps: Frames the client decoded per second
+            dropped: Frames dropped since the previous report
+            decoded: Frames decoded since the previous report
+
+        Returns:
+            Optional[Future]: Profile change in progress, or None
+        """
+        new_index = self.quality.report(client, decode_fps, dropped, decoded)
+        if new_index is None:
+            return None
+        return self.commands.submit(self.quality.get_stream_settings(new_index))
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get camera settings and pipeline health.
+
+        Returns:
+            Dict[str, Any]: Index, RTSP URL, settings and supervisor status
+        """
+        status = {
+            'index': self.camera.index,
+            'rtsp_url': self.camera.stream_config['rtsp_url'],
+            'settings': self.camera.get_settings()
+        }
+        status.update(self.supervisor.get_status())
+        status['commands'] = self.commands.get_stats()
+        status['quality'] = self.quality.get_state()
+        return status
+
+
+class CameraPool:
+    """
+    Collection of camera pipelines addressed by index.
+
+    Each camera runs its own libcamera/ffmpeg pipeline, RTSP path,
+    supervisor and command queue, so cameras fail, restart and change
+    settings independently of one another.
+    """
+
+    def __init__(self, camera_configs: Optional[List[Dict[str, Any]]] = None,
+                 supervisor_options: Optional[Dict[str, Any]] = None,
+                 command_interval: float = 0.5,
+                 profiles: Optional[List[Dict[str, Any]]] = None,
+                 adaptive_options: Optional[Dict[str, Any]] = None):
+        """
+        Initialize camera pool.
+
+        Args:
+            camera_configs: Per-camera stream configuration; may carry a
+                'default_settings' dict, a 'profile' name whose settings
+                take precedence and an 'adaptive' flag. One default camera
+                if omitted.
+            supervisor_options: Keyword arguments for every CameraSupervisor
+            command_interval: Minimum seconds between applied setting changes
+            profiles: Encoding profiles from lowest to highest quality
+            adaptive_options: Keyword arguments for every AdaptiveQualityController
+
+        Raises:
+            ProfileError: If a configured profile does not exist
+        """
+        self.pipelines: List[CameraPipeline] = []
+        for index, camera_config in enumerate(camera_configs or [{}]):
+            quality = AdaptiveQualityController(
+                profiles, adaptive=camera_config.get('adaptive', False),
+                **(adaptive_options or {})
+            )
+            stream_config = dict(camera_config)
+            if camera_config.get('profile'):
+                quality.active = quality.find(camera_config['profile'])
+                stream_config.update(quality.get_stream_settings())
+            camera = CameraModel(index, stream_config,
+                                 camera_config.get('default_settings'))
+            self.pipelines.append(
+                CameraPipeline(camera, supervisor_options, command_interval, quality)
+            )
+        logger.info(f"Camera pool created with {len(self.pipelines)} camera(s)")
+
+    def __len__(self) -> int:
+        """
+        Get the number of cameras.
+
+        Returns:
+            int: Camera count
+        """
+        return len(self.pipelines)
+
+    def __iter__(self) -> Iterator[CameraPipeline]:
+        """
+        Iterate over camera pipelines in index order.
+
+        Returns:
+            Iterator[CameraPipeline]: Pipelines
+        """
+        return iter(self.pipelines)
+
+    def get(self, index: int) -> CameraPipeline:
+        """
+        Get the pipeline of a camera.
+
+        Args:
+            index: Camera index
+
+        Returns:
+            CameraPipeline: Pipeline of the camera
+
+        Raises:
+            CameraPoolError: If no camera has this index
+        """
+        if not 0 <= index < len(self.pipelines):
+            raise CameraPoolError(f"No camera with index {index}")
+        return self.pipelines[index]
+
+    def get_camera(self, index: int) -> CameraModel:
+        """
+        Get the camera model of a camera.
+
+        Args:
+            index: Camera index
+
+        Returns:
+            CameraModel: Camera model
+
+        Raises:
+            CameraPoolError: If no camera has this index
+        """
+        return self.get(index).camera
+
+    def start_cameras(self) -> None:
+        """Start streaming on every camera; failures are logged per camera."""
+        for pipeline in self.pipelines:
+            try:
+                pipeline.camera.start_camera()
+            except Exception as e:
+                logger.error(f"Failed to start {pipeline.camera.name} streaming: {e}")
+
+    def stop_cameras(self) -> None:
+        """Stop streaming on every camera."""
+        for pipeline in self.pipelines:
+            pipeline.camera.stop_camera()
+
+    def start_supervisors(self) -> None:
+        """Start health checks on every camera."""
+        for pipeline in self.pipelines:
+            pipeline.supervisor.start()
+
+    def stop_supervisors(self) -> None:
+        """Stop health checks on every camera."""
+        for pipeline in self.pipelines:
+            pipeline.supervisor.stop()
+
+    def start_commands(self) -> None:
+        """Start the command worker of every camera."""
+        for pipeline in self.pipelines:
+            pipeline.commands.start()
+
+    def stop_commands(self) -> None:
+        """Stop the command worker of every camera."""
+        for pipeline in self.pipelines:
+            pipeline.commands.stop()
+
+    def submit(self, index: int, settings: Dict[str, Any]) -> Future:
+        """
+        Queue a settings change for one camera.
+
+        Args:
+            index: Camera index
+            settings: Camera or stream settings to change
+
+        Returns:
+            Future: Resolves to the camera settings once applied
+
+        Raises:
+            CameraPoolError: If no camera has this index
+        """
+        return self.get(index).commands.submit(settings)
+
+    def get_status(self) -> List[Dict[str, Any]]:
+        """
+        Get the status of every camera.
+
+        Returns:
+            List[Dict[str, Any]]: Per-camera status in index order
+        """
+        return [pipeline.get_status() for pipeline in self.pipelines]
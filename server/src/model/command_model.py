@@ -0,0 +1,175 @@
+"""
+Command Model Module
+Serialises camera setting changes through a single coalescing worker.
+"""
+
+# Standard library imports
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+# Third-party imports
+
+# Local application imports
+from .camera_model import CameraModel
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class CameraCommandError(Exception):
+    """Raised when a camera command cannot be applied."""
+    pass
+
+
+class CameraCommandQueue:
+    """
+    Single worker thread that applies camera setting changes.
+
+    Updates submitted while the worker is busy or rate limited are merged
+    into one pending change, later values winning, so a burst of slider
+    moves costs one camera restart. Changes are applied at most once per
+    min_interval. Every submitter gets a Future that resolves to the
+    settings in effect after the merged change was applied.
+    """
+
+    def __init__(self, camera: CameraModel, min_interval: float = 0.5):
+        """
+        Initialize camera command queue.
+
+        Args:
+            camera: Camera model the changes are applied to
+            min_interval: Minimum seconds between two applied changes
+        """
+        self.camera = camera
+        self.min_interval = min_interval
+        self.submitted = 0
+        self.applied = 0
+        self._pending: Dict[str, Any] = {}
+        self._waiters: List[Future] = []
+        self._last_apply = float('-inf')
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name=f"{self.camera.name}-commands", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"{self.camera.name} command queue started")
+
+    def is_running(self) -> bool:
+        """
+        Check whether the worker thread is accepting changes.
+
+        Returns:
+            bool: True if started and not stopping
+        """
+        return self._thread is not None and not self._stopping
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop the worker and fail any changes not yet applied.
+
+        Args:
+            timeout: Maximum seconds to wait for a change in progress
+        """
+        with self._condition:
+            self._stopping = True
+            waiters, self._waiters = self._waiters, []
+            self._pending = {}
+            self._condition.notify()
+        for future in waiters:
+            future.set_exception(CameraCommandError("Camera command queue stopped"))
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        logger.info(f"{self.camera.name} command queue stopped")
+
+    def submit(self, settings: Dict[str, Any]) -> Future:
+        """
+        Queue a settings change.
+
+        Args:
+            settings: Camera or stream settings to change
+
+        Returns:
+            Future: Resolves to the settings in effect once applied, or
+            raises the error that prevented the change
+        """
+        future: Future = Future()
+        with self._condition:
+            if self._stopping or self._thread is None:
+                future.set_exception(
+                    CameraCommandError("Camera command queue not running"))
+                return future
+            self._pending.update(settings)
+            self._waiters.append(future)
+            self.submitted += 1
+            self._condition.notify()
+        return future
+
+    def _run(self) -> None:
+        """Apply merged changes until stopped."""
+        while True:
+            with self._condition:
+                while not self._waiters and not self._stopping:
+                    self._condition.wait()
+                # Rate limit; anything arriving meanwhile joins this change
+                while not self._stopping:
+                    remaining = self._last_apply + self.min_interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._stopping:
+                    return
+                settings, self._pending = self._pending, {}
+                waiters, self._waiters = self._waiters, []
+
+            self._apply(settings, waiters)
+
+    def _apply(self, settings: Dict[str, Any], waiters: List[Future]) -> None:
+        """
+        Apply one merged change and resolve its futures.
+
+        Args:
+            settings: Merged settings change
+            waiters: Futures of every request merged into the change
+        """
+        if len(waiters) > 1:
+            logger.info(f"Applying {len(waiters)} coalesced {self.camera.name} "
+                        f"setting changes")
+        try:
+            self.camera.update_settings(settings)
+            result = self.camera.get_settings()
+        except Exception as e:
+            for future in waiters:
+                future.set_exception(e)
+        else:
+            for future in waiters:
+                future.set_result(result)
+        finally:
+            self._last_apply = time.monotonic()
+            self.applied += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get request and apply counters.
+
+        Returns:
+            Dict[str, int]: Submitted requests, applied changes and the
+            number of requests merged away
+        """
+        return {
+            'submitted': self.submitted,
+            'applied': self.applied,
+            'coalesced': self.submitted - self.applied - len(self._waiters)
+        }
@@ -0,0 +1,103 @@
+"""
+Deadband Model Module
+Change-only filtering of a client's data stream with periodic keepalives.
+"""
+
+# Standard library imports
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Third-party imports
+
+# Local application imports
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MAX_DEADBAND = 0xFF  # Values are one byte
+MAX_KEEPALIVE_MS = 0xFFFF
+
+
+class DeadbandFilter:
+    """
+    Passes only the samples of a stream that a change-only client needs.
+
+    A sample is passed when its value differs from the last passed value
+    by more than the deadband, or when keepalive_ms have elapsed, in
+    sample time, since the last passed sample. Every suppressed sample is
+    therefore within the deadband of the value last passed before it, so
+    holding each passed value until the next one reconstructs the series
+    to within the deadband, and the keepalive bounds how stale a held
+    value can get. The first sample is always passed.
+    """
+
+    def __init__(self, deadband: int = 0, keepalive_ms: int = 1000):
+        """
+        Initialize deadband filter.
+
+        Args:
+            deadband: Largest value change that is suppressed (0-255)
+            keepalive_ms: Longest gap between passed samples, 0 for none
+
+        Raises:
+            ValueError: If the deadband or keepalive is out of range
+        """
+        if not 0 <= deadband <= MAX_DEADBAND:
+            raise ValueError(f"Deadband must be 0-{MAX_DEADBAND}")
+        if not 0 <= keepalive_ms <= MAX_KEEPALIVE_MS:
+            raise ValueError(f"Keepalive must be 0-{MAX_KEEPALIVE_MS} ms")
+        self.deadband = deadband
+        self.keepalive_ms = keepalive_ms
+        self.last_value: Optional[int] = None
+        self.last_timestamp_ms: Optional[int] = None
+        self.passed = 0
+        self.suppressed = 0
+        self.keepalives = 0  # Passed samples that were within the deadband
+
+    def reset(self) -> None:
+        """Forget the last passed sample, so the next sample is passed."""
+        self.last_value = None
+        self.last_timestamp_ms = None
+
+    def filter(self, samples: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Select the samples to send.
+
+        Args:
+            samples: (value, timestamp_ms) pairs in time order
+
+        Returns:
+            List[Tuple[int, int]]: Samples to send, in time order
+        """
+        passed = []
+        for value, timestamp_ms in samples:
+            if self.last_value is None or abs(value - self.last_value) > self.deadband:
+                pass
+            elif (self.keepalive_ms
+                  and timestamp_ms - self.last_timestamp_ms >= self.keepalive_ms):
+                self.keepalives += 1
+            else:
+                self.suppressed += 1
+                continue
+            passed.append((value, timestamp_ms))
+            self.last_value = value
+            self.last_timestamp_ms = timestamp_ms
+        self.passed += len(passed)
+        return passed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the filter settings and counters.
+
+        Returns:
+            Dict[str, Any]: Deadband, keepalive in ms, passed, suppressed
+            and keepalive sample counts
+        """
+        return {
+            'deadband': self.deadband,
+            'keepalive_ms': self.keepalive_ms,
+            'passed': self.passed,
+            'suppressed': self.suppressed,
+            'keepalives': self.keepalives
+        }
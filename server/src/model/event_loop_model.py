@@ -0,0 +1,160 @@
+"""
+Event Loop Model Module
+Runs the shared asyncio event loop that hosts every TCP server.
+"""
+
+# Standard library imports
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Callable, Coroutine, Optional
+
+# Third-party imports
+
+# Local application imports
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class EventLoopError(Exception):
+    """Raised when the event loop cannot be started or used."""
+    pass
+
+
+class EventLoopModel:
+    """
+    Owns a single asyncio event loop running on a dedicated thread.
+
+    All servers register their listeners and client handlers on this loop,
+    so the number of OS threads no longer grows with the number of clients.
+    """
+
+    def __init__(self, name: str = 'server-event-loop'):
+        """
+        Initialize event loop model.
+
+        Args:
+            name: Name given to the event loop thread
+        """
+        self.name = name
+        self.loop = asyncio.new_event_loop()
+        self.thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+
+    def start(self) -> None:
+        """
+        Start the event loop thread.
+
+        Raises:
+            EventLoopError: If the loop is already closed
+        """
+        if self.loop.is_closed():
+            raise EventLoopError("Event loop has already been closed")
+        if self.thread and self.thread.is_alive():
+            return
+
+        self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self.thread.start()
+        self._started.wait()
+        logger.info("Event loop started")
+
+    def _run(self) -> None:
+        """Run the loop until stopped, then release its resources."""
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._started.set)
+        try:
+            self.loop.run_forever()
+        finally:
+            try:
+                self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            finally:
+                self.loop.close()
+                logger.info("Event loop closed")
+
+    def is_running(self) -> bool:
+        """
+        Check if the event loop thread is running.
+
+        Returns:
+            bool: True if the loop is running, False otherwise
+        """
+        return self.loop.is_running()
+
+    def in_loop_thread(self) -> bool:
+        """
+        Check if the caller runs on the event loop thread.
+
+        Returns:
+            bool: True when called from the loop thread
+        """
+        return self.thread is not None and threading.current_thread() is self.thread
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the loop from any thread.
+
+        Args:
+            coro: Coroutine to run on the loop
+
+        Returns:
+            concurrent.futures.Future: Future holding the coroutine result
+
+        Raises:
+            EventLoopError: If the loop is not running
+        """
+        if not self.is_running():
+            coro.close()
+            raise EventLoopError("Event loop is not running")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, Any],
+            timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the loop and wait for its result.
+
+        Args:
+            coro: Coroutine to run on the loop
+            timeout: Maximum seconds to wait for the result
+
+        Returns:
+            Any: Result of the coroutine
+        """
+        return self.submit(coro).result(timeout)
+
+    def call_soon(self, callback: Callable[..., Any], *args: Any) -> None:
+        """
+        Schedule a plain callback on the loop from any thread.
+
+        Args:
+            callback: Callable to invoke on the loop thread
+            *args: Positional arguments for the callback
+        """
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Cancel all pending tasks and stop the loop thread.
+
+        Args:
+            timeout: Maximum seconds to wait for the thread to finish
+        """
+        if not self.is_running():
+            return
+        try:
+            self.run(self._cancel_pending_tasks(), timeout)
+        except Exception as e:
+            logger.error(f"Error cancelling event loop tasks: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if self.thread and not self.in_loop_thread():
+            self.thread.join(timeout)
+
+    async def _cancel_pending_tasks(self) -> None:
+        """Cancel every task except the caller and wait for them to finish."""
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,161 @@
+"""
+History Model Module
+Keeps the most recent samples in a preallocated ring for backfill requests.
+"""
+
+# Standard library imports
+import logging
+import struct
+from itertools import starmap
+from typing import List, Optional, Tuple
+
+# Third-party imports
+
+# Local application imports
+from protocol import codec
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SAMPLE_SIZE = codec.SAMPLE_SIZE
+# Timestamp field of a packed sample, after the value byte
+_TIMESTAMP_STRUCT = struct.Struct('>Q')
+_TIMESTAMP_OFFSET = 1
+
+
+class SampleHistory:
+    """
+    Fixed-capacity ring of the latest samples in wire layout.
+
+    Samples are packed once into a buffer allocated up front, so keeping
+    history costs no allocation per sample and a backfill answer is a
+    copy of one or two slices, ready to go out as packet payload.
+    Samples are addressed by index, the count of samples appended before
+    them; samples older than the capacity are overwritten.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize sample history.
+
+        Args:
+            capacity: Maximum number of samples retained
+
+        Raises:
+            ValueError: If capacity is not positive
+        """
+        if capacity <= 0:
+            raise ValueError("History capacity must be positive")
+        self.capacity = capacity
+        self._buffer = bytearray(capacity * SAMPLE_SIZE)
+        self.head = 0
+
+    @property
+    def tail(self) -> int:
+        """
+        Get the index of the oldest sample still held.
+
+        Returns:
+            int: Oldest available index
+        """
+        return max(0, self.head - self.capacity)
+
+    def __len__(self) -> int:
+        return self.head - self.tail
+
+    def append(self, samples: List[Tuple[int, int]]) -> None:
+        """
+        Append samples, overwriting the oldest once full.
+
+        Args:
+            samples: (value, timestamp_ms) pairs in time order
+        """
+        if len(samples) > self.capacity:
+            self.head += len(samples) - self.capacity
+            samples = samples[-self.capacity:]
+        data = b''.join(starmap(codec.SAMPLE_STRUCT.pack, samples))
+        offset = (self.head % self.capacity) * SAMPLE_SIZE
+        first = min(len(data), len(self._buffer) - offset)
+        self._buffer[offset:offset + first] = data[:first]
+        self._buffer[:len(data) - first] = data[first:]
+        self.head += len(samples)
+
+    def timestamp(self, index: int) -> int:
+        """
+        Get the timestamp of a held sample.
+
+        Args:
+            index: Sample index between tail and head
+
+        Returns:
+            int: Sample timestamp in milliseconds
+        """
+        offset = (index % self.capacity) * SAMPLE_SIZE + _TIMESTAMP_OFFSET
+        return _TIMESTAMP_STRUCT.unpack_from(self._buffer, offset)[0]
+
+    def find(self, timestamp_ms: int, end: Optional[int] = None) -> int:
+        """
+        Find the first held sample at or after a timestamp.
+
+        Args:
+            timestamp_ms: Timestamp in milliseconds
+            end: Index to search below, the head if omitted
+
+        Returns:
+            int: Index of the first sample not older than timestamp_ms,
+            or end if there is none
+        """
+        low = self.tail
+        high = self.head if end is None else max(low, min(end, self.head))
+        while low < high:
+            middle = (low + high) // 2
+            if self.timestamp(middle) < timestamp_ms:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def read(self, start: int, end: Optional[int] = None) -> bytes:
+        """
+        Copy held samples out in wire layout.
+
+        Args:
+            start: First sample index, clamped to the tail
+            end: Index after the last sample, the head if omitted
+
+        Returns:
+            bytes: Packed (value, timestamp_ms) samples in time order
+        """
+        end = self.head if end is None else min(end, self.head)
+        start = max(start, self.tail)
+        if start >= end:
+            return b''
+        first = (start % self.capacity) * SAMPLE_SIZE
+        last = first + (end - start) * SAMPLE_SIZE
+        if last <= len(self._buffer):
+            return bytes(self._buffer[first:last])
+        return (bytes(self._buffer[first:])
+                + bytes(self._buffer[:last - len(self._buffer)]))
+
+    def select(self, kind: int, value: int, end: Optional[int] = None) -> bytes:
+        """
+        Copy out the samples a backfill request asks for.
+
+        Args:
+            kind: codec.BACKFILL_LAST or codec.BACKFILL_SINCE
+            value: Window in milliseconds, or the newest timestamp_ms the
+                requester already holds
+            end: Index after the last sample to consider, the head if omitted
+
+        Returns:
+            bytes: Packed samples in time order
+        """
+        end = self.head if end is None else min(end, self.head)
+        if end <= self.tail:
+            return b''
+        if kind == codec.BACKFILL_SINCE:
+            start = self.find(value + 1, end)
+        else:
+            start = self.find(self.timestamp(end - 1) - value, end)
+        return self.read(start, end)
@@ -0,0 +1,708 @@
+"""
+Metrics Model Module
+Counters, gauges and histograms exposed in Prometheus text format over HTTP.
+"""
+
+# Standard library imports
+import bisect
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Third-party imports
+
+# Local application imports
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Histogram buckets in seconds, from sub-millisecond sends to multi-second stalls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# (name, type, help, labels, value) sample produced by a collector at scrape time
+CollectedSample = Tuple[str, str, str, Dict[str, str], float]
+
+# JSON-serialisable state of a metric family, exchanged between processes
+FamilySnapshot = Dict[str, Any]
+
+
+class MetricsError(Exception):
+    """Raised when a metric is registered or labelled inconsistently."""
+    pass
+
+
+def _format_value(value: float) -> str:
+    """
+    Format a sample value for the text format.
+
+    Args:
+        value: Sample value
+
+    Returns:
+        str: Formatted value
+    """
+    if value == float('inf'):
+        return '+Inf'
+    if value == float('-inf'):
+        return '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """
+    Format a label set for the text format.
+
+    Args:
+        labels: Label names and values
+
+    Returns:
+        str: '{name="value",...}' or an empty string
+    """
+    if not labels:
+        return ''
+    pairs = []
+    for name, value in labels.items():
+        escaped = (str(value).replace('\\', r'\\').replace('"', r'\"')
+                   .replace('\n', r'\n'))
+        pairs.append(f'{name}="{escaped}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+class CounterValue:
+    """Monotonically increasing value of one counter label set."""
+
+    def __init__(self):
+        """Initialize counter value at zero."""
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """
+        Increase the counter.
+
+        Args:
+            amount: Non-negative increment
+        """
+        with self._lock:
+            self.value += amount
+
+    def get_state(self) -> float:
+        """
+        Get the value for a snapshot.
+
+        Returns:
+            float: Current value
+        """
+        return self.value
+
+    def set_state(self, state: float) -> None:
+        """
+        Restore the value from a snapshot.
+
+        Args:
+            state: Value returned by get_state()
+        """
+        self.value = float(state)
+
+    def samples(self, name: str, labels: Dict[str, str]) -> List[str]:
+        """
+        Render the value as text format lines.
+
+        Args:
+            name: Metric name
+            labels: Label set of this value
+
+        Returns:
+            List[str]: Sample lines
+        """
+        return [f"{name}{_format_labels(labels)} {_format_value(self.value)}"]
+
+
+class GaugeValue(CounterValue):
+    """Value of one gauge label set that may go up and down."""
+
+    def dec(self, amount: float = 1.0) -> None:
+        """
+        Decrease the gauge.
+
+        Args:
+            amount: Decrement
+        """
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        """
+        Set the gauge.
+
+        Args:
+            value: New value
+        """
+        self.value = value
+
+
+class HistogramValue:
+    """Bucketed observations of one histogram label set."""
+
+    def __init__(self, buckets: Sequence[float]):
+        """
+        Initialize empty histogram value.
+
+        Args:
+            buckets: Sorted upper bounds, without +Inf
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value: Observed value
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def get_state(self) -> List[Any]:
+        """
+        Get bucket counts, sum and count for a snapshot.
+
+        Returns:
+            List[Any]: [bucket counts, sum, count]
+        """
+        with self._lock:
+            return [list(self.counts), self.sum, self.count]
+
+    def set_state(self, state: List[Any]) -> None:
+        """
+        Restore the observations from a snapshot.
+
+        Args:
+            state: Value returned by get_state() with the same buckets
+
+        Raises:
+            MetricsError: If the bucket counts do not match the buckets
+        """
+        counts, total, count = state
+        if len(counts) != len(self.counts):
+            raise MetricsError("Histogram snapshot has different buckets")
+        with self._lock:
+            self.counts = [int(bucket_count) for bucket_count in counts]
+            self.sum = float(total)
+            self.count = int(count)
+
+    def samples(self, name: str, labels: Dict[str, str]) -> List[str]:
+        """
+        Render cumulative buckets, sum and count as text format lines.
+
+        Args:
+            name: Metric name
+            labels: Label set of this value
+
+        Returns:
+            List[str]: Sample lines
+        """
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(list(self.buckets) + [float('inf')], counts):
+            cumulative += bucket_count
+            bucket_labels = dict(labels, le=_format_value(bound))
+            lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class Metric:
+    """
+    A named metric family with one value per label set.
+
+    Values are created on first use of a label set by labels() and kept
+    until remove() is called, so callers should bind the returned value
+    once and reuse it on hot paths.
+    """
+
+    TYPE = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize metric family.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels every value carries
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_value(self) -> object:
+        """
+        Create the value of a new label set.
+
+        Returns:
+            object: Value holder
+        """
+        raise NotImplementedError("Subclasses must implement _new_value method")
+
+    def _key(self, labelvalues: Sequence[object]) -> Tuple[str, ...]:
+        """
+        Build the key of a label set.
+
+        Args:
+            labelvalues: Label values in labelnames order
+
+        Returns:
+            Tuple[str, ...]: Label values as strings
+
+        Raises:
+            MetricsError: If the number of values does not match
+        """
+        if len(labelvalues) != len(self.labelnames):
+            raise MetricsError(
+                f"{self.name} expects labels {self.labelnames}, "
+                f"got {len(labelvalues)} values"
+            )
+        return tuple(str(value) for value in labelvalues)
+
+    def labels(self, *labelvalues: object):
+        """
+        Get the value of a label set, creating it on first use.
+
+        Args:
+            *labelvalues: Label values in labelnames order
+
+        Returns:
+            Value holder of the label set
+        """
+        key = self._key(labelvalues)
+        with self._lock:
+            value = self._values.get(key)
+            if value is None:
+                value = self._values[key] = self._new_value()
+            return value
+
+    def remove(self, *labelvalues: object) -> None:
+        """
+        Drop the value of a label set, e.g. of a disconnected client.
+
+        Args:
+            *labelvalues: Label values in labelnames order
+        """
+        key = self._key(labelvalues)
+        with self._lock:
+            self._values.pop(key, None)
+
+    def render(self) -> List[str]:
+        """
+        Render the family as text format lines.
+
+        Returns:
+            List[str]: HELP, TYPE and sample lines
+        """
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} {self.TYPE}"]
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            lines.extend(value.samples(self.name, dict(zip(self.labelnames, key))))
+        return lines
+
+    def snapshot(self) -> FamilySnapshot:
+        """
+        Export the family's values for another process's registry.
+
+        Returns:
+            FamilySnapshot: Name, type, help, label names and the state of
+            every label set
+        """
+        with self._lock:
+            values = list(self._values.items())
+        return {
+            'name': self.name,
+            'type': self.TYPE,
+            'help': self.documentation,
+            'labelnames': list(self.labelnames),
+            'values': [[list(key), value.get_state()] for key, value in values]
+        }
+
+
+class Counter(Metric):
+    """Metric family of monotonically increasing counters."""
+
+    TYPE = 'counter'
+
+    def _new_value(self) -> CounterValue:
+        """
+        Create a counter value.
+
+        Returns:
+            CounterValue: Value at zero
+        """
+        return CounterValue()
+
+
+class Gauge(Metric):
+    """Metric family of values that may go up and down."""
+
+    TYPE = 'gauge'
+
+    def _new_value(self) -> GaugeValue:
+        """
+        Create a gauge value.
+
+        Returns:
+            GaugeValue: Value at zero
+        """
+        return GaugeValue()
+
+
+class Histogram(Metric):
+    """Metric family of bucketed observations."""
+
+    TYPE = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initialize histogram family.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels every value carries
+            buckets: Bucket upper bounds, without +Inf
+
+        Raises:
+            MetricsError: If the buckets are empty or unsorted
+        """
+        super().__init__(name, documentation, labelnames)
+        if not buckets or list(buckets) != sorted(buckets):
+            raise MetricsError(f"{name} needs sorted, non-empty buckets")
+        self.buckets = tuple(buckets)
+
+    def _new_value(self) -> HistogramValue:
+        """
+        Create a histogram value.
+
+        Returns:
+            HistogramValue: Empty histogram
+        """
+        return HistogramValue(self.buckets)
+
+    def snapshot(self) -> FamilySnapshot:
+        """
+        Export the family's values and buckets for another process's registry.
+
+        Returns:
+            FamilySnapshot: Family state including the bucket bounds
+        """
+        return dict(super().snapshot(), buckets=list(self.buckets))
+
+
+class MetricsRegistry:
+    """
+    Collection of metric families rendered together.
+
+    Registering an existing name returns the existing family, so several
+    servers can share one family and tell themselves apart by label.
+    Collectors are called at scrape time for values that already live
+    elsewhere, such as supervisor restart counts. Snapshots of other
+    processes' registries can be merged in with set_remote(), their
+    samples rendered within the families of the same name.
+    """
+
+    def __init__(self):
+        """Initialize empty registry."""
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], Iterable[CollectedSample]]] = []
+        # Source name -> (family snapshots, labels added to their samples)
+        self._remotes: Dict[str, Tuple[List[FamilySnapshot], Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric_class: type, name: str, documentation: str,
+                  labelnames: Sequence[str], **kwargs) -> Metric:
+        """
+        Register a family or return the existing one of that name.
+
+        Args:
+            metric_class: Counter, Gauge or Histogram
+            name: Metric name
+            documentation: Help text
+            labelnames: Label names
+            **kwargs: Extra family arguments
+
+        Returns:
+            Metric: Registered family
+
+        Raises:
+            MetricsError: If the name is taken by a different kind of metric
+        """
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = metric_class(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif (type(metric) is not metric_class
+                  or metric.labelnames != tuple(labelnames)):
+                raise MetricsError(f"Metric {name} already registered differently")
+            return metric
+
+    def counter(self, name: str, documentation: str,
+                labelnames: Sequence[str] = ()) -> Counter:
+        """
+        Register a counter family.
+
+        Args:
+            name: Metric name, conventionally ending in _total
+            documentation: Help text
+            labelnames: Label names
+
+        Returns:
+            Counter: Counter family
+        """
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str,
+              labelnames: Sequence[str] = ()) -> Gauge:
+        """
+        Register a gauge family.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Label names
+
+        Returns:
+            Gauge: Gauge family
+        """
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """
+        Register a histogram family.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Label names
+            buckets: Bucket upper bounds, without +Inf
+
+        Returns:
+            Histogram: Histogram family
+        """
+        return self._register(Histogram, name, documentation, labelnames,
+                              buckets=buckets)
+
+    def add_collector(self, collector: Callable[[], Iterable[CollectedSample]]) -> None:
+        """
+        Add a callable producing samples at scrape time.
+
+        Args:
+            collector: Returns (name, type, help, labels, value) samples
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def snapshot(self) -> List[FamilySnapshot]:
+        """
+        Export every registered family for another process's registry.
+
+        Collector samples are not included.
+
+        Returns:
+            List[FamilySnapshot]: Family states
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return [metric.snapshot() for metric in metrics]
+
+    def set_remote(self, source: str, families: List[FamilySnapshot],
+                   labels: Dict[str, str]) -> None:
+        """
+        Merge another process's snapshot into the rendered metrics.
+
+        Replaces the previous snapshot of the same source.
+
+        Args:
+            source: Name of the process the snapshot comes from
+            families: Snapshot returned by its registry's snapshot()
+            labels: Labels added to every sample, telling the sources apart
+        """
+        with self._lock:
+            self._remotes[source] = (families, dict(labels))
+
+    def remove_remote(self, source: str) -> None:
+        """
+        Stop rendering a source's snapshot, e.g. of a process that exited.
+
+        Args:
+            source: Name given to set_remote()
+        """
+        with self._lock:
+            self._remotes.pop(source, None)
+
+    def _render_remotes(self) -> Dict[str, Tuple[str, str, List[str]]]:
+        """
+        Render the merged snapshots.
+
+        Returns:
+            Dict[str, Tuple[str, str, List[str]]]: Type, help and sample
+            lines by family name
+        """
+        with self._lock:
+            remotes = list(self._remotes.items())
+        rendered: Dict[str, Tuple[str, str, List[str]]] = {}
+        for source, (families, labels) in remotes:
+            try:
+                for family in families:
+                    type_, documentation, lines = rendered.setdefault(
+                        family['name'], (family['type'], family['help'], []))
+                    for key, state in family['values']:
+                        if type_ == Histogram.TYPE:
+                            value = HistogramValue(family['buckets'])
+                        else:
+                            value = GaugeValue()
+                        value.set_state(state)
+                        sample_labels = dict(zip(family['labelnames'], key), **labels)
+                        lines.extend(value.samples(family['name'], sample_labels))
+            except (KeyError, TypeError, ValueError, MetricsError) as e:
+                logger.error(f"Invalid metrics snapshot from {source}: {e}")
+        return rendered
+
+    def render(self) -> str:
+        """
+        Render every family in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        remotes = self._render_remotes()
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+            if metric.name in remotes:
+                lines.extend(remotes.pop(metric.name)[2])
+        for name, (type_, documentation, samples) in remotes.items():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {type_}")
+            lines.extend(samples)
+
+        collected: Dict[str, Tuple[str, str, List[str]]] = {}
+        for collector in collectors:
+            try:
+                for name, type_, documentation, labels, value in collector():
+                    family = collected.setdefault(name, (type_, documentation, []))
+                    family[2].append(f"{name}{_format_labels(labels)} "
+                                     f"{_format_value(value)}")
+            except Exception as e:
+                logger.error(f"Metrics collector failed: {e}")
+        for name, (type_, documentation, samples) in collected.items():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {type_}")
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsHTTPServer:
+    """
+    Serves a registry at /metrics from a background thread.
+
+    Scrapes only read counters, so they never block the event loop that
+    updates them.
+    """
+
+    def __init__(self, registry: MetricsRegistry, host: str = '127.0.0.1',
+                 port: int = 9100):
+        """
+        Initialize metrics HTTP server.
+
+        Args:
+            registry: Registry to expose
+            host: Address to bind; loopback keeps the endpoint local
+            port: TCP port to bind, 0 for any free port
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Bind the port and start serving.
+
+        Raises:
+            MetricsError: If the port cannot be bound
+        """
+        if self._httpd is not None:
+            return
+        registry = self.registry
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            """Answers GET /metrics with the exposition text."""
+
+            def do_GET(self) -> None:
+                """Send the rendered registry or 404."""
+                if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                """Route request logs to the module logger."""
+                logger.debug(f"Metrics request: {format % args}")
+
+        try:
+            self._httpd = ThreadingHTTPServer((self.host, self.port), MetricsHandler)
+        except OSError as e:
+            raise MetricsError(f"Cannot bind metrics endpoint "
+                               f"{self.host}:{self.port}: {e}")
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name='metrics-http', daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Metrics endpoint at http://{self.host}:{self.port}/metrics")
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        if self._httpd is None:
+            return
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+        self._httpd = None
+        self._thread = None
+        logger.info("Metrics endpoint stopped")
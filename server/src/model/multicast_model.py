@@ -0,0 +1,147 @@
+"""
+Multicast Model Module
+Publishes data samples once per batch to a UDP multicast group.
+"""
+
+# Standard library imports
+import ipaddress
+import logging
+import socket
+from typing import Any, Dict, List, Optional, Tuple
+
+# Third-party imports
+
+# Local application imports
+from protocol import codec
+from .metrics_model import MetricsRegistry
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class MulticastError(Exception):
+    """Raised when the multicast group is invalid or cannot be joined."""
+    pass
+
+
+class MulticastPublisher:
+    """
+    Sends data samples to a UDP multicast group.
+
+    Every published batch becomes one datagram carrying a sequence
+    number (ID 0x06), so each sample is sent once whatever the number of
+    viewers and receivers can count the datagrams they missed. Sends
+    never block: a datagram the socket cannot take is counted as an error
+    and its sequence number is skipped.
+    """
+
+    def __init__(self, group: str = '239.255.0.1', port: int = 5004, ttl: int = 1,
+                 interface: str = '0.0.0.0', loopback: bool = True,
+                 metrics: Optional[MetricsRegistry] = None):
+        """
+        Initialize multicast publisher.
+
+        Args:
+            group: IPv4 multicast group address
+            port: Destination UDP port
+            ttl: Multicast time to live, 1 keeps datagrams on the local network
+            interface: Address of the interface to send from, 0.0.0.0 for default
+            loopback: Whether receivers on this host get the datagrams
+            metrics: Optional registry shared with the servers
+
+        Raises:
+            MulticastError: If group is not a multicast address
+        """
+        try:
+            if not ipaddress.IPv4Address(group).is_multicast:
+                raise MulticastError(f"{group} is not a multicast address")
+        except ipaddress.AddressValueError as e:
+            raise MulticastError(f"Invalid multicast group: {e}")
+        self.group = group
+        self.port = port
+        self.ttl = ttl
+        self.interface = interface
+        self.loopback = loopback
+        self.sequence = 0
+        self._socket: Optional[socket.socket] = None
+        registry = metrics or MetricsRegistry()
+        self._datagrams_sent = registry.counter(
+            'es_multicast_datagrams_sent_total', 'Datagrams sent to the multicast group'
+        ).labels()
+        self._bytes_sent = registry.counter(
+            'es_multicast_bytes_sent_total', 'Bytes sent to the multicast group'
+        ).labels()
+        self._send_errors = registry.counter(
+            'es_multicast_send_errors_total', 'Datagrams the socket did not accept'
+        ).labels()
+
+    def open(self) -> None:
+        """
+        Create the sending socket.
+
+        Raises:
+            MulticastError: If the socket cannot be configured
+        """
+        if self._socket is not None:
+            return
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        try:
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, self.ttl)
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP,
+                            int(self.loopback))
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF,
+                            socket.inet_aton(self.interface))
+            sock.setblocking(False)
+        except OSError as e:
+            sock.close()
+            raise MulticastError(f"Failed to configure multicast socket: {e}")
+        self._socket = sock
+        logger.info(f"Multicasting data to {self.group}:{self.port} (ttl {self.ttl})")
+
+    def publish(self, samples: List[Tuple[int, int]]) -> bool:
+        """
+        Send samples as one sequence-numbered datagram.
+
+        Args:
+            samples: (value, timestamp_ms) pairs in time order
+
+        Returns:
+            bool: True if the socket accepted the datagram
+        """
+        if self._socket is None:
+            return False
+        datagram = codec.encode_sequenced_samples(self.sequence, samples)
+        self.sequence = (self.sequence + 1) % codec.SEQUENCE_MODULO
+        try:
+            self._socket.sendto(datagram, (self.group, self.port))
+        except OSError as e:
+            self._send_errors.inc()
+            logger.debug(f"Multicast datagram dropped: {e}")
+            return False
+        self._datagrams_sent.inc()
+        self._bytes_sent.inc(len(datagram))
+        return True
+
+    def close(self) -> None:
+        """Close the sending socket."""
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+            logger.info("Multicast publisher closed")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get multicast destination and send counters.
+
+        Returns:
+            Dict[str, Any]: Group, port, next sequence number, datagrams sent
+            and send errors
+        """
+        return {
+            'group': self.group,
+            'port': self.port,
+            'sequence': self.sequence,
+            'datagrams_sent': int(self._datagrams_sent.value),
+            'send_errors': int(self._send_errors.value)
+        }
@@ -0,0 +1,134 @@
+"""
+Process Model Module
+Drains and parses the stderr output of streaming subprocesses.
+"""
+
+# Standard library imports
+import logging
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, IO, Optional
+
+# Third-party imports
+
+# Local application imports
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bytes read from a stderr pipe per call
+DRAIN_CHUNK_SIZE = 4096
+
+# ffmpeg progress ("fps= 24", "bitrate=1638.4kbits/s") and libcamera ("(24.00 fps)")
+_FPS_PATTERNS = (re.compile(rb'fps=\s*([\d.]+)'), re.compile(rb'\(([\d.]+) fps\)'))
+_BITRATE_PATTERN = re.compile(rb'bitrate=\s*([\d.]+)kbits/s')
+_LINE_SPLIT = re.compile(rb'[\r\n]')
+
+
+class StderrDrain:
+    """
+    Background reader that keeps a subprocess stderr pipe empty.
+
+    An unread pipe fills after ~64 KiB and blocks the writing process, so
+    every line is consumed as it arrives. ffmpeg progress lines end in a
+    carriage return, so both CR and LF split lines. The last reported frame
+    rate and bitrate are parsed out, and a short tail of lines is kept for
+    diagnosing crashes.
+    """
+
+    def __init__(self, stream: IO[bytes], name: str, tail_lines: int = 20):
+        """
+        Initialize and start the drain thread.
+
+        Args:
+            stream: Readable stderr pipe of the subprocess
+            name: Process name used for logging
+            tail_lines: Number of recent lines retained
+        """
+        self.name = name
+        self.fps: Optional[float] = None
+        self.bitrate_kbps: Optional[float] = None
+        self.line_count = 0
+        self.last_output: Optional[float] = None
+        self._tail: Deque[str] = deque(maxlen=tail_lines)
+        self._stream = stream
+        self._thread = threading.Thread(
+            target=self._run, name=f"{name}-stderr", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Read the pipe until EOF, parsing complete lines."""
+        pending = b''
+        try:
+            while True:
+                chunk = self._stream.read1(DRAIN_CHUNK_SIZE)
+                if not chunk:
+                    break
+                lines = _LINE_SPLIT.split(pending + chunk)
+                pending = lines.pop()
+                for line in lines:
+                    if line:
+                        self._parse_line(line)
+            if pending:
+                self._parse_line(pending)
+        except (OSError, ValueError) as e:
+            logger.debug(f"{self.name} stderr drain stopped: {e}")
+        finally:
+            self._stream.close()
+
+    def _parse_line(self, line: bytes) -> None:
+        """
+        Record one stderr line and extract statistics from it.
+
+        Args:
+            line: Line without its terminator
+        """
+        self.line_count += 1
+        self.last_output = time.monotonic()
+        for pattern in _FPS_PATTERNS:
+            match = pattern.search(line)
+            if match:
+                self.fps = float(match.group(1))
+                break
+        match = _BITRATE_PATTERN.search(line)
+        if match:
+            self.bitrate_kbps = float(match.group(1))
+
+        text = line.decode('utf-8', 'replace').strip()
+        self._tail.append(text)
+        logger.debug(f"[{self.name}] {text}")
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for the drain thread to reach EOF.
+
+        Args:
+            timeout: Maximum seconds to wait
+        """
+        self._thread.join(timeout)
+
+    def get_tail(self) -> str:
+        """
+        Get the most recent stderr lines.
+
+        Returns:
+            str: Recent lines joined by newlines
+        """
+        return '\n'.join(self._tail)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get parsed statistics.
+
+        Returns:
+            Dict[str, Any]: Frame rate, bitrate and line count
+        """
+        return {
+            'fps': self.fps,
+            'bitrate_kbps': self.bitrate_kbps,
+            'lines': self.line_count
+        }
@@ -0,0 +1,268 @@
+"""
+Profile Model Module
+Named encoding profiles and client-driven adaptive quality selection.
+"""
+
+# Standard library imports
+import logging
+import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+# Third-party imports
+
+# Local application imports
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Stream settings a profile controls
+PROFILE_KEYS = ('width', 'height', 'framerate', 'bitrate', 'gop')
+
+# Encoding profiles from lowest to highest quality; bitrate in bits/s, gop in frames
+DEFAULT_PROFILES: List[Dict[str, Any]] = [
+    {'name': 'low', 'width': 320, 'height': 240, 'framerate': 15,
+     'bitrate': 300000, 'gop': 30},
+    {'name': 'medium', 'width': 640, 'height': 480, 'framerate': 24,
+     'bitrate': 1000000, 'gop': 48},
+    {'name': 'high', 'width': 1280, 'height': 720, 'framerate': 30,
+     'bitrate': 3000000, 'gop': 60},
+    {'name': 'full', 'width': 1920, 'height': 1080, 'framerate': 30,
+     'bitrate': 6000000, 'gop': 60}
+]
+
+# Profile matching the camera's built-in stream defaults
+DEFAULT_PROFILE = 'medium'
+
+
+class ProfileError(Exception):
+    """Raised when a profile does not exist or is malformed."""
+    pass
+
+
+class AdaptiveQualityController:
+    """
+    Tracks the active encoding profile of one camera and adapts it.
+
+    Clients periodically report decode fps and dropped frames. A report is
+    unhealthy when fps falls below fps_ratio of the profile frame rate or
+    more than drop_threshold of frames were dropped. In adaptive mode the
+    profile steps down once any client sent down_after unhealthy reports
+    in a row, and steps up after every client stayed healthy for up_after
+    seconds. Changes are at least cooldown seconds apart.
+    """
+
+    def __init__(self, profiles: Optional[List[Dict[str, Any]]] = None,
+                 active: Optional[int] = None,
+                 adaptive: bool = False, fps_ratio: float = 0.8,
+                 drop_threshold: float = 0.05, down_after: int = 2,
+                 up_after: float = 30.0, cooldown: float = 10.0,
+                 report_timeout: float = 10.0):
+        """
+        Initialize adaptive quality controller.
+
+        Args:
+            profiles: Profiles ordered from lowest to highest quality
+            active: Index of the initially active profile; defaults to the
+                'medium' profile if present, else the first
+            adaptive: Whether to adapt the profile to client reports
+            fps_ratio: Fraction of the profile frame rate clients must decode
+            drop_threshold: Highest healthy fraction of dropped frames
+            down_after: Consecutive unhealthy reports before stepping down
+            up_after: Seconds all clients must stay healthy before stepping up
+            cooldown: Minimum seconds between profile changes
+            report_timeout: Seconds after which a client's report is ignored
+
+        Raises:
+            ProfileError: If there are no profiles or one lacks a setting
+        """
+        self.profiles = [dict(profile) for profile in (profiles or DEFAULT_PROFILES)]
+        if not self.profiles:
+            raise ProfileError("At least one profile is required")
+        for profile in self.profiles:
+            missing = [key for key in ('name',) + PROFILE_KEYS[:3]
+                       if key not in profile]
+            if missing:
+                raise ProfileError(f"Profile {profile.get('name')} lacks "
+                                   f"{', '.join(missing)}")
+        if active is None:
+            names = [profile['name'] for profile in self.profiles]
+            active = names.index(DEFAULT_PROFILE) if DEFAULT_PROFILE in names else 0
+        self.active = self._validate_index(active)
+        self.adaptive = adaptive
+        self.fps_ratio = fps_ratio
+        self.drop_threshold = drop_threshold
+        self.down_after = down_after
+        self.up_after = up_after
+        self.cooldown = cooldown
+        self.report_timeout = report_timeout
+
+        self.step_downs = 0
+        self.step_ups = 0
+        # client -> (report time, healthy, consecutive unhealthy reports)
+        self._reports: Dict[Hashable, Tuple[float, bool, int]] = {}
+        self._last_change = time.monotonic()
+        self._last_unhealthy = self._last_change
+
+    def _validate_index(self, index: int) -> int:
+        """
+        Validate a profile index.
+
+        Args:
+            index: Profile index
+
+        Returns:
+            int: Validated index
+
+        Raises:
+            ProfileError: If the index is out of range
+        """
+        if not 0 <= index < len(self.profiles):
+            raise ProfileError(f"No profile with index {index}")
+        return index
+
+    def find(self, name: str) -> int:
+        """
+        Find a profile by name.
+
+        Args:
+            name: Profile name
+
+        Returns:
+            int: Profile index
+
+        Raises:
+            ProfileError: If no profile has this name
+        """
+        for index, profile in enumerate(self.profiles):
+            if profile['name'] == name:
+                return index
+        raise ProfileError(f"No profile named {name}")
+
+    def get_stream_settings(self, index: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get the stream settings of a profile.
+
+        Args:
+            index: Profile index, the active profile if omitted
+
+        Returns:
+            Dict[str, Any]: Width, height, framerate, bitrate and gop
+        """
+        profile = self.profiles[self.active if index is None else index]
+        return {key: profile.get(key) for key in PROFILE_KEYS}
+
+    def select(self, index: int) -> Dict[str, Any]:
+        """
+        Make a profile active.
+
+        Args:
+            index: Profile index
+
+        Returns:
+            Dict[str, Any]: Stream settings of the profile
+
+        Raises:
+            ProfileError: If the index is out of range
+        """
+        self.active = self._validate_index(index)
+        self._last_change = time.monotonic()
+        logger.info(f"Stream profile set to {self.profiles[index]['name']}")
+        return self.get_stream_settings()
+
+    def set_adaptive(self, enabled: bool) -> None:
+        """
+        Enable or disable adaptive profile selection.
+
+        Args:
+            enabled: True to adapt to client reports
+        """
+        self.adaptive = enabled
+        self._reports.clear()
+        self._last_unhealthy = time.monotonic()
+        logger.info(f"Adaptive quality {'enabled' if enabled else 'disabled'}")
+
+    def forget(self, client: Hashable) -> None:
+        """
+        Drop the reports of a disconnected client.
+
+        Args:
+            client: Client identifier
+        """
+        self._reports.pop(client, None)
+
+    def report(self, client: Hashable, decode_fps: float, dropped: int,
+               decoded: int, now: Optional[float] = None) -> Optional[int]:
+        """
+        Record a client report and decide whether to change profile.
+
+        Args:
+            client: Client identifier
+            decode_fps: Frames the client decoded per second
+            dropped: Frames dropped since the previous report
+            decoded: Frames decoded since the previous report
+            now: Current monotonic time
+
+        Returns:
+            Optional[int]: Index of the profile to switch to, or None
+        """
+        now = time.monotonic() if now is None else now
+        target_fps = self.profiles[self.active]['framerate']
+        total = dropped + decoded
+        healthy = (decode_fps >= self.fps_ratio * target_fps
+                   and (total == 0 or dropped <= self.drop_threshold * total))
+        previous = self._reports.get(client)
+        streak = 0 if healthy else (previous[2] + 1 if previous else 1)
+        self._reports[client] = (now, healthy, streak)
+        if not healthy:
+            self._last_unhealthy = now
+
+        if not self.adaptive or now - self._last_change < self.cooldown:
+            return None
+
+        fresh = [entry for entry in self._reports.values()
+                 if now - entry[0] <= self.report_timeout]
+        if self.active > 0 and any(entry[2] >= self.down_after for entry in fresh):
+            self.step_downs += 1
+            self._reports.clear()
+            return self._step(now, -1)
+        if (self.active < len(self.profiles) - 1 and fresh
+                and all(entry[1] for entry in fresh)
+                and now - self._last_unhealthy >= self.up_after):
+            self.step_ups += 1
+            return self._step(now, 1)
+        return None
+
+    def _step(self, now: float, direction: int) -> int:
+        """
+        Move the active profile one step.
+
+        Args:
+            now: Current monotonic time
+            direction: -1 to step down, 1 to step up
+
+        Returns:
+            int: New active profile index
+        """
+        self.active += direction
+        self._last_change = now
+        self._last_unhealthy = now
+        logger.info(f"Adaptive quality stepped {'down' if direction < 0 else 'up'} "
+                    f"to {self.profiles[self.active]['name']}")
+        return self.active
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Get the active profile and adaptation counters.
+
+        Returns:
+            Dict[str, Any]: Profile state
+        """
+        return {
+            'profile': self.profiles[self.active]['name'],
+            'active': self.active,
+            'adaptive': self.adaptive,
+            'reporting_clients': len(self._reports),
+            'step_downs': self.step_downs,
+            'step_ups': self.step_ups
+        }
@@ -0,0 +1,268 @@
+"""
+Recorder Model Module
+Append-only binary sample logs with rotation, and memory-mapped readers.
+
+Log layout:
+    [header: magic 'ESLOG\\0', version, record size, created_ms]
+    [record: value u8, timestamp_ms u64 (big-endian)] * N
+Records have the wire sample layout, so a log maps directly onto a NumPy
+dtype [('value', 'u1'), ('timestamp_ms', '>u8')] at offset HEADER_SIZE.
+"""
+
+# Standard library imports
+import glob
+import logging
+import mmap
+import os
+import struct
+import time
+from itertools import starmap
+from typing import Iterator, List, Optional, Tuple
+
+# Third-party imports
+
+# Local application imports
+from protocol import codec
+from .metrics_model import MetricsRegistry
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+LOG_MAGIC = b'ESLOG\x00'
+LOG_VERSION = 1
+LOG_SUFFIX = '.eslog'
+LOG_HEADER = struct.Struct('>6sBBQ')  # magic, version, record size, created_ms
+HEADER_SIZE = LOG_HEADER.size
+RECORD = codec.SAMPLE_STRUCT
+RECORD_SIZE = RECORD.size
+
+Sample = Tuple[int, int]  # value, timestamp_ms
+
+
+class RecorderError(Exception):
+    """Raised when a sample log cannot be written or read."""
+    pass
+
+
+class SampleRecorder:
+    """
+    Appends every emitted sample to rotating fixed-record log files.
+
+    Files are named '<prefix>-<first timestamp_ms>.eslog' so they sort in
+    time order. A file is closed and a new one started once it would
+    exceed max_bytes; beyond max_files the oldest files are deleted.
+    Writes go through a buffered file flushed every flush_interval
+    seconds, so a crash loses at most that much history.
+    """
+
+    def __init__(self, directory: str, prefix: str = 'samples',
+                 max_bytes: int = 64 * 1024 * 1024, max_files: int = 16,
+                 flush_interval: float = 1.0,
+                 metrics: Optional[MetricsRegistry] = None):
+        """
+        Initialize sample recorder.
+
+        Args:
+            directory: Directory holding the logs, created if missing
+            prefix: File name prefix
+            max_bytes: Size at which a log is rotated
+            max_files: Logs kept, 0 to keep all
+            flush_interval: Seconds between flushes to the operating system
+            metrics: Optional registry shared with the servers
+
+        Raises:
+            RecorderError: If max_bytes cannot hold a single record
+        """
+        if max_bytes < HEADER_SIZE + RECORD_SIZE:
+            raise RecorderError(f"max_bytes of {max_bytes} cannot hold a record")
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.flush_interval = flush_interval
+        self.path: Optional[str] = None
+        self._file = None
+        self._size = 0
+        self._last_flush = 0.0
+        self._failed = False
+        registry = metrics or MetricsRegistry()
+        self._records = registry.counter(
+            'es_recorder_samples_total', 'Samples written to the sample log'
+        ).labels()
+        self._rotations = registry.counter(
+            'es_recorder_rotations_total', 'Sample log files started'
+        ).labels()
+        self._errors = registry.counter(
+            'es_recorder_errors_total', 'Sample log writes that failed'
+        ).labels()
+
+    def open(self) -> None:
+        """
+        Create the log directory; the first file starts with the first sample.
+
+        Raises:
+            RecorderError: If the directory cannot be created
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError as e:
+            raise RecorderError(f"Cannot create log directory: {e}")
+        self._failed = False
+        logger.info(f"Recording samples to {self.directory}")
+
+    def write(self, samples: List[Sample]) -> None:
+        """
+        Append samples, rotating first if the file would grow too large.
+
+        Write failures are logged once and counted; recording resumes with
+        a new file when a later write succeeds.
+
+        Args:
+            samples: (value, timestamp_ms) pairs in time order
+        """
+        if not samples:
+            return
+        data = b''.join(starmap(RECORD.pack, samples))
+        try:
+            if self._file is None or self._size + len(data) > self.max_bytes:
+                self._rotate(samples[0][1])
+            self._file.write(data)
+            self._size += len(data)
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_interval:
+                self._file.flush()
+                self._last_flush = now
+        except OSError as e:
+            self._errors.inc()
+            if not self._failed:
+                logger.error(f"Sample recording failed: {e}")
+            self._failed = True
+            self._close_file()
+            return
+        if self._failed:
+            logger.info("Sample recording resumed")
+            self._failed = False
+        self._records.inc(len(samples))
+
+    def _rotate(self, first_timestamp_ms: int) -> None:
+        """
+        Close the current log and start a new one.
+
+        Args:
+            first_timestamp_ms: Timestamp of the first sample of the new log
+
+        Raises:
+            OSError: If the new file cannot be created
+        """
+        self._close_file()
+        path = os.path.join(self.directory,
+                            f"{self.prefix}-{first_timestamp_ms:013d}{LOG_SUFFIX}")
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, RECORD_SIZE,
+                                             int(time.time() * 1000)))
+        self._size = self._file.tell()
+        self.path = path
+        self._rotations.inc()
+        logger.info(f"Recording samples to {path}")
+        self._prune()
+
+    def _prune(self) -> None:
+        """Delete the oldest logs beyond max_files."""
+        if not self.max_files:
+            return
+        for path in list_logs(self.directory, self.prefix)[:-self.max_files]:
+            try:
+                os.remove(path)
+                logger.info(f"Deleted old sample log {path}")
+            except OSError as e:
+                logger.warning(f"Cannot delete old sample log {path}: {e}")
+
+    def _close_file(self) -> None:
+        """Flush and close the current log, ignoring errors."""
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+        except OSError as e:
+            logger.warning(f"Error closing sample log: {e}")
+        self._file = None
+
+    def close(self) -> None:
+        """Flush and close the current log."""
+        self._close_file()
+        self.path = None
+
+
+class SampleLog:
+    """
+    Read-only memory-mapped view of one sample log.
+
+    Records past the last whole one, such as a record still being written,
+    are ignored.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a sample log.
+
+        Args:
+            path: Log file path
+
+        Raises:
+            RecorderError: If the file cannot be read or is not a sample log
+        """
+        self.path = path
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(HEADER_SIZE)
+                if len(header) < HEADER_SIZE:
+                    raise RecorderError(f"{path} is too short to be a sample log")
+                magic, version, record_size, self.created_ms = LOG_HEADER.unpack(header)
+                if (magic != LOG_MAGIC or version != LOG_VERSION
+                        or record_size != RECORD_SIZE):
+                    raise RecorderError(
+                        f"{path} is not a version {LOG_VERSION} sample log")
+                size = os.fstat(f.fileno()).st_size
+                self._count = (size - HEADER_SIZE) // RECORD_SIZE
+                self._map = (mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                             if self._count else None)
+        except OSError as e:
+            raise RecorderError(f"Cannot read sample log: {e}")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> Sample:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(f"Record {index} out of range")
+        return RECORD.unpack_from(self._map, HEADER_SIZE + index * RECORD_SIZE)
+
+    def __iter__(self) -> Iterator[Sample]:
+        for index in range(self._count):
+            yield RECORD.unpack_from(self._map, HEADER_SIZE + index * RECORD_SIZE)
+
+    def close(self) -> None:
+        """Unmap the log."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._count = 0
+
+
+def list_logs(directory: str, prefix: str = 'samples') -> List[str]:
+    """
+    List the sample logs of a directory in time order.
+
+    Args:
+        directory: Log directory
+        prefix: File name prefix
+
+    Returns:
+        List[str]: Log paths, oldest first
+    """
+    pattern = os.path.join(glob.escape(directory), f"{prefix}-*{LOG_SUFFIX}")
+    return sorted(glob.glob(pattern))
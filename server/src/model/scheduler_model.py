@@ -0,0 +1,251 @@
+"""
+Scheduler Model Module
+Drives periodic work from absolute monotonic-clock deadlines.
+"""
+
+# Standard library imports
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict
+
+# Third-party imports
+
+# Local application imports
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Supported sample rate range in Hz
+MIN_RATE_HZ = 1.0
+MAX_RATE_HZ = 1000.0
+
+# Missed tick policies
+POLICY_CATCH_UP = 'catch_up'
+POLICY_SKIP = 'skip'
+
+# A tick is missed once it is this many periods late, and at least
+# MIN_MISS_TOLERANCE seconds: timers routinely wake a millisecond late and
+# stall for several more now and then, which must not cost ticks at high rates
+MISS_TOLERANCE_PERIODS = 3
+MIN_MISS_TOLERANCE = 0.02
+
+
+class SchedulerError(Exception):
+    """Raised when the scheduler is configured with invalid values."""
+    pass
+
+
+class DeadlineScheduler:
+    """
+    Drift-free periodic scheduler based on the event loop's monotonic clock.
+
+    Each tick is scheduled at an absolute deadline (start + n * period), so
+    the time spent in the tick callback never accumulates as drift. Every
+    tick that came due while the loop slept runs on the wake-up, so timer
+    overshoot costs jitter, not ticks. Ticks later than the miss tolerance
+    are missed: they are either run back-to-back (catch_up, bounded by
+    max_catch_up) or dropped (skip). Each missed deadline is counted once.
+    """
+
+    def __init__(self, rate_hz: float = 24.0, policy: str = POLICY_SKIP,
+                 max_catch_up: int = 10, stats_window: int = 240):
+        """
+        Initialize deadline scheduler.
+
+        Args:
+            rate_hz: Tick rate in Hz
+            policy: Missed tick policy, 'catch_up' or 'skip'
+            max_catch_up: Maximum missed ticks replayed before skipping
+            stats_window: Number of recent ticks used for statistics
+
+        Raises:
+            SchedulerError: If rate or policy is invalid
+        """
+        if policy not in (POLICY_CATCH_UP, POLICY_SKIP):
+            raise SchedulerError(f"Unknown missed tick policy: {policy}")
+        self.policy = policy
+        self.max_catch_up = max(0, max_catch_up)
+        self.rate_hz = self._validate_rate(rate_hz)
+        self.period = 1.0 / self.rate_hz
+
+        self.tick_count = 0
+        self.missed_ticks = 0
+        self.skipped_ticks = 0
+        self._tick_times: Deque[float] = deque(maxlen=stats_window)
+        self._lateness: Deque[float] = deque(maxlen=stats_window)
+        self._next_deadline = 0.0
+        self._mono_base = 0.0
+        self._wall_base = 0.0
+
+    def _validate_rate(self, rate_hz: float) -> float:
+        """
+        Validate a tick rate.
+
+        Args:
+            rate_hz: Tick rate in Hz
+
+        Returns:
+            float: Validated rate
+
+        Raises:
+            SchedulerError: If the rate is out of range
+        """
+        rate_hz = float(rate_hz)
+        if not MIN_RATE_HZ <= rate_hz <= MAX_RATE_HZ:
+            raise SchedulerError(
+                f"Sample rate {rate_hz} Hz outside {MIN_RATE_HZ}-{MAX_RATE_HZ} Hz"
+            )
+        return rate_hz
+
+    def set_rate(self, rate_hz: float) -> None:
+        """
+        Change the tick rate; takes effect from the next tick.
+
+        Args:
+            rate_hz: New tick rate in Hz
+
+        Raises:
+            SchedulerError: If the rate is out of range
+        """
+        self.rate_hz = self._validate_rate(rate_hz)
+        self.period = 1.0 / self.rate_hz
+        self._tick_times.clear()
+        self._lateness.clear()
+        logger.info(f"Scheduler rate set to {self.rate_hz:g} Hz")
+
+    def deadline_to_wall_ms(self, deadline: float) -> int:
+        """
+        Convert a monotonic tick deadline to a wall-clock timestamp.
+
+        Timestamps derived this way are evenly spaced even when the tick
+        itself runs late.
+
+        Args:
+            deadline: Tick deadline on the loop clock
+
+        Returns:
+            int: Wall-clock timestamp in milliseconds
+        """
+        return int((self._wall_base + (deadline - self._mono_base)) * 1000)
+
+    async def run(self, on_tick: Callable[[int, float], None]) -> None:
+        """
+        Invoke a callback on every tick until cancelled.
+
+        Args:
+            on_tick: Callback receiving the tick index and its deadline
+        """
+        loop = asyncio.get_running_loop()
+        self._mono_base = loop.time()
+        self._wall_base = time.time()
+        self._next_deadline = self._mono_base
+        logger.info(f"Scheduler running at {self.rate_hz:g} Hz ({self.policy})")
+
+        while True:
+            delay = self._next_deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                # Yield so client handlers still run while catching up
+                await asyncio.sleep(0)
+
+            woke = loop.time()
+            self._handle_missed_ticks(woke)
+            # Every tick due by the wake-up runs now, back to back
+            while self._next_deadline <= woke:
+                deadline = self._next_deadline
+                now = loop.time()
+                lateness = now - deadline
+                if lateness > self._miss_tolerance():
+                    self.missed_ticks += 1  # Replayed under catch_up
+                self._record_tick(now, lateness)
+                try:
+                    on_tick(self.tick_count, deadline)
+                except Exception as e:
+                    logger.error(f"Error in scheduled tick: {e}")
+                self.tick_count += 1
+                self._next_deadline = deadline + self.period
+
+    def _miss_tolerance(self) -> float:
+        """
+        Get how late a tick may run before it counts as missed.
+
+        Returns:
+            float: Tolerance in seconds
+        """
+        return max(MISS_TOLERANCE_PERIODS * self.period, MIN_MISS_TOLERANCE)
+
+    def _handle_missed_ticks(self, now: float) -> None:
+        """
+        Drop the missed ticks the policy does not replay.
+
+        Ticks later than the miss tolerance are missed. skip drops them
+        all; catch_up drops the oldest beyond max_catch_up. Dropped ticks
+        are counted here, replayed ones when they run, so every missed
+        deadline is counted once.
+
+        Args:
+            now: Current loop time
+        """
+        cutoff = now - self._miss_tolerance()
+        if self._next_deadline >= cutoff:
+            return
+        late = math.ceil((cutoff - self._next_deadline) / self.period)
+        if self.policy == POLICY_CATCH_UP:
+            dropped = max(0, late - self.max_catch_up)
+        else:
+            dropped = late
+        if dropped:
+            self.missed_ticks += dropped
+            self.skipped_ticks += dropped
+            self._next_deadline += dropped * self.period
+
+    def _record_tick(self, now: float, lateness: float) -> None:
+        """
+        Record timing of a tick for statistics.
+
+        Args:
+            now: Loop time when the tick ran
+            lateness: Seconds between the deadline and the actual tick
+        """
+        self._tick_times.append(now)
+        self._lateness.append(lateness)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get achieved rate and jitter statistics over the recent window.
+
+        Returns:
+            Dict[str, Any]: Scheduler statistics
+        """
+        achieved_rate = 0.0
+        if len(self._tick_times) > 1:
+            elapsed = self._tick_times[-1] - self._tick_times[0]
+            if elapsed > 0:
+                achieved_rate = (len(self._tick_times) - 1) / elapsed
+
+        jitter_mean_ms = 0.0
+        jitter_max_ms = 0.0
+        jitter_p99_ms = 0.0
+        if self._lateness:
+            ordered = sorted(abs(value) for value in self._lateness)
+            jitter_mean_ms = sum(ordered) / len(ordered) * 1000
+            jitter_max_ms = ordered[-1] * 1000
+            p99_index = min(len(ordered) - 1, int(len(ordered) * 0.99))
+            jitter_p99_ms = ordered[p99_index] * 1000
+
+        return {
+            'target_rate_hz': self.rate_hz,
+            'achieved_rate_hz': round(achieved_rate, 3),
+            'jitter_mean_ms': round(jitter_mean_ms, 3),
+            'jitter_p99_ms': round(jitter_p99_ms, 3),
+            'jitter_max_ms': round(jitter_max_ms, 3),
+            'ticks': self.tick_count,
+            'missed_ticks': self.missed_ticks,
+            'skipped_ticks': self.skipped_ticks,
+            'policy': self.policy
+        }
@@ -0,0 +1,756 @@
+"""
+Source Model Module
+Sample sources the data server's sampler pulls its values from.
+"""
+
+# Standard library imports
+import errno
+import logging
+import math
+import os
+import random
+import socket
+import stat
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+# Third-party imports
+
+# Local application imports
+from protocol.parser import READ_CHUNK_SIZE
+from .recorder_model import RecorderError, SampleLog, list_logs
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Sample values are one unsigned byte on the wire
+MIN_VALUE = 0
+MAX_VALUE = 255
+
+# Most samples one read() returns; a source further behind skips ahead
+MAX_BLOCK_SAMPLES = 4096
+
+WAVEFORMS = ('random', 'sine', 'square', 'triangle', 'sawtooth')
+
+Sample = Tuple[int, int]  # value, timestamp_ms
+
+
+class SourceError(Exception):
+    """Raised when a sample source is misconfigured or cannot be opened."""
+    pass
+
+
+def clamp_value(value: float) -> int:
+    """
+    Round a reading into the range of a sample value.
+
+    Args:
+        value: Raw reading
+
+    Returns:
+        int: Value between MIN_VALUE and MAX_VALUE
+    """
+    return max(MIN_VALUE, min(MAX_VALUE, int(round(value))))
+
+
+def parse_line(line: bytes, now_ms: int) -> Optional[Sample]:
+    """
+    Parse one text record, 'value' or 'timestamp_ms,value'.
+
+    Args:
+        line: Record without line terminator
+        now_ms: Timestamp used when the record has none
+
+    Returns:
+        Optional[Sample]: Parsed sample, or None for blank and comment lines
+
+    Raises:
+        ValueError: If the record is malformed
+    """
+    line = line.strip()
+    if not line or line.startswith(b'#'):
+        return None
+    fields = line.split(b',')
+    if len(fields) == 1:
+        return clamp_value(float(fields[0])), now_ms
+    if len(fields) == 2:
+        return clamp_value(float(fields[1])), int(float(fields[0]))
+    raise ValueError(f"Expected 1 or 2 fields, got {len(fields)}")
+
+
+class SampleSource(ABC):
+    """
+    Produces the samples the data server streams.
+
+    The sampler calls read() once per tick with the tick's wall clock time
+    and streams every sample returned, so a source may deliver one sample
+    per tick or whole blocks at a rate of its own.
+    """
+
+    kind = 'source'
+
+    def __init__(self):
+        """Initialize sample source."""
+        self.samples_read = 0
+
+    def open(self) -> None:
+        """
+        Acquire the source's resources before the first read.
+
+        Raises:
+            SourceError: If the source cannot be opened
+        """
+        pass
+
+    def close(self) -> None:
+        """Release the source's resources."""
+        pass
+
+    def read(self, now_ms: int) -> List[Sample]:
+        """
+        Get the samples that became available by now.
+
+        Args:
+            now_ms: Wall clock time of the sampler tick in milliseconds
+
+        Returns:
+            List[Sample]: (value, timestamp_ms) pairs in time order
+        """
+        samples = self._read(now_ms)
+        self.samples_read += len(samples)
+        return samples
+
+    def get_sample_period(self) -> Optional[float]:
+        """
+        Get the spacing of the source's samples.
+
+        Returns:
+            Optional[float]: Seconds between samples, None for one sample per tick
+        """
+        return None
+
+    @abstractmethod
+    def _read(self, now_ms: int) -> List[Sample]:
+        """
+        Produce the samples that became available by now.
+
+        Args:
+            now_ms: Wall clock time of the sampler tick in milliseconds
+
+        Returns:
+            List[Sample]: (value, timestamp_ms) pairs in time order
+        """
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the source type and number of samples delivered.
+
+        Returns:
+            Dict[str, Any]: Source statistics
+        """
+        return {'type': self.kind, 'samples': self.samples_read}
+
+
+class SyntheticSource(SampleSource):
+    """
+    Deterministic waveform generator.
+
+    Without a rate it produces one sample per tick, phased by timestamp.
+    With rate_hz it produces samples at that rate, delivered in blocks
+    and phased by sample index, so the same settings always yield the same
+    series. The random waveform is reproducible when seeded.
+    """
+
+    kind = 'synthetic'
+
+    def __init__(self, waveform: str = 'random', low: int = 0, high: int = 10,
+                 period: float = 1.0, rate_hz: Optional[float] = None,
+                 seed: Optional[int] = None):
+        """
+        Initialize synthetic source.
+
+        Args:
+            waveform: 'random', 'sine', 'square', 'triangle' or 'sawtooth'
+            low: Lowest value
+            high: Highest value
+            period: Waveform period in seconds
+            rate_hz: Own sample rate, one sample per tick if omitted
+            seed: Seed of the random waveform
+
+        Raises:
+            SourceError: If the waveform, range, period or rate is invalid
+        """
+        super().__init__()
+        if waveform not in WAVEFORMS:
+            raise SourceError(f"Unknown waveform: {waveform}")
+        if not MIN_VALUE <= low <= high <= MAX_VALUE:
+            raise SourceError(f"Invalid value range {low}-{high}")
+        if period <= 0 or (rate_hz is not None and rate_hz <= 0):
+            raise SourceError("Period and rate must be positive")
+        self.waveform = waveform
+        self.low = low
+        self.high = high
+        self.period = period
+        self.rate_hz = rate_hz
+        self.seed = seed
+        self.skipped = 0
+        self._random = random.Random(seed)
+        self._start_ms: Optional[int] = None
+        self._index = 0
+
+    def open(self) -> None:
+        """Restart the series from its first sample."""
+        self._random.seed(self.seed)
+        self._start_ms = None
+        self._index = 0
+
+    def value_at(self, seconds: float) -> int:
+        """
+        Evaluate the waveform.
+
+        Args:
+            seconds: Time since the first sample
+
+        Returns:
+            int: Sample value
+        """
+        if self.waveform == 'random':
+            return self._random.randint(self.low, self.high)
+        phase = (seconds / self.period) % 1.0
+        if self.waveform == 'sine':
+            level = 0.5 + 0.5 * math.sin(2.0 * math.pi * phase)
+        elif self.waveform == 'square':
+            level = 1.0 if phase < 0.5 else 0.0
+        elif self.waveform == 'triangle':
+            level = 1.0 - abs(2.0 * phase - 1.0)
+        else:
+            level = phase
+        return clamp_value(self.low + level * (self.high - self.low))
+
+    def _read(self, now_ms: int) -> List[Sample]:
+        if self._start_ms is None:
+            self._start_ms = now_ms
+        if self.rate_hz is None:
+            return [(self.value_at((now_ms - self._start_ms) / 1000.0), now_ms)]
+
+        due = int((now_ms - self._start_ms) * self.rate_hz / 1000.0) + 1
+        if due - self._index > MAX_BLOCK_SAMPLES:
+            self.skipped += due - self._index - MAX_BLOCK_SAMPLES
+            self._index = due - MAX_BLOCK_SAMPLES
+        samples = []
+        for index in range(self._index, due):
+            seconds = index / self.rate_hz
+            timestamp = self._start_ms + int(seconds * 1000)
+            samples.append((self.value_at(seconds), timestamp))
+        self._index = due
+        return samples
+
+    def get_sample_period(self) -> Optional[float]:
+        return 1.0 / self.rate_hz if self.rate_hz else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats.update(waveform=self.waveform, skipped=self.skipped)
+        return stats
+
+
+class FileReplaySource(SampleSource):
+    """
+    Replays text records from a file.
+
+    Each line is 'value' or 'timestamp_ms,value'. Timestamped records are
+    paced by their original spacing divided by speed; others go out one
+    per tick, or at rate_hz. Samples are re-stamped with the replay time.
+    """
+
+    kind = 'replay'
+
+    def __init__(self, path: str, rate_hz: Optional[float] = None, speed: float = 1.0,
+                 loop: bool = True):
+        """
+        Initialize file replay source.
+
+        Args:
+            path: Path of the record file
+            rate_hz: Rate for records without timestamps, one per tick if omitted
+            speed: Replay speed factor for timestamped records
+            loop: Whether to start over at the end of the file
+
+        Raises:
+            SourceError: If the rate or speed is not positive
+        """
+        super().__init__()
+        if speed <= 0 or (rate_hz is not None and rate_hz <= 0):
+            raise SourceError("Replay rate and speed must be positive")
+        self.path = path
+        self.rate_hz = rate_hz
+        self.speed = speed
+        self.loop = loop
+        self.passes = 0
+        self._values: List[int] = []
+        self._offsets_ms: Optional[List[float]] = None  # record time since the first
+        self._start_ms: Optional[int] = None
+        self._position = 0
+
+    def open(self) -> None:
+        """
+        Load the records.
+
+        Raises:
+            SourceError: If the file cannot be read or has no valid record
+        """
+        records: List[Sample] = []
+        try:
+            with open(self.path, 'rb') as f:
+                for number, line in enumerate(f, 1):
+                    try:
+                        record = parse_line(line, -1)
+                    except ValueError as e:
+                        raise SourceError(f"{self.path}:{number}: {e}")
+                    if record is not None:
+                        records.append(record)
+        except OSError as e:
+            raise SourceError(f"Cannot read replay file: {e}")
+        if not records:
+            raise SourceError(f"No records in {self.path}")
+
+        self._values = [value for value, _ in records]
+        timestamps = [timestamp for _, timestamp in records]
+        if min(timestamps) >= 0 and timestamps[-1] > timestamps[0]:
+            first = timestamps[0]
+            self._offsets_ms = [(timestamp - first) / self.speed
+                                for timestamp in timestamps]
+        else:
+            self._offsets_ms = None
+        self._start_ms = None
+        self._position = 0
+        self.passes = 0
+        logger.info(f"Replaying {len(records)} records from {self.path}")
+
+    def _offset_of(self, position: int) -> float:
+        """
+        Get the replay time of a record position since the start.
+
+        Args:
+            position: Record position counted over all passes
+
+        Returns:
+            float: Milliseconds after the first record
+        """
+        count = len(self._values)
+        passes, index = divmod(position, count)
+        if self._offsets_ms is not None:
+            # Keep the average record spacing between passes
+            span = self._offsets_ms[-1] * count / max(1, count - 1)
+            return passes * span + self._offsets_ms[index]
+        return position * 1000.0 / self.rate_hz
+
+    def get_sample_period(self) -> Optional[float]:
+        if self._offsets_ms is not None:
+            return self._offsets_ms[-1] / max(1, len(self._values) - 1) / 1000.0
+        return 1.0 / self.rate_hz if self.rate_hz else None
+
+    def _read(self, now_ms: int) -> List[Sample]:
+        if not self._values:
+            return []
+        if self._start_ms is None:
+            self._start_ms = now_ms
+        count = len(self._values)
+        paced = self._offsets_ms is not None or self.rate_hz is not None
+        samples = []
+        while len(samples) < MAX_BLOCK_SAMPLES:
+            if not self.loop and self._position >= count:
+                break
+            if paced:
+                offset = self._offset_of(self._position)
+                if self._start_ms + offset > now_ms:
+                    break
+                timestamp = self._start_ms + int(offset)
+            elif samples:
+                break
+            else:
+                timestamp = now_ms
+            samples.append((self._values[self._position % count], timestamp))
+            self._position += 1
+            if self._position % count == 0:
+                self.passes += 1
+        return samples
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats.update(path=self.path, records=len(self._values), passes=self.passes)
+        return stats
+
+
+class LogReplaySource(SampleSource):
+    """
+    Replays sample logs written by the recorder.
+
+    Records are read through memory maps, paced by their recorded
+    timestamps divided by speed, and re-stamped with the replay time.
+    Pauses longer than max_gap seconds, such as server downtime between
+    logs, are shortened to max_gap.
+    """
+
+    kind = 'log'
+
+    def __init__(self, path: str, speed: float = 1.0, loop: bool = False,
+                 max_gap: float = 5.0, prefix: str = 'samples'):
+        """
+        Initialize log replay source.
+
+        Args:
+            path: Log file, or directory whose logs are replayed in order
+            speed: Replay speed factor, 1.0 for real time
+            loop: Whether to start over after the last record
+            max_gap: Longest pause replayed, in recorded seconds
+            prefix: File name prefix of the logs in a directory
+
+        Raises:
+            SourceError: If speed or max_gap is not positive
+        """
+        super().__init__()
+        if speed <= 0 or max_gap <= 0:
+            raise SourceError("Replay speed and max_gap must be positive")
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.max_gap = max_gap
+        self.prefix = prefix
+        self.passes = 0
+        self._logs: List[SampleLog] = []
+        self._log = 0
+        self._index = 0
+        self._start_ms: Optional[int] = None
+        self._offset_ms = 0.0  # replay time of the next record since the start
+        self._previous_ms: Optional[int] = None  # recorded time of the last record
+        self._last_step_ms = 0.0
+        self._period: Optional[float] = None
+
+    def open(self) -> None:
+        """
+        Map the logs.
+
+        Raises:
+            SourceError: If there is no readable log with records
+        """
+        if os.path.isdir(self.path):
+            paths = list_logs(self.path, self.prefix)
+        else:
+            paths = [self.path]
+        try:
+            logs = [SampleLog(path) for path in paths]
+        except RecorderError as e:
+            raise SourceError(str(e))
+        self._logs = [log for log in logs if len(log)]
+        if not self._logs:
+            raise SourceError(f"No recorded samples in {self.path}")
+        self._log = self._index = 0
+        self._start_ms = self._previous_ms = None
+        self._offset_ms = self._last_step_ms = 0.0
+        self.passes = 0
+        total = sum(map(len, self._logs))
+        span_ms = sum(log[len(log) - 1][1] - log[0][1] for log in self._logs)
+        spacings = total - len(self._logs)
+        self._period = span_ms / spacings / self.speed / 1000.0 if span_ms > 0 else None
+        logger.info(f"Replaying {total} recorded samples from {len(self._logs)} logs "
+                    f"at {self.speed:g}x")
+
+    def close(self) -> None:
+        for log in self._logs:
+            log.close()
+        self._logs = []
+
+    def _next_record(self) -> Optional[Sample]:
+        """
+        Get the record at the replay position, wrapping when looping.
+
+        Returns:
+            Optional[Sample]: Recorded sample, or None after the last one
+        """
+        if self._log >= len(self._logs):
+            return None  # Ended without looping
+        if self._index >= len(self._logs[self._log]):
+            self._log += 1
+            self._index = 0
+            if self._log >= len(self._logs):
+                if not self.loop:
+                    logger.info(f"Replay of {self.path} ended")
+                    return None
+                self._log = 0
+                self.passes += 1
+                self._previous_ms = None  # Keep the last spacing across the wrap
+        return self._logs[self._log][self._index]
+
+    def _read(self, now_ms: int) -> List[Sample]:
+        if not self._logs:
+            return []
+        if self._start_ms is None:
+            self._start_ms = now_ms
+        samples = []
+        while len(samples) < MAX_BLOCK_SAMPLES:
+            record = self._next_record()
+            if record is None:
+                break
+            value, recorded_ms = record
+            if self._previous_ms is not None:
+                gap_ms = min(max(0, recorded_ms - self._previous_ms),
+                             self.max_gap * 1000.0)
+                step = gap_ms / self.speed
+            else:
+                step = self._last_step_ms  # 0 for the first record, else after a wrap
+            offset = self._offset_ms + step
+            if self._start_ms + offset > now_ms:
+                break
+            samples.append((value, self._start_ms + int(offset)))
+            self._offset_ms = offset
+            self._last_step_ms = step
+            self._previous_ms = recorded_ms
+            self._index += 1
+        return samples
+
+    def get_sample_period(self) -> Optional[float]:
+        return self._period
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats.update(path=self.path, logs=len(self._logs), passes=self.passes)
+        return stats
+
+
+class StreamSource(SampleSource):
+    """
+    Base class for sources fed text records by another process.
+
+    Records are 'value' or 'timestamp_ms,value' lines; records without a
+    timestamp are stamped with the tick that received them. Reads never
+    block the event loop.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize stream source.
+
+        Args:
+            path: Filesystem path of the FIFO or socket
+        """
+        super().__init__()
+        self.path = path
+        self.malformed = 0
+        self._buffers: Dict[Any, bytearray] = {}
+
+    def _parse(self, key: Any, data: bytes, now_ms: int) -> List[Sample]:
+        """
+        Split received bytes into records, keeping a partial last line.
+
+        Args:
+            key: Identifier of the stream the bytes came from
+            data: Received bytes
+            now_ms: Timestamp for records without one
+
+        Returns:
+            List[Sample]: Parsed samples
+        """
+        buffer = self._buffers.setdefault(key, bytearray())
+        buffer += data
+        *lines, rest = buffer.split(b'\n')
+        self._buffers[key] = bytearray(rest)
+        samples = []
+        for line in lines:
+            try:
+                sample = parse_line(line, now_ms)
+            except ValueError:
+                self.malformed += 1
+                continue
+            if sample is not None:
+                samples.append(sample)
+        return samples
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats.update(path=self.path, malformed=self.malformed)
+        return stats
+
+
+class FifoSource(StreamSource):
+    """
+    Reads records from a named pipe, created if missing.
+
+    The source keeps its own write end open, so the pipe stays readable
+    while writers come and go.
+    """
+
+    kind = 'fifo'
+
+    def __init__(self, path: str):
+        """
+        Initialize FIFO source.
+
+        Args:
+            path: Path of the named pipe
+        """
+        super().__init__(path)
+        self._read_fd: Optional[int] = None
+        self._write_fd: Optional[int] = None
+
+    def open(self) -> None:
+        """
+        Create and open the named pipe.
+
+        Raises:
+            SourceError: If the path exists but is not a FIFO or cannot be opened
+        """
+        try:
+            if not os.path.exists(self.path):
+                os.mkfifo(self.path)
+            elif not stat.S_ISFIFO(os.stat(self.path).st_mode):
+                raise SourceError(f"{self.path} is not a FIFO")
+            self._read_fd = os.open(self.path, os.O_RDONLY | os.O_NONBLOCK)
+            self._write_fd = os.open(self.path, os.O_WRONLY | os.O_NONBLOCK)
+        except OSError as e:
+            self.close()
+            raise SourceError(f"Cannot open FIFO: {e}")
+        logger.info(f"Reading samples from FIFO {self.path}")
+
+    def close(self) -> None:
+        for fd in (self._read_fd, self._write_fd):
+            if fd is not None:
+                os.close(fd)
+        self._read_fd = self._write_fd = None
+
+    def _read(self, now_ms: int) -> List[Sample]:
+        if self._read_fd is None:
+            return []
+        samples: List[Sample] = []
+        while len(samples) < MAX_BLOCK_SAMPLES:
+            try:
+                data = os.read(self._read_fd, READ_CHUNK_SIZE)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            samples.extend(self._parse(None, data, now_ms))
+        return samples
+
+
+class UnixSocketSource(StreamSource):
+    """
+    Accepts acquisition processes on a Unix domain socket.
+
+    Any number of writers may connect; their records are merged in the
+    order they are read.
+    """
+
+    kind = 'unix'
+
+    def __init__(self, path: str):
+        """
+        Initialize Unix socket source.
+
+        Args:
+            path: Path of the listening socket
+        """
+        super().__init__(path)
+        self._server: Optional[socket.socket] = None
+        self._connections: List[socket.socket] = []
+
+    def open(self) -> None:
+        """
+        Listen on the socket path, replacing a stale socket file.
+
+        Raises:
+            SourceError: If the socket cannot be bound
+        """
+        try:
+            if os.path.exists(self.path) and stat.S_ISSOCK(os.stat(self.path).st_mode):
+                os.unlink(self.path)
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.setblocking(False)
+            server.bind(self.path)
+            server.listen(8)
+        except OSError as e:
+            raise SourceError(f"Cannot listen on {self.path}: {e}")
+        self._server = server
+        logger.info(f"Reading samples from Unix socket {self.path}")
+
+    def close(self) -> None:
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
+        self._buffers.clear()
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def _accept(self) -> None:
+        """Accept pending writers without blocking."""
+        while True:
+            try:
+                connection, _ = self._server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            connection.setblocking(False)
+            self._connections.append(connection)
+            logger.info("Sample writer connected")
+
+    def _read(self, now_ms: int) -> List[Sample]:
+        if self._server is None:
+            return []
+        self._accept()
+        samples: List[Sample] = []
+        for connection in list(self._connections):
+            while len(samples) < MAX_BLOCK_SAMPLES:
+                try:
+                    data = connection.recv(READ_CHUNK_SIZE)
+                except BlockingIOError:
+                    break
+                except OSError as e:
+                    if e.errno not in (errno.ECONNRESET, errno.EPIPE):
+                        logger.warning(f"Sample writer error: {e}")
+                    data = b''
+                if not data:
+                    self._connections.remove(connection)
+                    self._buffers.pop(connection, None)
+                    connection.close()
+                    logger.info("Sample writer disconnected")
+                    break
+                samples.extend(self._parse(connection, data, now_ms))
+        return samples
+
+
+SOURCE_TYPES = {
+    SyntheticSource.kind: SyntheticSource,
+    FileReplaySource.kind: FileReplaySource,
+    LogReplaySource.kind: LogReplaySource,
+    FifoSource.kind: FifoSource,
+    UnixSocketSource.kind: UnixSocketSource
+}
+
+
+def create_source(source_config: Dict[str, Any]) -> SampleSource:
+    """
+    Build a sample source from its configuration.
+
+    Args:
+        source_config: 'type' plus the source's constructor arguments
+
+    Returns:
+        SampleSource: Configured source
+
+    Raises:
+        SourceError: If the type is unknown or the arguments are invalid
+    """
+    options = dict(source_config)
+    kind = options.pop('type', SyntheticSource.kind)
+    if kind not in SOURCE_TYPES:
+        raise SourceError(f"Unknown sample source type: {kind}")
+    try:
+        return SOURCE_TYPES[kind](**options)
+    except TypeError as e:
+        raise SourceError(f"Invalid {kind} source options: {e}")
@@ -0,0 +1,207 @@
+"""
+Supervisor Model Module
+Keeps the camera streaming pipeline alive with health checks and restarts.
+"""
+
+# Standard library imports
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Third-party imports
+
+# Local application imports
+from .camera_model import CameraModel
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Pipeline states
+STATE_STOPPED = 'stopped'
+STATE_RUNNING = 'running'
+STATE_BACKOFF = 'backoff'
+
+
+class CameraSupervisor:
+    """
+    Background health checker for the libcamera/ffmpeg pipeline.
+
+    Every check interval the supervisor reaps exited processes and treats
+    a capture that has relayed no video for stall_timeout as hung. Failed
+    pipelines are restarted: the first restart is immediate, repeated
+    failures back off exponentially up to backoff_max, and the backoff
+    resets once the pipeline has stayed up for stable_after seconds.
+    """
+
+    def __init__(self, camera: CameraModel, check_interval: float = 1.0,
+                 stall_timeout: float = 5.0, backoff_initial: float = 1.0,
+                 backoff_max: float = 30.0, stable_after: float = 30.0):
+        """
+        Initialize camera supervisor.
+
+        Args:
+            camera: Camera model owning the pipeline processes
+            check_interval: Seconds between health checks
+            stall_timeout: Seconds without video before libcamera is restarted
+            backoff_initial: Delay before the second consecutive restart
+            backoff_max: Upper bound on the restart delay
+            stable_after: Uptime in seconds that resets the backoff
+        """
+        self.camera = camera
+        self.check_interval = check_interval
+        self.stall_timeout = stall_timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.stable_after = stable_after
+
+        self.state = STATE_STOPPED
+        self.restarts = 0
+        self.consecutive_failures = 0
+        self.last_failure: Optional[str] = None
+        self._running_since: Optional[float] = None
+        self._next_attempt = 0.0
+        self._failed: List[str] = []
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start supervising; a stopped pipeline is started on the first check."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self.state = STATE_RUNNING
+        self._running_since = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._run, name=f"{self.camera.name}-supervisor", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"{self.camera.name} supervisor started")
+
+    def stop(self) -> None:
+        """Stop supervising without touching the pipeline processes."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.check_interval + 5.0)
+            self._thread = None
+        self.state = STATE_STOPPED
+        self._running_since = None
+        logger.info(f"{self.camera.name} supervisor stopped")
+
+    def _run(self) -> None:
+        """Run health checks until stopped."""
+        while not self._stop_event.wait(self.check_interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"{self.camera.name} supervisor check failed: {e}")
+
+    def check(self) -> None:
+        """Perform one health check and restart the pipeline if due."""
+        now = time.monotonic()
+        if self.state == STATE_RUNNING:
+            failed = self.camera.get_failed_processes()
+            reason = f"{', '.join(failed)} not running"
+            if not failed and self.camera.get_relay_idle_time() > self.stall_timeout:
+                failed = ['libcamera']
+                reason = f"no video from libcamera for {self.stall_timeout:g} s"
+            if not failed:
+                stable = now - self._running_since >= self.stable_after
+                if self.consecutive_failures and stable:
+                    logger.info(f"{self.camera.name} pipeline stable, "
+                                f"resetting restart backoff")
+                    self.consecutive_failures = 0
+                return
+            self._on_failure(now, failed, reason)
+
+        if self.state == STATE_BACKOFF and now >= self._next_attempt:
+            self._restart(now)
+
+    def _backoff_delay(self) -> float:
+        """
+        Get the delay before the next restart attempt.
+
+        Returns:
+            float: Seconds to wait; zero for the first failure
+        """
+        if self.consecutive_failures <= 1:
+            return 0.0
+        return min(self.backoff_max,
+                   self.backoff_initial * 2 ** (self.consecutive_failures - 2))
+
+    def _on_failure(self, now: float, failed: List[str], reason: str) -> None:
+        """
+        Record a failure and schedule the next restart attempt.
+
+        Args:
+            now: Current monotonic time
+            failed: Names of the failed processes
+            reason: Human-readable failure description
+        """
+        self.consecutive_failures += 1
+        self.last_failure = reason
+        # Remember ffmpeg failures across retries so the pipeline is rebuilt
+        self._failed = sorted(set(self._failed) | set(failed))
+        delay = self._backoff_delay()
+        self._next_attempt = now + delay
+        self._running_since = None
+        self.state = STATE_BACKOFF
+        if delay:
+            logger.warning(f"{self.camera.name} pipeline failed ({reason}), "
+                           f"retrying in {delay:g} s")
+        else:
+            logger.warning(f"{self.camera.name} pipeline failed ({reason}), restarting")
+
+    def _restart(self, now: float) -> None:
+        """
+        Restart the failed part of the pipeline.
+
+        Args:
+            now: Current monotonic time
+        """
+        try:
+            if 'ffmpeg' in self._failed:
+                self.camera.restart_pipeline()
+            else:
+                self.camera.restart_capture()
+        except Exception as e:
+            self._on_failure(now, self._failed, str(e))
+            return
+        self.restarts += 1
+        self._failed = []
+        self._running_since = now
+        self.state = STATE_RUNNING
+        logger.info(f"{self.camera.name} pipeline restarted (restart #{self.restarts})")
+
+    def get_uptime(self) -> float:
+        """
+        Get seconds since the pipeline was last (re)started healthy.
+
+        Returns:
+            float: Uptime in seconds, 0.0 when not running
+        """
+        if self.state != STATE_RUNNING or self._running_since is None:
+            return 0.0
+        return time.monotonic() - self._running_since
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get supervisor state and pipeline statistics.
+
+        Returns:
+            Dict[str, Any]: Pipeline state, uptime, restart counters and
+            per-process statistics
+        """
+        next_retry = 0.0
+        if self.state == STATE_BACKOFF:
+            next_retry = max(0.0, self._next_attempt - time.monotonic())
+        return {
+            'state': self.state,
+            'uptime_s': round(self.get_uptime(), 1),
+            'restarts': self.restarts,
+            'consecutive_failures': self.consecutive_failures,
+            'next_retry_s': round(next_retry, 1),
+            'last_failure': self.last_failure,
+            'pipeline': self.camera.get_pipeline_stats()
+        }
@@ -4,33 +4,103 @@ Handles TCP server operations and client communication protocols.
 """
 
 # Standard library imports
+import asyncio
+import concurrent.futures
 import json
 import logging
-import random
 import socket
 import struct
-import threading
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List, Set, Tuple
+
+# Unsent bytes in a socket's kernel send queue (Linux only)
+try:
+    import fcntl
+    import termios
+    SIOCOUTQ: Optional[int] = termios.TIOCOUTQ
+except (ImportError, AttributeError):
+    SIOCOUTQ = None
 
 # Third-party imports
 
 # Local application imports
-from .camera_model import CameraModel
+from protocol import codec
+from protocol.heartbeat import RTT_BUCKETS, RttWindow
+from protocol.parser import FrameParser, Frame, READ_CHUNK_SIZE
+from .broadcast_model import (
+    BroadcastModel,
+    BroadcastSubscriber,
+    POLICY_DISCONNECT,
+    POLICY_DROP_OLDEST,
+    SLOW_CONSUMER_POLICIES,
+    SlowConsumerError
+)
+from .camera_pool_model import CameraPipeline, CameraPool, CameraPoolError
+from .deadband_model import DeadbandFilter
+from .history_model import SampleHistory
+from .metrics_model import CounterValue, MetricsRegistry
+from .multicast_model import MulticastError, MulticastPublisher
+from .profile_model import ProfileError
+from .recorder_model import RecorderError, SampleRecorder
+from .scheduler_model import DeadlineScheduler
+from .source_model import SampleSource, SyntheticSource
+from .worker_model import WorkerHub, WorkerLink
 
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Sampler tick lateness buckets in seconds
+TICK_LATENESS_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                         0.025, 0.05, 0.1)
+
+# Seconds between lag checks while a lagging client's socket drains
+LAG_POLL_INTERVAL = 0.05
+
+
+def client_label(writer: asyncio.StreamWriter) -> str:
+    """
+    Label a client connection by its peer address.
+    
+    Args:
+        writer: Stream writer for the client connection
+        
+    Returns:
+        str: 'host:port' of the peer
+    """
+    addr = writer.get_extra_info('peername')
+    return f"{addr[0]}:{addr[1]}" if isinstance(addr, tuple) else str(addr)
+
 
 class TCPServerError(Exception):
     """Raised when TCP server operations fail."""
     pass
 
 
-class ProtocolError(Exception):
-    """Raised when communication protocol errors occur."""
-    pass
+class ClientMetrics:
+    """
+    Per-client send counters, bound once when the client connects, and
+    the client's heartbeat round-trip times.
+    """
+
+    def __init__(self, label: str, packets: CounterValue, bytes_: CounterValue,
+                 blocked: CounterValue):
+        """
+        Initialize client metrics.
+        
+        Args:
+            label: Client label, 'host:port'
+            packets: Packets written to the client
+            bytes_: Bytes written to the client
+            blocked: Seconds spent waiting for the client socket to drain
+        """
+        self.label = label
+        self.packets = packets
+        self.bytes = bytes_
+        self.blocked = blocked
+        self.rtt = RttWindow()
+        # Monotonic time of the last heartbeat answer, None if never answered
+        self.last_pong: Optional[float] = None
 
 
 class TCPServerModel:
@@ -38,15 +108,39 @@ class TCPServerModel:
     Base class for TCP servers following the communication protocol.
     
     Provides common functionality for packet handling and client management.
+    Clients are served as coroutines on a shared asyncio event loop instead
+    of one OS thread per connection.
+    
+    Every client is pinged (ID 0x08) each heartbeat_interval seconds and
+    the answers are timed. A client that answered once but stays silent
+    for heartbeat_timeout seconds is disconnected; clients that never
+    answer pings are not held to the timeout. Pings and clock sync
+    requests (ID 0x09) from clients are answered by the handlers through
+    handle_control().
     """
 
-    def __init__(self, host: str = '0.0.0.0', port: int = 5000):
+    # Label identifying the server in metrics
+    server_name = 'tcp'
+
+    # Whether connections are pinged; off for short-lived ones
+    pings_clients = True
+
+    # Data stream subscribers by connection, shared by every server of the
+    # process since multiplexed connections are written by several of them
+    _stream_subscribers: Dict[asyncio.StreamWriter, BroadcastSubscriber] = {}
+
+    def __init__(self, host: str = '0.0.0.0', port: int = 5000, backlog: int = 128,
+                 metrics: Optional[MetricsRegistry] = None, reuse_port: bool = False):
         """
         Initialize TCP server.
         
         Args:
             host: Server host address
             port: Server port number
+            backlog: Maximum number of pending connections in the listen queue
+            metrics: Optional registry shared with other servers
+            reuse_port: Share the port with other processes (SO_REUSEPORT),
+                the kernel spreading new connections across them
             
         Raises:
             TCPServerError: If server cannot be initialized
@@ -54,15 +148,74 @@ class TCPServerModel:
         try:
             self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if reuse_port:
+                if not hasattr(socket, 'SO_REUSEPORT'):
+                    raise OSError("SO_REUSEPORT is not supported on this platform")
+                self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
             self.server.bind((host, port))
-            self.server.listen(1)
+            self.server.listen(backlog)
+            self.server.setblocking(False)
             self.running = True
             self.host = host
             self.port = port
-            logger.info(f"TCP Server initialized on {host}:{port}")
+            self.backlog = backlog
+            self.loop: Optional[asyncio.AbstractEventLoop] = None
+            self._async_server: Optional[asyncio.AbstractServer] = None
+            self._client_tasks: Set[asyncio.Task] = set()
+            self.heartbeat_interval = 1.0
+            self.heartbeat_timeout = 10.0
+            logger.info(f"TCP Server initialized on {host}:{port} (backlog {backlog})")
         except OSError as e:
             logger.error(f"Failed to initialize TCP server: {e}")
             raise TCPServerError(f"Server initialization failed: {e}")
+        self._init_metrics(metrics or MetricsRegistry())
+
+    def _init_metrics(self, registry: MetricsRegistry) -> None:
+        """
+        Register connection and send metrics labelled with this server.
+        
+        Args:
+            registry: Metrics registry
+        """
+        self.metrics = registry
+        server = self.server_name
+        self._connections = registry.counter(
+            'es_connections_total', 'Client connections accepted', ('server',)
+        ).labels(server)
+        self._active_connections = registry.gauge(
+            'es_connections_active', 'Clients currently connected', ('server',)
+        ).labels(server)
+        self._packets_sent = registry.counter(
+            'es_packets_sent_total', 'Packets written to clients', ('server',)
+        ).labels(server)
+        self._bytes_sent = registry.counter(
+            'es_bytes_sent_total', 'Bytes written to clients', ('server',)
+        ).labels(server)
+        self._send_blocked = registry.histogram(
+            'es_send_blocked_seconds',
+            'Time spent waiting for a client socket to drain', ('server',)
+        ).labels(server)
+        self._client_packets = registry.counter(
+            'es_client_packets_sent_total', 'Packets written per client',
+            ('server', 'client')
+        )
+        self._client_bytes = registry.counter(
+            'es_client_bytes_sent_total', 'Bytes written per client',
+            ('server', 'client')
+        )
+        self._client_blocked = registry.counter(
+            'es_client_send_blocked_seconds_total',
+            'Time spent waiting for the client socket to drain', ('server', 'client')
+        )
+        self._rtt = registry.histogram(
+            'es_rtt_seconds', 'Heartbeat round-trip time to clients', ('server',),
+            buckets=RTT_BUCKETS
+        ).labels(server)
+        self._heartbeat_timeouts = registry.counter(
+            'es_heartbeat_timeouts_total',
+            'Clients disconnected for missing heartbeats', ('server',)
+        ).labels(server)
+        self._clients: Dict[asyncio.StreamWriter, ClientMetrics] = {}
 
     def calculate_checksum(self, data: bytes) -> int:
         """
@@ -74,129 +227,1175 @@ class TCPServerModel:
         Returns:
             int: Calculated checksum value
         """
-        result = 0
-        for b in data:
-            result ^= b
-        return result
+        return codec.checksum(data)
+
+    async def start_serving(self) -> None:
+        """
+        Register the listening socket on the running event loop.
+        
+        Must be awaited on the event loop that will serve the clients.
+        """
+        self.loop = asyncio.get_running_loop()
+        self._async_server = await asyncio.start_server(
+            self._on_client_connected,
+            sock=self.server,
+            backlog=self.backlog
+        )
+        logger.info(f"Starting TCP server on {self.host}:{self.port}")
+
+    async def stop_serving(self) -> None:
+        """Stop accepting clients and cancel all running client handlers."""
+        self.running = False
+        if self._async_server:
+            self._async_server.close()
+        for task in list(self._client_tasks):
+            task.cancel()
+        if self._client_tasks:
+            await asyncio.gather(*self._client_tasks, return_exceptions=True)
+        if self._async_server:
+            await self._async_server.wait_closed()
+            self._async_server = None
+
+    async def serve_forever(self) -> None:
+        """Serve clients until the server is stopped."""
+        await self.start_serving()
+        try:
+            while self.running:
+                await asyncio.sleep(0.5)
+        finally:
+            await self.stop_serving()
 
     def run(self) -> None:
         """
         Start server and handle incoming connections.
         
-        Creates daemon threads for each client connection.
+        Runs a private event loop; use start_serving() to share a loop
+        with other servers instead.
         """
-        logger.info(f"Starting TCP server on {self.host}:{self.port}")
-        while self.running:
+        try:
+            asyncio.run(self.serve_forever())
+        except Exception as e:
+            logger.error(f"Unexpected error in server loop: {e}")
+        finally:
+            self.cleanup()
+
+    async def _on_client_connected(self, reader: asyncio.StreamReader,
+                                   writer: asyncio.StreamWriter) -> None:
+        """
+        Track a new client connection and dispatch it to handle_client.
+        
+        Args:
+            reader: Stream reader for the client connection
+            writer: Stream writer for the client connection
+        """
+        addr = writer.get_extra_info('peername')
+        logger.info(f"Client connected from {addr}")
+        task = asyncio.current_task()
+        self._client_tasks.add(task)
+        self._track_client(writer)
+        heartbeat = (asyncio.create_task(self._heartbeat(writer, task))
+                     if self.pings_clients else None)
+        try:
+            await self.handle_client(reader, writer)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Unexpected error handling client {addr}: {e}")
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+            self._client_tasks.discard(task)
+            self._forget_client(writer)
+            writer.close()
             try:
-                client_socket, addr = self.server.accept()
-                logger.info(f"Client connected from {addr}")
-                client_thread = threading.Thread(
-                    target=self.handle_client, 
-                    args=(client_socket,), 
-                    daemon=True
-                )
-                client_thread.start()
-            except OSError:
-                if self.running:
-                    logger.error("Server socket error occurred")
-                break
-            except Exception as e:
-                logger.error(f"Unexpected error in server loop: {e}")
-                break
-        self.cleanup()
+                await writer.wait_closed()
+            except (OSError, asyncio.CancelledError):
+                pass
+
+    async def _heartbeat(self, writer: asyncio.StreamWriter,
+                         handler: asyncio.Task) -> None:
+        """
+        Ping a client until it disconnects, dropping it once its answers stop.
+        
+        Args:
+            writer: Stream writer for the client connection
+            handler: Task serving the connection, cancelled on timeout
+        """
+        client = self._clients.get(writer)
+        while not writer.is_closing():
+            interval = self.heartbeat_interval
+            await asyncio.sleep(interval if interval > 0 else 1.0)
+            if interval <= 0 or writer.is_closing():
+                continue
+            timeout = self.heartbeat_timeout
+            if (client is not None and client.last_pong is not None
+                    and 0 < timeout < time.monotonic() - client.last_pong):
+                logger.warning(f"Client {client.label} stopped answering heartbeats, "
+                               f"disconnecting")
+                self._heartbeat_timeouts.inc()
+                handler.cancel()
+                return
+            self.write_packet(writer, codec.encode_ping(time.monotonic_ns()))
+
+    def handle_control(self, writer: asyncio.StreamWriter, frame: Frame) -> bool:
+        """
+        Handle a link control frame: a heartbeat or clock sync request.
+        
+        Args:
+            writer: Stream writer for the client connection
+            frame: Packet ID, type and payload view
+            
+        Returns:
+            bool: True if the frame was a control frame and needs no more handling
+        """
+        if frame[0] == codec.ID_PING:
+            self._handle_ping(writer, frame)
+            return True
+        if frame[0] == codec.ID_CLOCK:
+            self._handle_clock_request(writer, frame)
+            return True
+        return False
+
+    def _handle_clock_request(self, writer: asyncio.StreamWriter, frame: Frame) -> None:
+        """
+        Answer a clock sync request with the server's wall clock.
+        
+        Args:
+            writer: Stream writer for the client connection
+            frame: Packet ID, type and payload view
+        """
+        received_us = time.time_ns() // 1000
+        _, typ, payload = frame
+        if typ != codec.TYPE_COMMAND:
+            return
+        try:
+            t1_us = codec.decode_clock_request(payload)
+        except codec.ProtocolError as e:
+            logger.warning(f"Invalid clock sync request: {e}")
+            return
+        self.write_packet(writer, codec.encode_clock_response(
+            t1_us, received_us, time.time_ns() // 1000))
+
+    def _handle_ping(self, writer: asyncio.StreamWriter, frame: Frame) -> None:
+        """
+        Answer a client's ping or time the answer to one of ours.
+        
+        Args:
+            writer: Stream writer for the client connection
+            frame: Packet ID, type and payload view
+        """
+        _, typ, payload = frame
+        try:
+            token = codec.decode_ping(payload)
+        except codec.ProtocolError as e:
+            logger.warning(f"Invalid heartbeat: {e}")
+            return
+        if typ == codec.TYPE_COMMAND:
+            self.write_packet(writer, codec.encode_ping(token, codec.TYPE_RESPONSE))
+        elif typ == codec.TYPE_RESPONSE:
+            rtt = (time.monotonic_ns() - token) / 1e9
+            self._rtt.observe(rtt)
+            client = self._clients.get(writer)
+            if client is not None:
+                client.rtt.add(rtt)
+                client.last_pong = time.monotonic()
+
+    def set_heartbeat(self, interval: Optional[float] = None,
+                      timeout: Optional[float] = None) -> None:
+        """
+        Update the heartbeat of new and connected clients.
+        
+        Args:
+            interval: Seconds between pings, 0 stops pinging
+            timeout: Seconds without answers after which a client is
+                dropped, 0 never drops
+            
+        Raises:
+            ValueError: If a value is negative
+        """
+        if ((interval is not None and interval < 0)
+                or (timeout is not None and timeout < 0)):
+            raise ValueError("Heartbeat interval and timeout must not be negative")
+        if interval is not None:
+            self.heartbeat_interval = interval
+        if timeout is not None:
+            self.heartbeat_timeout = timeout
+
+    def get_link_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get the heartbeat round-trip times of every client.
+        
+        Returns:
+            List[Dict[str, Any]]: Client label, RTT statistics in ms and
+            seconds since the last heartbeat answer (None if never answered)
+        """
+        now = time.monotonic()
+        return [{
+            'client': client.label,
+            'rtt': client.rtt.get_stats(),
+            'last_pong_s': (round(now - client.last_pong, 3)
+                            if client.last_pong else None)
+        } for client in list(self._clients.values())]
+
+    def _track_client(self, writer: asyncio.StreamWriter) -> None:
+        """
+        Count a new connection and bind its per-client metrics.
+        
+        Args:
+            writer: Stream writer for the client connection
+        """
+        label = client_label(writer)
+        self._clients[writer] = ClientMetrics(
+            label,
+            self._client_packets.labels(self.server_name, label),
+            self._client_bytes.labels(self.server_name, label),
+            self._client_blocked.labels(self.server_name, label)
+        )
+        self._connections.inc()
+        self._active_connections.inc()
+
+    def _forget_client(self, writer: asyncio.StreamWriter) -> None:
+        """
+        Drop the per-client metrics of a disconnected client.
+        
+        Args:
+            writer: Stream writer for the client connection
+        """
+        client = self._clients.pop(writer, None)
+        if client is None:
+            return
+        self._active_connections.dec()
+        for family in (self._client_packets, self._client_bytes, self._client_blocked):
+            family.remove(self.server_name, client.label)
+
+    def write_packets(self, writer: asyncio.StreamWriter, packets: List[bytes],
+                      stream: bool = False) -> None:
+        """
+        Write encoded packets to a client and count them.
+        
+        Packets outside the data stream are also counted by the client's
+        stream subscriber, if any, as they share its socket buffers.
+        
+        Args:
+            writer: Stream writer for the client connection
+            packets: Encoded packets
+            stream: True for packets taken from the client's subscriber
+        """
+        writer.writelines(packets)
+        count = len(packets)
+        size = sum(map(len, packets))
+        subscriber = self._stream_subscribers.get(writer)
+        if subscriber is not None and not stream:
+            subscriber.count_bytes(size)
+        self._packets_sent.inc(count)
+        self._bytes_sent.inc(size)
+        client = self._clients.get(writer)
+        if client is not None:
+            client.packets.inc(count)
+            client.bytes.inc(size)
+
+    def write_packet(self, writer: asyncio.StreamWriter, packet: bytes) -> None:
+        """
+        Write one encoded packet to a client and count it.
+        
+        Args:
+            writer: Stream writer for the client connection
+            packet: Encoded packet
+        """
+        self.write_packets(writer, [packet])
+
+    async def drain(self, writer: asyncio.StreamWriter) -> None:
+        """
+        Wait until the client's send buffer drains, timing the wait.
+        
+        Args:
+            writer: Stream writer for the client connection
+        """
+        start = time.monotonic()
+        try:
+            await writer.drain()
+        finally:
+            blocked = time.monotonic() - start
+            self._send_blocked.observe(blocked)
+            client = self._clients.get(writer)
+            if client is not None:
+                client.blocked.inc(blocked)
+
+    async def read_frame(self, reader: asyncio.StreamReader,
+                         parser: FrameParser) -> Optional[Frame]:
+        """
+        Read the next complete frame from a client stream.
+        
+        Bytes are accumulated in the parser, so frames split across TCP
+        segments are reassembled and corrupt bytes are skipped.
+        
+        Args:
+            reader: Stream reader for the client connection
+            parser: Frame parser holding this connection's buffered bytes
+            
+        Returns:
+            Optional[Frame]: Packet ID, type and payload view, or None if
+            the client disconnected
+        """
+        while True:
+            errors = parser.checksum_errors
+            frame = parser.next_frame()
+            if parser.checksum_errors != errors:
+                logger.warning(f"Discarded corrupt packet on port {self.port}")
+            if frame is not None:
+                return frame
+            chunk = await reader.read(READ_CHUNK_SIZE)
+            if not chunk:
+                return None
+            parser.feed(chunk)
+
+    async def handle_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        """
+        Handle individual client connection.
+        
+        Args:
+            reader: Stream reader for the client connection
+            writer: Stream writer for the client connection
+            
+        Note:
+            This method should be overridden by subclasses
+        """
+        raise NotImplementedError("Subclasses must implement handle_client method")
+
+    def get_client_count(self) -> int:
+        """
+        Get the number of currently connected clients.
+        
+        Returns:
+            int: Number of active client handlers
+        """
+        return len(self._client_tasks)
+
+    def cleanup(self) -> None:
+        """Clean up server resources."""
+        self.running = False
+        try:
+            loop = self.loop
+            if loop and loop.is_running() and not self._in_loop_thread(loop):
+                future = asyncio.run_coroutine_threadsafe(self.stop_serving(), loop)
+                future.result(timeout=5.0)
+            self.server.close()
+            logger.info("TCP server closed successfully")
+        except Exception as e:
+            logger.error(f"Error during server cleanup: {e}")
+
+    def _in_loop_thread(self, loop: asyncio.AbstractEventLoop) -> bool:
+        """
+        Check whether the caller is running on the given loop.
+        
+        Args:
+            loop: Event loop to compare against
+            
+        Returns:
+            bool: True if called from within the loop
+        """
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
+
+
+class DataServerModel(TCPServerModel):
+    """
+    Handles numeric data streaming to clients.
+    
+    A single sampler, clocked by a drift-free deadline scheduler (24 Hz by
+    default), pulls samples from a sample source (random values by
+    default), encodes each packet once and publishes it to a shared ring
+    buffer from which every connected client is fed the same bytes.
+    
+    When the sample rate allows more than one sample within the latency
+    budget, samples are grouped into batch packets (ID 0x03) instead of
+    one single-sample packet (ID 0x01) each.
+    
+    Every batch is also published, in lockstep, as a compact packet (ID
+    0x0A) of varint timestamp deltas referenced to the previous packet's
+    last sample. A client selects the compact encoding with an encoding
+    command (ID 0x0A) and is switched over at the same sequence number;
+    the first packet after a gap in its stream, and after the switch, is
+    re-encoded as a key packet carrying its own reference timestamp.
+    
+    A client may also select change-only mode with a deadband command (ID
+    0x0B): its stream then only carries samples whose value moved beyond
+    the deadband, plus a keepalive sample whenever keepalive_ms passed
+    without one, encoded for that client alone.
+    
+    Every client has a bounded backlog of client_queue_size packets with
+    a slow client policy (drop_oldest, conflate or disconnect). Lag counts
+    data still queued in socket buffers; while a client lags more than
+    max_client_lag seconds nothing more is written to it, so its backlog
+    overflows into the policy instead of piling up stale data in the
+    kernel. Clients lagging slow_client_timeout seconds are disconnected
+    whatever the policy.
+    
+    With a multicast publisher every packet's samples are also sent once
+    to a UDP multicast group, for any number of viewers. With a recorder
+    every emitted sample is appended to a rotating sample log.
+    
+    With a sample history the latest samples are kept in memory, and a
+    client may send a backfill command (ID 0x07) for the last N
+    milliseconds or everything after a timestamp. The answer holds only
+    samples published before the client's live stream started, so it
+    joins the live samples without duplicates.
+    
+    In multi-process mode the owner process forwards every emitted batch
+    to the worker processes, whose data servers run no sampler of their
+    own and publish the forwarded batches with publish_samples().
+    """
+
+    server_name = 'data'
+
+    def __init__(self, host: str = '0.0.0.0', port: int = 5000, backlog: int = 128,
+                 ring_capacity: int = 256,
+                 scheduler: Optional[DeadlineScheduler] = None,
+                 latency_budget_ms: float = 50.0,
+                 camera_pool: Optional[CameraPool] = None,
+                 metrics: Optional[MetricsRegistry] = None, client_queue_size: int = 48,
+                 slow_client_policy: str = POLICY_DROP_OLDEST,
+                 max_client_lag: float = 1.0, slow_client_timeout: float = 10.0,
+                 multicast: Optional[MulticastPublisher] = None,
+                 source: Optional[SampleSource] = None,
+                 recorder: Optional[SampleRecorder] = None,
+                 history: Optional[SampleHistory] = None,
+                 workers: Optional[WorkerHub] = None, sampler: bool = True,
+                 reuse_port: bool = False):
+        """
+        Initialize data server.
+        
+        Args:
+            host: Server host address  
+            port: Server port number
+            backlog: Maximum number of pending connections
+            ring_capacity: Number of encoded packets kept for client streams
+            scheduler: Optional scheduler driving the sampler (24 Hz default)
+            latency_budget_ms: Maximum time a sample may wait for its batch
+            camera_pool: Optional camera pool to stream (one default camera)
+            metrics: Optional registry shared with other servers
+            client_queue_size: Maximum backlog per client in packets
+            slow_client_policy: 'drop_oldest', 'conflate' or 'disconnect'
+            max_client_lag: Seconds of lag after which writes are held back
+            slow_client_timeout: Seconds of lag after which a client is dropped
+            multicast: Optional publisher also sending samples to a multicast group
+            source: Sample source, random values 0-10 one per tick if omitted
+            recorder: Optional recorder logging every emitted sample
+            history: Optional ring of recent samples served to backfill requests
+            workers: Optional worker processes every emitted batch is forwarded to
+            sampler: Run the sampler; off in worker processes, which only
+                publish the batches forwarded by the owner
+            reuse_port: Share the port with other processes (SO_REUSEPORT)
+            
+        Raises:
+            TCPServerError: If the slow client policy is unknown
+        """
+        if slow_client_policy not in SLOW_CONSUMER_POLICIES:
+            raise TCPServerError(f"Unknown slow client policy: {slow_client_policy}")
+        super().__init__(host, port, backlog, metrics, reuse_port)
+        self.camera_pool = camera_pool or CameraPool()
+        self.broadcaster = BroadcastModel(ring_capacity)
+        # Same packets in the compact encoding, published in lockstep
+        self.compact_broadcaster = BroadcastModel(ring_capacity)
+        # Samples of each ring slot, for key packets and change-only streams
+        self._published_samples: List[List[Tuple[int, int]]] = [[]] * ring_capacity
+        self._last_timestamp_ms: Optional[int] = None
+        self._encodings: Dict[asyncio.StreamWriter, int] = {}
+        self._deadbands: Dict[asyncio.StreamWriter, DeadbandFilter] = {}
+        self.scheduler = scheduler or DeadlineScheduler(rate_hz=24.0)
+        self.latency_budget_ms = latency_budget_ms
+        self.batch_size = self._calculate_batch_size()
+        self.client_queue_size = min(client_queue_size, ring_capacity)
+        self.slow_client_policy = slow_client_policy
+        self.max_client_lag = max_client_lag
+        self.slow_client_timeout = slow_client_timeout
+        self.multicast = multicast
+        self.source = source or SyntheticSource()
+        self.recorder = recorder
+        self.history = history
+        self.workers = workers
+        self.sampler = sampler
+        self._subscribers: Dict[asyncio.StreamWriter, BroadcastSubscriber] = {}
+        # History index at which each client's live stream started
+        self._history_marks: Dict[asyncio.StreamWriter, int] = {}
+        self._pending_samples: List[Tuple[int, int]] = []
+        self._sampler_task: Optional[asyncio.Task] = None
+        self._send_latency = self.metrics.histogram(
+            'es_send_latency_seconds',
+            'Time from publishing a packet until a client took it', ('server',)
+        ).labels(self.server_name)
+        self._packets_skipped = self.metrics.counter(
+            'es_packets_skipped_total', 'Packets a slow client never received',
+            ('server',)
+        ).labels(self.server_name)
+        self._slow_disconnects = self.metrics.counter(
+            'es_slow_client_disconnects_total', 'Clients disconnected for lagging',
+            ('server',)
+        ).labels(self.server_name)
+        self._client_lag = self.metrics.gauge(
+            'es_client_lag_seconds', 'Age of the oldest data a client has not received',
+            ('server', 'client')
+        )
+        self._client_backlog = self.metrics.gauge(
+            'es_client_backlog_packets',
+            'Packets published but not yet written to a client', ('server', 'client')
+        )
+        self._tick_lateness = self.metrics.histogram(
+            'es_sampler_tick_lateness_seconds',
+            'Delay of sampler ticks behind their deadline',
+            buckets=TICK_LATENESS_BUCKETS
+        ).labels()
+        self._backfill_requests = self.metrics.counter(
+            'es_backfill_requests_total', 'Backfill requests answered', ('server',)
+        ).labels(self.server_name)
+        self._backfill_samples = self.metrics.counter(
+            'es_backfill_samples_total', 'Samples sent in backfill answers', ('server',)
+        ).labels(self.server_name)
+
+    def start_camera_streaming(self) -> None:
+        """Start camera streaming when server starts."""
+        self.camera_pool.start_cameras()
+        for pipeline in self.camera_pool:
+            logger.info(f"Camera {pipeline.camera.index} streaming at "
+                        f"{pipeline.camera.stream_config['rtsp_url']}")
+
+    async def start_serving(self) -> None:
+        """
+        Open the sample source, start accepting clients and launch the sampler.
+        
+        Raises:
+            SourceError: If the sample source cannot be opened
+        """
+        if self.sampler:
+            self.source.open()
+        await super().start_serving()
+        if self.multicast:
+            try:
+                self.multicast.open()
+            except MulticastError as e:
+                # TCP clients are still served; multicast viewers get nothing
+                logger.error(f"Multicast unavailable: {e}")
+        if self.recorder:
+            try:
+                self.recorder.open()
+            except RecorderError as e:
+                logger.error(f"Sample recording unavailable: {e}")
+                self.recorder = None
+        if self.sampler:
+            self._sampler_task = asyncio.create_task(self._run_sampler())
+
+    async def stop_serving(self) -> None:
+        """Stop the sampler and all client streams."""
+        if self._sampler_task:
+            self._sampler_task.cancel()
+            await asyncio.gather(self._sampler_task, return_exceptions=True)
+            self._sampler_task = None
+        if self.multicast:
+            self.multicast.close()
+        if self.recorder:
+            self.recorder.close()
+        if self.sampler:
+            self.source.close()
+        await super().stop_serving()
+
+    async def _run_sampler(self) -> None:
+        """Run the sampler on the deadline scheduler until stopped."""
+        logger.info("Data sampler started")
+        await self.scheduler.run(self._on_sample_tick)
+
+    def _calculate_batch_size(self) -> int:
+        """
+        Choose how many samples go into one packet.
+        
+        Returns:
+            int: Samples per packet that fit the latency budget
+        """
+        samples_in_budget = int(self.scheduler.rate_hz
+                                * self.latency_budget_ms / 1000.0)
+        return max(1, min(codec.MAX_BATCH_SAMPLES, samples_in_budget))
+
+    def set_latency_budget(self, latency_budget_ms: float) -> None:
+        """
+        Update the batching latency budget.
+        
+        Args:
+            latency_budget_ms: Maximum time a sample may wait for its batch
+        """
+        self.latency_budget_ms = latency_budget_ms
+        self.batch_size = self._calculate_batch_size()
+        logger.info(f"Data batch size set to {self.batch_size} samples")
+
+    def set_sample_rate(self, rate_hz: float) -> None:
+        """
+        Change the sampler rate and resize batches to the latency budget.
+        
+        Args:
+            rate_hz: New sample rate in Hz
+            
+        Raises:
+            SchedulerError: If the rate is out of range
+        """
+        self.scheduler.set_rate(rate_hz)
+        self.set_latency_budget(self.latency_budget_ms)
+        # Held values of change-only clients now stand for differently spaced samples
+        for writer, deadband in self._deadbands.items():
+            self.write_packet(writer, self._encode_deadband_state(
+                True, deadband.deadband, deadband.keepalive_ms))
+
+    def set_slow_client_options(self, client_queue_size: Optional[int] = None,
+                                slow_client_policy: Optional[str] = None,
+                                max_client_lag: Optional[float] = None,
+                                slow_client_timeout: Optional[float] = None) -> None:
+        """
+        Update the slow client limits of new and connected clients.
+        
+        Args:
+            client_queue_size: Maximum backlog per client in packets
+            slow_client_policy: 'drop_oldest', 'conflate' or 'disconnect'
+            max_client_lag: Seconds of lag after which writes are held back
+            slow_client_timeout: Seconds of lag after which a client is dropped
+            
+        Raises:
+            TCPServerError: If the slow client policy is unknown
+        """
+        if slow_client_policy is not None:
+            if slow_client_policy not in SLOW_CONSUMER_POLICIES:
+                raise TCPServerError(f"Unknown slow client policy: "
+                                     f"{slow_client_policy}")
+            self.slow_client_policy = slow_client_policy
+        if client_queue_size is not None:
+            self.client_queue_size = max(1, min(client_queue_size,
+                                                self.broadcaster.ring.capacity))
+        if max_client_lag is not None:
+            self.max_client_lag = max_client_lag
+        if slow_client_timeout is not None:
+            self.slow_client_timeout = slow_client_timeout
+        for subscriber in self._subscribers.values():
+            subscriber.max_queue = self.client_queue_size
+            subscriber.policy = self.slow_client_policy
+        logger.info(f"Slow client limits: {self.client_queue_size} packets, "
+                    f"{self.slow_client_policy}, lag {self.max_client_lag:g} s, "
+                    f"timeout {self.slow_client_timeout:g} s")
+
+    def _on_sample_tick(self, tick: int, deadline: float) -> None:
+        """
+        Pull the tick's samples from the source and publish full batches.
+        
+        Args:
+            tick: Index of the scheduler tick
+            deadline: Scheduled tick time on the loop clock
+        """
+        self._tick_lateness.observe(max(0.0, self.loop.time() - deadline))
+        # Stamp with the scheduled time so samples stay evenly spaced
+        timestamp_ms = self.scheduler.deadline_to_wall_ms(deadline)
+        try:
+            self._pending_samples.extend(self.source.read(timestamp_ms))
+        except Exception as e:
+            logger.error(f"Sample source read failed: {e}")
+        if len(self._pending_samples) >= self.batch_size:
+            self._flush_samples()
+
+    def _flush_samples(self) -> None:
+        """Publish the pending samples."""
+        pending = self._pending_samples
+        self._pending_samples = []
+        if pending:
+            self.publish_samples(pending)
+
+    def publish_samples(self, pending: List[Tuple[int, int]]) -> None:
+        """
+        Record samples, encode them into packets and publish them.
+        
+        Args:
+            pending: (value, timestamp_ms) pairs in time order
+        """
+        if self.recorder:
+            self.recorder.write(pending)
+        if self.history is not None:
+            self.history.append(pending)
+        if self.workers:
+            self.workers.publish(pending)
+        # Sources delivering blocks may exceed one packet
+        for start in range(0, len(pending), codec.MAX_BATCH_SAMPLES):
+            samples = pending[start:start + codec.MAX_BATCH_SAMPLES]
+            if len(samples) == 1:
+                self.broadcaster.publish(self._create_data_packet(*samples[0]))
+            else:
+                self.broadcaster.publish(self._create_batch_packet(samples))
+            self._publish_compact(samples)
+            if self.multicast:
+                self.multicast.publish(samples)
+
+    def _publish_compact(self, samples: List[Tuple[int, int]]) -> None:
+        """
+        Publish samples to the compact broadcast, referenced to the last
+        timestamp of the previous packet.
+        
+        Args:
+            samples: (value, timestamp_ms) pairs in time order
+        """
+        packet = codec.encode_compact_samples(samples, self._last_timestamp_ms)
+        seq = self.compact_broadcaster.publish(packet)
+        self._published_samples[seq % self.compact_broadcaster.ring.capacity] = samples
+        self._last_timestamp_ms = samples[-1][1]
+
+    def _get_published_samples(self, seq: int, count: int) -> List[Tuple[int, int]]:
+        """
+        Get the samples of packets still held in the rings.
+        
+        Args:
+            seq: Sequence number of the first packet
+            count: Number of packets
+            
+        Returns:
+            List[Tuple[int, int]]: (value, timestamp_ms) pairs in time order
+        """
+        capacity = self.compact_broadcaster.ring.capacity
+        samples = []
+        for index in range(seq, seq + count):
+            samples.extend(self._published_samples[index % capacity])
+        return samples
+
+    def _create_compact_key(self, seq: int) -> bytes:
+        """
+        Re-encode a compact packet still held in the ring as a key packet.
+        
+        Args:
+            seq: Sequence number of the packet
+            
+        Returns:
+            bytes: Compact packet carrying its own reference timestamp
+        """
+        return codec.encode_compact_samples(self._get_published_samples(seq, 1))
+
+    def _get_last_published_ms(self, seq: int) -> Optional[int]:
+        """
+        Get the last timestamp of a packet, the reference of the next compact packet.
+        
+        Args:
+            seq: Sequence number of the packet
+            
+        Returns:
+            Optional[int]: Timestamp in ms, None if seq was never published
+        """
+        if seq < 0:
+            return None
+        samples = self._published_samples[seq % self.compact_broadcaster.ring.capacity]
+        return samples[-1][1] if samples else None
+
+    def _encode_samples(self, samples: List[Tuple[int, int]], encoding: int,
+                        reference: Optional[int]) -> List[bytes]:
+        """
+        Encode samples for one client, as the sampler would have.
+        
+        Args:
+            samples: (value, timestamp_ms) pairs in time order
+            encoding: ENCODING_PLAIN or ENCODING_COMPACT
+            reference: Last timestamp of the compact packets written to the
+                client, None to start with a key packet
+                
+        Returns:
+            List[bytes]: Packets to write
+        """
+        packets = []
+        for start in range(0, len(samples), codec.MAX_BATCH_SAMPLES):
+            chunk = samples[start:start + codec.MAX_BATCH_SAMPLES]
+            if encoding == codec.ENCODING_COMPACT:
+                packets.append(codec.encode_compact_samples(chunk, reference))
+                reference = chunk[-1][1]
+            elif len(chunk) == 1:
+                packets.append(self._create_data_packet(*chunk[0]))
+            else:
+                packets.append(self._create_batch_packet(chunk))
+        return packets
+
+    def set_encoding(self, writer: asyncio.StreamWriter, payload: memoryview) -> None:
+        """
+        Select the encoding of a client's data stream from an encoding command.
+        
+        Takes effect at the stream's next packet. Also used by the
+        multiplexed server, before or after subscribing.
+        
+        Args:
+            writer: Stream writer for the client connection
+            payload: Encoding command payload
+        """
+        try:
+            encoding = codec.decode_stream_encoding(payload)
+        except codec.ProtocolError as e:
+            logger.warning(f"Invalid encoding command: {e}")
+            self.write_packet(writer, codec.encode_packet(codec.ID_DATA_COMPACT,
+                                                          codec.TYPE_ERROR,
+                                                          b'unknown encoding'))
+            return
+        self._encodings[writer] = encoding
+        logger.info(f"Data client selected "
+                    f"{'compact' if encoding else 'plain'} encoding")
+
+    def set_deadband(self, writer: asyncio.StreamWriter, payload: memoryview) -> None:
+        """
+        Turn a client's change-only mode on or off from a deadband command.
+        
+        Answers with the applied mode and the sample period, the spacing
+        of the samples a held value stands for. Takes effect at the
+        stream's next packet. Also used by the multiplexed server, before
+        or after subscribing.
+        
+        Args:
+            writer: Stream writer for the client connection
+            payload: Deadband command payload
+        """
+        try:
+            enabled, deadband, keepalive_ms = codec.decode_deadband_command(payload)
+        except codec.ProtocolError as e:
+            logger.warning(f"Invalid deadband command: {e}")
+            self.write_packet(writer, codec.encode_packet(codec.ID_DEADBAND,
+                                                          codec.TYPE_ERROR,
+                                                          b'invalid request'))
+            return
+        if enabled:
+            self._deadbands[writer] = DeadbandFilter(deadband, keepalive_ms)
+            logger.info(f"Data client selected change-only mode, deadband {deadband}, "
+                        f"keepalive {keepalive_ms} ms")
+        elif self._deadbands.pop(writer, None):
+            logger.info("Data client left change-only mode")
+        self.write_packet(writer,
+                          self._encode_deadband_state(enabled, deadband, keepalive_ms))
+
+    def _encode_deadband_state(self, enabled: bool, deadband: int,
+                               keepalive_ms: int) -> bytes:
+        """
+        Encode a change-only mode state with the source's sample period.
+        
+        Sources delivering blocks at their own rate space samples closer
+        than the sampler period; others produce one sample per tick.
+        
+        Args:
+            enabled: Whether change-only mode is on
+            deadband: Largest value change that is suppressed
+            keepalive_ms: Longest gap between passed samples
+            
+        Returns:
+            bytes: Encoded deadband state packet
+        """
+        period = self.source.get_sample_period() or self.scheduler.period
+        return codec.encode_deadband_state(enabled, deadband, keepalive_ms,
+                                           int(period * 1e6))
+
+    def forget_stream_options(self, writer: asyncio.StreamWriter) -> None:
+        """
+        Forget the encoding and change-only mode selected by a disconnected client.
+        
+        Args:
+            writer: Stream writer for the client connection
+        """
+        self._encodings.pop(writer, None)
+        self._deadbands.pop(writer, None)
+
+    def get_sampler_stats(self) -> Dict[str, Any]:
+        """
+        Get achieved sample rate, tick jitter and sample source counters.
+        
+        Returns:
+            Dict[str, Any]: Scheduler statistics plus the source's under 'source'
+        """
+        stats = self.scheduler.get_stats()
+        stats['source'] = self.source.get_stats()
+        return stats
+
+    def _create_data_packet(self, value: int, timestamp_ms: int) -> bytes:
+        """
+        Encode a single data sample packet.
+        
+        Args:
+            value: Sample value (0-255)
+            timestamp_ms: Sample timestamp in milliseconds
+            
+        Returns:
+            bytes: Complete data packet including checksum
+        """
+        return codec.encode_data_sample(value, timestamp_ms)
+
+    def _create_batch_packet(self, samples: List[Tuple[int, int]]) -> bytes:
+        """
+        Encode several samples into one batch packet.
+        
+        Args:
+            samples: (value, timestamp_ms) pairs in time order
+            
+        Returns:
+            bytes: Complete batch packet including checksum
+        """
+        return codec.encode_data_batch(samples)
+
+    async def handle_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        """
+        Handle data streaming client connection.
+        
+        Packets are streamed while commands from the client, such as
+        backfill requests, are read alongside.
+        
+        Args:
+            reader: Stream reader for the client connection
+            writer: Stream writer for the client connection
+        """
+        client = self._clients.get(writer)
+        commands = asyncio.create_task(self._read_commands(reader, writer))
+        try:
+            await self.stream(writer, client.label if client else client_label(writer))
+        finally:
+            commands.cancel()
+            await asyncio.gather(commands, return_exceptions=True)
+            self.forget_stream_options(writer)
 
-    def handle_client(self, client_socket: socket.socket) -> None:
+    async def _read_commands(self, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter) -> None:
         """
-        Handle individual client connection.
+        Answer commands a data client sends until it stops sending.
         
         Args:
-            client_socket: Connected client socket
-            
-        Note:
-            This method should be overridden by subclasses
+            reader: Stream reader for the client connection
+            writer: Stream writer for the client connection
         """
-        raise NotImplementedError("Subclasses must implement handle_client method")
-
-    def cleanup(self) -> None:
-        """Clean up server resources."""
-        self.running = False
+        parser = FrameParser()
         try:
-            self.server.close()
-            logger.info("TCP server closed successfully")
-        except Exception as e:
-            logger.error(f"Error during server cleanup: {e}")
-
-
-class DataServerModel(TCPServerModel):
-    """
-    Handles numeric data streaming to clients.
-    
-    Sends continuous data packets with random values and timestamps
-    at 24 Hz frequency.
-    """
+            while self.running:
+                frame = await self.read_frame(reader, parser)
+                if frame is None:
+                    return
+                if self.handle_control(writer, frame):
+                    continue
+                id_, typ, payload = frame
+                if id_ == codec.ID_BACKFILL and typ == codec.TYPE_COMMAND:
+                    self.handle_backfill(writer, payload)
+                elif id_ == codec.ID_DATA_COMPACT and typ == codec.TYPE_COMMAND:
+                    self.set_encoding(writer, payload)
+                elif id_ == codec.ID_DEADBAND and typ == codec.TYPE_COMMAND:
+                    self.set_deadband(writer, payload)
+                else:
+                    logger.debug(f"Ignored data client frame ID={id_:02x}")
+        except (socket.error, ConnectionResetError):
+            pass
 
-    def __init__(self, host: str = '0.0.0.0', port: int = 5000):
+    def handle_backfill(self, writer: asyncio.StreamWriter,
+                        payload: memoryview) -> None:
         """
-        Initialize data server.
+        Answer a backfill request with the samples published before the
+        client's live stream started.
+        
+        The samples are sent as one backfill response (ID 0x07), or several
+        if they exceed one packet, and an empty response when there are
+        none. Also used by the multiplexed server.
         
         Args:
-            host: Server host address  
-            port: Server port number
+            writer: Stream writer for the client connection
+            payload: Backfill request payload
         """
-        super().__init__(host, port)
-        self.camera_mgr = CameraModel()
-
-    def start_camera_streaming(self) -> None:
-        """Start camera streaming when server starts."""
+        if self.history is None:
+            self.write_packet(writer, codec.encode_packet(codec.ID_BACKFILL,
+                                                          codec.TYPE_ERROR,
+                                                          b'history disabled'))
+            return
         try:
-            self.camera_mgr.start_camera()
-            logger.info("Camera streaming started for data server")
-            logger.info("Streaming available at rtsp://<IP_RPI>:8554/ES_MTX")
-        except Exception as e:
-            logger.error(f"Failed to start camera streaming: {e}")
+            kind, value = codec.decode_backfill_request(payload)
+        except codec.ProtocolError as e:
+            logger.warning(f"Invalid backfill request: {e}")
+            self.write_packet(writer, codec.encode_packet(codec.ID_BACKFILL,
+                                                          codec.TYPE_ERROR,
+                                                          b'invalid request'))
+            return
+        data = self.history.select(kind, value, self._history_marks.get(writer))
+        chunk = codec.MAX_BATCH_SAMPLES * codec.SAMPLE_SIZE
+        packets = [codec.encode_packet(codec.ID_BACKFILL, codec.TYPE_RESPONSE,
+                                       data[start:start + chunk])
+                   for start in range(0, len(data), chunk)]
+        self.write_packets(writer, packets or [
+            codec.encode_packet(codec.ID_BACKFILL, codec.TYPE_RESPONSE)])
+        self._backfill_requests.inc()
+        self._backfill_samples.inc(len(data) // codec.SAMPLE_SIZE)
+        logger.info(f"Backfilled {len(data) // codec.SAMPLE_SIZE} samples")
 
-    def handle_client(self, client_socket: socket.socket) -> None:
+    async def stream(self, writer: asyncio.StreamWriter, label: str) -> None:
         """
-        Handle data streaming client connection.
+        Stream data packets to a client until it disconnects or is cancelled.
+        
+        Streams shared packets from the broadcast ring, starting at the
+        live head when the stream starts, through a bounded subscriber,
+        from the compact broadcast once the client selected it. In
+        change-only mode the samples of the taken packets go through the
+        client's deadband filter and the ones passed are encoded for it
+        alone. Also used by the multiplexed server for subscribed sessions.
         
         Args:
-            client_socket: Connected client socket
+            writer: Stream writer for the client connection
+            label: Client label used in logs and metrics
         """
+        subscriber = BroadcastSubscriber(self.broadcaster, self.client_queue_size,
+                                         self.slow_client_policy)
+        self._subscribers[writer] = subscriber
+        self._stream_subscribers[writer] = subscriber
+        if self.history is not None:
+            self._history_marks[writer] = self.history.head
+        lag_gauge = self._client_lag.labels(self.server_name, label)
+        backlog_gauge = self._client_backlog.labels(self.server_name, label)
+        sock = writer.get_extra_info('socket')
+        encoding = codec.ENCODING_PLAIN
+        deadband: Optional[DeadbandFilter] = None
+        reference: Optional[int] = None  # Last timestamp of the compact packets written
+        first = 0  # Sequence number of the first packet taken
+
+        def rewrite(start: int, packets: List[bytes]) -> List[bytes]:
+            nonlocal reference, first
+            first = start
+            if deadband is not None:
+                samples = deadband.filter(
+                    self._get_published_samples(start, len(packets)))
+                if not samples:
+                    return []
+                packets = self._encode_samples(samples, encoding, reference)
+                reference = samples[-1][1]
+            elif encoding == codec.ENCODING_COMPACT:
+                if (reference is None
+                        or reference != self._get_last_published_ms(start - 1)):
+                    # The client lacks the previous packet's timestamp
+                    packets[0] = self._create_compact_key(start)
+                reference = self._get_last_published_ms(start + len(packets) - 1)
+            return packets
+
         try:
             while self.running:
-                # Generate data packet
-                random_value = random.randint(0, 10)
-                timestamp_ms = int(time.time() * 1000)
-                
-                # Create data packet structure
-                timestamp_bytes = struct.pack('>Q', timestamp_ms)
-                payload = bytes([random_value]) + timestamp_bytes
-                
-                packet = bytes([
-                    0x00,           # P
-                    0xFF,           # N
-                    0x01,           # ID (Data)
-                    0x00,           # Type (Response)
-                    0x00, 0x09      # Payload Length (9 bytes)
-                ]) + payload + bytes([0])
-                
-                # Calculate and append checksum
-                packet = packet[:-1] + bytes([self.calculate_checksum(packet[:-1])])
-                client_socket.send(packet)
-                time.sleep(1 / 24)  # 24 Hz frequency
+                await subscriber.wait()
+                options = (self._encodings.get(writer, codec.ENCODING_PLAIN),
+                           self._deadbands.get(writer))
+                if options != (encoding, deadband):
+                    encoding, deadband = options
+                    subscriber.follow(self.compact_broadcaster
+                                      if encoding == codec.ENCODING_COMPACT
+                                      else self.broadcaster)
+                    if deadband is not None:
+                        deadband.reset()
+                    reference = None
+                lag = subscriber.get_lag(self._get_unsent_bytes(writer, sock))
+                lag_gauge.set(lag)
+                if lag > self.max_client_lag:
+                    if self.slow_client_policy == POLICY_DISCONNECT:
+                        raise SlowConsumerError(f"{lag:.1f} s behind")
+                    if lag > self.slow_client_timeout:
+                        raise SlowConsumerError(f"stalled for {lag:.1f} s")
+
+                dropped = subscriber.dropped
+                if lag > self.max_client_lag:
+                    # Hold back until the socket drains; the policy trims the backlog
+                    subscriber.trim()
+                    packets = []
+                else:
+                    packets = subscriber.take(rewrite)
+                backlog_gauge.set(subscriber.backlog())
+                if subscriber.dropped != dropped:
+                    self._packets_skipped.inc(subscriber.dropped - dropped)
+                    logger.debug(f"Data client {label} fell behind, dropped "
+                                 f"{subscriber.dropped - dropped} packets")
+                if not packets:
+                    await asyncio.sleep(LAG_POLL_INTERVAL)
+                    continue
+                published = subscriber.broadcaster.get_publish_time(first)
+                self.write_packets(writer, packets, stream=True)
+                await self._drain_bounded(writer)
+                self._send_latency.observe(time.monotonic() - published)
 
+        except SlowConsumerError as e:
+            self._slow_disconnects.inc()
+            logger.warning(f"Disconnecting slow data client {label}: {e}")
         except (socket.error, ConnectionResetError) as e:
             logger.info(f"Data client disconnected: {e}")
         except Exception as e:
             logger.error(f"Error handling data client: {e}")
         finally:
-            client_socket.close()
+            self._subscribers.pop(writer, None)
+            self._stream_subscribers.pop(writer, None)
+            self._history_marks.pop(writer, None)
+            self._client_lag.remove(self.server_name, label)
+            self._client_backlog.remove(self.server_name, label)
+
+    async def _drain_bounded(self, writer: asyncio.StreamWriter) -> None:
+        """
+        Wait for the send buffer to drain, at most max_client_lag seconds.
+        
+        A stalled client must not park its handler in drain() forever, or
+        its lag would never be checked again.
+        
+        Args:
+            writer: Stream writer for the client connection
+        """
+        if writer.transport.get_write_buffer_size() == 0:
+            # Nothing buffered: returns at once but still surfaces a closed socket
+            await self.drain(writer)
+            return
+        try:
+            await asyncio.wait_for(self.drain(writer), self.max_client_lag)
+        except asyncio.TimeoutError:
+            pass
+
+    def _get_unsent_bytes(self, writer: asyncio.StreamWriter, sock: Any) -> int:
+        """
+        Get the bytes written to a client that it has not received yet.
+        
+        Args:
+            writer: Stream writer for the client connection
+            sock: Client socket
+            
+        Returns:
+            int: Bytes in the transport buffer plus, on Linux, the kernel
+            send queue
+        """
+        unsent = writer.transport.get_write_buffer_size()
+        if SIOCOUTQ is not None and sock is not None:
+            try:
+                queued = fcntl.ioctl(sock.fileno(), SIOCOUTQ, b'\0\0\0\0')
+                unsent += struct.unpack('i', queued)[0]
+            except (OSError, ValueError):  # ValueError: socket already closed
+                pass
+        return unsent
+
+    def get_client_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get lag and backlog of every data client.
+        
+        Lag is the value measured at the client's last wake-up.
+        
+        Returns:
+            List[Dict[str, Any]]: Client label, lag in seconds, backlog in
+            packets, packets dropped by the slow client policy, bytes
+            sent, stream encoding, change-only filter counters (None when
+            off) and median RTT in ms
+        """
+        stats = []
+        for writer, subscriber in list(self._subscribers.items()):
+            client = self._clients.get(writer)
+            stats.append({
+                'client': client.label if client else client_label(writer),
+                'lag_s': round(subscriber.lag, 3),
+                'backlog': subscriber.backlog(),
+                'dropped': subscriber.dropped,
+                'bytes_sent': subscriber.bytes_written,
+                'encoding': ('compact'
+                             if subscriber.broadcaster is self.compact_broadcaster
+                             else 'plain'),
+                'deadband': (self._deadbands[writer].get_stats()
+                             if writer in self._deadbands else None),
+                'rtt_ms': client.rtt.get_stats()['p50_ms'] if client else None
+            })
+        return stats
 
     def cleanup(self) -> None:
         """Clean up data server resources including camera."""
         super().cleanup()
         try:
-            self.camera_mgr.stop_camera()
+            self.camera_pool.stop_cameras()
             logger.info("Camera streaming stopped")
         except Exception as e:
             logger.error(f"Error stopping camera: {e}")
@@ -209,55 +1408,62 @@ class SettingsServerModel(TCPServerModel):
     Processes settings queries and configuration updates from clients.
     """
 
-    def __init__(self, host: str = '0.0.0.0', port: int = 5001):
+    server_name = 'settings'
+
+    def __init__(self, host: str = '0.0.0.0', port: int = 5001, backlog: int = 128,
+                 camera_pool: Optional[CameraPool] = None,
+                 metrics: Optional[MetricsRegistry] = None, reuse_port: bool = False):
         """
         Initialize settings server.
         
         Args:
             host: Server host address
             port: Server port number
+            backlog: Maximum number of pending connections
+            camera_pool: Optional camera pool to control (one default camera)
+            metrics: Optional registry shared with other servers
+            reuse_port: Share the port with other processes (SO_REUSEPORT)
         """
-        super().__init__(host, port)
-        self.camera_mgr = CameraModel()
+        super().__init__(host, port, backlog, metrics, reuse_port)
+        self.camera_pool = camera_pool or CameraPool()
+
+    async def start_serving(self) -> None:
+        """Start accepting clients and the camera command workers."""
+        self.camera_pool.start_commands()
+        await super().start_serving()
+
+    async def stop_serving(self) -> None:
+        """Stop all client connections and the camera command workers."""
+        await super().stop_serving()
+        # Joining may wait for a camera restart, so keep it off the loop
+        await asyncio.get_running_loop().run_in_executor(None,
+                                                         self.camera_pool.stop_commands)
 
-    def handle_client(self, client_socket: socket.socket) -> None:
+    async def handle_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
         """
         Handle settings client connection.
         
         Args:
-            client_socket: Connected client socket
+            reader: Stream reader for the client connection
+            writer: Stream writer for the client connection
         """
-        client_socket.settimeout(1.0)
         logger.info("Settings client connected")
+        parser = FrameParser()
+        replies: Set[asyncio.Task] = set()
+        client_id = writer.get_extra_info('peername')
 
         try:
             while self.running:
                 try:
-                    # Read request header
-                    header = client_socket.recv(6)
-                    if not header or len(header) != 6:
+                    frame = await self.read_frame(reader, parser)
+                    if frame is None:
+                        logger.info("Settings client disconnected")
+                        break
+                    if self.handle_control(writer, frame):
                         continue
+                    await self.handle_frame(writer, frame, client_id, replies)
 
-                    if header[0] != 0x00 or header[1] != 0xFF:
-                        continue
-
-                    id_ = header[2]
-                    typ = header[3]
-                    payload_len = (header[4] << 8) | header[5]
-
-                    # Get payload if present
-                    payload = None
-                    if payload_len > 0:
-                        payload = client_socket.recv(payload_len)
-                        if len(payload) != payload_len:
-                            continue
-
-                    # Handle settings requests
-                    if id_ == 0x02 and typ == 0x01:
-                        self._handle_settings_request(client_socket, payload_len, payload)
-
-                except socket.timeout:
-                    pass  # Normal timeout, continue loop
                 except Exception as e:
                     logger.error(f"Error handling settings client: {e}")
                     break
@@ -265,64 +1471,256 @@ class SettingsServerModel(TCPServerModel):
         except (socket.error, ConnectionResetError) as e:
             logger.info(f"Settings client disconnected: {e}")
         finally:
-            client_socket.close()
+            self.forget_client(client_id, replies)
+
+    async def handle_frame(self, writer: asyncio.StreamWriter, frame: Frame,
+                           client_id: Any, replies: Set[asyncio.Task]) -> None:
+        """
+        Dispatch one settings, profile or quality frame from a client.
+        
+        Also used by the multiplexed server for frames with these IDs.
+        
+        Args:
+            writer: Stream writer for the client connection
+            frame: Packet ID, type and payload view
+            client_id: Identifier of the connection
+            replies: Pending reply tasks of this connection
+        """
+        id_, typ, payload = frame
+        if typ != codec.TYPE_COMMAND:
+            return
+        if id_ == codec.ID_SETTINGS:
+            await self._handle_settings_request(
+                writer, len(payload), bytes(payload) if payload else None, replies
+            )
+        elif id_ == codec.ID_PROFILE:
+            self._handle_profile_request(writer, bytes(payload), replies)
+        elif id_ == codec.ID_QUALITY:
+            self._handle_quality_report(client_id, payload)
+
+    def forget_client(self, client_id: Any, replies: Set[asyncio.Task]) -> None:
+        """
+        Cancel pending replies and drop quality reports of a closed connection.
+        
+        Args:
+            client_id: Identifier of the connection
+            replies: Pending reply tasks of this connection
+        """
+        for task in replies:
+            task.cancel()
+        for pipeline in self.camera_pool:
+            pipeline.quality.forget(client_id)
 
-    def _handle_settings_request(self, client_socket: socket.socket, 
-                               payload_len: int, payload: Optional[bytes]) -> None:
+    async def _handle_settings_request(self, writer: asyncio.StreamWriter,
+                                       payload_len: int, payload: Optional[bytes],
+                                       replies: Set[asyncio.Task]) -> None:
         """
         Process settings request or update.
         
+        Updates are queued and answered from a separate task once applied,
+        so the connection keeps reading while the camera restarts. A 1-byte
+        request or a 7th update byte selects the camera; camera 0 otherwise.
+        
         Args:
-            client_socket: Client socket connection
+            writer: Stream writer for the client connection
             payload_len: Length of payload data
             payload: Payload data bytes
+            replies: Pending reply tasks of this connection
         """
         try:
-            if payload_len == 0:  # Request current settings
-                self._send_current_settings(client_socket)
-            elif payload_len == 6:  # Update settings command
-                self._update_camera_settings(payload)
+            if payload_len in (0, 1):  # Request current settings
+                index = payload[0] if payload_len else 0
+                self._send_current_settings(writer, index)
+                await self.drain(writer)
+            elif payload_len in (6, 7):  # Update settings command
+                index = payload[6] if payload_len == 7 else 0
+                future = self.camera_pool.submit(index, self._decode_settings(payload))
+                self._reply_later(writer, future, codec.ID_SETTINGS, replies,
+                                  lambda settings: codec.encode_packet(
+                                      codec.ID_SETTINGS, codec.TYPE_RESPONSE,
+                                      self._encode_settings(settings, index)))
+        except CameraPoolError as e:
+            logger.warning(f"Rejected settings request: {e}")
+            self.write_packet(writer, codec.encode_packet(codec.ID_SETTINGS,
+                                                          codec.TYPE_ERROR,
+                                                          str(e).encode('utf-8')))
         except Exception as e:
             logger.error(f"Error handling settings request: {e}")
 
-    def _send_current_settings(self, client_socket: socket.socket) -> None:
+    def _reply_later(self, writer: asyncio.StreamWriter,
+                     future: concurrent.futures.Future,
+                     id_: int, replies: Set[asyncio.Task],
+                     make_packet: Callable[[Any], bytes]) -> None:
+        """
+        Answer a queued camera command from its own task once applied.
+        
+        Args:
+            writer: Stream writer for the client connection
+            future: Future returned by the command queue
+            id_: Packet ID used for an error reply
+            replies: Pending reply tasks of this connection
+            make_packet: Builds the success reply from the future's result
+        """
+        task = asyncio.create_task(
+            self._reply_when_applied(writer, future, id_, make_packet))
+        replies.add(task)
+        task.add_done_callback(replies.discard)
+
+    async def _reply_when_applied(self, writer: asyncio.StreamWriter,
+                                  future: concurrent.futures.Future, id_: int,
+                                  make_packet: Callable[[Any], bytes]) -> None:
+        """
+        Wait for a queued command and send its outcome to the client.
+        
+        Args:
+            writer: Stream writer for the client connection
+            future: Future returned by the command queue
+            id_: Packet ID used for an error reply
+            make_packet: Builds the success reply from the future's result
+        """
+        try:
+            packet = make_packet(await asyncio.wrap_future(future))
+            logger.info("Camera command applied")
+        except Exception as e:
+            logger.error(f"Camera command failed: {e}")
+            packet = codec.encode_packet(id_, codec.TYPE_ERROR,
+                                         str(e).encode('utf-8')[:255])
+        try:
+            self.write_packet(writer, packet)
+            await self.drain(writer)
+        except (socket.error, ConnectionResetError) as e:
+            logger.debug(f"Settings client gone before reply: {e}")
+
+    def _handle_profile_request(self, writer: asyncio.StreamWriter, payload: bytes,
+                                replies: Set[asyncio.Task]) -> None:
+        """
+        Query, select or toggle adaptive selection of encoding profiles.
+        
+        The payload is [op][camera] plus a profile index for select or an
+        on/off byte for adaptive. Every operation is answered with the
+        camera's profile state; a selection once it has been applied.
+        
+        Args:
+            writer: Stream writer for the client connection
+            payload: Profile command payload
+            replies: Pending reply tasks of this connection
+        """
+        try:
+            if len(payload) < 2:
+                raise ProfileError(f"Profile command of {len(payload)} bytes")
+            op, index = payload[0], payload[1]
+            pipeline = self.camera_pool.get(index)
+            if op == codec.PROFILE_OP_QUERY:
+                self.write_packet(writer, self._encode_profile_state(pipeline))
+            elif op == codec.PROFILE_OP_SELECT and len(payload) == 3:
+                future = pipeline.select_profile(payload[2])
+                self._reply_later(writer, future, codec.ID_PROFILE, replies,
+                                  lambda _: self._encode_profile_state(pipeline))
+            elif op == codec.PROFILE_OP_ADAPTIVE and len(payload) == 3:
+                pipeline.quality.set_adaptive(bool(payload[2]))
+                self.write_packet(writer, self._encode_profile_state(pipeline))
+            else:
+                raise ProfileError(f"Unknown profile operation {op}")
+        except (CameraPoolError, ProfileError) as e:
+            logger.warning(f"Rejected profile request: {e}")
+            self.write_packet(writer, codec.encode_packet(codec.ID_PROFILE,
+                                                          codec.TYPE_ERROR,
+                                                          str(e).encode('utf-8')))
+
+    def _encode_profile_state(self, pipeline: CameraPipeline) -> bytes:
+        """
+        Encode the profile state of a camera.
+        
+        Args:
+            pipeline: Camera pipeline
+            
+        Returns:
+            bytes: Encoded profile state packet
+        """
+        quality = pipeline.quality
+        return codec.encode_profile_state(pipeline.camera.index, quality.active,
+                                          quality.adaptive, quality.profiles)
+
+    def _handle_quality_report(self, client_id: Any, payload: memoryview) -> None:
+        """
+        Feed a client playback report to the camera's adaptive controller.
+        
+        Args:
+            client_id: Identifier of the reporting connection
+            payload: Quality report payload
+        """
+        try:
+            index, decode_fps, dropped, decoded = codec.decode_quality_report(payload)
+            future = self.camera_pool.get(index).report_quality(
+                client_id, decode_fps, dropped, decoded
+            )
+        except (codec.ProtocolError, CameraPoolError) as e:
+            logger.warning(f"Ignored quality report: {e}")
+            return
+        if future is not None:
+            future.add_done_callback(self._log_profile_change)
+
+    def _log_profile_change(self, future: concurrent.futures.Future) -> None:
+        """
+        Log the outcome of an adaptive profile change.
+        
+        Args:
+            future: Completed command future
+        """
+        if future.exception() is not None:
+            logger.error(f"Adaptive profile change failed: {future.exception()}")
+
+    def _send_current_settings(self, writer: asyncio.StreamWriter,
+                               index: int = 0) -> None:
         """
         Send current camera settings to client.
         
         Args:
-            client_socket: Client socket connection
+            writer: Stream writer for the client connection
+            index: Camera index
+            
+        Raises:
+            CameraPoolError: If no camera has this index
+        """
+        settings = self.camera_pool.get_camera(index).get_settings()
+        settings_data = self._encode_settings(settings, index)
+        packet = codec.encode_packet(codec.ID_SETTINGS, codec.TYPE_RESPONSE,
+                                     settings_data)
+        self.write_packet(writer, packet)
+        logger.info("Sent current camera settings to client")
+
+    def _encode_settings(self, settings: Dict[str, Any], index: int = 0) -> bytes:
+        """
+        Pack camera settings into a settings response payload.
+        
+        Args:
+            settings: Camera settings
+            index: Camera index reported in byte 6
+            
+        Returns:
+            bytes: 9-byte settings payload
         """
-        settings = self.camera_mgr.get_settings()
-        settings_data = bytes([
+        return bytes([
             (settings['shutter'] // 100) & 0xFF,
             int(settings['gain']),
             int(settings['awb_red'] * 10),
             int(settings['awb_blue'] * 10),
             int(settings['contrast'] * 10),
             int((settings['brightness'] + 1.0) * 127.5),
-            0, 0, 0  # padding
+            index, 0, 0  # camera index, padding
         ])
 
-        packet = bytes([
-            0x00,           # P
-            0xFF,           # N
-            0x02,           # ID (Settings)
-            0x00,           # Type (Response)
-            0x00, 0x09      # Payload Length
-        ]) + settings_data + bytes([0])
-
-        packet = packet[:-1] + bytes([self.calculate_checksum(packet[:-1])])
-        client_socket.send(packet)
-        logger.info("Sent current camera settings to client")
-
-    def _update_camera_settings(self, payload: bytes) -> None:
+    def _decode_settings(self, payload: bytes) -> Dict[str, Any]:
         """
-        Update camera settings from payload data.
+        Unpack camera settings from an update command payload.
         
         Args:
             payload: Settings data bytes
+            
+        Returns:
+            Dict[str, Any]: Camera settings
         """
-        new_settings = {
+        return {
             'shutter': payload[0] * 100,
             'gain': payload[1],
             'awb_red': payload[2] / 10.0,
@@ -330,148 +1728,230 @@ class SettingsServerModel(TCPServerModel):
             'contrast': payload[4] / 10.0,
             'brightness': (payload[5] / 127.5) - 1.0
         }
-        self.camera_mgr.update_settings(new_settings)
-        logger.info("Camera settings updated successfully")
+
+
+class RemoteSettingsServerModel(SettingsServerModel):
+    """
+    Settings server of a worker process.
+    
+    Cameras are controlled by the owner process only, so settings,
+    profile and quality frames are relayed to it over the worker link
+    and its replies are written back to the connection they answer.
+    """
+
+    def __init__(self, link: WorkerLink, host: str = '0.0.0.0', port: int = 5001,
+                 backlog: int = 128, metrics: Optional[MetricsRegistry] = None,
+                 reuse_port: bool = False):
+        """
+        Initialize relaying settings server.
+        
+        Args:
+            link: Link to the owner process
+            host: Server host address
+            port: Server port number
+            backlog: Maximum number of pending connections
+            metrics: Optional registry shared with other servers
+            reuse_port: Share the port with other processes (SO_REUSEPORT)
+        """
+        super().__init__(host, port, backlog, None, metrics, reuse_port)
+        self.link = link
+
+    async def start_serving(self) -> None:
+        """Start accepting clients; the owner runs the camera commands."""
+        await TCPServerModel.start_serving(self)
+
+    async def stop_serving(self) -> None:
+        """Stop all client connections."""
+        await TCPServerModel.stop_serving(self)
+
+    async def handle_frame(self, writer: asyncio.StreamWriter, frame: Frame,
+                           client_id: Any, replies: Set[asyncio.Task]) -> None:
+        """
+        Relay one settings, profile or quality command to the owner.
+        
+        Args:
+            writer: Stream writer for the client connection
+            frame: Packet ID, type and payload view
+            client_id: Identifier of the connection
+            replies: Pending reply tasks of this connection (unused, the
+                owner tracks its own)
+        """
+        id_, typ, payload = frame
+        if typ != codec.TYPE_COMMAND:
+            return
+        if id_ in (codec.ID_SETTINGS, codec.ID_PROFILE, codec.ID_QUALITY):
+            self.link.relay_frame(writer, client_id,
+                                  codec.encode_packet(id_, typ, payload))
+
+    def forget_client(self, client_id: Any, replies: Set[asyncio.Task]) -> None:
+        """
+        Tell the owner a connection closed.
+        
+        Args:
+            client_id: Identifier of the connection
+            replies: Pending reply tasks of this connection (unused)
+        """
+        self.link.forget(client_id)
 
 
 class AuthServerModel(TCPServerModel):
     """
     Handles client authentication requests.
     
-    Validates passwords and sends appropriate responses.
+    Validates passwords and sends appropriate responses. A connection is
+    closed once it authenticated; after a wrong password it may try again
+    until auth_timeout seconds after it opened. Heartbeats do not extend
+    that, and the server does not ping these short-lived connections.
     """
 
-    def __init__(self, host: str = '0.0.0.0', port: int = 5002):
+    server_name = 'auth'
+    pings_clients = False
+
+    def __init__(self, host: str = '0.0.0.0', port: int = 5002, backlog: int = 128,
+                 metrics: Optional[MetricsRegistry] = None, reuse_port: bool = False):
         """
         Initialize authentication server.
         
         Args:
             host: Server host address
             port: Server port number
+            backlog: Maximum number of pending connections
+            metrics: Optional registry shared with other servers
+            reuse_port: Share the port with other processes (SO_REUSEPORT)
         """
-        super().__init__(host, port)
+        super().__init__(host, port, backlog, metrics, reuse_port)
         self.valid_password = "1111"
+        self.auth_timeout = 5.0
+        self._auth_attempts = self.metrics.counter(
+            'es_auth_attempts_total', 'Authentication attempts by outcome', ('result',)
+        )
 
-    def handle_client(self, client_socket: socket.socket) -> None:
+    async def handle_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
         """
         Handle authentication client connection.
         
         Args:
-            client_socket: Connected client socket
+            reader: Stream reader for the client connection
+            writer: Stream writer for the client connection
         """
-        client_socket.settimeout(5.0)
         logger.info("Authentication client connected")
+        parser = FrameParser()
+        requested = False
+        deadline = time.monotonic() + self.auth_timeout
         
         try:
-            # Read authentication request
-            header = client_socket.recv(6)
-            if not header or len(header) != 6:
-                logger.warning("Invalid authentication header received")
-                return
-            
-            if header[0] != 0x00 or header[1] != 0xFF:
-                logger.warning("Invalid authentication packet format")
-                return
-            
-            id_ = header[2]
-            typ = header[3]
-            payload_len = (header[4] << 8) | header[5]
-            
-            # Process authentication request
-            if id_ == 0x00 and typ == 0x01:
-                self._process_auth_request(client_socket, header, payload_len)
-            else:
-                logger.warning(f"Invalid auth request: ID={id_:02x}, Type={typ:02x}")
+            # Wrong passwords may be retried on the same connection until
+            # the deadline; answered heartbeats do not extend it
+            while self.running:
+                frame = await asyncio.wait_for(self.read_frame(reader, parser),
+                                               max(0.0, deadline - time.monotonic()))
+                if frame is None:
+                    if not requested:
+                        self.count_attempt('disconnected')
+                        logger.warning("Authentication client disconnected "
+                                       "before request")
+                    return
+                if self.handle_control(writer, frame):
+                    continue
+                id_, typ, payload = frame
+                requested = True
+                
+                # Process authentication request
+                if id_ == codec.ID_AUTH and typ == codec.TYPE_COMMAND:
+                    if await self._process_auth_request(writer, bytes(payload)):
+                        logger.info("Authentication client done, closing connection")
+                        return
+                else:
+                    self.count_attempt('invalid')
+                    logger.warning(f"Invalid auth request: ID={id_:02x}, "
+                                   f"Type={typ:02x}")
+                    return
                 
-        except socket.timeout:
-            logger.warning("Authentication client timeout")
+        except asyncio.TimeoutError:
+            if not requested:
+                self.count_attempt('timeout')
+                logger.warning("Authentication client timeout")
         except Exception as e:
             logger.error(f"Authentication client error: {e}")
-        finally:
-            client_socket.close()
 
-    def _process_auth_request(self, client_socket: socket.socket, 
-                            header: bytes, payload_len: int) -> None:
+    async def _process_auth_request(self, writer: asyncio.StreamWriter,
+                                    password_payload: bytes) -> bool:
         """
         Process authentication request with password validation.
         
         Args:
-            client_socket: Client socket connection
-            header: Request header bytes
-            payload_len: Length of password payload
+            writer: Stream writer for the client connection
+            password_payload: Checksum-verified password bytes
+            
+        Returns:
+            bool: True if the client authenticated and got its answer
         """
         try:
-            if payload_len > 0:
-                # Get password payload and checksum
-                password_payload = client_socket.recv(payload_len)
-                if len(password_payload) != payload_len:
-                    logger.warning("Invalid password payload length")
-                    return
-                
-                checksum_byte = client_socket.recv(1)
-                if len(checksum_byte) != 1:
-                    logger.warning("Missing authentication checksum")
-                    return
-                
-                # Verify checksum
-                packet = header + password_payload
-                expected_checksum = self.calculate_checksum(packet)
-                
-                if checksum_byte[0] != expected_checksum:
-                    logger.warning("Invalid authentication checksum")
-                    return
-                
-                # Validate password
-                received_password = password_payload.decode('ascii', errors='ignore')
-                logger.debug(f"Authentication attempt with password length: {len(received_password)}")
-                
-                if received_password == self.valid_password:
-                    self._send_success_response(client_socket)
+            if password_payload:
+                valid = self.check_password(password_payload)
+                if valid:
+                    self._send_success_response(writer)
                 else:
-                    self._send_error_response(client_socket)
+                    self._send_error_response(writer)
+                await self.drain(writer)
+                return valid
             else:
+                self.count_attempt('invalid')
                 logger.warning("No password provided in authentication request")
                 
         except Exception as e:
             logger.error(f"Error processing authentication request: {e}")
+        return False
+
+    def check_password(self, password_payload: bytes) -> bool:
+        """
+        Validate a password and count the attempt.
+        
+        Args:
+            password_payload: Checksum-verified password bytes
+            
+        Returns:
+            bool: True if the password is valid
+        """
+        received_password = password_payload.decode('ascii', errors='ignore')
+        logger.debug(f"Authentication attempt with password length: "
+                     f"{len(received_password)}")
+        valid = received_password == self.valid_password
+        self.count_attempt('success' if valid else 'failure')
+        return valid
+
+    def count_attempt(self, result: str) -> None:
+        """
+        Count an authentication attempt.
+        
+        Args:
+            result: 'success', 'failure', 'invalid', 'timeout' or 'disconnected'
+        """
+        self._auth_attempts.labels(result).inc()
 
-    def _send_success_response(self, client_socket: socket.socket) -> None:
+    def _send_success_response(self, writer: asyncio.StreamWriter) -> None:
         """
         Send successful authentication response.
         
         Args:
-            client_socket: Client socket connection
+            writer: Stream writer for the client connection
         """
         success_payload = b'ready'
-        response_packet = bytes([
-            0x00,           # P
-            0xFF,           # N
-            0x00,           # ID (Auth)
-            0x00,           # Type (Response)
-            0x00, len(success_payload)  # Payload Length
-        ]) + success_payload
-        
-        response_packet += bytes([self.calculate_checksum(response_packet)])
-        client_socket.send(response_packet)
+        response_packet = codec.encode_packet(codec.ID_AUTH, codec.TYPE_RESPONSE,
+                                              success_payload)
+        self.write_packet(writer, response_packet)
         logger.info("Authentication successful - sent 'ready' response")
 
-    def _send_error_response(self, client_socket: socket.socket) -> None:
+    def _send_error_response(self, writer: asyncio.StreamWriter) -> None:
         """
         Send authentication error response.
         
         Args:
-            client_socket: Client socket connection
+            writer: Stream writer for the client connection
         """
-        error_packet = bytes([
-            0x00,           # P
-            0xFF,           # N
-            0x00,           # ID (Auth)
-            0x02,           # Type (Error)
-            0x00, 0x00      # No payload
-        ])
-        
-        error_packet += bytes([self.calculate_checksum(error_packet)])
-        client_socket.send(error_packet)
+        error_packet = codec.encode_packet(codec.ID_AUTH, codec.TYPE_ERROR)
+        self.write_packet(writer, error_packet)
         logger.info("Authentication failed - wrong password")
 
     def set_password(self, new_password: str) -> None:
@@ -482,4 +1962,198 @@ class AuthServerModel(TCPServerModel):
             new_password: New password string
         """
         self.valid_password = new_password
-        logger.info("Authentication password updated")
\ No newline at end of file
+        logger.info("Authentication password updated")
+
+
+class MuxServerModel(TCPServerModel):
+    """
+    Serves auth, data and settings traffic over one connection per client.
+    
+    A session must authenticate first: its first frame is an auth command
+    answered like on the auth port, and anything else closes the session.
+    Afterwards frames are routed by packet ID. A data command subscribes
+    to the data stream (payload empty or 0x01) or unsubscribes (0x00);
+    backfill commands are answered as on the data port, and settings,
+    profile and quality frames are handled as on the settings port. The
+    legacy ports keep working alongside.
+    """
+
+    server_name = 'mux'
+
+    def __init__(self, data_server: DataServerModel,
+                 settings_server: SettingsServerModel,
+                 auth_server: AuthServerModel, host: str = '0.0.0.0', port: int = 5003,
+                 backlog: int = 128, metrics: Optional[MetricsRegistry] = None,
+                 reuse_port: bool = False):
+        """
+        Initialize multiplexed server.
+        
+        Args:
+            data_server: Data server whose stream sessions subscribe to
+            settings_server: Settings server handling settings frames
+            auth_server: Auth server validating session passwords
+            host: Server host address
+            port: Server port number
+            backlog: Maximum number of pending connections
+            metrics: Optional registry shared with other servers
+            reuse_port: Share the port with other processes (SO_REUSEPORT)
+        """
+        super().__init__(host, port, backlog, metrics, reuse_port)
+        self.data_server = data_server
+        self.settings_server = settings_server
+        self.auth_server = auth_server
+        self._streams: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+
+    async def handle_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        """
+        Handle multiplexed client session.
+        
+        Args:
+            reader: Stream reader for the client connection
+            writer: Stream writer for the client connection
+        """
+        logger.info("Multiplexed client connected")
+        parser = FrameParser()
+        replies: Set[asyncio.Task] = set()
+        client_id = writer.get_extra_info('peername')
+
+        try:
+            if not await self._authenticate(reader, writer, parser):
+                return
+            while self.running:
+                frame = await self.read_frame(reader, parser)
+                if frame is None:
+                    logger.info("Multiplexed client disconnected")
+                    break
+                if self.handle_control(writer, frame):
+                    continue
+                id_ = frame[0]
+                if id_ == codec.ID_DATA:
+                    self._handle_subscription(writer, frame)
+                elif id_ == codec.ID_BACKFILL and frame[1] == codec.TYPE_COMMAND:
+                    self.data_server.handle_backfill(writer, frame[2])
+                elif id_ == codec.ID_DATA_COMPACT and frame[1] == codec.TYPE_COMMAND:
+                    self.data_server.set_encoding(writer, frame[2])
+                elif id_ == codec.ID_DEADBAND and frame[1] == codec.TYPE_COMMAND:
+                    self.data_server.set_deadband(writer, frame[2])
+                elif id_ in (codec.ID_SETTINGS, codec.ID_PROFILE, codec.ID_QUALITY):
+                    await self.settings_server.handle_frame(writer, frame, client_id,
+                                                            replies)
+                else:
+                    logger.debug(f"Ignored multiplexed frame ID={id_:02x}")
+
+        except (socket.error, ConnectionResetError) as e:
+            logger.info(f"Multiplexed client disconnected: {e}")
+        finally:
+            self._unsubscribe(writer)
+            self.data_server.forget_stream_options(writer)
+            self.settings_server.forget_client(client_id, replies)
+
+    async def _authenticate(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter, parser: FrameParser) -> bool:
+        """
+        Authenticate a session with its first frame other than control frames.
+        
+        Args:
+            reader: Stream reader for the client connection
+            writer: Stream writer for the client connection
+            parser: Frame parser of the connection
+            
+        Returns:
+            bool: True if the session may continue
+        """
+        deadline = time.monotonic() + self.auth_server.auth_timeout
+        while True:
+            try:
+                frame = await asyncio.wait_for(self.read_frame(reader, parser),
+                                               max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                self.auth_server.count_attempt('timeout')
+                logger.warning("Multiplexed client authentication timeout")
+                return False
+            if frame is None:
+                self.auth_server.count_attempt('disconnected')
+                return False
+            if not self.handle_control(writer, frame):
+                break
+
+        id_, typ, payload = frame
+        if id_ != codec.ID_AUTH or typ != codec.TYPE_COMMAND or not payload:
+            self.auth_server.count_attempt('invalid')
+            logger.warning(f"Multiplexed frame before authentication: "
+                           f"ID={id_:02x}, Type={typ:02x}")
+            self.write_packet(writer, codec.encode_packet(codec.ID_AUTH,
+                                                          codec.TYPE_ERROR,
+                                                          b'authentication required'))
+            await self.drain(writer)
+            return False
+        if not self.auth_server.check_password(bytes(payload)):
+            logger.info("Multiplexed authentication failed - wrong password")
+            self.write_packet(writer,
+                              codec.encode_packet(codec.ID_AUTH, codec.TYPE_ERROR))
+            await self.drain(writer)
+            return False
+
+        self.write_packet(writer, codec.encode_packet(codec.ID_AUTH,
+                                                      codec.TYPE_RESPONSE, b'ready'))
+        await self.drain(writer)
+        logger.info("Multiplexed client authenticated")
+        return True
+
+    def _handle_subscription(self, writer: asyncio.StreamWriter, frame: Frame) -> None:
+        """
+        Start or stop the data stream of a session.
+        
+        Args:
+            writer: Stream writer for the client connection
+            frame: Data command frame
+        """
+        _, typ, payload = frame
+        if typ != codec.TYPE_COMMAND:
+            return
+        if payload and payload[0] == codec.DATA_UNSUBSCRIBE:
+            self._unsubscribe(writer)
+        elif writer not in self._streams:
+            task = asyncio.create_task(
+                self.data_server.stream(writer, self._clients[writer].label))
+            self._streams[writer] = task
+            task.add_done_callback(lambda done: self._on_stream_done(writer, done))
+            logger.info("Multiplexed client subscribed to data")
+
+    def _on_stream_done(self, writer: asyncio.StreamWriter, task: asyncio.Task) -> None:
+        """
+        Forget a finished data stream and close the session if it ended itself.
+        
+        A stream only ends on its own when the client was disconnected as a
+        slow consumer or its socket failed, so the session goes with it.
+        
+        Args:
+            writer: Stream writer for the client connection
+            task: Finished stream task
+        """
+        if self._streams.get(writer) is task:
+            del self._streams[writer]
+        if not task.cancelled():
+            writer.close()
+
+    def _unsubscribe(self, writer: asyncio.StreamWriter) -> None:
+        """
+        Stop the data stream of a session, if any.
+        
+        Args:
+            writer: Stream writer for the client connection
+        """
+        task = self._streams.pop(writer, None)
+        if task is not None:
+            task.cancel()
+            logger.info("Multiplexed client unsubscribed from data")
+
+    def get_stream_count(self) -> int:
+        """
+        Get the number of sessions subscribed to data.
+        
+        Returns:
+            int: Subscribed sessions
+        """
+        return len(self._streams)
@@ -0,0 +1,553 @@
+"""
+Worker Model Module
+Runs server worker processes sharing the ports with SO_REUSEPORT.
+
+The owner process keeps the camera pool, the sampler and the settings
+logic. Every worker is linked to it by a Unix socket pair carrying
+messages of the form:
+    [kind u8][connection id u32][length u32][body]
+Sample batches go from the owner to every worker, and settings frames
+received by a worker go to the owner, whose replies are routed back to
+the worker connection they answer. Workers also send snapshots of their
+metrics, which the owner serves along with its own.
+"""
+
+# Standard library imports
+import asyncio
+import json
+import logging
+import multiprocessing
+import socket
+import struct
+import time
+from itertools import starmap
+from multiprocessing.process import BaseProcess
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# Third-party imports
+
+# Local application imports
+from protocol import codec
+from .metrics_model import MetricsRegistry
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Link message layout and kinds
+MESSAGE_HEADER = struct.Struct('>BII')  # kind, connection id, body length
+MSG_SAMPLES = 0x01  # Owner to worker: packed samples to publish
+MSG_FRAME = 0x02  # Worker to owner: settings frame from a client connection
+MSG_REPLY = 0x03  # Owner to worker: packet to write to a client connection
+MSG_CLOSED = 0x04  # Worker to owner: client connection closed
+MSG_METRICS = 0x05  # Worker to owner: JSON snapshot of the worker's metrics
+
+# Bytes a worker link may buffer before sample batches are dropped for it
+MAX_LINK_BUFFER = 4 * 1024 * 1024
+
+# Seconds between worker liveness checks
+CHECK_INTERVAL = 1.0
+
+# Seconds between metrics snapshots sent by a worker
+METRICS_INTERVAL = 1.0
+
+WorkerTarget = Callable[[int, socket.socket], None]
+
+
+class WorkerError(Exception):
+    """Raised when worker processes cannot be started."""
+    pass
+
+
+def encode_message(kind: int, connection_id: int, body: bytes = b'') -> bytes:
+    """
+    Encode one link message.
+
+    Args:
+        kind: Message kind
+        connection_id: Worker connection the message is about, 0 for none
+        body: Message body
+
+    Returns:
+        bytes: Encoded message
+    """
+    return MESSAGE_HEADER.pack(kind, connection_id, len(body)) + body
+
+
+async def read_message(
+        reader: asyncio.StreamReader) -> Optional[Tuple[int, int, bytes]]:
+    """
+    Read the next link message.
+
+    Args:
+        reader: Stream reader of the link
+
+    Returns:
+        Optional[Tuple[int, int, bytes]]: Kind, connection id and body, or
+        None if the other process closed the link
+    """
+    try:
+        header = await reader.readexactly(MESSAGE_HEADER.size)
+        kind, connection_id, length = MESSAGE_HEADER.unpack(header)
+        body = await reader.readexactly(length) if length else b''
+    except asyncio.IncompleteReadError:
+        return None
+    return kind, connection_id, body
+
+
+class RelayWriter:
+    """
+    Stream writer stand-in for a client connection served by a worker.
+
+    Lets the owner's settings server answer relayed frames with its usual
+    code: packets written here go back over the link as replies.
+    """
+
+    def __init__(self, link: asyncio.StreamWriter, worker: int, connection_id: int):
+        """
+        Initialize relay writer.
+
+        Args:
+            link: Stream writer of the worker link
+            worker: Worker index
+            connection_id: Connection id within the worker
+        """
+        self.link = link
+        self.worker = worker
+        self.connection_id = connection_id
+
+    def writelines(self, packets: List[bytes]) -> None:
+        self.link.writelines([encode_message(MSG_REPLY, self.connection_id, packet)
+                              for packet in packets])
+
+    def write(self, packet: bytes) -> None:
+        self.writelines([packet])
+
+    async def drain(self) -> None:
+        await self.link.drain()
+
+    def get_extra_info(self, name: str, default: Any = None) -> Any:
+        if name == 'peername':
+            return (f"worker{self.worker}", self.connection_id)
+        return default
+
+    def is_closing(self) -> bool:
+        return self.link.is_closing()
+
+
+class WorkerHub:
+    """
+    Owner side of the worker processes.
+
+    Starts the workers through a fork server, so they start from a clean
+    single-threaded process instead of inheriting the owner's threads,
+    camera pipes and sockets. It forwards every sample batch to each
+    worker and relays their settings frames to the owner's settings
+    server. The metrics snapshots of the workers are merged into the
+    owner's registry with a worker label, until the worker exits. A
+    worker that exits is restarted after restart_delay seconds.
+    """
+
+    def __init__(self, count: int, restart_delay: float = 1.0,
+                 metrics: Optional[MetricsRegistry] = None):
+        """
+        Initialize worker hub.
+
+        Args:
+            count: Number of worker processes besides the owner
+            restart_delay: Seconds before an exited worker is restarted
+            metrics: Optional registry shared with the servers
+
+        Raises:
+            WorkerError: If count is not positive
+        """
+        if count <= 0:
+            raise WorkerError("At least one worker process is required")
+        self.count = count
+        self.restart_delay = restart_delay
+        self.restarts = 0
+        self._context = multiprocessing.get_context('forkserver')
+        self._target: Optional[WorkerTarget] = None
+        self._args: Tuple[Any, ...] = ()
+        self._processes: List[Optional[BaseProcess]] = [None] * count
+        self._sockets: List[Optional[socket.socket]] = [None] * count
+        self._links: List[Optional[asyncio.StreamWriter]] = [None] * count
+        self._exited_at: List[Optional[float]] = [None] * count
+        self._settings_server: Any = None
+        self._tasks: Set[asyncio.Task] = set()
+        registry = metrics or MetricsRegistry()
+        self._metrics = registry
+        self._batches_dropped = registry.counter(
+            'es_worker_batches_dropped_total',
+            'Sample batches not forwarded to a worker whose link was full'
+        ).labels()
+        self._worker_restarts = registry.counter(
+            'es_worker_restarts_total', 'Worker processes restarted after exiting'
+        ).labels()
+
+    def spawn(self, target: WorkerTarget, *args: Any) -> None:
+        """
+        Start all worker processes.
+
+        Args:
+            target: Picklable module-level function run in each worker as
+                target(*args, index, link socket)
+            *args: Leading picklable arguments for target
+
+        Raises:
+            WorkerError: If a worker process cannot be started
+        """
+        self._target = target
+        self._args = args
+        for index in range(self.count):
+            self._spawn_worker(index)
+
+    def _spawn_worker(self, index: int) -> None:
+        """
+        Start one worker process with a new link.
+
+        Args:
+            index: Worker index
+
+        Raises:
+            WorkerError: If the process cannot be started
+        """
+        parent, child = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        process = self._context.Process(target=self._target,
+                                        args=self._args + (index, child),
+                                        name=f"server-worker-{index}", daemon=True)
+        try:
+            process.start()
+        except Exception as e:
+            parent.close()
+            raise WorkerError(f"Cannot start worker {index}: {e}")
+        finally:
+            child.close()
+        self._processes[index] = process
+        self._sockets[index] = parent
+        self._exited_at[index] = None
+        logger.info(f"Worker {index} started (pid {process.pid})")
+
+    async def start(self, settings_server: Any) -> None:
+        """
+        Connect to the workers' links and start supervising them.
+
+        Must be awaited on the owner's event loop.
+
+        Args:
+            settings_server: Owner settings server answering relayed frames
+        """
+        self._settings_server = settings_server
+        for index in range(self.count):
+            await self._connect(index)
+        self._start_task(self._supervise())
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """
+        Close the links and wait for the workers to exit.
+
+        Workers shut down on their own when their link closes; those
+        still running after timeout seconds are terminated.
+
+        Args:
+            timeout: Seconds to wait for the workers
+        """
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        for index, link in enumerate(self._links):
+            if link is not None:
+                link.close()
+            self._links[index] = None
+        await asyncio.get_running_loop().run_in_executor(None, self._join, timeout)
+
+    def _join(self, timeout: float) -> None:
+        """
+        Wait for the workers, terminating any that linger.
+
+        Args:
+            timeout: Seconds to wait before terminating
+        """
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            if process is None:
+                continue
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"Terminating worker pid {process.pid}")
+                process.terminate()
+                process.join(1.0)
+            if process.is_alive():
+                process.kill()
+                process.join()
+        logger.info("Worker processes stopped")
+
+    def _start_task(self, coro: Any) -> None:
+        """
+        Run a coroutine as a tracked task.
+
+        Args:
+            coro: Coroutine to run
+        """
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _connect(self, index: int) -> None:
+        """
+        Open the owner end of a worker's link and serve it.
+
+        Args:
+            index: Worker index
+        """
+        reader, writer = await asyncio.open_unix_connection(sock=self._sockets[index])
+        self._links[index] = writer
+        self._start_task(self._serve(index, reader, writer))
+
+    async def _serve(self, index: int, reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        """
+        Answer the settings frames a worker relays until its link closes.
+
+        Args:
+            index: Worker index
+            reader: Stream reader of the link
+            writer: Stream writer of the link
+        """
+        relays: Dict[int, Tuple[RelayWriter, Set[asyncio.Task]]] = {}
+        source = f"worker{index}"
+        try:
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                kind, connection_id, body = message
+                if kind == MSG_FRAME:
+                    relay, replies = relays.setdefault(
+                        connection_id,
+                        (RelayWriter(writer, index, connection_id), set()))
+                    try:
+                        frame = codec.decode_packet(body)
+                    except codec.ProtocolError as e:
+                        logger.warning(f"Invalid frame from worker {index}: {e}")
+                        continue
+                    await self._settings_server.handle_frame(
+                        relay, frame, relay.get_extra_info('peername'), replies)
+                elif kind == MSG_CLOSED and connection_id in relays:
+                    relay, replies = relays.pop(connection_id)
+                    self._settings_server.forget_client(
+                        relay.get_extra_info('peername'), replies)
+                elif kind == MSG_METRICS:
+                    try:
+                        families = json.loads(body)
+                    except ValueError as e:
+                        logger.warning(f"Invalid metrics from worker {index}: {e}")
+                        continue
+                    self._metrics.set_remote(source, families, {'worker': str(index)})
+        except (ConnectionError, OSError) as e:
+            logger.warning(f"Worker {index} link failed: {e}")
+        finally:
+            self._metrics.remove_remote(source)
+            for relay, replies in relays.values():
+                self._settings_server.forget_client(
+                    relay.get_extra_info('peername'), replies)
+            if self._links[index] is writer:
+                self._links[index] = None
+            writer.close()
+
+    async def _supervise(self) -> None:
+        """Restart workers that exited, restart_delay seconds after they did."""
+        while True:
+            await asyncio.sleep(CHECK_INTERVAL)
+            for index, process in enumerate(self._processes):
+                if process is None or process.is_alive():
+                    continue
+                now = time.monotonic()
+                if self._exited_at[index] is None:
+                    self._exited_at[index] = now
+                    logger.error(f"Worker {index} (pid {process.pid}) exited "
+                                 f"with code {process.exitcode}")
+                    continue
+                if now - self._exited_at[index] < self.restart_delay:
+                    continue
+                try:
+                    self._spawn_worker(index)
+                    await self._connect(index)
+                except (WorkerError, OSError) as e:
+                    logger.error(f"Worker {index} restart failed: {e}")
+                    self._exited_at[index] = now
+                    continue
+                self.restarts += 1
+                self._worker_restarts.inc()
+
+    def publish(self, samples: List[Tuple[int, int]]) -> None:
+        """
+        Forward a sample batch to every worker.
+
+        A worker whose link already buffers MAX_LINK_BUFFER bytes misses
+        the batch instead of growing the owner's memory.
+
+        Args:
+            samples: (value, timestamp_ms) pairs in time order
+        """
+        message = encode_message(MSG_SAMPLES, 0,
+                                 b''.join(starmap(codec.SAMPLE_STRUCT.pack, samples)))
+        for link in self._links:
+            if link is None or link.is_closing():
+                continue
+            if link.transport.get_write_buffer_size() > MAX_LINK_BUFFER:
+                self._batches_dropped.inc()
+                continue
+            link.write(message)
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get the state of every worker.
+
+        Returns:
+            List[Dict[str, Any]]: Index, pid, whether alive and linked
+        """
+        return [{
+            'index': index,
+            'pid': process.pid if process else None,
+            'alive': bool(process and process.is_alive()),
+            'linked': self._links[index] is not None
+        } for index, process in enumerate(self._processes)]
+
+
+class WorkerLink:
+    """
+    Worker side of the link to the owner process.
+
+    Publishes the sample batches the owner forwards, relays settings
+    frames of local client connections and writes back the replies. The
+    worker's metrics are sent to the owner every METRICS_INTERVAL seconds,
+    as only the owner serves the metrics endpoint.
+    """
+
+    def __init__(self, sock: socket.socket,
+                 on_close: Optional[Callable[[], None]] = None):
+        """
+        Initialize worker link.
+
+        Args:
+            sock: Worker end of the socket pair
+            on_close: Called when the owner closes the link
+        """
+        self.sock = sock
+        self.on_close = on_close
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+        self._metrics_task: Optional[asyncio.Task] = None
+        self._data_server: Any = None
+        self._settings_server: Any = None
+        self._next_id = 1
+        self._ids: Dict[Any, int] = {}
+        self._writers: Dict[int, asyncio.StreamWriter] = {}
+
+    async def start(self, data_server: Any, settings_server: Any,
+                    metrics: Optional[MetricsRegistry] = None) -> None:
+        """
+        Connect the link and start reading the owner's messages.
+
+        Must be awaited on the worker's event loop.
+
+        Args:
+            data_server: Worker data server publishing forwarded samples
+            settings_server: Worker settings server writing replies
+            metrics: Optional registry of the worker sent to the owner
+        """
+        self._data_server = data_server
+        self._settings_server = settings_server
+        reader, self._writer = await asyncio.open_unix_connection(sock=self.sock)
+        self._task = asyncio.create_task(self._run(reader))
+        if metrics is not None:
+            self._metrics_task = asyncio.create_task(self._send_metrics(metrics))
+
+    async def stop(self) -> None:
+        """Stop reading and close the link."""
+        if self._metrics_task:
+            self._metrics_task.cancel()
+            await asyncio.gather(self._metrics_task, return_exceptions=True)
+            self._metrics_task = None
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+
+    async def _run(self, reader: asyncio.StreamReader) -> None:
+        """
+        Handle the owner's messages until the link closes.
+
+        Args:
+            reader: Stream reader of the link
+        """
+        try:
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                kind, connection_id, body = message
+                if kind == MSG_SAMPLES:
+                    samples = codec.decode_samples(body)
+                    if samples:
+                        self._data_server.publish_samples(samples)
+                elif kind == MSG_REPLY:
+                    writer = self._writers.get(connection_id)
+                    if writer is not None:
+                        self._settings_server.write_packet(writer, body)
+        except (ConnectionError, OSError, codec.ProtocolError) as e:
+            logger.error(f"Owner link failed: {e}")
+        logger.warning("Owner process closed the link")
+        if self.on_close:
+            self.on_close()
+
+    async def _send_metrics(self, metrics: MetricsRegistry) -> None:
+        """
+        Send snapshots of the worker's metrics until cancelled.
+
+        Args:
+            metrics: Registry of the worker
+        """
+        while self._writer is not None and not self._writer.is_closing():
+            snapshot = json.dumps(metrics.snapshot()).encode()
+            self._writer.write(encode_message(MSG_METRICS, 0, snapshot))
+            await asyncio.sleep(METRICS_INTERVAL)
+
+    def relay_frame(self, writer: asyncio.StreamWriter, client_id: Any,
+                    packet: bytes) -> None:
+        """
+        Send a client connection's settings frame to the owner.
+
+        Args:
+            writer: Stream writer of the client connection
+            client_id: Identifier of the connection
+            packet: Encoded frame
+        """
+        if self._writer is None:
+            return
+        connection_id = self._ids.get(client_id)
+        if connection_id is None:
+            connection_id = self._next_id
+            self._next_id = self._next_id % 0xFFFFFFFF + 1
+            self._ids[client_id] = connection_id
+            self._writers[connection_id] = writer
+        self._writer.write(encode_message(MSG_FRAME, connection_id, packet))
+
+    def forget(self, client_id: Any) -> None:
+        """
+        Tell the owner a client connection closed.
+
+        Args:
+            client_id: Identifier of the connection
+        """
+        connection_id = self._ids.pop(client_id, None)
+        if connection_id is None:
+            return
+        self._writers.pop(connection_id, None)
+        if self._writer is not None and not self._writer.is_closing():
+            self._writer.write(encode_message(MSG_CLOSED, connection_id))
@@ -4,26 +4,57 @@ Coordinates server operations and manages multiple TCP server instances.
 """
 
 # Standard library imports
+import asyncio
 import logging
-import threading
+import math
+import os
+import socket
 import time
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # Third-party imports
 
 # Local application imports
-from ..model.camera_model import CameraModel, CameraConfigurationError
+from ..model.camera_model import CameraConfigurationError
+from ..model.camera_pool_model import CameraPool
+from ..model.profile_model import ProfileError
+from ..model.event_loop_model import EventLoopModel
+from ..model.history_model import SampleHistory
+from ..model.metrics_model import (
+    CollectedSample,
+    MetricsError,
+    MetricsHTTPServer,
+    MetricsRegistry
+)
+from ..model.multicast_model import MulticastPublisher
+from ..model.recorder_model import SampleRecorder
+from ..model.scheduler_model import DeadlineScheduler, SchedulerError
+from ..model.source_model import create_source
+from ..model.supervisor_model import STATE_RUNNING
 from ..model.tcp_server_model import (
+    TCPServerModel,
     DataServerModel, 
     SettingsServerModel, 
+    RemoteSettingsServerModel,
     AuthServerModel,
+    MuxServerModel,
     TCPServerError
 )
+from ..model.worker_model import WorkerHub, WorkerLink
 
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Camera adaptive quality keys and the controller attributes they set
+ADAPTIVE_OPTIONS = {
+    'camera.adaptive_fps_ratio': 'fps_ratio',
+    'camera.adaptive_drop_threshold': 'drop_threshold',
+    'camera.adaptive_down_after': 'down_after',
+    'camera.adaptive_up_after': 'up_after',
+    'camera.adaptive_cooldown': 'cooldown'
+}
+
 
 class ServerPresenterError(Exception):
     """Raised when server presenter operations fail."""
@@ -36,35 +67,178 @@ class ServerPresenter:
     
     Implements the presenter pattern by mediating between server models
     and providing a unified interface for server management.
+    
+    With server.workers above 1 the presenter is the owner process: it
+    keeps the cameras, the sampler and the metrics endpoint, and starts
+    server.workers - 1 worker processes serving the same ports with
+    SO_REUSEPORT. A worker's presenter is given the link to the owner and
+    runs the servers only.
     """
 
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None,
+                 server_config: Optional[Any] = None,
+                 worker_link: Optional[WorkerLink] = None):
         """
         Initialize server presenter.
         
         Args:
-            config_path: Optional path to camera configuration file
+            config_path: Optional path to camera 0's settings file; camera N
+                uses the same name with an _N suffix
+            server_config: Optional ServerConfig instance for server tuning
+            worker_link: Link to the owner process when running as a worker
             
         Raises:
             ServerPresenterError: If initialization fails
         """
         try:
-            # Initialize camera model and load settings if provided
-            self.camera_model = CameraModel()
-            if config_path:
-                try:
-                    self.camera_model.load_settings(config_path)
-                except CameraConfigurationError as e:
-                    logger.warning(f"Using default camera settings: {e}")
+            self.server_config = server_config
+            self.worker_link = worker_link
+            is_worker = worker_link is not None
+            host = self._get_config('server.host', '0.0.0.0')
+            backlog = self._get_config('server.backlog', 128)
+            workers = self._get_config('server.workers', 1)
+            reuse_port = is_worker or workers > 1
+            self.metrics = MetricsRegistry()
+            self.worker_hub: Optional[WorkerHub] = None
+            if not is_worker and workers > 1:
+                self.worker_hub = WorkerHub(
+                    workers - 1,
+                    restart_delay=self._get_config('server.worker_restart_delay', 1.0),
+                    metrics=self.metrics
+                )
+            # Cameras are owned by a single process
+            self.camera_enabled = (self._get_config('camera.enabled', True)
+                                   and not is_worker)
+
+            # Initialize camera pool and load settings if provided
+            self.camera_pool = CameraPool(
+                self._get_camera_configs(),
+                supervisor_options={
+                    'check_interval':
+                        self._get_config('camera.health_check_interval', 1.0),
+                    'stall_timeout': self._get_config('camera.stall_timeout', 5.0),
+                    'backoff_initial':
+                        self._get_config('camera.restart_backoff_initial', 1.0),
+                    'backoff_max': self._get_config('camera.restart_backoff_max', 30.0),
+                    'stable_after': self._get_config('camera.stable_after', 30.0)
+                },
+                command_interval=self._get_config('camera.command_interval', 0.5),
+                profiles=self._get_config('camera.profiles'),
+                adaptive_options={
+                    'fps_ratio': self._get_config('camera.adaptive_fps_ratio', 0.8),
+                    'drop_threshold':
+                        self._get_config('camera.adaptive_drop_threshold', 0.05),
+                    'down_after': self._get_config('camera.adaptive_down_after', 2),
+                    'up_after': self._get_config('camera.adaptive_up_after', 30.0),
+                    'cooldown': self._get_config('camera.adaptive_cooldown', 10.0)
+                }
+            )
+            if config_path and not is_worker:
+                for pipeline in self.camera_pool:
+                    index = pipeline.camera.index
+                    try:
+                        pipeline.camera.load_settings(
+                            self._settings_path(config_path, index))
+                    except CameraConfigurationError as e:
+                        logger.warning(f"Using default settings for camera "
+                                       f"{index}: {e}")
             
             # Initialize server models
-            self.data_server = DataServerModel(port=5000)
-            self.settings_server = SettingsServerModel(port=5001)
-            self.auth_server = AuthServerModel(port=5002)
+            scheduler = DeadlineScheduler(
+                rate_hz=self._get_config('data.sample_rate', 24),
+                policy=self._get_config('data.missed_tick_policy', 'skip'),
+                max_catch_up=self._get_config('data.max_catch_up_ticks', 10)
+            )
+            multicast = None
+            if self._get_config('multicast.enabled', False) and not is_worker:
+                multicast = MulticastPublisher(
+                    group=self._get_config('multicast.group', '239.255.0.1'),
+                    port=self._get_config('multicast.port', 5004),
+                    ttl=self._get_config('multicast.ttl', 1),
+                    interface=self._get_config('multicast.interface', '0.0.0.0'),
+                    loopback=self._get_config('multicast.loopback', True),
+                    metrics=self.metrics
+                )
+            recorder = None
+            if self._get_config('recording.enabled', False) and not is_worker:
+                recorder = SampleRecorder(
+                    self._get_config('recording.directory', 'recordings'),
+                    prefix=self._get_config('recording.prefix', 'samples'),
+                    max_bytes=self._get_config('recording.max_bytes', 64 * 1024 * 1024),
+                    max_files=self._get_config('recording.max_files', 16),
+                    flush_interval=self._get_config('recording.flush_interval', 1.0),
+                    metrics=self.metrics
+                )
+            history = None
+            history_seconds = self._get_config('data.history_seconds', 60)
+            if history_seconds:
+                history = SampleHistory(self._get_history_capacity(history_seconds))
+            self.data_server = DataServerModel(
+                host=host,
+                port=self._get_config('server.data_port', 5000),
+                backlog=backlog,
+                ring_capacity=self._get_config('data.ring_capacity', 256),
+                scheduler=scheduler,
+                latency_budget_ms=self._get_config('data.latency_budget_ms', 50.0),
+                camera_pool=self.camera_pool,
+                metrics=self.metrics,
+                client_queue_size=self._get_config('data.client_queue_size', 48),
+                slow_client_policy=self._get_config('data.slow_client_policy',
+                                                    'drop_oldest'),
+                max_client_lag=self._get_config('data.max_client_lag', 1.0),
+                slow_client_timeout=self._get_config('data.slow_client_timeout', 10.0),
+                multicast=multicast,
+                source=create_source(self._get_config('data.source',
+                                                      {'type': 'synthetic'})),
+                recorder=recorder,
+                history=history,
+                workers=self.worker_hub,
+                sampler=not is_worker,
+                reuse_port=reuse_port
+            )
+            settings_port = self._get_config('server.settings_port', 5001)
+            if is_worker:
+                self.settings_server = RemoteSettingsServerModel(
+                    worker_link, host=host, port=settings_port, backlog=backlog,
+                    metrics=self.metrics, reuse_port=True
+                )
+            else:
+                self.settings_server = SettingsServerModel(
+                    host=host, port=settings_port, backlog=backlog,
+                    camera_pool=self.camera_pool, metrics=self.metrics,
+                    reuse_port=reuse_port
+                )
+            self.auth_server = AuthServerModel(
+                host=host, port=self._get_config('server.auth_port', 5002),
+                backlog=backlog, metrics=self.metrics, reuse_port=reuse_port
+            )
+            password = self._get_config('auth.default_password')
+            if password:
+                self.auth_server.set_password(password)
+            self.mux_server: Optional[MuxServerModel] = None
+            if self._get_config('server.mux_enabled', True):
+                self.mux_server = MuxServerModel(
+                    self.data_server, self.settings_server, self.auth_server,
+                    host=host, port=self._get_config('server.mux_port', 5003),
+                    backlog=backlog, metrics=self.metrics, reuse_port=reuse_port
+                )
+            for server in self._get_servers():
+                server.set_heartbeat(self._get_config('heartbeat.interval', 1.0),
+                                     self._get_config('heartbeat.timeout', 10.0))
+            self.metrics.add_collector(self._collect_metrics)
+            self.metrics_server: Optional[MetricsHTTPServer] = None
+            # Workers send their metrics to the owner, which serves them all
+            if self._get_config('metrics.enabled', True) and not is_worker:
+                self.metrics_server = MetricsHTTPServer(
+                    self.metrics,
+                    host=self._get_config('metrics.host', '127.0.0.1'),
+                    port=self._get_config('metrics.port', 9100)
+                )
             
-            # Server threads
-            self.server_threads: List[threading.Thread] = []
+            # Single event loop shared by all servers
+            self.event_loop = EventLoopModel()
             self.running = False
+            self._config_watch = None
             
             logger.info("Server presenter initialized successfully")
             
@@ -72,9 +246,139 @@ class ServerPresenter:
             logger.error(f"Failed to initialize server presenter: {e}")
             raise ServerPresenterError(f"Initialization failed: {e}")
 
+    def _get_config(self, key_path: str, default: Any = None) -> Any:
+        """
+        Read a value from the server configuration if one was provided.
+        
+        Args:
+            key_path: Dot-separated configuration key path
+            default: Value returned when no configuration is available
+            
+        Returns:
+            Any: Configuration value or default
+        """
+        if self.server_config is None:
+            return default
+        return self.server_config.get(key_path, default)
+
+    def _get_history_capacity(self, history_seconds: float) -> int:
+        """
+        Size the sample history to hold history_seconds of samples.
+        
+        Sources with their own rate fill it at that rate, others at one
+        sample per tick; data.history_capacity overrides the estimate.
+        
+        Args:
+            history_seconds: Seconds of samples to keep
+            
+        Returns:
+            int: History capacity in samples
+        """
+        capacity = self._get_config('data.history_capacity', 0)
+        if capacity:
+            return capacity
+        rate_hz = (self._get_config('data.source', {}).get('rate_hz')
+                   or self._get_config('data.sample_rate', 24))
+        return max(1, math.ceil(history_seconds * rate_hz))
+
+    def _get_camera_configs(self) -> List[Dict[str, Any]]:
+        """
+        Build per-camera configuration from the camera section.
+        
+        Entries of camera.cameras override the shared camera settings for
+        one camera each; without the list a single camera is configured.
+        
+        Returns:
+            List[Dict[str, Any]]: Configuration of each camera in index order
+        """
+        base = dict(self._get_config('camera', {}))
+        overrides = base.pop('cameras', None) or [{}]
+        configs = []
+        for index, override in enumerate(overrides):
+            camera_config = dict(base, **override)
+            if index > 0 and 'rtsp_url' in base and 'rtsp_url' not in override:
+                # Never publish two cameras on the same RTSP path
+                camera_config['rtsp_url'] = f"{base['rtsp_url']}_{index}"
+            configs.append(camera_config)
+        return configs
+
+    def _settings_path(self, config_path: str, index: int) -> str:
+        """
+        Get the settings file of a camera.
+        
+        Args:
+            config_path: Settings file of camera 0
+            index: Camera index
+            
+        Returns:
+            str: Settings file path for the camera
+        """
+        if index == 0:
+            return config_path
+        root, ext = os.path.splitext(config_path)
+        return f"{root}_{index}{ext}"
+
+    def _collect_metrics(self) -> List[CollectedSample]:
+        """
+        Produce camera and sampler metrics at scrape time.
+        
+        Returns:
+            List[CollectedSample]: Samples read from the supervisors and scheduler
+        """
+        samples: List[CollectedSample] = []
+        for pipeline in self.camera_pool:
+            camera = {'camera': str(pipeline.camera.index)}
+            supervisor = pipeline.supervisor
+            samples.extend([
+                ('es_camera_restarts_total', 'counter',
+                 'Camera pipeline restarts by the supervisor', camera,
+                 supervisor.restarts),
+                ('es_camera_up', 'gauge',
+                 'Whether the camera pipeline is running', camera,
+                 int(supervisor.state == STATE_RUNNING)),
+                ('es_camera_uptime_seconds', 'gauge',
+                 'Seconds since the camera pipeline was last started', camera,
+                 supervisor.get_uptime()),
+                ('es_camera_commands_applied_total', 'counter',
+                 'Camera setting changes applied', camera, pipeline.commands.applied)
+            ])
+        scheduler = self.data_server.scheduler
+        samples.extend([
+            ('es_sampler_ticks_total', 'counter', 'Sampler ticks run', {},
+             scheduler.tick_count),
+            ('es_sampler_missed_ticks_total', 'counter',
+             'Sampler ticks later than the miss tolerance', {},
+             scheduler.missed_ticks),
+            ('es_sampler_skipped_ticks_total', 'counter',
+             'Missed sampler ticks dropped by the missed tick policy', {},
+             scheduler.skipped_ticks)
+        ])
+        return samples
+
+    def get_metrics(self) -> str:
+        """
+        Render all server metrics in Prometheus text format.
+        
+        Returns:
+            str: Exposition text
+        """
+        return self.metrics.render()
+
+    def _get_servers(self) -> List[TCPServerModel]:
+        """
+        Get all managed server models.
+        
+        Returns:
+            List[TCPServerModel]: Server models in start order
+        """
+        servers = [self.data_server, self.settings_server, self.auth_server]
+        if self.mux_server is not None:
+            servers.append(self.mux_server)
+        return servers
+
     def start_servers(self) -> None:
         """
-        Start all TCP servers in separate daemon threads.
+        Start all TCP servers on the shared event loop.
         
         Raises:
             ServerPresenterError: If servers fail to start
@@ -82,32 +386,246 @@ class ServerPresenter:
         try:
             logger.info("Starting all TCP servers")
             
-            # Start camera streaming for data server
-            self.data_server.start_camera_streaming()
+            # Start camera streaming for data server and keep it alive
+            if self.camera_enabled:
+                self.data_server.start_camera_streaming()
+                self.camera_pool.start_supervisors()
+            else:
+                logger.warning("Camera disabled, serving without video streaming")
             
-            # Create and start server threads
-            self.server_threads = [
-                threading.Thread(target=self.data_server.run, daemon=True),
-                threading.Thread(target=self.settings_server.run, daemon=True),
-                threading.Thread(target=self.auth_server.run, daemon=True)
-            ]
+            # Register every server on the single event loop
+            self.event_loop.start()
+            for server in self._get_servers():
+                self.event_loop.run(server.start_serving(), timeout=5.0)
+            self._start_workers()
             
-            # Start all threads
-            for thread in self.server_threads:
-                thread.start()
+            if self.metrics_server is not None:
+                try:
+                    self.metrics_server.start()
+                except MetricsError as e:
+                    # Metrics are diagnostic only; keep serving without them
+                    logger.error(f"Metrics endpoint unavailable: {e}")
             
             self.running = True
             
+            if (self._get_config('reload.watch', True)
+                    and hasattr(self.server_config, 'reload')):
+                self._config_watch = self.event_loop.submit(self._watch_config())
+            
             logger.info("All servers started successfully:")
-            logger.info("- Data server: port 5000")
-            logger.info("- Settings server: port 5001") 
-            logger.info("- Auth server: port 5002")
+            logger.info(f"- Data server: port {self.data_server.port}")
+            logger.info(f"- Settings server: port {self.settings_server.port}")
+            logger.info(f"- Auth server: port {self.auth_server.port}")
+            if self.mux_server is not None:
+                logger.info(f"- Multiplexed server: port {self.mux_server.port}")
+            if self.data_server.multicast is not None:
+                logger.info(f"- Data multicast: {self.data_server.multicast.group}:"
+                            f"{self.data_server.multicast.port}")
+            if self.worker_hub is not None:
+                logger.info(f"- Worker processes: {self.worker_hub.count} "
+                            f"besides this one")
             
         except Exception as e:
             logger.error(f"Failed to start servers: {e}")
             self.cleanup()
             raise ServerPresenterError(f"Server startup failed: {e}")
 
+    def _start_workers(self) -> None:
+        """
+        Start the worker processes, or connect this worker to its owner.
+        
+        Raises:
+            WorkerError: If a worker process cannot be started
+        """
+        if self.worker_link is not None:
+            self.worker_link.on_close = self._on_owner_closed
+            link_started = self.worker_link.start(self.data_server,
+                                                  self.settings_server, self.metrics)
+            self.event_loop.run(link_started, timeout=5.0)
+        elif self.worker_hub is not None:
+            self.worker_hub.spawn(run_worker, self.server_config)
+            self.event_loop.run(self.worker_hub.start(self.settings_server),
+                                timeout=5.0)
+
+    def _on_owner_closed(self) -> None:
+        """Stop this worker once the owner process is gone."""
+        self.running = False
+
+    async def _watch_config(self) -> None:
+        """Poll the configuration file and apply its changes until cancelled."""
+        logger.info(f"Watching {self.server_config.path} for configuration changes")
+        while True:
+            await asyncio.sleep(self._get_config('reload.interval', 2.0))
+            if self.server_config.file_changed():
+                self.reload_config()
+
+    def reload_config(self) -> Dict[str, Tuple[Any, Any]]:
+        """
+        Re-read the configuration file and apply what changed.
+        
+        Must run on the event loop thread while servers are running, or
+        before they start.
+        
+        Returns:
+            Dict[str, Tuple[Any, Any]]: Old and new value of every changed key path
+        """
+        try:
+            changes = self.server_config.reload()
+        except Exception as e:
+            logger.error(f"Configuration reload failed, keeping the current "
+                         f"settings: {e}")
+            return {}
+        if changes:
+            logger.info(f"Configuration reloaded from {self.server_config.path}")
+            self.apply_config_changes(changes)
+        return changes
+
+    def _get_config_handlers(self) -> Dict[str, Callable[[Any], None]]:
+        """
+        Get the setters of the configuration keys applied without a restart.
+        
+        Returns:
+            Dict[str, Callable[[Any], None]]: Setter taking the new value, by key path
+        """
+        data = self.data_server
+        handlers = {
+            'data.sample_rate': data.set_sample_rate,
+            'data.latency_budget_ms': data.set_latency_budget,
+            'data.client_queue_size':
+                lambda value: data.set_slow_client_options(client_queue_size=value),
+            'data.slow_client_policy':
+                lambda value: data.set_slow_client_options(slow_client_policy=value),
+            'data.max_client_lag':
+                lambda value: data.set_slow_client_options(max_client_lag=value),
+            'data.slow_client_timeout':
+                lambda value: data.set_slow_client_options(slow_client_timeout=value),
+            'auth.default_password': self.auth_server.set_password,
+            'heartbeat.interval': lambda value: self._set_heartbeat(interval=value),
+            'heartbeat.timeout': lambda value: self._set_heartbeat(timeout=value),
+            'logging.level': self._set_log_level,
+            'camera.profile': self._set_camera_profile,
+            'camera.adaptive': self._set_camera_adaptive,
+            # Read by the watcher before every poll
+            'reload.interval': lambda value: None
+        }
+        for key, attribute in ADAPTIVE_OPTIONS.items():
+            handlers[key] = (lambda value, attribute=attribute:
+                             self._set_adaptive_option(attribute, value))
+        if self.worker_link is not None:
+            # Applied by the owner process, which runs the sampler and cameras
+            for key in ['data.sample_rate', 'camera.profile', 'camera.adaptive',
+                        *ADAPTIVE_OPTIONS]:
+                handlers[key] = lambda value: None
+        return handlers
+
+    def apply_config_changes(self, changes: Dict[str, Tuple[Any, Any]]) -> None:
+        """
+        Push changed configuration values into the running servers.
+        
+        Values without a setter only take effect after a restart, which is
+        logged. A rejected value is logged and leaves the server as it was.
+        
+        Args:
+            changes: Old and new value of every changed key path
+        """
+        handlers = self._get_config_handlers()
+        for key, (old, new) in changes.items():
+            handler = handlers.get(key)
+            if handler is None:
+                logger.warning(f"Configuration change {key} takes effect "
+                               f"after a restart")
+                continue
+            try:
+                handler(new)
+            except (ValueError, TypeError, SchedulerError, ProfileError,
+                    TCPServerError) as e:
+                logger.error(f"Rejected configuration change {key}={new!r}: {e}")
+                continue
+            shown = '***' if key == 'auth.default_password' else f"{old!r} -> {new!r}"
+            logger.info(f"Applied configuration change {key}: {shown}")
+
+    def _set_heartbeat(self, interval: Optional[float] = None,
+                       timeout: Optional[float] = None) -> None:
+        """
+        Change the heartbeat of every server.
+        
+        Args:
+            interval: Seconds between pings, 0 stops pinging
+            timeout: Seconds without answers after which a client is dropped
+            
+        Raises:
+            ValueError: If a value is negative
+        """
+        for server in self._get_servers():
+            server.set_heartbeat(interval, timeout)
+
+    def _set_log_level(self, level: str) -> None:
+        """
+        Change the root log level.
+        
+        Args:
+            level: Level name, e.g. 'DEBUG'
+            
+        Raises:
+            ValueError: If the level name is unknown
+        """
+        if not isinstance(logging.getLevelName(str(level).upper()), int):
+            raise ValueError(f"Unknown log level {level}")
+        logging.getLogger().setLevel(str(level).upper())
+
+    def _set_camera_profile(self, name: str) -> None:
+        """
+        Switch every camera without its own profile override to a profile.
+        
+        Args:
+            name: Profile name
+            
+        Raises:
+            ProfileError: If no profile has this name
+        """
+        overrides = self._get_config('camera.cameras') or [{}]
+        for pipeline in self.camera_pool:
+            index = pipeline.camera.index
+            if index < len(overrides) and 'profile' in overrides[index]:
+                continue
+            future = pipeline.select_profile(pipeline.quality.find(name))
+            future.add_done_callback(self._log_command_failure)
+
+    def _set_camera_adaptive(self, enabled: bool) -> None:
+        """
+        Enable or disable adaptive quality on every camera without an override.
+        
+        Args:
+            enabled: True to adapt profiles to client reports
+        """
+        overrides = self._get_config('camera.cameras') or [{}]
+        for pipeline in self.camera_pool:
+            index = pipeline.camera.index
+            if index < len(overrides) and 'adaptive' in overrides[index]:
+                continue
+            pipeline.quality.set_adaptive(bool(enabled))
+
+    def _set_adaptive_option(self, attribute: str, value: Any) -> None:
+        """
+        Set an adaptive quality threshold on every camera.
+        
+        Args:
+            attribute: AdaptiveQualityController attribute
+            value: New value
+        """
+        for pipeline in self.camera_pool:
+            setattr(pipeline.quality, attribute, value)
+
+    def _log_command_failure(self, future: Any) -> None:
+        """
+        Log a camera command that failed to apply.
+        
+        Args:
+            future: Completed camera command
+        """
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Camera profile change failed: {future.exception()}")
+
     def stop_servers(self) -> None:
         """Stop all running servers and clean up resources."""
         logger.info("Stopping all servers")
@@ -118,13 +636,35 @@ class ServerPresenter:
         try:
             self.running = False
             
-            # Stop all servers
+            if getattr(self, '_config_watch', None) is not None:
+                self._config_watch.cancel()
+                self._config_watch = None
+            
+            # Release the worker links while the event loop still runs
+            event_loop = getattr(self, 'event_loop', None)
+            if event_loop is not None and event_loop.is_running():
+                if getattr(self, 'worker_hub', None) is not None:
+                    self.event_loop.run(self.worker_hub.stop(), timeout=10.0)
+                if getattr(self, 'worker_link', None) is not None:
+                    self.event_loop.run(self.worker_link.stop(), timeout=5.0)
+            
+            # Stop supervising before the camera is shut down
+            if hasattr(self, 'camera_pool'):
+                self.camera_pool.stop_supervisors()
+            
+            # Stop all servers, sessions sharing the others first
+            if getattr(self, 'mux_server', None) is not None:
+                self.mux_server.cleanup()
             if hasattr(self, 'data_server'):
                 self.data_server.cleanup()
             if hasattr(self, 'settings_server'):
                 self.settings_server.cleanup()
             if hasattr(self, 'auth_server'):
                 self.auth_server.cleanup()
+            if hasattr(self, 'event_loop'):
+                self.event_loop.stop()
+            if getattr(self, 'metrics_server', None) is not None:
+                self.metrics_server.stop()
             
             logger.info("Server cleanup completed")
             
@@ -172,37 +712,68 @@ class ServerPresenter:
             'data_server': {
                 'host': self.data_server.host,
                 'port': self.data_server.port,
-                'running': self.data_server.running
+                'running': self.data_server.running,
+                'clients': self.data_server.get_client_count(),
+                'sampler': self.data_server.get_sampler_stats(),
+                'batch_size': self.data_server.batch_size,
+                'client_lag': self.data_server.get_client_stats(),
+                'multicast': (self.data_server.multicast.get_stats()
+                              if self.data_server.multicast else None),
+                'history_samples': (len(self.data_server.history)
+                                    if self.data_server.history is not None else None)
             },
             'settings_server': {
                 'host': self.settings_server.host,
                 'port': self.settings_server.port,
-                'running': self.settings_server.running
+                'running': self.settings_server.running,
+                'clients': self.settings_server.get_client_count(),
+                'links': self.settings_server.get_link_stats()
             },
             'auth_server': {
                 'host': self.auth_server.host,
                 'port': self.auth_server.port,
-                'running': self.auth_server.running
+                'running': self.auth_server.running,
+                'clients': self.auth_server.get_client_count(),
+                'links': self.auth_server.get_link_stats()
             },
-            'camera_settings': self.camera_model.get_settings()
+            'mux_server': {
+                'host': self.mux_server.host,
+                'port': self.mux_server.port,
+                'running': self.mux_server.running,
+                'clients': self.mux_server.get_client_count(),
+                'subscribed': self.mux_server.get_stream_count(),
+                'links': self.mux_server.get_link_stats()
+            } if self.mux_server else None,
+            'cameras': self.camera_pool.get_status(),
+            'metrics_port': self.metrics_server.port if self.metrics_server else None,
+            'workers': self.worker_hub.get_stats() if self.worker_hub else None
         }
 
-    def update_camera_settings(self, new_settings: dict, config_path: Optional[str] = None) -> None:
+    def update_camera_settings(self, new_settings: dict,
+                               config_path: Optional[str] = None,
+                               camera_index: int = 0) -> None:
         """
         Update camera settings and optionally save to file.
         
         Args:
             new_settings: New camera settings dictionary
-            config_path: Optional path to save settings file
+            config_path: Optional path of camera 0's settings file
+            camera_index: Index of the camera to update
             
         Raises:
             ServerPresenterError: If settings update fails
         """
         try:
-            self.camera_model.update_settings(new_settings)
+            pipeline = self.camera_pool.get(camera_index)
+            if pipeline.commands.is_running():
+                # Serialise with client updates on the command worker
+                pipeline.commands.submit(new_settings).result()
+            else:
+                pipeline.camera.update_settings(new_settings)
             
             if config_path:
-                self.camera_model.save_settings(config_path)
+                pipeline.camera.save_settings(
+                    self._settings_path(config_path, camera_index))
                 
             logger.info("Camera settings updated via presenter")
             
@@ -210,6 +781,28 @@ class ServerPresenter:
             logger.error(f"Failed to update camera settings: {e}")
             raise ServerPresenterError(f"Settings update failed: {e}")
 
+    def select_stream_profile(self, profile_name: str, camera_index: int = 0) -> None:
+        """
+        Switch a camera to a named encoding profile, disabling adaptive mode.
+        
+        Args:
+            profile_name: Name of the profile
+            camera_index: Index of the camera
+            
+        Raises:
+            ServerPresenterError: If the profile cannot be applied
+        """
+        try:
+            pipeline = self.camera_pool.get(camera_index)
+            future = pipeline.select_profile(pipeline.quality.find(profile_name))
+            if pipeline.commands.is_running():
+                future.result()
+            logger.info(f"Camera {camera_index} profile set to {profile_name} "
+                        f"via presenter")
+        except Exception as e:
+            logger.error(f"Failed to select stream profile: {e}")
+            raise ServerPresenterError(f"Profile selection failed: {e}")
+
     def set_auth_password(self, new_password: str) -> None:
         """
         Update the authentication password.
@@ -222,4 +815,36 @@ class ServerPresenter:
             logger.info("Authentication password updated via presenter")
         except Exception as e:
             logger.error(f"Failed to update auth password: {e}")
-            raise ServerPresenterError(f"Password update failed: {e}")
\ No newline at end of file
+            raise ServerPresenterError(f"Password update failed: {e}")
+
+
+def run_worker(server_config: Any, index: int, sock: socket.socket) -> None:
+    """
+    Run a worker process serving clients on the shared ports.
+    
+    Started by the owner's WorkerHub in a fresh process, so logging is
+    configured here from the server configuration.
+    
+    Args:
+        server_config: ServerConfig of the owner process
+        index: Worker index
+        sock: Worker end of the link to the owner
+    """
+    log_config = server_config.get_logging_config()
+    logging.basicConfig(
+        level=getattr(logging, log_config.get('level', 'INFO')),
+        format=log_config.get('format',
+                              '%(asctime)s - %(name)s - %(levelname)s - %(message)s'),
+        handlers=[
+            logging.FileHandler(log_config.get('file', 'server.log')),
+            logging.StreamHandler()
+        ]
+    )
+    logger.info(f"Worker {index} starting (pid {os.getpid()})")
+    try:
+        presenter = ServerPresenter(server_config=server_config,
+                                    worker_link=WorkerLink(sock))
+    except ServerPresenterError as e:
+        logger.error(f"Worker {index} failed: {e}")
+        return
+    presenter.run_forever()
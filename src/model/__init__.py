@@ -4,14 +4,17 @@ Contains all data models for the ES IoT application.
 """
 
 from .auth_model import AuthModel
+from .clock_model import ClockModel
 from .data_model import DataModel
 from .graph_model import GraphModel
 from .settings_model import SettingsModel
-from .tcp_model import TCPBase, NumberDataReceiver, SettingsReceiver, AuthReceiver
+from .tcp_model import (TCPBase, NumberDataReceiver, SettingsReceiver, AuthReceiver,
+                        MuxSession)
 from .video_model import VideoModel
 
 __all__ = [
     'AuthModel',
+    'ClockModel',
     'DataModel',
     'GraphModel',
     'SettingsModel',
@@ -19,5 +22,6 @@ __all__ = [
     'NumberDataReceiver',
     'SettingsReceiver',
     'AuthReceiver',
+    'MuxSession',
     'VideoModel'
 ]
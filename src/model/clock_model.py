@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import deque
+
+
+class ClockModel:
+    """Estimates the server clock's offset and drift from NTP-style exchanges
+
+    Each exchange gives the client transmit time t1, server receive time t2,
+    server transmit time t3 and client receive time t4. Its offset
+    ((t2 - t1) + (t3 - t4)) / 2 is exact when both directions take equally
+    long, and off by at most half the round trip otherwise, so of the last
+    filter_size exchanges only the one with the shortest round trip is
+    kept. The drift is the least-squares slope of the kept offsets.
+    """
+    def __init__(self, window=32, filter_size=8, sync_interval=4.0,
+                 initial_interval=0.5, min_drift_span=30.0):
+        self.filter_size = filter_size
+        self.sync_interval = sync_interval  # Seconds between exchanges once synced
+        # Seconds between the first filter_size exchanges
+        self.initial_interval = initial_interval
+        self.min_drift_span = min_drift_span  # Seconds of kept offsets needed for drift
+        self.exchanges = 0
+        self._recent = deque(maxlen=filter_size)  # (local_s, offset_s, delay_s)
+        self._kept = deque(maxlen=window)  # Best exchange of each filter round
+        self._offset = None  # (local_s, offset_s) the estimate is anchored at
+        self._drift = 0.0  # Seconds of offset change per second
+        self._delay = None
+        self._lock = threading.Lock()
+
+    def get_sync_interval(self):
+        """Seconds until the next exchange should be sent"""
+        if self.exchanges < self.filter_size:
+            return self.initial_interval
+        return self.sync_interval
+
+    def add_exchange(self, t1, t2, t3, t4):
+        """Add one exchange, all times in seconds since the epoch"""
+        delay = (t4 - t1) - (t3 - t2)
+        if delay < 0:
+            return  # A clock stepped during the exchange
+        offset = ((t2 - t1) + (t3 - t4)) / 2
+        with self._lock:
+            self.exchanges += 1
+            self._recent.append((t4, offset, delay))
+            best = min(self._recent, key=lambda exchange: exchange[2])
+            if self._kept and self._kept[-1] is best:
+                return
+            if self._kept and self._kept[-1] in self._recent:
+                # Still the same filter round, the better exchange replaces it
+                self._kept.pop()
+            self._kept.append(best)
+            self._delay = best[2]
+            self._update_estimate()
+
+    def _update_estimate(self):
+        """Fit offset and drift to the kept exchanges"""
+        points = list(self._kept)
+        span = points[-1][0] - points[0][0]
+        if len(points) < 3 or span < self.min_drift_span:
+            self._offset = points[-1][:2]
+            self._drift = 0.0
+            return
+        mean_t = sum(p[0] for p in points) / len(points)
+        mean_o = sum(p[1] for p in points) / len(points)
+        variance = sum((p[0] - mean_t) ** 2 for p in points)
+        self._drift = sum((p[0] - mean_t) * (p[1] - mean_o) for p in points) / variance
+        self._offset = (mean_t, mean_o)
+
+    def is_synced(self):
+        """True once at least one exchange has been measured"""
+        return self._offset is not None
+
+    def get_offset(self, local_time=None):
+        """Server clock minus client clock in seconds at a local time"""
+        with self._lock:
+            if self._offset is None:
+                return 0.0
+            anchor, offset = self._offset
+            if local_time is None:
+                local_time = time.time()
+            return offset + self._drift * (local_time - anchor)
+
+    def to_server_ms(self, local_time=None):
+        """Convert a local time.time() value to the server's clock in ms"""
+        if local_time is None:
+            local_time = time.time()
+        return (local_time + self.get_offset(local_time)) * 1000.0
+
+    def get_stats(self):
+        """Offset, drift and round trip of the current estimate"""
+        offset = self.get_offset()
+        delay = self._delay
+        return {
+            'synced': self.is_synced(),
+            'offset_ms': round(offset * 1000, 3),
+            'drift_ppm': round(self._drift * 1e6, 2),
+            'delay_ms': round(delay * 1000, 3) if delay is not None else None,
+            'exchanges': self.exchanges
+        }
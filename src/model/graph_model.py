@@ -13,14 +13,31 @@ class GraphModel:
         self.last_print = 0
         self.last_value = None
         self.last_time = None
+        # Change-only streams skip samples whose value held; when set, the
+        # gaps are filled with the held value at this spacing
+        self.hold_interval_ms = None
+        self.held_times = deque(maxlen=max_length)  # Points that were filled in
+        # Latest sample latencies in ms on the server's clock
+        self.network_latency = deque(maxlen=256)  # Sample to client receipt
+        self.render_latency = deque(maxlen=256)  # Newest sample to graph render
         self._observers = []
 
-    def add_data_point(self, value, timestamp_ms):
-        """Add new data point and process it"""
+    def add_data_point(self, value, timestamp_ms, received_ms=None):
+        """Add new data point and process it
+
+        received_ms is the sample's arrival time on the server's clock,
+        when known, and records its network latency.
+        """
         # Skip if no new data
         if value == self.last_value and timestamp_ms == self.last_time:
             return False
 
+        if received_ms is not None:
+            self.network_latency.append(received_ms - timestamp_ms)
+
+        if self.hold_interval_ms and self.last_time and timestamp_ms > self.last_time:
+            self._add_held_points(timestamp_ms)
+
         self.last_value = value
         self.last_time = timestamp_ms
         current_time = time.time()
@@ -30,13 +47,7 @@ class GraphModel:
 
         # Add new data
         if timestamp_ms > 0:
-            dt = datetime.fromtimestamp(timestamp_ms / 1000.0)
-            self.times.append(dt)
-            self.values.append(value)
-
-            # Calculate smoothed value
-            smoothed = self._calculate_smoothed_value(value)
-            self.smoothed_values.append(smoothed)
+            self._append_point(value, timestamp_ms)
             
             # Notify observers
             self._notify_observers()
@@ -44,6 +55,60 @@ class GraphModel:
         
         return False
 
+    def set_hold_interval(self, interval_ms):
+        """Fill gaps of a change-only stream at interval_ms, None for full rate"""
+        self.hold_interval_ms = interval_ms
+
+    def _add_held_points(self, timestamp_ms):
+        """Repeat the last value at every sample time skipped before timestamp_ms"""
+        interval = self.hold_interval_ms
+        count = int((timestamp_ms - self.last_time) / interval + 0.5) - 1
+        # Only the newest max_length points can stay in the window
+        for step in range(max(1, count - self.times.maxlen + 1), count + 1):
+            self._append_point(self.last_value, self.last_time + step * interval)
+            self.held_times.append(self.times[-1])
+
+    def _append_point(self, value, timestamp_ms):
+        """Append one point and its smoothed value"""
+        self.times.append(datetime.fromtimestamp(timestamp_ms / 1000.0))
+        self.values.append(value)
+        self.smoothed_values.append(self._calculate_smoothed_value(value))
+
+    def merge_data_points(self, samples):
+        """Merge backfilled (value, timestamp_ms) samples, older or newer, into view"""
+        points = dict(zip(self.times, self.values))
+        real = [(value, timestamp_ms) for value, timestamp_ms in samples
+                if timestamp_ms > 0]
+        replaced = False
+        if real and self.held_times:
+            # Real samples supersede the values held in for them
+            start = datetime.fromtimestamp(min(ts for _, ts in real) / 1000.0)
+            end = datetime.fromtimestamp(max(ts for _, ts in real) / 1000.0)
+            for dt in self.held_times:
+                if start <= dt <= end and points.pop(dt, None) is not None:
+                    replaced = True
+        for value, timestamp_ms in real:
+            points.setdefault(datetime.fromtimestamp(timestamp_ms / 1000.0), value)
+        newest = real[-1] if real else None
+        if len(points) == len(self.times) and not replaced:
+            return False
+
+        # Rebuild in time order so smoothing runs over the merged values
+        self.times.clear()
+        self.values.clear()
+        self.smoothed_values.clear()
+        for dt in sorted(points)[-self.times.maxlen:]:
+            self.times.append(dt)
+            self.values.append(points[dt])
+            self.smoothed_values.append(self._calculate_smoothed_value(points[dt]))
+        self.held_times = deque((dt for dt in self.held_times if dt in points),
+                                maxlen=self.held_times.maxlen)
+
+        if newest and (self.last_time is None or newest[1] > self.last_time):
+            self.last_value, self.last_time = newest
+        self._notify_observers()
+        return True
+
     def _calculate_smoothed_value(self, current_value):
         """Calculate smoothed value using moving average"""
         values_list = list(self.values)
@@ -68,6 +133,29 @@ class GraphModel:
         
         return times_list, values_list, smoothed_list, (start_time, end_time)
 
+    def mark_rendered(self, rendered_ms):
+        """Record that the graph was drawn at rendered_ms on the server's clock"""
+        if self.last_time:
+            self.render_latency.append(rendered_ms - self.last_time)
+
+    def get_latency_stats(self):
+        """Median, p99 and max of the latest network and render latencies in ms"""
+        stats = {}
+        for name, latencies in (('network', self.network_latency),
+                                ('render', self.render_latency)):
+            ordered = sorted(latencies)
+            if not ordered:
+                stats[name] = None
+                continue
+            stats[name] = {
+                'p50_ms': round(ordered[len(ordered) // 2], 1),
+                'p99_ms': round(ordered[min(len(ordered) - 1,
+                                            int(0.99 * len(ordered)))], 1),
+                'max_ms': round(ordered[-1], 1),
+                'count': len(ordered)
+            }
+        return stats
+
     def should_update_plot(self, update_interval=0.1):
         """Check if plot should be updated based on time interval"""
         current_time = time.time()
@@ -87,6 +175,9 @@ class GraphModel:
         self.smoothed_values.clear()
         self.last_value = None
         self.last_time = None
+        self.held_times.clear()
+        self.network_latency.clear()
+        self.render_latency.clear()
         self._notify_observers()
 
     def add_observer(self, observer):
@@ -1,12 +1,20 @@
 import socket
-import threading
 import struct
+import threading
 import time
 from abc import ABC, abstractmethod
-from functools import reduce
+from collections import deque
+
+from protocol import codec
+from protocol.heartbeat import RttWindow
+from protocol.parser import FrameParser
+from .clock_model import ClockModel
 
 class TCPBase(ABC):
     """Base class with common TCP functionality"""
+    # Packet IDs a MuxSession routes to this receiver
+    packet_ids = frozenset()
+
     def __init__(self, server_ip, port):
         self.server_ip = server_ip
         self.port = port
@@ -17,12 +25,27 @@ class TCPBase(ABC):
         self.last_reconnect = 0
         self.reconnect_delay = 1.0
         self.data_timeout = 2.0
+        # Pings keep idle links alive well within data_timeout and time the round trip
+        self.heartbeat_interval = 0.5
+        self.last_ping = 0
+        self.rtt = RttWindow()
+        # Server clock estimate fed by this link's sync exchanges; links may share one
+        self.clock = ClockModel()
+        self.last_clock_sync = 0
+        self.session = None  # MuxSession feeding this receiver, if any
+        # The receiver thread (heartbeats, clock sync) and the UI thread
+        # (commands) write to the same socket; whole packets only
+        self.send_lock = threading.Lock()
+        self._parser = FrameParser()
 
     def _connect(self):
         try:
             client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             client.settimeout(1.0)
+            # Heartbeats and commands are tiny; don't let Nagle hold them back
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             client.connect((self.server_ip, self.port))
+            self._parser.reset()
             print(f"TCP connected to {self.server_ip}:{self.port}")
             self.last_data_time = time.time()
             return client
@@ -31,47 +54,27 @@ class TCPBase(ABC):
             return None
 
     def _calculate_checksum(self, data):
-        return reduce(lambda x, y: x ^ y, data)
+        return codec.checksum(data)
 
     def _create_packet(self, id_, typ, payload=b''):
         """Create a packet with header and checksum"""
-        header = bytes([
-            0x00, 0xFF,  # P, N
-            id_,         # ID
-            typ,         # Type
-            len(payload) >> 8,  # Length MSB
-            len(payload) & 0xFF # Length LSB
-        ])
-        packet = header + payload
-        return packet + bytes([self._calculate_checksum(packet)])
+        return codec.encode_packet(id_, typ, payload)
 
     def _read_packet(self, client):
-        """Read and validate a complete packet"""
-        # Read packet header
-        header = client.recv(6)
-        if not header or len(header) != 6:
-            raise ConnectionError("Invalid header")
-
-        if header[0] != 0x00 or header[1] != 0xFF:
-            return None, None, None
-
-        id_ = header[2]
-        typ = header[3]
-        payload_len = (header[4] << 8) | header[5]
-
-        # Read payload and checksum
-        data = client.recv(payload_len + 1)
-        if len(data) != payload_len + 1:
-            raise ConnectionError("Invalid payload")
+        """Read the next valid packet (payload is a memoryview).
 
-        # Verify checksum
-        packet = header + data[:-1]
-        if self._calculate_checksum(packet) != data[-1]:
-            return None, None, None
-
-        return id_, typ, data[:-1]
+        Partial packets are kept across socket timeouts and corrupt bytes
+        are skipped by resynchronising on the packet markers.
+        """
+        errors = self._parser.checksum_errors
+        frame = self._parser.read_frame(client)
+        if self._parser.checksum_errors != errors:
+            print(f"{self.__class__.__name__} resynchronised after corrupt packet")
+        return frame
 
     def start(self):
+        if self.session:  # Fed by a shared session connection
+            return
         self.thread = threading.Thread(target=self._tcp_receiver, daemon=True)
         self.thread.start()
 
@@ -83,6 +86,57 @@ class TCPBase(ABC):
     def is_connected(self):
         return self.connected and time.time() - self.last_data_time < self.data_timeout
 
+    def get_rtt_stats(self):
+        """Return heartbeat round-trip times of the link in ms"""
+        return (self.session or self).rtt.get_stats()
+
+    def _send(self, client, packet):
+        """Send a whole packet, holding the connection's send lock"""
+        with (self.session or self).send_lock:
+            client.sendall(packet)
+
+    def _send_heartbeat(self, client):
+        """Ping the server once every heartbeat_interval"""
+        now = time.time()
+        if now - self.last_ping >= self.heartbeat_interval:
+            self.last_ping = now
+            self._send(client, codec.encode_ping(time.monotonic_ns()))
+
+    def _send_clock_sync(self, client):
+        """Start a clock sync exchange when the clock model asks for one"""
+        now = time.time()
+        if now - self.last_clock_sync >= self.clock.get_sync_interval():
+            self.last_clock_sync = now
+            self._send(client, codec.encode_clock_request(time.time_ns() // 1000))
+
+    def _handle_clock(self, typ, payload):
+        """Feed a clock sync answer, stamped on arrival, to the clock model"""
+        received = time.time()
+        if typ != codec.TYPE_RESPONSE:
+            return
+        try:
+            t1, t2, t3 = codec.decode_clock_response(payload)
+        except codec.ProtocolError as e:
+            print(f"{self.__class__.__name__} ignored invalid clock sync: {e}")
+            return
+        self.clock.add_exchange(t1 / 1e6, t2 / 1e6, t3 / 1e6, received)
+
+    def _handle_ping(self, client, typ, payload):
+        """Answer the server's pings and time the answers to ours"""
+        try:
+            token = codec.decode_ping(payload)
+        except codec.ProtocolError as e:
+            print(f"{self.__class__.__name__} ignored invalid heartbeat: {e}")
+            return
+        if typ == codec.TYPE_COMMAND:
+            self._send(client, codec.encode_ping(token, codec.TYPE_RESPONSE))
+        elif typ == codec.TYPE_RESPONSE:
+            self.rtt.add((time.monotonic_ns() - token) / 1e9)
+
+    def _mark_alive(self):
+        """Record that the link delivered a packet, heartbeats included"""
+        self.last_data_time = time.time()
+
     def _tcp_receiver(self):
         while self.run:
             client = None
@@ -106,10 +160,18 @@ class TCPBase(ABC):
 
                 while self.run and self.connected:
                     try:
+                        self._send_heartbeat(client)
+                        self._send_clock_sync(client)
                         id_, typ, payload = self._read_packet(client)
-                        if id_ is not None:
+                        if id_ == codec.ID_PING:
+                            self._handle_ping(client, typ, payload)
+                            self._mark_alive()
+                        elif id_ == codec.ID_CLOCK:
+                            self._handle_clock(typ, payload)
+                            self._mark_alive()
+                        elif id_ is not None:
                             self._handle_packet(id_, typ, payload)
-                            self.last_data_time = time.time()
+                            self._mark_alive()
                     except socket.timeout:
                         continue
                     except Exception as e:
@@ -136,17 +198,232 @@ class TCPBase(ABC):
 
 class NumberDataReceiver(TCPBase):
     """Handles receiving numeric data stream"""
-    def __init__(self, server_ip, port=5000):
+    packet_ids = frozenset([codec.ID_DATA, codec.ID_DATA_BATCH, codec.ID_BACKFILL,
+                            codec.ID_DATA_COMPACT, codec.ID_DEADBAND])
+
+    def __init__(self, server_ip, port=5000, max_pending=4096,
+                 multicast_group=None, multicast_port=5004, backfill_seconds=30,
+                 compact=True, deadband=None, keepalive=1.0):
         super().__init__(server_ip, port)
         self.finger_count = 0
         self.timestamp_ms = 0
+        # Ask for the delta/varint stream encoding on every connection
+        self.compact = compact
+        self.compact_reference = None  # Last timestamp of the previous compact packet
+        # Change-only mode: only samples moving more than deadband, plus one
+        # every keepalive seconds; each value holds until the next sample
+        self.deadband = deadband
+        self.keepalive = keepalive
+        self.sample_interval_ms = None  # Spacing of the held samples, set by the server
+        # Samples not yet consumed by the UI, oldest first, with their
+        # arrival time on the server's clock (None until the clock is synced)
+        self.samples = deque(maxlen=max_pending)
+        # History requested on every (re)connect, merged by the UI separately
+        self.backfill_seconds = backfill_seconds
+        self.history = deque(maxlen=max_pending)
+        # Multicast mode receives datagrams from the group instead of TCP
+        self.multicast_group = multicast_group
+        self.multicast_port = multicast_port
+        self.next_sequence = None
+        self.reorder_window = 64  # Larger backward jumps mean the server restarted
+        self.gaps = 0
+        self.lost_datagrams = 0
+        self.late_datagrams = 0
+
+    def start(self):
+        if not self.multicast_group or self.session:
+            super().start()
+            return
+        self.thread = threading.Thread(target=self._multicast_receiver, daemon=True)
+        self.thread.start()
+
+    def _on_connect(self, client):
+        """Select the encoding, subscribe on a mux session, then ask for history"""
+        self.compact_reference = None
+        self.sample_interval_ms = None
+        if self.compact:
+            self._send(client, codec.encode_stream_encoding(codec.ENCODING_COMPACT))
+        if self.deadband is not None:
+            command = codec.encode_deadband_command(True, self.deadband,
+                                                    int(self.keepalive * 1000))
+            self._send(client, command)
+        if self.session:
+            self._send(client, self._create_packet(codec.ID_DATA, codec.TYPE_COMMAND,
+                                                   bytes([codec.DATA_SUBSCRIBE])))
+        if not self.backfill_seconds:
+            return
+        if self.timestamp_ms:
+            # Reconnecting: only the samples missed while disconnected
+            request = codec.encode_backfill_request(codec.BACKFILL_SINCE,
+                                                    self.timestamp_ms)
+        else:
+            request = codec.encode_backfill_request(codec.BACKFILL_LAST,
+                                                    int(self.backfill_seconds * 1000))
+        self._send(client, request)
 
     def _handle_packet(self, id_, typ, payload):
-        if id_ == 0x01 and typ == 0x00 and len(payload) == 9:
-            value = payload[0]
-            timestamp = struct.unpack('>Q', payload[1:9])[0]
-            self.finger_count = value
-            self.timestamp_ms = timestamp
+        if id_ == codec.ID_BACKFILL:
+            self._handle_backfill_packet(typ, payload)
+            return
+        if id_ == codec.ID_DEADBAND:
+            self._handle_deadband_packet(typ, payload)
+            return
+        if typ != codec.TYPE_RESPONSE:
+            return
+        if id_ == codec.ID_DATA and len(payload) == codec.SAMPLE_SIZE:
+            self._add_samples([codec.decode_sample(payload)])
+        elif (id_ == codec.ID_DATA_BATCH and payload
+              and len(payload) % codec.SAMPLE_SIZE == 0):
+            # Batch of samples packed back to back
+            self._add_samples(codec.decode_samples(payload))
+        elif id_ == codec.ID_DATA_COMPACT:
+            self._handle_compact_packet(payload)
+
+    def _handle_compact_packet(self, payload):
+        """Decode delta-coded samples against the previous compact packet"""
+        try:
+            samples = codec.decode_compact_samples(payload, self.compact_reference)
+        except codec.ProtocolError as e:
+            # Without its reference the stream cannot be decoded until the next
+            # key packet
+            print(f"Ignored compact data packet: {e}")
+            self.compact_reference = None
+            return
+        self.compact_reference = samples[-1][1]
+        self._add_samples(samples)
+
+    def _handle_deadband_packet(self, typ, payload):
+        """Record whether the server applied change-only mode and its sample spacing"""
+        if typ == codec.TYPE_ERROR:
+            print("Change-only mode refused:",
+                  bytes(payload).decode('utf-8', 'replace'))
+            return
+        if typ != codec.TYPE_RESPONSE:
+            return
+        try:
+            state = codec.decode_deadband_state(payload)
+            enabled, deadband, keepalive_ms, period_us = state
+        except codec.ProtocolError as e:
+            print(f"Ignored invalid change-only mode state: {e}")
+            return
+        self.sample_interval_ms = period_us / 1000.0 if enabled else None
+        if enabled:
+            print(f"Change-only mode: deadband {deadband}, keepalive {keepalive_ms} ms")
+
+    def _handle_backfill_packet(self, typ, payload):
+        """Queue backfilled samples, older than the live ones that follow"""
+        if typ == codec.TYPE_ERROR:
+            print("Backfill refused:", bytes(payload).decode('utf-8', 'replace'))
+            return
+        if typ != codec.TYPE_RESPONSE or len(payload) % codec.SAMPLE_SIZE:
+            return
+        samples = codec.decode_samples(payload)
+        if not samples:
+            return
+        print(f"Backfilled {len(samples)} samples")
+        self.history.extend(samples)
+        if samples[-1][1] > self.timestamp_ms:
+            self.finger_count, self.timestamp_ms = samples[-1]
+
+    def _open_multicast(self):
+        """Join the multicast group, returns the socket or None"""
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind(('', self.multicast_port))
+            membership = struct.pack('4s4s', socket.inet_aton(self.multicast_group),
+                                     socket.inet_aton('0.0.0.0'))
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+            sock.settimeout(1.0)
+            print(f"Joined multicast group "
+                  f"{self.multicast_group}:{self.multicast_port}")
+            return sock
+        except OSError as e:
+            print(f"Multicast join failed: {e}")
+            return None
+
+    def _multicast_receiver(self):
+        while self.run:
+            sock = self._open_multicast()
+            if not sock:
+                time.sleep(self.reconnect_delay)
+                continue
+            try:
+                while self.run:
+                    try:
+                        datagram = sock.recv(65535)
+                    except socket.timeout:
+                        continue
+                    self._handle_datagram(datagram)
+            except OSError as e:
+                print(f"Multicast receive error: {e}")
+            finally:
+                sock.close()
+                self.connected = False
+
+    def _handle_datagram(self, datagram):
+        """Decode a sequenced datagram and count missing sequence numbers"""
+        try:
+            id_, typ, payload = codec.decode_packet(datagram)
+            if id_ != codec.ID_DATA_SEQUENCED or typ != codec.TYPE_RESPONSE:
+                return
+            sequence, samples = codec.decode_sequenced_samples(payload)
+        except codec.ProtocolError as e:
+            print(f"Ignored corrupt multicast datagram: {e}")
+            return
+
+        if self.next_sequence is not None:
+            missed = (sequence - self.next_sequence) % codec.SEQUENCE_MODULO
+            behind = codec.SEQUENCE_MODULO - missed
+            if missed >= codec.SEQUENCE_MODULO // 2 and behind <= self.reorder_window:
+                self.late_datagrams += 1  # Duplicate or reordered, already past it
+                return
+            if 0 < missed < codec.SEQUENCE_MODULO // 2:
+                self.gaps += 1
+                self.lost_datagrams += missed
+                print(f"Multicast gap: {missed} datagrams lost")
+        self.next_sequence = (sequence + 1) % codec.SEQUENCE_MODULO
+        self.connected = True
+        self.last_data_time = time.time()
+        if samples:
+            self._add_samples(samples)
+
+    def get_multicast_stats(self):
+        """Return gap counters of the multicast stream"""
+        return {
+            'gaps': self.gaps,
+            'lost_datagrams': self.lost_datagrams,
+            'late_datagrams': self.late_datagrams
+        }
+
+    def _add_samples(self, samples):
+        """Queue decoded (value, timestamp_ms) samples and keep the latest"""
+        received_ms = self.clock.to_server_ms() if self.clock.is_synced() else None
+        self.samples.extend((value, timestamp_ms, received_ms)
+                            for value, timestamp_ms in samples)
+        self.finger_count, self.timestamp_ms = samples[-1]
+
+    def get_samples(self):
+        """Return and remove all queued samples in time order"""
+        return [sample[:2] for sample in self.get_timed_samples()]
+
+    def get_timed_samples(self):
+        """Return and remove all queued (value, timestamp_ms, received_ms) samples
+
+        received_ms is the arrival time on the server's clock, so
+        received_ms - timestamp_ms is the sample's true latency.
+        """
+        samples = []
+        while self.samples:
+            samples.append(self.samples.popleft())
+        return samples
+
+    def get_history(self):
+        """Return and remove all backfilled samples in time order"""
+        history = []
+        while self.history:
+            history.append(self.history.popleft())
+        return history
 
     def get_finger_count(self):
         return self.finger_count
@@ -156,8 +433,12 @@ class NumberDataReceiver(TCPBase):
 
 class SettingsReceiver(TCPBase):
     """Handles settings synchronization"""
-    def __init__(self, server_ip, port=5001):
+    packet_ids = frozenset([codec.ID_SETTINGS, codec.ID_PROFILE, codec.ID_QUALITY])
+
+    def __init__(self, server_ip, port=5001, camera_index=0):
         super().__init__(server_ip, port)
+        self.camera_index = camera_index  # Camera addressed on multi-camera servers
+        self.profile_state = None  # Encoding profiles, populated on request
         self.settings = None  # Will be populated when settings are received
         self.settings_received = False  # Flag to track successful receipt
         self.client = None
@@ -178,9 +459,11 @@ class SettingsReceiver(TCPBase):
                 int(float(settings['contrast']) * 10),
                 int((settings['brightness'] + 1.0) * 127.5)  # map -1,1 to 0,255
             ])
+            if self.camera_index:
+                payload += bytes([self.camera_index])  # optional camera index
 
             packet = self._create_packet(0x02, 0x01, payload)
-            self.client.send(packet)
+            self._send(self.client, packet)
             print("Sent settings command:", settings)
             return True
 
@@ -188,22 +471,68 @@ class SettingsReceiver(TCPBase):
             print(f"Error sending settings command: {e}")
             return False
 
+    def _send_profile_command(self, op, arg=None):
+        """Send a profile command for this camera"""
+        if not self.connected or not self.client:
+            print("Not connected - cannot send profile command")
+            return False
+        try:
+            payload = bytes([op, self.camera_index]
+                            + ([arg] if arg is not None else []))
+            packet = self._create_packet(codec.ID_PROFILE, codec.TYPE_COMMAND, payload)
+            self._send(self.client, packet)
+            return True
+        except Exception as e:
+            print(f"Error sending profile command: {e}")
+            return False
+
+    def request_profiles(self):
+        """Request the available encoding profiles"""
+        return self._send_profile_command(codec.PROFILE_OP_QUERY)
+
+    def select_profile(self, profile_index):
+        """Switch the stream to a profile, turning adaptive quality off"""
+        return self._send_profile_command(codec.PROFILE_OP_SELECT, profile_index)
+
+    def set_adaptive(self, enabled):
+        """Let the server adapt the profile to reported playback quality"""
+        return self._send_profile_command(codec.PROFILE_OP_ADAPTIVE, int(bool(enabled)))
+
+    def send_quality_report(self, decode_fps, dropped, decoded):
+        """Report video playback quality for adaptive profiles"""
+        if not self.connected or not self.client:
+            return False
+        try:
+            report = codec.encode_quality_report(self.camera_index, decode_fps,
+                                                 dropped, decoded)
+            self._send(self.client, report)
+            return True
+        except Exception as e:
+            print(f"Error sending quality report: {e}")
+            return False
+
     def _on_connect(self, client):
         """Store client socket and send initial settings request"""
         self.client = client
         self.next_request_time = time.time()
         
         if not self.settings_received:
-            request = self._create_packet(0x02, 0x01)
-            self.client.send(request)
+            index = bytes([self.camera_index]) if self.camera_index else b''
+            request = self._create_packet(0x02, 0x01, index)
+            self._send(self.client, request)
             print("Requesting settings...")
 
     def _handle_packet(self, id_, typ, payload):
         """Handle settings packets"""
+        if id_ == codec.ID_PROFILE:
+            self._handle_profile_packet(typ, payload)
+            return
         if id_ != 0x02:  # Not a settings packet
             return
 
         if typ == 0x00 and len(payload) == 9:  # Settings response
+            if payload[6] != self.camera_index:  # Reply for another camera
+                return
             try:
                 # Get raw values from payload (6 parameters)
                 shutter = payload[0] * 100  # multiply by 100 to get microseconds
@@ -226,10 +555,33 @@ class SettingsReceiver(TCPBase):
             except Exception as e:
                 print(f"Error unpacking settings: {e}")
                 self.settings_received = False
+        elif typ == 0x02:  # Settings update rejected
+            print("Settings update failed:", bytes(payload).decode('utf-8', 'replace'))
+
+    def _handle_profile_packet(self, typ, payload):
+        """Handle profile state and profile errors"""
+        if typ == codec.TYPE_ERROR:
+            print("Profile command failed:", bytes(payload).decode('utf-8', 'replace'))
+            return
+        try:
+            state = codec.decode_profile_state(payload)
+        except codec.ProtocolError as e:
+            print(f"Error unpacking profiles: {e}")
+            return
+        if state['camera'] == self.camera_index:
+            self.profile_state = state
+            active = None
+            if state['profiles']:
+                active = state['profiles'][state['active']]['name']
+            adaptive = 'on' if state['adaptive'] else 'off'
+            print(f"Stream profile: {active} (adaptive {adaptive})")
 
     def get_settings(self):
         return self.settings
 
+    def get_profile_state(self):
+        return self.profile_state
+
 class AuthReceiver(TCPBase):
     """Handles authentication with server"""
     def __init__(self, server_ip, port=5002):
@@ -250,7 +602,7 @@ class AuthReceiver(TCPBase):
             payload = password_bytes
             
             packet = self._create_packet(0x00, 0x01, payload)  # ID=0x00 (Auth), Type=0x01 (Command)
-            self.client.send(packet)
+            self._send(self.client, packet)
             print(f"Sent auth request with password: {password}")
             return True
             
@@ -265,6 +617,7 @@ class AuthReceiver(TCPBase):
     
     def _handle_packet(self, id_, typ, payload):
         """Handle authentication response packets"""
+        payload = bytes(payload)
         print(f"AUTH RECEIVER: Got packet - ID={id_:02x}, Type={typ:02x}, Payload={payload}")
         
         if id_ != 0x00:  # Not an auth packet
@@ -278,6 +631,7 @@ class AuthReceiver(TCPBase):
                     print("AUTH RECEIVER: Authentication successful!")
                     self.auth_status = True
                     self.auth_completed = True
+                    self.run = False  # The server closes it, don't reconnect
                 else:
                     print(f"AUTH RECEIVER: Unknown auth response: {payload}")
                     self.auth_status = False
@@ -308,4 +662,74 @@ class AuthReceiver(TCPBase):
         """Reset authentication state"""
         self.auth_status = False
         self.auth_completed = False
-        
\ No newline at end of file
+
+
+class MuxSession(TCPBase):
+    """Single authenticated connection carrying data and settings traffic"""
+    def __init__(self, server_ip, password, port=5003):
+        super().__init__(server_ip, port)
+        self.password = password
+        self.auth_status = False
+        self.auth_completed = False
+        self.client = None
+        self.receivers = []
+        self.routes = {}  # Packet ID -> receivers handling it
+
+    def attach(self, receiver):
+        """Feed a receiver from this session instead of its own connection"""
+        receiver.session = self
+        self.receivers.append(receiver)
+        for id_ in receiver.packet_ids:
+            self.routes.setdefault(id_, []).append(receiver)
+        if self.connected and self.auth_status:
+            self._connect_receiver(receiver)
+
+    def _connect_receiver(self, receiver):
+        """Hand the session socket to a receiver once authenticated"""
+        receiver.connected = True
+        receiver.last_data_time = time.time()
+        receiver._on_connect(self.client)
+
+    def _on_connect(self, client):
+        """Authenticate first, the server closes sessions that send anything else"""
+        self.client = client
+        self.auth_status = False
+        self._send(client, self._create_packet(codec.ID_AUTH, codec.TYPE_COMMAND,
+                                               self.password.encode('ascii')))
+
+    def _handle_packet(self, id_, typ, payload):
+        """Route packets by ID to the attached receivers"""
+        if id_ == codec.ID_AUTH:
+            self._handle_auth_packet(typ, payload)
+            return
+        if not self.auth_status:
+            return  # Nothing is routed before the server accepted the password
+        for receiver in self.routes.get(id_, ()):
+            receiver._handle_packet(id_, typ, payload)
+
+    def _mark_alive(self):
+        """Heartbeats on the session keep every attached receiver alive"""
+        super()._mark_alive()
+        for receiver in self.receivers:
+            receiver.last_data_time = self.last_data_time
+
+    def _handle_auth_packet(self, typ, payload):
+        """Subscribe to data once the server accepted the password"""
+        self.auth_status = typ == codec.TYPE_RESPONSE and bytes(payload) == b'ready'
+        self.auth_completed = True
+        if not self.auth_status:
+            print("Session authentication failed:",
+                  bytes(payload).decode('utf-8', 'replace'))
+            self.run = False  # Reconnecting would fail the same way
+            return
+        print("Session authenticated")
+        for receiver in self.receivers:
+            self._connect_receiver(receiver)
+
+    def get_auth_status(self):
+        """Get authentication result"""
+        return self.auth_status
+
+    def is_auth_completed(self):
+        """Check if authentication process completed"""
+        return self.auth_completed
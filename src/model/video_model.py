@@ -20,6 +20,11 @@ class VideoModel(threading.Thread):
         self.last_frame_time = 0
         self.reconnect_delay = 1.0
         self._observers = []
+        # Playback quality counters for adaptive stream profiles
+        self.decoded_frames = 0
+        self.dropped_frames = 0
+        self._stats_lock = threading.Lock()
+        self._stats_time = time.time()
         
     def _start_ffmpeg(self):
         if self.process:
@@ -38,7 +43,9 @@ class VideoModel(threading.Thread):
                     analyzeduration='0',
                     r='24'
                 )
-                .output('pipe:', format='rawvideo', pix_fmt='bgr24')
+                # Scale to the display size so profile resolution changes keep working
+                .output('pipe:', format='rawvideo', pix_fmt='bgr24',
+                        s=f'{width}x{height}')
                 .run_async(pipe_stdout=True)
             )
             print(f"[{time.strftime('%H:%M:%S')}] RTSP stream connected")
@@ -71,12 +78,16 @@ class VideoModel(threading.Thread):
                 
                 # Update last frame time
                 self.last_frame_time = time.time()
+                with self._stats_lock:
+                    self.decoded_frames += 1
                 
                 try:
                     # Only drop frames if queue is full
                     if self.frame_queue.full():
                         try:
                             self.frame_queue.get_nowait()  # Remove oldest frame
+                            with self._stats_lock:
+                                self.dropped_frames += 1
                         except queue.Empty:
                             pass
                     self.frame_queue.put_nowait(frame)
@@ -110,6 +121,17 @@ class VideoModel(threading.Thread):
         except queue.Empty:
             return None
             
+    def get_quality_stats(self):
+        """Return (decode fps, dropped, decoded) since the last call, resetting them"""
+        with self._stats_lock:
+            now = time.time()
+            elapsed = now - self._stats_time
+            decoded, dropped = self.decoded_frames, self.dropped_frames
+            self.decoded_frames = self.dropped_frames = 0
+            self._stats_time = now
+        fps = decoded / elapsed if elapsed > 0 else 0.0
+        return fps, dropped, decoded
+
     def is_connected(self):
         return self.process is not None and self.connected
             
@@ -1,13 +1,16 @@
 import threading
 import socket
+import time
 
 class ConnectionPresenter:
     """Connection Presenter - Handles connection logic and authentication"""
     
-    def __init__(self, view, auth_model, on_connected_callback):
+    def __init__(self, view, auth_model, on_connected_callback, mux_port=5003):
         self.view = view
         self.auth_model = auth_model
         self.on_connected_callback = on_connected_callback
+        self.mux_port = mux_port  # Single-port session, preferred when offered
+        self.session = None  # Authenticated MuxSession handed to the main app
         
         # Set view callbacks
         self.view.set_connect_callback(self.on_connect_clicked)
@@ -66,6 +69,11 @@ class ConnectionPresenter:
             # Test basic connectivity first
             self.view.modal.after(0, lambda: self.view.update_status("🔍 Testing connectivity..."))
             
+            # Prefer one multiplexed session, older servers only have the three ports
+            if self.mux_port and self._test_port(ip_address, self.mux_port):
+                self._authenticate_session(ip_address, password)
+                return
+            
             # Test data port (5000)
             if not self._test_port(ip_address, 5000):
                 self.view.modal.after(0, lambda: self._connection_failed("Data port (5000) not accessible"))
@@ -102,6 +110,30 @@ class ConnectionPresenter:
         except Exception as e:
             self.view.modal.after(0, lambda: self._connection_failed(f"Connection failed: {str(e)}"))
     
+    def _authenticate_session(self, ip_address, password):
+        """Open and authenticate a multiplexed session (runs in background thread)"""
+        from src.model import MuxSession
+        
+        self.view.modal.after(0, lambda: self.view.update_status("🔐 Authenticating..."))
+        self.auth_model.set_credentials(ip_address, password)
+        self.session = MuxSession(ip_address, password, port=self.mux_port)
+        self.session.start()
+        
+        # Wait for the auth response
+        wait_time = 0.0
+        while not self.session.is_auth_completed() and wait_time < 5.0:
+            time.sleep(0.1)
+            wait_time += 0.1
+        
+        auth_result = self.session.get_auth_status()
+        print(f"CONNECTION: Session auth result = {auth_result}")
+        self.auth_model.set_authenticated(auth_result)
+        
+        if auth_result:
+            self.view.modal.after(0, self._connection_success)
+        else:
+            self.view.modal.after(0, lambda: self._connection_failed("Authentication failed - Invalid password"))
+    
     def _test_port(self, ip_address, port):
         """Test if a specific port is accessible"""
         try:
@@ -138,6 +170,9 @@ class ConnectionPresenter:
         if self.auth_presenter:
             self.auth_presenter.cleanup()
             self.auth_presenter = None
+        if self.session:
+            self.session.stop()
+            self.session = None
     
     def cleanup(self):
         """Clean up resources"""
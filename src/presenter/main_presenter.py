@@ -1,19 +1,23 @@
 from src.model import (
     NumberDataReceiver, 
     SettingsReceiver,
+    ClockModel,
     DataModel,
     SettingsModel,
     GraphModel,
     VideoModel
 )
+import time
 
 
 class MainPresenter:
     """Main Presenter - Controls main application logic and coordinates components"""
-    def __init__(self, view, server_ip="192.168.137.112", tcp_port=5000):
+    def __init__(self, view, server_ip="192.168.137.112", tcp_port=5000, session=None,
+                 multicast_group=None, deadband=None):
         self.view = view
         self.server_ip = server_ip
         self.tcp_port = tcp_port
+        self.session = session  # Authenticated MuxSession replacing per-port links
         
         # Initialize models
         self.data_model = DataModel()
@@ -21,12 +25,30 @@ class MainPresenter:
         self.graph_model = GraphModel()
         
         # Initialize TCP connections
-        self.data_receiver = NumberDataReceiver(server_ip, tcp_port)
+        # Data arrives over TCP, or from the multicast group when one is given
+        # A deadband asks for a change-only stream, for slow links
+        self.data_receiver = NumberDataReceiver(server_ip, tcp_port,
+                                                multicast_group=multicast_group,
+                                                deadband=deadband)
         self.settings_receiver = SettingsReceiver(server_ip, tcp_port + 1)
+        if self.session:
+            if not multicast_group:
+                self.session.attach(self.data_receiver)
+            self.session.attach(self.settings_receiver)
+
+        # One estimate of the server's clock, fed by every link's exchanges
+        self.clock = ClockModel()
+        for link in (self.data_receiver, self.settings_receiver, self.session):
+            if link:
+                link.clock = self.clock
 
         # Initialize video model
         rtsp_url = f"rtsp://{server_ip}:8554/ES_MTX"
         self.video_model = VideoModel(rtsp_url)
+        self.quality_report_interval = 2.0  # Seconds between playback quality reports
+        self._last_quality_report = time.time()
+        self.link_report_interval = 30.0  # Seconds between link RTT/latency log lines
+        self._last_link_report = time.time()
         
         # Setup observers
         self._setup_observers()
@@ -72,10 +94,52 @@ class MainPresenter:
                     
                 except Exception as e:
                     print(f"Error updating settings UI: {e}")
+
+            # Report playback quality so the server can adapt the stream profile
+            if time.time() - self._last_quality_report >= self.quality_report_interval:
+                self._last_quality_report = time.time()
+                if self.video_model.is_connected():
+                    stats = self.video_model.get_quality_stats()
+                    self.settings_receiver.send_quality_report(*stats)
+        
+        if time.time() - self._last_link_report >= self.link_report_interval:
+            self._last_link_report = time.time()
+            self._report_link()
         
         # Schedule next update
         if self.data_receiver.run:
             self.view.after(500, self._update_status_loop)
+
+    def get_link_rtt(self):
+        """Heartbeat round-trip times in ms of the data and settings links"""
+        return {
+            'data': self.data_receiver.get_rtt_stats(),
+            'settings': self.settings_receiver.get_rtt_stats()
+        }
+
+    def get_latency_stats(self):
+        """Clock estimate and sample latencies in ms on the server's clock"""
+        return {
+            'clock': self.clock.get_stats(),
+            **self.graph_model.get_latency_stats()
+        }
+
+    def _report_link(self):
+        """Log link round trips, the clock estimate and sample latencies"""
+        for link, stats in self.get_link_rtt().items():
+            if stats['count']:
+                print(f"{link} link RTT: p50 {stats['p50_ms']} ms, "
+                      f"p99 {stats['p99_ms']} ms")
+        latency = self.get_latency_stats()
+        clock = latency['clock']
+        if clock['synced']:
+            print(f"Server clock offset {clock['offset_ms']} ms, "
+                  f"drift {clock['drift_ppm']} ppm")
+        for name in ('network', 'render'):
+            stats = latency[name]
+            if stats:
+                print(f"Sample {name} latency: p50 {stats['p50_ms']} ms, "
+                      f"p99 {stats['p99_ms']} ms, max {stats['max_ms']} ms")
         
     def _update_video_loop(self):
         """Update video display"""
@@ -105,21 +169,34 @@ class MainPresenter:
         if not self.data_receiver.run:
             return
             
-        # Get data from TCP receiver
-        count = self.data_receiver.get_finger_count()
-        timestamp = self.data_receiver.get_timestamp_ms()
-        
-        # Update data model
-        self.data_model.update_data(count, timestamp)
-        
-        # Add data to graph model
-        if self.graph_model.add_data_point(count, timestamp):
-            # Check if graph should be updated
-            if self.graph_model.should_update_plot():
-                # Get plot data and update view
-                times, values, smoothed, time_window = self.graph_model.get_plot_data()
-                if times and values and smoothed and time_window:
-                    self.view.update_graph_display(times, values, smoothed, time_window)
+        # Backfilled history first, so live samples after it stay in order
+        history = self.data_receiver.get_history()
+        added = bool(history) and self.graph_model.merge_data_points(history)
+        
+        # Get every sample received since the last update (batches included)
+        samples = self.data_receiver.get_timed_samples()
+        # Gaps in a change-only stream stand for the last value held
+        self.graph_model.set_hold_interval(self.data_receiver.sample_interval_ms)
+        
+        for count, timestamp, received_ms in samples:
+            # Add data to graph model
+            if self.graph_model.add_data_point(count, timestamp, received_ms):
+                added = True
+        
+        if samples:
+            # Update data model with the latest sample
+            self.data_model.update_data(*samples[-1][:2])
+        elif history:
+            self.data_model.update_data(*history[-1])
+        
+        # Check if graph should be updated
+        if added and self.graph_model.should_update_plot():
+            # Get plot data and update view
+            times, values, smoothed, time_window = self.graph_model.get_plot_data()
+            if times and values and smoothed and time_window:
+                self.view.update_graph_display(times, values, smoothed, time_window)
+                if self.clock.is_synced():
+                    self.graph_model.mark_rendered(self.clock.to_server_ms())
         
         # Schedule next update
         self.view.after(1, self._update_graph_loop)
@@ -153,6 +230,8 @@ class MainPresenter:
         """Handle application closing"""
         self.data_receiver.stop()
         self.settings_receiver.stop()
+        if self.session:
+            self.session.stop()
         if hasattr(self, 'video_model'):
             self.video_model.stop()
         self.view.on_closing()
@@ -0,0 +1,4 @@
+"""
+Test Package
+Contains the tests of the server models and the shared protocol.
+"""
@@ -0,0 +1,56 @@
+"""
+Test Configuration
+Puts the server package and the shared protocol package on the import path.
+"""
+
+# Standard library imports
+import importlib
+import os
+import sys
+import types
+
+# Third-party imports
+import pytest
+
+# Local application imports
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER = os.path.join(ROOT, 'server')
+CLIENT_MODEL = os.path.join(ROOT, 'src', 'model')
+
+# The server's 'src' package is imported before any test module, so the
+# repository root that pytest puts first on the path cannot shadow it with
+# the client's; client modules are loaded by path
+sys.path.insert(0, ROOT)
+sys.path.insert(0, SERVER)
+import src  # noqa: E402
+
+
+def load_client_module(name: str):
+    """
+    Load a client model module without importing the client package.
+
+    The client's src package shares its name with the server's and pulls
+    in the GUI, so its models are imported from a 'client_model' package
+    standing in for src/model without running its __init__; relative
+    imports between the models still work.
+
+    Args:
+        name: Module file name in src/model without extension
+
+    Returns:
+        module: Loaded module
+    """
+    if 'client_model' not in sys.modules:
+        package = types.ModuleType('client_model')
+        package.__path__ = [CLIENT_MODEL]
+        sys.modules['client_model'] = package
+    return importlib.import_module(f'client_model.{name}')
+
+
+@pytest.fixture
+def samples():
+    """Samples 5 ms apart with a few repeated values."""
+    values = [3, 3, 3, 7, 7, 0, 255, 255, 255, 255]
+    return [(value, 1700000000000 + index * 5) for index, value in enumerate(values)]
@@ -0,0 +1,4 @@
+"""
+Model Tests
+Contains the tests of the server and client models.
+"""
@@ -0,0 +1,168 @@
+"""
+Broadcast Model Tests
+Ring buffer reads, the shared fan-out and the slow subscriber policies.
+"""
+
+# Standard library imports
+import asyncio
+
+# Third-party imports
+import pytest
+
+# Local application imports
+from src.model.broadcast_model import (
+    BroadcastModel,
+    BroadcastSubscriber,
+    PacketRingBuffer,
+    POLICY_CONFLATE,
+    POLICY_DISCONNECT,
+    POLICY_DROP_OLDEST,
+    SlowConsumerError
+)
+
+
+def publish(broadcaster, count, start=0):
+    """Publish numbered one-byte packets."""
+    for index in range(start, start + count):
+        broadcaster.publish(bytes([index]))
+
+
+def test_ring_reads_across_wrap_and_reports_overwritten():
+    ring = PacketRingBuffer(capacity=4)
+    for index in range(6):
+        ring.append(bytes([index]))
+    packets, cursor, skipped = ring.read_from(0)
+    assert packets == [bytes([index]) for index in range(2, 6)]
+    assert (cursor, skipped) == (6, 2)
+    assert ring.read_from(6) == ([], 6, 0)
+
+
+def test_ring_rejects_empty_capacity():
+    with pytest.raises(ValueError):
+        PacketRingBuffer(capacity=0)
+
+
+def test_every_reader_gets_the_same_packets():
+    broadcaster = BroadcastModel(capacity=16)
+    publish(broadcaster, 3)
+    first, _, _ = broadcaster.read_from(0)
+    second, cursor, _ = broadcaster.read_from(1)
+    assert first == [b'\x00', b'\x01', b'\x02']
+    assert second == first[1:]
+    assert cursor == broadcaster.head_seq == 3
+
+
+def test_wait_for_wakes_all_waiters_on_publish():
+    async def main():
+        broadcaster = BroadcastModel(capacity=16)
+        waiters = [asyncio.ensure_future(broadcaster.wait_for(0)) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert not any(waiter.done() for waiter in waiters)
+        broadcaster.publish(b'\x00')
+        await asyncio.wait_for(asyncio.gather(*waiters), timeout=1.0)
+
+    asyncio.run(main())
+
+
+def test_subscriber_starts_at_live_head():
+    broadcaster = BroadcastModel(capacity=16)
+    publish(broadcaster, 3)
+    subscriber = BroadcastSubscriber(broadcaster, max_queue=8)
+    assert subscriber.take() == []
+    publish(broadcaster, 2, start=3)
+    assert subscriber.take() == [b'\x03', b'\x04']
+
+
+def test_drop_oldest_keeps_newest_max_queue_packets():
+    broadcaster = BroadcastModel(capacity=16)
+    subscriber = BroadcastSubscriber(broadcaster, max_queue=4,
+                                     policy=POLICY_DROP_OLDEST)
+    publish(broadcaster, 10)
+    assert subscriber.take() == [bytes([index]) for index in range(6, 10)]
+    assert subscriber.dropped == 6
+
+
+def test_conflate_keeps_only_newest_packet():
+    broadcaster = BroadcastModel(capacity=16)
+    subscriber = BroadcastSubscriber(broadcaster, max_queue=4, policy=POLICY_CONFLATE)
+    publish(broadcaster, 10)
+    assert subscriber.take() == [b'\x09']
+    assert subscriber.dropped == 9
+
+
+def test_conflate_sends_backlog_within_bound():
+    broadcaster = BroadcastModel(capacity=16)
+    subscriber = BroadcastSubscriber(broadcaster, max_queue=4, policy=POLICY_CONFLATE)
+    publish(broadcaster, 3)
+    assert subscriber.take() == [b'\x00', b'\x01', b'\x02']
+    assert subscriber.dropped == 0
+
+
+def test_disconnect_raises_on_overflow():
+    broadcaster = BroadcastModel(capacity=16)
+    subscriber = BroadcastSubscriber(broadcaster, max_queue=4, policy=POLICY_DISCONNECT)
+    publish(broadcaster, 4)
+    assert len(subscriber.take()) == 4
+    publish(broadcaster, 5, start=4)
+    with pytest.raises(SlowConsumerError):
+        subscriber.take()
+
+
+def test_rejects_invalid_options():
+    broadcaster = BroadcastModel(capacity=16)
+    with pytest.raises(ValueError):
+        BroadcastSubscriber(broadcaster, policy='block')
+    with pytest.raises(ValueError):
+        BroadcastSubscriber(broadcaster, max_queue=17)
+
+
+def test_lag_covers_unsent_bytes():
+    broadcaster = BroadcastModel(capacity=16)
+    subscriber = BroadcastSubscriber(broadcaster, max_queue=8)
+    publish(broadcaster, 2)
+    published = broadcaster.get_publish_time(0)
+    assert subscriber.get_lag(now=published + 1.0) == pytest.approx(1.0)
+    subscriber.take()
+    assert subscriber.get_lag(unsent_bytes=1, now=published + 2.0) == pytest.approx(2.0)
+    assert subscriber.get_lag(unsent_bytes=0, now=published + 3.0) == 0.0
+
+
+def test_follow_keeps_cursor_on_lockstep_broadcast():
+    plain = BroadcastModel(capacity=16)
+    compact = BroadcastModel(capacity=16)
+    subscriber = BroadcastSubscriber(plain, max_queue=8)
+    for index in range(3):
+        plain.publish(b'plain%d' % index)
+        compact.publish(b'compact%d' % index)
+    subscriber.take()
+    plain.publish(b'plain3')
+    compact.publish(b'compact3')
+    subscriber.follow(compact)
+    assert subscriber.take() == [b'compact3']
+
+
+def test_take_rewrite_replaces_packets_and_counts_its_bytes():
+    broadcaster = BroadcastModel(capacity=16)
+    subscriber = BroadcastSubscriber(broadcaster, max_queue=8)
+    publish(broadcaster, 3)
+    firsts = []
+
+    def rewrite(first, packets):
+        firsts.append(first)
+        return [b''.join(packets) * 2]
+
+    assert subscriber.take(rewrite) == [b'\x00\x01\x02' * 2]
+    assert firsts == [0]
+    assert subscriber.bytes_written == 6
+
+
+def test_lag_counts_bytes_written_outside_the_stream():
+    broadcaster = BroadcastModel(capacity=16)
+    subscriber = BroadcastSubscriber(broadcaster, max_queue=8)
+    publish(broadcaster, 2)
+    published = broadcaster.get_publish_time(0)
+    subscriber.take()
+    # A reply written after the stream packets is all that is still queued
+    subscriber.count_bytes(100)
+    assert subscriber.bytes_written == 102
+    assert subscriber.get_lag(unsent_bytes=100, now=published + 1.0) == 0.0
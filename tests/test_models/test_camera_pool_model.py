@@ -0,0 +1,49 @@
+"""
+Camera Pool Model Tests
+Pipelines addressed by index and the per-index camera defaults.
+"""
+
+# Standard library imports
+
+# Third-party imports
+import pytest
+
+# Local application imports
+from src.model.camera_pool_model import CameraPool, CameraPoolError
+
+
+def test_default_pool_has_camera_zero():
+    pool = CameraPool()
+    assert len(pool) == 1
+    camera = pool.get_camera(0)
+    assert camera.index == 0
+    assert camera.stream_config['device'] == 0
+    assert camera.stream_config['rtsp_url'].endswith('/ES_MTX')
+
+
+def test_pipelines_are_indexed_in_config_order():
+    pool = CameraPool([{'width': 1280}, {}, {'device': 5}])
+    assert [pipeline.camera.index for pipeline in pool] == [0, 1, 2]
+    assert pool.get(1).camera is pool.get_camera(1)
+    assert pool.get_camera(0).stream_config['width'] == 1280
+    assert pool.get_camera(1).stream_config['width'] == 640
+    # Cameras default to their index as device and RTSP path suffix
+    assert pool.get_camera(1).stream_config['device'] == 1
+    assert pool.get_camera(2).stream_config['device'] == 5
+    assert pool.get_camera(2).stream_config['rtsp_url'].endswith('/ES_MTX_2')
+
+
+def test_cameras_keep_their_own_settings():
+    pool = CameraPool([{'default_settings': {'gain': 4}}, {}])
+    assert pool.get_camera(0).get_settings()['gain'] == 4
+    assert pool.get_camera(1).get_settings()['gain'] == 1
+    assert pool.get_camera(0).name != pool.get_camera(1).name
+
+
+@pytest.mark.parametrize('index', [-1, 2, 255])
+def test_rejects_unknown_index(index):
+    pool = CameraPool([{}, {}])
+    with pytest.raises(CameraPoolError):
+        pool.get(index)
+    with pytest.raises(CameraPoolError):
+        pool.submit(index, {'gain': 2})
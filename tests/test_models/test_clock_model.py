@@ -0,0 +1,76 @@
+"""
+Clock Model Tests
+Offset filtering and drift estimation of the client's server clock model.
+"""
+
+# Standard library imports
+
+# Third-party imports
+import pytest
+
+# Local application imports
+from tests.conftest import load_client_module
+
+
+ClockModel = load_client_module('clock_model').ClockModel
+
+BASE = 1700000000.0
+
+
+def exchange(clock, local, offset, up, down, server_time=0.0001):
+    """Add an exchange sent at a local time over a path of up/down seconds."""
+    t1 = local
+    t2 = t1 + up + offset
+    t3 = t2 + server_time
+    t4 = t3 - offset + down
+    clock.add_exchange(t1, t2, t3, t4)
+
+
+def test_unsynced_clock_has_no_offset():
+    clock = ClockModel()
+    assert not clock.is_synced()
+    assert clock.get_offset(BASE) == 0.0
+    assert clock.to_server_ms(BASE) == BASE * 1000.0
+
+
+def test_symmetric_exchange_gives_exact_offset():
+    clock = ClockModel()
+    exchange(clock, BASE, offset=0.25, up=0.01, down=0.01)
+    assert clock.is_synced()
+    assert clock.get_offset(BASE) == pytest.approx(0.25)
+    assert clock.to_server_ms(BASE) == pytest.approx((BASE + 0.25) * 1000.0)
+
+
+def test_keeps_shortest_round_trip_of_filter_round():
+    clock = ClockModel(filter_size=4)
+    # Asymmetric, slow exchanges are off by half their extra delay
+    exchange(clock, BASE, offset=0.1, up=0.2, down=0.01)
+    exchange(clock, BASE + 1, offset=0.1, up=0.005, down=0.005)
+    exchange(clock, BASE + 2, offset=0.1, up=0.01, down=0.3)
+    assert clock.get_offset(BASE + 2) == pytest.approx(0.1)
+    assert clock.get_stats()['delay_ms'] == pytest.approx(10.0)
+
+
+def test_ignores_exchange_with_negative_delay():
+    clock = ClockModel()
+    clock.add_exchange(BASE, BASE + 5, BASE + 5, BASE - 1)
+    assert not clock.is_synced()
+    assert clock.exchanges == 0
+
+
+def test_estimates_drift():
+    clock = ClockModel(filter_size=1, min_drift_span=30.0)
+    drift = 50e-6  # 50 ppm
+    for second in range(0, 120, 4):
+        exchange(clock, BASE + second, offset=0.02 + drift * second,
+                 up=0.002, down=0.002)
+    assert clock.get_stats()['drift_ppm'] == pytest.approx(50, abs=0.5)
+    assert clock.get_offset(BASE + 200) == pytest.approx(0.02 + drift * 200, abs=1e-6)
+
+
+def test_sync_interval_slows_once_filter_is_full():
+    clock = ClockModel(filter_size=2, sync_interval=4.0, initial_interval=0.5)
+    assert clock.get_sync_interval() == 0.5
+    exchange(clock, BASE, offset=0.0, up=0.001, down=0.001)
+    exchange(clock, BASE + 1, offset=0.0, up=0.001, down=0.001)
+    assert clock.get_sync_interval() == 4.0
@@ -0,0 +1,104 @@
+"""
+Command Model Tests
+Coalescing of a camera's setting changes and the answers to every requester.
+"""
+
+# Standard library imports
+import threading
+
+# Third-party imports
+import pytest
+
+# Local application imports
+from src.model.command_model import CameraCommandError, CameraCommandQueue
+
+
+class FakeCamera:
+    """Camera recording each applied change, optionally held inside the first."""
+
+    def __init__(self):
+        self.name = 'camera0'
+        self.settings = {'gain': 1, 'shutter': 10000}
+        self.calls = []
+        self.refused_gains = set()
+        self.applying = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def update_settings(self, settings):
+        self.calls.append(dict(settings))
+        self.applying.set()
+        self.release.wait(2.0)
+        if settings.get('gain') in self.refused_gains:
+            raise ValueError('camera refused')
+        self.settings.update(settings)
+
+    def get_settings(self):
+        return dict(self.settings)
+
+
+@pytest.fixture
+def camera():
+    """Camera that holds its first change until released."""
+    camera = FakeCamera()
+    camera.release.clear()
+    return camera
+
+
+@pytest.fixture
+def queue(camera):
+    """Running command queue without a rate limit."""
+    queue = CameraCommandQueue(camera, min_interval=0.0)
+    queue.start()
+    yield queue
+    camera.release.set()
+    queue.stop()
+
+
+def submit_while_busy(camera, queue, *changes):
+    """Submit changes while the camera applies a first one, then release it."""
+    first = queue.submit({'gain': 2})
+    assert camera.applying.wait(2.0)
+    futures = [queue.submit(change) for change in changes]
+    camera.release.set()
+    return first, futures
+
+
+def test_changes_to_the_same_camera_coalesce_to_the_latest(camera, queue):
+    first, futures = submit_while_busy(camera, queue, {'gain': 3}, {'gain': 4},
+                                       {'gain': 5})
+    assert first.result(2.0)['gain'] == 2
+    assert [future.result(2.0)['gain'] for future in futures] == [5, 5, 5]
+    assert camera.calls == [{'gain': 2}, {'gain': 5}]
+    assert queue.get_stats() == {'submitted': 4, 'applied': 2, 'coalesced': 2}
+
+
+def test_coalesced_change_keeps_every_setting(camera, queue):
+    _, futures = submit_while_busy(camera, queue, {'gain': 3},
+                                   {'shutter': 20000}, {'gain': 6})
+    results = [future.result(2.0) for future in futures]
+    assert camera.calls[-1] == {'gain': 6, 'shutter': 20000}
+    # Every requester is answered with the settings in effect afterwards
+    assert results == [{'gain': 6, 'shutter': 20000}] * 3
+
+
+def test_failed_change_fails_every_merged_requester(camera, queue):
+    camera.refused_gains = {4}
+    first, futures = submit_while_busy(camera, queue, {'gain': 3}, {'gain': 4})
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result(2.0)
+    # The change applied before the failure is still answered
+    assert first.result(2.0)['gain'] == 2
+
+
+def test_stop_fails_waiting_requesters(camera, queue):
+    queue.submit({'gain': 2})
+    assert camera.applying.wait(2.0)
+    waiting = queue.submit({'gain': 3})
+    camera.release.set()
+    queue.stop()
+    # Either applied before the stop or failed by it, never left unanswered
+    assert waiting.done()
+    with pytest.raises(CameraCommandError):
+        queue.submit({'gain': 4}).result(0)
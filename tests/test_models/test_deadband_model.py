@@ -0,0 +1,61 @@
+"""
+Deadband Model Tests
+Change-only filtering and keepalives.
+"""
+
+# Standard library imports
+
+# Third-party imports
+import pytest
+
+# Local application imports
+from src.model.deadband_model import DeadbandFilter
+
+
+def series(values, spacing_ms=10):
+    """Stamp values spacing_ms apart."""
+    return [(value, index * spacing_ms) for index, value in enumerate(values)]
+
+
+def test_passes_first_sample_and_changes_beyond_deadband():
+    deadband = DeadbandFilter(deadband=2, keepalive_ms=0)
+    passed = deadband.filter(series([5, 6, 7, 8, 4, 4, 3]))
+    assert passed == [(5, 0), (8, 30), (4, 40)]
+    assert deadband.get_stats()['suppressed'] == 4
+
+
+def test_zero_deadband_passes_every_change():
+    deadband = DeadbandFilter(deadband=0, keepalive_ms=0)
+    assert deadband.filter(series([1, 1, 2, 2, 1])) == [(1, 0), (2, 20), (1, 40)]
+
+
+def test_keepalive_passes_unchanged_value():
+    deadband = DeadbandFilter(deadband=5, keepalive_ms=50)
+    passed = deadband.filter(series([1] * 12))
+    assert [timestamp for _, timestamp in passed] == [0, 50, 100]
+    assert deadband.keepalives == 2
+
+
+def test_held_values_reconstruct_within_deadband():
+    values = [0, 1, 3, 2, 9, 10, 8, 8, 20, 19, 17]
+    deadband = DeadbandFilter(deadband=3, keepalive_ms=0)
+    passed = deadband.filter(series(values))
+    held = []
+    for value, timestamp in series(values):
+        held_value = [kept for kept, at in passed if at <= timestamp][-1]
+        held.append(abs(held_value - value))
+    assert max(held) <= 3
+
+
+def test_state_carries_across_calls_until_reset():
+    deadband = DeadbandFilter(deadband=1, keepalive_ms=0)
+    deadband.filter([(5, 0)])
+    assert deadband.filter([(5, 10)]) == []
+    deadband.reset()
+    assert deadband.filter([(5, 20)]) == [(5, 20)]
+
+
+@pytest.mark.parametrize('deadband, keepalive_ms', [(-1, 0), (256, 0), (0, 0x10000)])
+def test_rejects_out_of_range_settings(deadband, keepalive_ms):
+    with pytest.raises(ValueError):
+        DeadbandFilter(deadband, keepalive_ms)
@@ -0,0 +1,69 @@
+"""
+History Model Tests
+Sample ring wrap-around and backfill selection.
+"""
+
+# Standard library imports
+
+# Third-party imports
+import pytest
+
+# Local application imports
+from protocol import codec
+from src.model.history_model import SampleHistory
+
+
+def filled(capacity, count, spacing_ms=10):
+    """History holding count samples stamped spacing_ms apart."""
+    history = SampleHistory(capacity)
+    history.append([(index % 256, 1000 + index * spacing_ms) for index in range(count)])
+    return history
+
+
+def timestamps(data):
+    """Timestamps of packed samples."""
+    return [timestamp for _, timestamp in codec.decode_samples(data)]
+
+
+def test_keeps_latest_samples_across_wrap():
+    history = SampleHistory(4)
+    history.append([(1, 10), (2, 20), (3, 30)])
+    history.append([(4, 40), (5, 50)])
+    assert len(history) == 4
+    assert codec.decode_samples(history.read(0)) == [(2, 20), (3, 30), (4, 40), (5, 50)]
+
+
+def test_append_larger_than_capacity_keeps_tail():
+    history = filled(3, 10)
+    assert history.head == 10
+    assert timestamps(history.read(0)) == [1070, 1080, 1090]
+
+
+def test_select_last_window():
+    history = filled(100, 50)
+    # Newest sample at 1490, window includes the sample at 1490 - 40
+    data = history.select(codec.BACKFILL_LAST, 40)
+    assert timestamps(data) == [1450, 1460, 1470, 1480, 1490]
+
+
+def test_select_since_returns_only_newer_samples():
+    history = filled(8, 20)
+    assert timestamps(history.select(codec.BACKFILL_SINCE, 1175)) == [1180, 1190]
+    assert history.select(codec.BACKFILL_SINCE, 1190) == b''
+    # Older than the tail: everything held
+    assert len(timestamps(history.select(codec.BACKFILL_SINCE, 0))) == 8
+
+
+def test_select_stops_at_end_index():
+    history = filled(100, 20)
+    data = history.select(codec.BACKFILL_SINCE, 1000, end=5)
+    assert timestamps(data) == [1010, 1020, 1030, 1040]
+
+
+def test_select_on_empty_history():
+    assert SampleHistory(4).select(codec.BACKFILL_LAST, 1000) == b''
+
+
+def test_rejects_empty_capacity():
+    with pytest.raises(ValueError):
+        SampleHistory(0)
@@ -0,0 +1,132 @@
+"""
+Metrics Model Tests
+Prometheus text rendering and merging of other processes' snapshots.
+"""
+
+# Standard library imports
+import json
+
+# Third-party imports
+import pytest
+
+# Local application imports
+from src.model.metrics_model import MetricsError, MetricsRegistry
+
+
+def test_renders_counter_and_gauge_families():
+    registry = MetricsRegistry()
+    registry.counter('es_sent_total', 'Sent', ['server']).labels('data').inc(3)
+    gauge = registry.gauge('es_clients', 'Clients').labels()
+    gauge.set(4)
+    gauge.inc(0.5)
+    assert registry.render().splitlines() == [
+        '# HELP es_sent_total Sent',
+        '# TYPE es_sent_total counter',
+        'es_sent_total{server="data"} 3',
+        '# HELP es_clients Clients',
+        '# TYPE es_clients gauge',
+        'es_clients 4.5'
+    ]
+
+
+def test_escapes_label_values():
+    registry = MetricsRegistry()
+    counter = registry.counter('es_errors_total', 'Errors', ['reason'])
+    counter.labels('bad "name"\\path\nline').inc()
+    assert registry.render().splitlines()[-1] == (
+        r'es_errors_total{reason="bad \"name\"\\path\nline"} 1')
+
+
+def test_histogram_buckets_are_cumulative_with_sum_and_count():
+    registry = MetricsRegistry()
+    latency = registry.histogram('es_latency_seconds', 'Latency', ['server'],
+                                 buckets=(0.01, 0.1, 1.0))
+    for value in (0.005, 0.01, 0.05, 2.5):
+        latency.labels('data').observe(value)
+    assert registry.render().splitlines()[2:] == [
+        'es_latency_seconds_bucket{server="data",le="0.01"} 2',
+        'es_latency_seconds_bucket{server="data",le="0.1"} 3',
+        'es_latency_seconds_bucket{server="data",le="1"} 3',
+        'es_latency_seconds_bucket{server="data",le="+Inf"} 4',
+        'es_latency_seconds_sum{server="data"} 2.565',
+        'es_latency_seconds_count{server="data"} 4'
+    ]
+
+
+def test_collectors_render_after_registered_families():
+    registry = MetricsRegistry()
+    registry.counter('es_sent_total', 'Sent').labels().inc()
+
+    def cameras():
+        return [('es_camera_up', 'gauge', 'Camera running', {'camera': '0'}, 1),
+                ('es_camera_up', 'gauge', 'Camera running', {'camera': '1'}, 0)]
+
+    def broken():
+        raise RuntimeError('camera gone')
+
+    registry.add_collector(broken)
+    registry.add_collector(cameras)
+    assert registry.render().splitlines()[3:] == [
+        '# HELP es_camera_up Camera running',
+        '# TYPE es_camera_up gauge',
+        'es_camera_up{camera="0"} 1',
+        'es_camera_up{camera="1"} 0'
+    ]
+
+
+def test_rejects_conflicting_registration_and_label_count():
+    registry = MetricsRegistry()
+    counter = registry.counter('es_sent_total', 'Sent', ['server'])
+    assert registry.counter('es_sent_total', 'Sent', ['server']) is counter
+    with pytest.raises(MetricsError):
+        registry.gauge('es_sent_total', 'Sent', ['server'])
+    with pytest.raises(MetricsError):
+        counter.labels('data', 'extra')
+
+
+def test_remote_samples_render_within_local_family():
+    owner = MetricsRegistry()
+    owner.counter('es_sent_total', 'Sent', ['server']).labels('data').inc(2)
+    worker = MetricsRegistry()
+    worker.counter('es_sent_total', 'Sent', ['server']).labels('data').inc(5)
+    # Snapshots cross the worker link as JSON
+    snapshot = json.loads(json.dumps(worker.snapshot()))
+    owner.set_remote('worker0', snapshot, {'worker': '0'})
+    lines = owner.render().splitlines()
+    assert lines == [
+        '# HELP es_sent_total Sent',
+        '# TYPE es_sent_total counter',
+        'es_sent_total{server="data"} 2',
+        'es_sent_total{server="data",worker="0"} 5'
+    ]
+
+
+def test_remote_histogram_and_remote_only_family():
+    owner = MetricsRegistry()
+    worker = MetricsRegistry()
+    wait = worker.histogram('es_wait_seconds', 'Wait', buckets=(0.1, 1.0))
+    wait.labels().observe(0.5)
+    worker.gauge('es_clients', 'Clients').labels().set(3)
+    owner.set_remote('worker1', worker.snapshot(), {'worker': '1'})
+    assert owner.render().splitlines() == [
+        '# HELP es_wait_seconds Wait',
+        '# TYPE es_wait_seconds histogram',
+        'es_wait_seconds_bucket{worker="1",le="0.1"} 0',
+        'es_wait_seconds_bucket{worker="1",le="1"} 1',
+        'es_wait_seconds_bucket{worker="1",le="+Inf"} 1',
+        'es_wait_seconds_sum{worker="1"} 0.5',
+        'es_wait_seconds_count{worker="1"} 1',
+        '# HELP es_clients Clients',
+        '# TYPE es_clients gauge',
+        'es_clients{worker="1"} 3'
+    ]
+
+
+def test_removed_or_invalid_remote_is_not_rendered():
+    owner = MetricsRegistry()
+    worker = MetricsRegistry()
+    worker.counter('es_sent_total', 'Sent').labels().inc()
+    owner.set_remote('worker0', worker.snapshot(), {'worker': '0'})
+    owner.remove_remote('worker0')
+    owner.set_remote('worker1', [{'name': 'es_broken'}], {'worker': '1'})
+    assert owner.render() == '\n'
@@ -0,0 +1,98 @@
+"""
+Profile Model Tests
+Profile lookup and the adaptive quality step down and step up thresholds.
+"""
+
+# Standard library imports
+import time
+
+# Third-party imports
+import pytest
+
+# Local application imports
+from src.model.profile_model import AdaptiveQualityController, ProfileError
+
+
+# Well past the controller's creation, so the first cooldown has ended
+START = time.monotonic() + 1000.0
+
+# The default active profile 'medium' runs at 24 fps
+GOOD = (24.0, 0, 100)
+SLOW = (19.0, 0, 100)
+
+
+def controller(**options):
+    """Adaptive controller on the default profiles without a cooldown."""
+    options = dict({'adaptive': True, 'cooldown': 0.0}, **options)
+    return AdaptiveQualityController(**options)
+
+
+def test_defaults_to_medium_and_finds_profiles():
+    quality = AdaptiveQualityController()
+    assert quality.get_state()['profile'] == 'medium'
+    assert quality.find('full') == 3
+    assert quality.select(0)['width'] == 320
+    with pytest.raises(ProfileError):
+        quality.find('ultra')
+    with pytest.raises(ProfileError):
+        quality.select(4)
+
+
+def test_steps_down_after_consecutive_unhealthy_reports():
+    quality = controller(down_after=3)
+    assert quality.report('a', *SLOW, now=START) is None
+    assert quality.report('a', *SLOW, now=START + 1) is None
+    assert quality.report('a', *SLOW, now=START + 2) == 0
+    assert quality.step_downs == 1
+
+
+def test_healthy_report_resets_down_streak():
+    quality = controller(down_after=2)
+    assert quality.report('a', *SLOW, now=START) is None
+    assert quality.report('a', *GOOD, now=START + 1) is None
+    assert quality.report('a', *SLOW, now=START + 2) is None
+    assert quality.active == 1
+
+
+@pytest.mark.parametrize('report, healthy', [
+    ((12.0, 0, 100), True),   # exactly fps_ratio of 24 fps
+    ((11.9, 0, 100), False),
+    ((24.0, 5, 95), True),    # exactly drop_threshold of frames dropped
+    ((24.0, 6, 94), False),
+])
+def test_health_thresholds_are_inclusive(report, healthy):
+    quality = controller(fps_ratio=0.5, down_after=1, up_after=1e6)
+    changed = quality.report('a', *report, now=START)
+    assert (changed is None) == healthy
+
+
+def test_steps_up_once_every_client_stayed_healthy():
+    quality = controller(up_after=30.0)
+    assert quality.report('b', *SLOW, now=START) is None
+    assert quality.report('a', *GOOD, now=START + 1) is None
+    # b's slow report started the healthy period over
+    assert quality.report('b', *GOOD, now=START + 29) is None
+    assert quality.report('a', *GOOD, now=START + 30) == 2
+    assert quality.step_ups == 1
+
+
+def test_stale_reports_do_not_block_stepping_up():
+    quality = controller(up_after=5.0, report_timeout=10.0)
+    assert quality.report('gone', *SLOW, now=START) is None
+    assert quality.report('a', *GOOD, now=START + 20) == 2
+
+
+def test_cooldown_and_bounds_hold_profile():
+    quality = controller(active=0, down_after=1, up_after=0.0, cooldown=10.0)
+    # Already at the lowest profile
+    assert quality.report('a', *(10.0, 0, 100), now=START) is None
+    assert quality.report('a', *GOOD, now=START + 1) == 1
+    # Within the cooldown of the step up
+    assert quality.report('a', *GOOD, now=START + 5) is None
+    assert quality.report('a', *GOOD, now=START + 11) == 2
+
+
+def test_reports_are_ignored_while_not_adaptive():
+    quality = controller(adaptive=False, down_after=1)
+    assert quality.report('a', *SLOW, now=START) is None
+    assert quality.active == 1
@@ -0,0 +1,53 @@
+"""
+Recorder Model Tests
+Sample log round trips, rotation and pruning.
+"""
+
+# Standard library imports
+import os
+
+# Third-party imports
+import pytest
+
+# Local application imports
+from src.model.recorder_model import (
+    HEADER_SIZE,
+    RECORD_SIZE,
+    RecorderError,
+    SampleLog,
+    SampleRecorder,
+    list_logs
+)
+
+
+def test_written_samples_read_back(tmp_path):
+    recorder = SampleRecorder(str(tmp_path))
+    recorder.open()
+    samples = [(index, 1000 + index * 10) for index in range(5)]
+    recorder.write(samples[:2])
+    recorder.write(samples[2:])
+    recorder.close()
+    paths = list_logs(str(tmp_path))
+    assert [os.path.basename(path) for path in paths] == ['samples-0000000001000.eslog']
+    log = SampleLog(paths[0])
+    assert len(log) == 5
+    assert list(log) == samples
+    assert log[4] == samples[4]
+    log.close()
+
+
+def test_rotates_and_prunes_oldest_logs(tmp_path):
+    recorder = SampleRecorder(str(tmp_path), max_bytes=HEADER_SIZE + 2 * RECORD_SIZE,
+                              max_files=2)
+    recorder.open()
+    for index in range(4):
+        recorder.write([(index, 1000 + index * 10), (index, 1005 + index * 10)])
+    recorder.close()
+    paths = list_logs(str(tmp_path))
+    assert len(paths) == 2
+    assert [SampleLog(path)[0] for path in paths] == [(2, 1020), (3, 1030)]
+
+
+def test_rejects_log_size_below_one_record(tmp_path):
+    with pytest.raises(RecorderError):
+        SampleRecorder(str(tmp_path), max_bytes=HEADER_SIZE)
@@ -0,0 +1,124 @@
+"""
+Scheduler Model Tests
+Tick rate, deadlines and missed tick accounting of the deadline scheduler.
+"""
+
+# Standard library imports
+import asyncio
+import time
+
+# Third-party imports
+import pytest
+
+# Local application imports
+from src.model.scheduler_model import (
+    DeadlineScheduler,
+    POLICY_CATCH_UP,
+    POLICY_SKIP,
+    SchedulerError
+)
+
+
+def run_for(scheduler, seconds, on_tick=None):
+    """Run a scheduler for a while and return the tick deadlines."""
+    deadlines = []
+
+    def tick(index, deadline):
+        deadlines.append(deadline)
+        if on_tick:
+            on_tick(index)
+
+    async def main():
+        task = asyncio.ensure_future(scheduler.run(tick))
+        await asyncio.sleep(seconds)
+        task.cancel()
+
+    asyncio.run(main())
+    return deadlines
+
+
+def on_grid(deadlines, period):
+    """Whether every deadline lies a whole number of periods after the first."""
+    steps = [(deadline - deadlines[0]) / period for deadline in deadlines]
+    return all(step == pytest.approx(round(step)) for step in steps)
+
+
+def test_rejects_invalid_settings():
+    with pytest.raises(SchedulerError):
+        DeadlineScheduler(rate_hz=0.5)
+    with pytest.raises(SchedulerError):
+        DeadlineScheduler(policy='late')
+    scheduler = DeadlineScheduler(rate_hz=24)
+    with pytest.raises(SchedulerError):
+        scheduler.set_rate(5000)
+    assert scheduler.rate_hz == 24
+
+
+def test_deadlines_are_evenly_spaced():
+    scheduler = DeadlineScheduler(rate_hz=50)
+    deadlines = run_for(scheduler, 0.5)
+    # A stall of the test machine may skip ticks but never shifts the grid
+    assert 23 <= len(deadlines) + scheduler.skipped_ticks <= 27
+    assert on_grid(deadlines, 0.02)
+
+
+def test_wall_timestamps_follow_deadlines():
+    scheduler = DeadlineScheduler(rate_hz=50)
+    deadlines = run_for(scheduler, 0.2)
+    stamps = [scheduler.deadline_to_wall_ms(deadline) for deadline in deadlines]
+    assert all(abs((b - a + 10) % 20 - 10) <= 1 for a, b in zip(stamps, stamps[1:]))
+
+
+@pytest.mark.parametrize('rate_hz', [100.0, 1000.0])
+def test_reaches_target_rate(rate_hz):
+    scheduler = DeadlineScheduler(rate_hz=rate_hz)
+    deadlines = run_for(scheduler, 1.0)
+    # Timer overshoot must not cost ticks: every deadline up to the end runs
+    assert len(deadlines) >= 0.97 * rate_hz
+    assert on_grid(deadlines, 1.0 / rate_hz)
+
+
+def test_skip_drops_missed_ticks_and_counts_them_once():
+    scheduler = DeadlineScheduler(rate_hz=100, policy=POLICY_SKIP)
+    run_for(scheduler, 1.0, lambda index: time.sleep(0.3) if index == 10 else None)
+    assert 25 <= scheduler.skipped_ticks <= 32
+    assert scheduler.missed_ticks == scheduler.skipped_ticks
+
+
+def test_catch_up_replays_missed_ticks_up_to_limit():
+    scheduler = DeadlineScheduler(rate_hz=100, policy=POLICY_CATCH_UP, max_catch_up=5)
+    run_for(scheduler, 1.0, lambda index: time.sleep(0.3) if index == 10 else None)
+    replayed = scheduler.missed_ticks - scheduler.skipped_ticks
+    assert 20 <= scheduler.skipped_ticks <= 27
+    assert replayed == 5
+
+
+def test_stats_report_target_and_achieved_rate():
+    scheduler = DeadlineScheduler(rate_hz=50)
+    run_for(scheduler, 0.5)
+    stats = scheduler.get_stats()
+    assert stats['target_rate_hz'] == 50
+    assert stats['achieved_rate_hz'] == pytest.approx(50, rel=0.1)
+
+
+def test_missed_ticks_beyond_tolerance_only():
+    scheduler = DeadlineScheduler(rate_hz=1000, policy=POLICY_SKIP)
+    scheduler._next_deadline = 10.0
+    # Within the tolerance the overdue ticks all still run
+    scheduler._handle_missed_ticks(10.0 + scheduler._miss_tolerance())
+    assert scheduler.skipped_ticks == 0
+    assert scheduler._next_deadline == 10.0
+    scheduler._handle_missed_ticks(10.0 + scheduler._miss_tolerance() + 0.0095)
+    assert scheduler.skipped_ticks == scheduler.missed_ticks == 10
+    assert scheduler._next_deadline == pytest.approx(10.010)
+    # The same late wake-up seen again counts nothing twice
+    scheduler._handle_missed_ticks(10.0 + scheduler._miss_tolerance() + 0.0095)
+    assert scheduler.missed_ticks == 10
+
+
+def test_catch_up_drops_only_beyond_max_catch_up():
+    scheduler = DeadlineScheduler(rate_hz=100, policy=POLICY_CATCH_UP, max_catch_up=4)
+    scheduler._next_deadline = 10.0
+    scheduler._handle_missed_ticks(10.0 + scheduler._miss_tolerance() + 0.095)
+    assert scheduler.skipped_ticks == scheduler.missed_ticks == 6
+    assert scheduler._next_deadline == pytest.approx(10.06)
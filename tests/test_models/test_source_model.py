@@ -0,0 +1,144 @@
+"""
+Source Model Tests
+Record parsing, the synthetic source and file and log replay pacing.
+"""
+
+# Standard library imports
+
+# Third-party imports
+import pytest
+
+# Local application imports
+from src.model.recorder_model import SampleRecorder
+from src.model.source_model import (
+    FileReplaySource,
+    LogReplaySource,
+    SourceError,
+    SyntheticSource,
+    parse_line
+)
+
+
+START_MS = 1700000000000
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    """Directory holding one recorded log of five samples 10 ms apart."""
+    recorder = SampleRecorder(str(tmp_path))
+    recorder.open()
+    recorder.write([(index, 1000 + index * 10) for index in range(5)])
+    recorder.close()
+    return str(tmp_path)
+
+
+def test_parse_line_formats():
+    assert parse_line(b'42\n', 5) == (42, 5)
+    assert parse_line(b'1000,300.7', 5) == (255, 1000)
+    assert parse_line(b'  # comment', 5) is None
+    assert parse_line(b'', 5) is None
+    with pytest.raises(ValueError):
+        parse_line(b'1,2,3', 5)
+
+
+def test_synthetic_one_sample_per_tick():
+    source = SyntheticSource(waveform='square', low=0, high=10, period=1.0)
+    source.open()
+    assert source.read(START_MS) == [(10, START_MS)]
+    assert source.read(START_MS + 600) == [(0, START_MS + 600)]
+    assert source.get_stats()['samples'] == 2
+
+
+def test_synthetic_block_source_is_reproducible():
+    first = SyntheticSource(waveform='random', rate_hz=1000, seed=7)
+    second = SyntheticSource(waveform='random', rate_hz=1000, seed=7)
+    for source in (first, second):
+        source.open()
+    blocks = [source.read(START_MS) + source.read(START_MS + 50)
+              for source in (first, second)]
+    assert blocks[0] == blocks[1]
+    assert len(blocks[0]) == 51
+    assert [timestamp - START_MS for _, timestamp in blocks[0]] == list(range(51))
+
+
+@pytest.mark.parametrize('options', [
+    {'waveform': 'noise'},
+    {'low': 20, 'high': 10},
+    {'rate_hz': 0},
+])
+def test_synthetic_rejects_invalid_settings(options):
+    with pytest.raises(SourceError):
+        SyntheticSource(**options)
+
+
+def test_file_replay_paces_timestamped_records(tmp_path):
+    path = tmp_path / 'records.txt'
+    path.write_text('\n'.join(f'{1000 + index * 4},{index}' for index in range(6)))
+    source = FileReplaySource(str(path), speed=2.0, loop=False)
+    source.open()
+    samples = source.read(START_MS) + source.read(START_MS + 4)
+    assert samples == [(0, START_MS), (1, START_MS + 2), (2, START_MS + 4)]
+    assert [value for value, _ in source.read(START_MS + 100)] == [3, 4, 5]
+    assert source.read(START_MS + 200) == []
+
+
+def test_file_replay_untimed_records_one_per_tick_and_loop(tmp_path):
+    path = tmp_path / 'records.txt'
+    path.write_text('1\n2\n')
+    source = FileReplaySource(str(path))
+    source.open()
+    values = [source.read(START_MS + tick)[0][0] for tick in range(5)]
+    assert values == [1, 2, 1, 2, 1]
+    assert source.passes == 2
+
+
+def test_file_replay_rejects_malformed_file(tmp_path):
+    path = tmp_path / 'records.txt'
+    path.write_text('1\nnot a number\n')
+    with pytest.raises(SourceError):
+        FileReplaySource(str(path)).open()
+    with pytest.raises(SourceError):
+        FileReplaySource(str(tmp_path / 'missing.txt')).open()
+
+
+def test_log_replay_loops(log_dir):
+    source = LogReplaySource(log_dir, loop=True)
+    source.open()
+    samples = source.read(START_MS) + source.read(START_MS + 70)
+    assert [value for value, _ in samples] == [0, 1, 2, 3, 4, 0, 1, 2]
+    # The wrap keeps the recorded spacing
+    assert [timestamp - START_MS for _, timestamp in samples] == list(range(0, 80, 10))
+    assert source.passes == 1
+
+
+def test_log_replay_stays_at_end_without_loop(log_dir):
+    source = LogReplaySource(log_dir)
+    source.open()
+    assert source.read(START_MS) == [(0, START_MS)]
+    assert [value for value, _ in source.read(START_MS + 100)] == [1, 2, 3, 4]
+    assert source.read(START_MS + 200) == []
+    assert source.read(START_MS + 300) == []
+    assert source.passes == 0
+
+
+def test_synthetic_block_source_reports_own_period():
+    assert SyntheticSource(rate_hz=200).get_sample_period() == pytest.approx(0.005)
+    assert SyntheticSource().get_sample_period() is None
+
+
+def test_file_replay_reports_record_spacing(tmp_path):
+    path = tmp_path / 'records.txt'
+    path.write_text('\n'.join(f'{1000 + index * 4},{index}' for index in range(6)))
+    source = FileReplaySource(str(path), speed=2.0)
+    source.open()
+    assert source.get_sample_period() == pytest.approx(0.002)
+    path.write_text('1\n2\n')
+    source = FileReplaySource(str(path), rate_hz=50)
+    source.open()
+    assert source.get_sample_period() == pytest.approx(0.02)
+
+
+def test_log_replay_reports_recorded_spacing(log_dir):
+    source = LogReplaySource(log_dir, speed=2.0)
+    source.open()
+    assert source.get_sample_period() == pytest.approx(0.005)
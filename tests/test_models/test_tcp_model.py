@@ -0,0 +1,145 @@
+"""
+Client TCP Model Tests
+Packet writes of the client receivers and routing of their shared sessions.
+"""
+
+# Standard library imports
+import socket
+import threading
+
+# Third-party imports
+
+# Local application imports
+from protocol import codec
+from protocol.parser import FrameParser
+from tests.conftest import load_client_module
+
+
+tcp_model = load_client_module('tcp_model')
+
+SETTINGS = {'shutter': 1000, 'gain': 2, 'awb_red': 1.5, 'awb_blue': 1.2,
+            'contrast': 1.0, 'brightness': 0.0}
+
+
+class FakeSocket:
+    """Socket keeping each sendall() and whether the lock was held."""
+
+    def __init__(self, lock=None):
+        self.lock = lock
+        self.sent = []
+
+    def sendall(self, packet):
+        self.sent.append((codec.decode_packet(packet)[0], self.lock.locked()))
+
+
+def connected_settings():
+    """Settings receiver connected to a fake socket."""
+    receiver = tcp_model.SettingsReceiver('127.0.0.1')
+    receiver.client = FakeSocket(receiver.send_lock)
+    receiver.connected = True
+    return receiver
+
+
+def test_commands_use_sendall_under_the_send_lock():
+    receiver = connected_settings()
+    assert receiver.send_command(SETTINGS)
+    assert receiver.request_profiles()
+    assert receiver.send_quality_report(30.0, 0, 30)
+    receiver._send_heartbeat(receiver.client)
+    assert receiver.client.sent == [(codec.ID_SETTINGS, True), (codec.ID_PROFILE, True),
+                                    (codec.ID_QUALITY, True), (codec.ID_PING, True)]
+
+
+def test_session_receivers_share_the_session_lock():
+    session = tcp_model.MuxSession('127.0.0.1', '1111')
+    receiver = tcp_model.NumberDataReceiver('127.0.0.1', backfill_seconds=0)
+    session.attach(receiver)
+    client = FakeSocket(session.send_lock)
+    receiver._on_connect(client)
+    assert client.sent == [(codec.ID_DATA_COMPACT, True), (codec.ID_DATA, True)]
+    assert not receiver.send_lock.locked()
+
+
+def test_concurrent_sends_keep_packets_whole():
+    receiver = connected_settings()
+    reader, writer = socket.socketpair()
+    packet = codec.encode_packet(codec.ID_SETTINGS, codec.TYPE_COMMAND, bytes(200))
+    count = 500
+
+    def send_many():
+        for _ in range(count):
+            receiver._send(writer, packet)
+
+    threads = [threading.Thread(target=send_many) for _ in range(4)]
+    parser = FrameParser()
+    frames = 0
+    for thread in threads:
+        thread.start()
+    reader.settimeout(5.0)
+    while frames < 4 * count:
+        parser.recv_from(reader)
+        frames += len(list(parser.frames()))
+    for thread in threads:
+        thread.join()
+    reader.close()
+    writer.close()
+    assert parser.checksum_errors == 0
+
+
+class RecordingReceiver:
+    """Receiver keeping the packet IDs a session routes to it."""
+
+    def __init__(self, packet_ids):
+        self.packet_ids = packet_ids
+        self.session = None
+        self.handled = []
+        self.connects = 0
+
+    def _handle_packet(self, id_, typ, payload):
+        self.handled.append(id_)
+
+    def _on_connect(self, client):
+        self.connects += 1
+
+
+def authenticated_session(*receivers):
+    """Session that attached receivers and got the server's ready answer."""
+    session = tcp_model.MuxSession('127.0.0.1', '1111')
+    session.client = FakeSocket(session.send_lock)
+    session.connected = True
+    for receiver in receivers:
+        session.attach(receiver)
+    session._handle_packet(codec.ID_AUTH, codec.TYPE_RESPONSE, b'ready')
+    return session
+
+
+def test_session_routes_packets_by_id():
+    data = RecordingReceiver(tcp_model.NumberDataReceiver.packet_ids)
+    settings = RecordingReceiver(tcp_model.SettingsReceiver.packet_ids)
+    session = authenticated_session(data, settings)
+    for id_ in (codec.ID_DATA_BATCH, codec.ID_PROFILE, codec.ID_BACKFILL,
+                codec.ID_SETTINGS, codec.ID_DEADBAND, codec.ID_DATA_SEQUENCED):
+        session._handle_packet(id_, codec.TYPE_RESPONSE, b'')
+    assert data.handled == [codec.ID_DATA_BATCH, codec.ID_BACKFILL, codec.ID_DEADBAND]
+    assert settings.handled == [codec.ID_PROFILE, codec.ID_SETTINGS]
+
+
+def test_session_fans_out_to_every_receiver_of_an_id():
+    packet_ids = tcp_model.SettingsReceiver.packet_ids
+    cameras = [RecordingReceiver(packet_ids), RecordingReceiver(packet_ids)]
+    session = authenticated_session(*cameras)
+    session._handle_packet(codec.ID_SETTINGS, codec.TYPE_RESPONSE, b'')
+    assert [camera.handled for camera in cameras] == [[codec.ID_SETTINGS]] * 2
+    assert [camera.connects for camera in cameras] == [1, 1]
+
+
+def test_session_routes_nothing_before_authentication():
+    session = tcp_model.MuxSession('127.0.0.1', '1111')
+    data = RecordingReceiver(tcp_model.NumberDataReceiver.packet_ids)
+    session.attach(data)
+    session._handle_packet(codec.ID_DATA, codec.TYPE_RESPONSE, b'')
+    session._handle_packet(codec.ID_AUTH, codec.TYPE_ERROR, b'')
+    session._handle_packet(codec.ID_DATA, codec.TYPE_RESPONSE, b'')
+    assert data.handled == []
+    assert data.connects == 0
+    assert not session.run
@@ -0,0 +1,293 @@
+"""
+TCP Server Model Tests
+Per-connection write accounting, the auth server's connection lifetime,
+camera addressing of settings requests and routing of multiplexed sessions.
+"""
+
+# Standard library imports
+import asyncio
+import time
+
+# Third-party imports
+import pytest
+
+# Local application imports
+from protocol import codec
+from protocol.parser import FrameParser
+from src.model.broadcast_model import BroadcastModel, BroadcastSubscriber
+from src.model.camera_pool_model import CameraPool
+from src.model.history_model import SampleHistory
+from src.model.tcp_server_model import (
+    AuthServerModel,
+    DataServerModel,
+    MuxServerModel,
+    SettingsServerModel,
+    TCPServerModel
+)
+
+
+class FakeWriter:
+    """Stream writer keeping what is written."""
+
+    def __init__(self):
+        self.data = b''
+
+    def writelines(self, packets):
+        self.data += b''.join(packets)
+
+    def get_extra_info(self, name, default=None):
+        return default
+
+
+@pytest.fixture
+def server():
+    """Base server on a free local port."""
+    server = TCPServerModel('127.0.0.1', 0)
+    yield server
+    server.cleanup()
+
+
+@pytest.fixture
+def auth_server():
+    """Auth server on a free local port that would ping every 50 ms."""
+    server = AuthServerModel('127.0.0.1', 0)
+    server.heartbeat_interval = 0.05
+    yield server
+    server.cleanup()
+
+
+@pytest.fixture
+def settings_server():
+    """Settings server of two cameras with different gains, on a free port."""
+    pool = CameraPool([{'default_settings': {'gain': 2}},
+                       {'default_settings': {'gain': 3}}])
+    server = SettingsServerModel('127.0.0.1', 0, camera_pool=pool)
+    server.heartbeat_interval = 0
+    yield server
+    server.cleanup()
+
+
+@pytest.fixture
+def mux_server():
+    """Multiplexed server over a data server without sampler, on free ports."""
+    data = DataServerModel('127.0.0.1', 0, sampler=False, history=SampleHistory(64))
+    settings = SettingsServerModel('127.0.0.1', 0)
+    auth = AuthServerModel('127.0.0.1', 0)
+    server = MuxServerModel(data, settings, auth, '127.0.0.1', 0)
+    server.heartbeat_interval = 0
+    yield server
+    for each in (server, data, settings, auth):
+        each.cleanup()
+
+
+def serve(server, client):
+    """Run an async client function of the server's port while it serves."""
+    async def main():
+        await server.start_serving()
+        try:
+            return await client(server.server.getsockname()[1])
+        finally:
+            await server.stop_serving()
+
+    return asyncio.run(main())
+
+
+async def read_until_closed(reader, timeout=2.0):
+    """Read packets until the server closes the connection, within timeout."""
+    parser = FrameParser()
+    frames = []
+    deadline = time.monotonic() + timeout
+    while True:
+        data = await asyncio.wait_for(reader.read(4096), deadline - time.monotonic())
+        if not data:
+            return frames
+        parser.feed(data)
+        for id_, typ, payload in parser.frames():
+            frames.append((id_, typ, bytes(payload)))
+
+
+async def read_frames(reader, parser, count, timeout=1.0):
+    """Read count packets, or those that arrived within timeout."""
+    frames = []
+    deadline = time.monotonic() + timeout
+    while len(frames) < count:
+        try:
+            data = await asyncio.wait_for(reader.read(4096),
+                                          deadline - time.monotonic())
+        except asyncio.TimeoutError:
+            break
+        if not data:
+            break
+        parser.feed(data)
+        for id_, typ, payload in parser.frames():
+            frames.append((id_, typ, bytes(payload)))
+    return frames
+
+
+async def open_session(port, password=b'1111'):
+    """Open a multiplexed session and read the answer to its password."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(codec.encode_packet(codec.ID_AUTH, codec.TYPE_COMMAND, password))
+    parser = FrameParser()
+    return reader, writer, parser, await read_frames(reader, parser, 1)
+
+
+async def wait_for_streams(server, count, timeout=1.0):
+    """Wait until count sessions of a multiplexed server subscribed to data."""
+    deadline = time.monotonic() + timeout
+    while server.get_stream_count() < count and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    # Let the new streams reach their first wait for packets
+    await asyncio.sleep(0.05)
+    return server.get_stream_count() == count
+
+
+def test_replies_count_toward_stream_subscriber(server):
+    writer = FakeWriter()
+    subscriber = BroadcastSubscriber(BroadcastModel(capacity=16), max_queue=8)
+    server._stream_subscribers[writer] = subscriber
+    try:
+        server.write_packets(writer, [b'stream'], stream=True)
+        server.write_packet(writer, b'reply')
+    finally:
+        server._stream_subscribers.pop(writer)
+    # Stream bytes are counted when taken, everything else when written
+    assert subscriber.bytes_written == len(b'reply')
+    assert writer.data == b'streamreply'
+
+
+def test_auth_connection_closes_after_success(auth_server):
+    async def client(port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(codec.encode_packet(codec.ID_AUTH, codec.TYPE_COMMAND, b'1111'))
+        frames = await read_until_closed(reader)
+        writer.close()
+        return frames
+
+    ready = (codec.ID_AUTH, codec.TYPE_RESPONSE, b'ready')
+    assert serve(auth_server, client) == [ready]
+
+
+def test_auth_wrong_password_may_be_retried(auth_server):
+    async def client(port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(codec.encode_packet(codec.ID_AUTH, codec.TYPE_COMMAND, b'0000'))
+        writer.write(codec.encode_packet(codec.ID_AUTH, codec.TYPE_COMMAND, b'1111'))
+        frames = await read_until_closed(reader)
+        writer.close()
+        return frames
+
+    assert serve(auth_server, client) == [
+        (codec.ID_AUTH, codec.TYPE_ERROR, b''),
+        (codec.ID_AUTH, codec.TYPE_RESPONSE, b'ready')
+    ]
+
+
+def test_auth_heartbeats_do_not_extend_connection(auth_server):
+    auth_server.auth_timeout = 0.3
+
+    async def client(port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+        async def ping():
+            while not writer.is_closing():
+                writer.write(codec.encode_ping(time.monotonic_ns()))
+                await asyncio.sleep(0.05)
+
+        pinger = asyncio.create_task(ping())
+        start = time.monotonic()
+        frames = await read_until_closed(reader)
+        elapsed = time.monotonic() - start
+        pinger.cancel()
+        writer.close()
+        return frames, elapsed
+
+    frames, elapsed = serve(auth_server, client)
+    assert elapsed < 1.0
+    # Pings are answered, but the server sends none of its own
+    assert frames
+    assert all(frame[:2] == (codec.ID_PING, codec.TYPE_RESPONSE) for frame in frames)
+
+
+def test_mux_requires_authentication_before_routing(mux_server):
+    async def client(port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(codec.encode_ping(1))
+        writer.write(codec.encode_packet(codec.ID_SETTINGS, codec.TYPE_COMMAND))
+        frames = await read_until_closed(reader)
+        writer.close()
+        return frames
+
+    # Heartbeats are answered, anything else closes the session
+    assert serve(mux_server, client) == [
+        (codec.ID_PING, codec.TYPE_RESPONSE, codec.encode_ping(1)[6:-1]),
+        (codec.ID_AUTH, codec.TYPE_ERROR, b'authentication required')
+    ]
+
+
+def test_mux_closes_session_on_wrong_password(mux_server):
+    async def client(port):
+        reader, writer, parser, answer = await open_session(port, b'0000')
+        closed = await read_until_closed(reader)
+        writer.close()
+        return answer, closed
+
+    answer, closed = serve(mux_server, client)
+    assert answer == [(codec.ID_AUTH, codec.TYPE_ERROR, b'')]
+    assert closed == []
+
+
+def test_mux_routes_frames_by_id(mux_server):
+    mux_server.data_server.history.append([(5, 1000), (6, 1010)])
+
+    async def client(port):
+        reader, writer, parser, answer = await open_session(port)
+        writer.write(codec.encode_packet(codec.ID_SETTINGS, codec.TYPE_COMMAND))
+        writer.write(codec.encode_backfill_request(codec.BACKFILL_SINCE, 0))
+        frames = await read_frames(reader, parser, 2)
+        writer.close()
+        return answer, frames
+
+    answer, frames = serve(mux_server, client)
+    assert answer == [(codec.ID_AUTH, codec.TYPE_RESPONSE, b'ready')]
+    assert [frame[:2] for frame in frames] == [(codec.ID_SETTINGS, codec.TYPE_RESPONSE),
+                                               (codec.ID_BACKFILL, codec.TYPE_RESPONSE)]
+    assert codec.decode_samples(frames[1][2]) == [(5, 1000), (6, 1010)]
+
+
+def test_mux_fans_data_out_to_subscribed_sessions(mux_server):
+    subscribe = codec.encode_packet(codec.ID_DATA, codec.TYPE_COMMAND,
+                                    bytes([codec.DATA_SUBSCRIBE]))
+
+    async def client(port):
+        sessions = [await open_session(port) for _ in range(3)]
+        for _, writer, _, _ in sessions[:2]:
+            writer.write(subscribe)
+        assert await wait_for_streams(mux_server, 2)
+        mux_server.data_server.publish_samples([(7, 2000)])
+        received = [await read_frames(reader, parser, 1, timeout=0.5)
+                    for reader, _, parser, _ in sessions]
+        for _, writer, _, _ in sessions:
+            writer.close()
+        return received
+
+    frame = (codec.ID_DATA, codec.TYPE_RESPONSE, codec.SAMPLE_STRUCT.pack(7, 2000))
+    assert serve(mux_server, client) == [[frame], [frame], []]
+
+
+def test_settings_request_without_index_addresses_camera_zero(settings_server):
+    async def client(port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        for payload in (b'', b'\x01', b'\x00', b'\x07'):
+            writer.write(codec.encode_packet(codec.ID_SETTINGS, codec.TYPE_COMMAND,
+                                             payload))
+        frames = await read_frames(reader, FrameParser(), 4)
+        writer.close()
+        return frames
+
+    frames = serve(settings_server, client)
+    responses = [(payload[6], payload[1]) for _, typ, payload in frames[:3]
+                 if typ == codec.TYPE_RESPONSE]
+    # Camera index and gain of each answer
+    assert responses == [(0, 2), (1, 3), (0, 2)]
+    assert frames[3][:2] == (codec.ID_SETTINGS, codec.TYPE_ERROR)
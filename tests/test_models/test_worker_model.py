@@ -0,0 +1,192 @@
+"""
+Worker Model Tests
+Link framing, relaying between owner and worker, and worker restarts.
+"""
+
+# Standard library imports
+import asyncio
+import socket
+import time
+
+# Third-party imports
+import pytest
+
+# Local application imports
+from protocol import codec
+from src.model import worker_model
+from src.model.metrics_model import MetricsRegistry
+from src.model.tcp_server_model import RemoteSettingsServerModel
+from src.model.worker_model import (
+    MSG_FRAME,
+    MSG_SAMPLES,
+    WorkerError,
+    WorkerHub,
+    WorkerLink,
+    encode_message,
+    read_message
+)
+
+
+class FakeWriter:
+    """Client connection writer keeping what is written."""
+
+    def __init__(self):
+        self.packets = []
+
+    def writelines(self, packets):
+        self.packets.extend(packets)
+
+    def get_extra_info(self, name, default=None):
+        return default
+
+
+class EchoSettingsServer:
+    """Owner settings server answering every frame with its payload."""
+
+    def __init__(self):
+        self.frames = []
+        self.forgotten = []
+
+    async def handle_frame(self, writer, frame, client_id, replies):
+        id_, _, payload = frame
+        self.frames.append((id_, bytes(payload), client_id))
+        writer.writelines([codec.encode_packet(id_, codec.TYPE_RESPONSE, payload)])
+
+    def forget_client(self, client_id, replies):
+        self.forgotten.append(client_id)
+
+
+class PublishingDataServer:
+    """Worker data server keeping the published samples."""
+
+    def __init__(self):
+        self.samples = []
+
+    def publish_samples(self, samples):
+        self.samples.extend(samples)
+
+
+def exit_at_once(index, sock):
+    """Worker target that exits right away."""
+    sock.close()
+
+
+async def wait_until(condition, timeout=2.0):
+    """Poll until condition() is true or timeout seconds passed."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    return condition()
+
+
+def run_linked(test, metrics=None):
+    """Run an async test with a hub and a worker link joined in this process."""
+    async def main():
+        owner_sock, worker_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        hub = WorkerHub(1)
+        hub._sockets[0] = owner_sock
+        owner_settings = EchoSettingsServer()
+        await hub.start(owner_settings)
+        link = WorkerLink(worker_sock)
+        worker_settings = RemoteSettingsServerModel(link, '127.0.0.1', 0)
+        worker_data = PublishingDataServer()
+        await link.start(worker_data, worker_settings, metrics)
+        try:
+            await test(hub, link, owner_settings, worker_settings, worker_data)
+        finally:
+            await link.stop()
+            await hub.stop(timeout=0.1)
+            worker_settings.server.close()
+
+    asyncio.run(main())
+
+
+def test_messages_round_trip_and_end_at_close():
+    async def main():
+        reader = asyncio.StreamReader()
+        reader.feed_data(encode_message(MSG_FRAME, 7, b'body'))
+        reader.feed_data(encode_message(MSG_SAMPLES, 0))
+        reader.feed_data(encode_message(MSG_FRAME, 1, b'cut')[:-1])
+        reader.feed_eof()
+        return [await read_message(reader) for _ in range(3)]
+
+    assert asyncio.run(main()) == [(MSG_FRAME, 7, b'body'), (MSG_SAMPLES, 0, b''), None]
+
+
+@pytest.mark.parametrize('id_', [codec.ID_SETTINGS, codec.ID_PROFILE, codec.ID_QUALITY])
+def test_frames_are_relayed_and_replies_routed_back(id_):
+    async def test(hub, link, owner_settings, worker_settings, worker_data):
+        first, second = FakeWriter(), FakeWriter()
+        frame = (id_, codec.TYPE_COMMAND, memoryview(b'\x01\x02'))
+        await worker_settings.handle_frame(first, frame, 'first', set())
+        await worker_settings.handle_frame(second, frame, 'second', set())
+        assert await wait_until(lambda: first.packets and second.packets)
+        reply = codec.encode_packet(id_, codec.TYPE_RESPONSE, b'\x01\x02')
+        assert first.packets == [reply]
+        assert second.packets == [reply]
+        # Each client connection is a separate connection to the owner
+        assert len({client_id for _, _, client_id in owner_settings.frames}) == 2
+
+        worker_settings.forget_client('first', set())
+        assert await wait_until(lambda: owner_settings.forgotten)
+        assert owner_settings.forgotten == [owner_settings.frames[0][2]]
+
+    run_linked(test)
+
+
+def test_other_frames_are_not_relayed():
+    async def test(hub, link, owner_settings, worker_settings, worker_data):
+        writer = FakeWriter()
+        for frame in [(codec.ID_DATA, codec.TYPE_COMMAND, memoryview(b'')),
+                      (codec.ID_SETTINGS, codec.TYPE_RESPONSE, memoryview(b''))]:
+            await worker_settings.handle_frame(writer, frame, 'client', set())
+        await asyncio.sleep(0.05)
+        assert owner_settings.frames == []
+
+    run_linked(test)
+
+
+def test_sample_batches_reach_the_worker():
+    async def test(hub, link, owner_settings, worker_settings, worker_data):
+        hub.publish([(1, 1000), (2, 1005)])
+        hub.publish([])
+        hub.publish([(3, 1010)])
+        assert await wait_until(lambda: len(worker_data.samples) == 3)
+        assert worker_data.samples == [(1, 1000), (2, 1005), (3, 1010)]
+
+    run_linked(test)
+
+
+def test_worker_metrics_reach_the_owner():
+    worker_metrics = MetricsRegistry()
+    worker_metrics.counter('es_sent_total', 'Sent').labels().inc(4)
+
+    async def test(hub, link, owner_settings, worker_settings, worker_data):
+        assert await wait_until(lambda: 'es_sent_total' in hub._metrics.render())
+        assert 'es_sent_total{worker="0"} 4' in hub._metrics.render().splitlines()
+        await link.stop()
+        assert await wait_until(lambda: 'es_sent_total' not in hub._metrics.render())
+
+    run_linked(test, worker_metrics)
+
+
+def test_exited_workers_are_restarted(monkeypatch):
+    monkeypatch.setattr(worker_model, 'CHECK_INTERVAL', 0.05)
+
+    async def main():
+        hub = WorkerHub(1, restart_delay=0.0)
+        hub.spawn(exit_at_once)
+        await hub.start(EchoSettingsServer())
+        try:
+            assert await wait_until(lambda: hub.restarts >= 1, timeout=10.0)
+        finally:
+            await hub.stop(timeout=1.0)
+        return hub.get_stats()
+
+    stats = asyncio.run(main())
+    assert [worker['index'] for worker in stats] == [0]
+
+
+def test_rejects_empty_worker_count():
+    with pytest.raises(WorkerError):
+        WorkerHub(0)
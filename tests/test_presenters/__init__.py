@@ -0,0 +1,4 @@
+"""
+Presenter Tests
+Contains the tests of the server presenter.
+"""
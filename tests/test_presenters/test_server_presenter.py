@@ -0,0 +1,90 @@
+"""
+Server Presenter Tests
+Configuration reloads applied to the servers, rejected values and invalid files.
+"""
+
+# Standard library imports
+import json
+import os
+import time
+
+# Third-party imports
+import pytest
+
+# Local application imports
+from config import ServerConfig
+from src.presenter.server_presenter import ServerPresenter
+
+
+BASE_CONFIG = {
+    'server': {'data_port': 0, 'settings_port': 0, 'auth_port': 0, 'mux_port': 0},
+    'camera': {'enabled': False},
+    'metrics': {'enabled': False},
+    'data': {'sample_rate': 50, 'client_queue_size': 16}
+}
+
+
+def rewrite(path, text):
+    """Replace the configuration file and move its mtime past the last load."""
+    path.write_text(text)
+    later = time.time() + 5
+    os.utime(path, (later, later))
+
+
+def rewrite_data(path, **data):
+    """Rewrite the configuration file with changed data settings."""
+    config = json.loads(json.dumps(BASE_CONFIG))
+    config['data'].update(data)
+    rewrite(path, json.dumps(config))
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    """Configuration file with every server on a free port and no camera."""
+    path = tmp_path / 'server.json'
+    path.write_text(json.dumps(BASE_CONFIG))
+    return path
+
+
+@pytest.fixture
+def presenter(config_path):
+    """Presenter built from the configuration file, servers not started."""
+    presenter = ServerPresenter(server_config=ServerConfig(path=str(config_path)))
+    yield presenter
+    presenter.cleanup()
+
+
+def test_reload_applies_sample_rate(presenter, config_path):
+    assert presenter.data_server.scheduler.rate_hz == 50
+    rewrite_data(config_path, sample_rate=100)
+    assert presenter.reload_config() == {'data.sample_rate': (50, 100)}
+    assert presenter.data_server.scheduler.rate_hz == 100
+    assert presenter.server_config.get('data.sample_rate') == 100
+
+
+def test_reload_applies_queue_size_and_policy(presenter, config_path):
+    rewrite_data(config_path, client_queue_size=8, slow_client_policy='conflate')
+    changes = presenter.reload_config()
+    assert changes['data.client_queue_size'] == (16, 8)
+    assert presenter.data_server.client_queue_size == 8
+    assert presenter.data_server.slow_client_policy == 'conflate'
+
+
+def test_rejected_value_leaves_server_unchanged(presenter, config_path):
+    policy = presenter.data_server.slow_client_policy
+    rewrite_data(config_path, sample_rate=100, slow_client_policy='unknown')
+    presenter.reload_config()
+    assert presenter.data_server.slow_client_policy == policy
+    # Other changes of the same file still apply
+    assert presenter.data_server.scheduler.rate_hz == 100
+
+
+def test_invalid_file_keeps_current_config(presenter, config_path):
+    rewrite(config_path, '{"data": {"sample_rate": ')
+    assert presenter.reload_config() == {}
+    assert presenter.server_config.get('data.sample_rate') == 50
+    assert presenter.data_server.scheduler.rate_hz == 50
+    # Fixing the file applies it again
+    rewrite_data(config_path, sample_rate=100)
+    assert presenter.reload_config() == {'data.sample_rate': (50, 100)}
+    assert presenter.data_server.scheduler.rate_hz == 100
@@ -0,0 +1,4 @@
+"""
+Protocol Tests
+Contains the tests of the shared wire format.
+"""
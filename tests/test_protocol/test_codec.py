@@ -0,0 +1,186 @@
+"""
+Codec Tests
+Round trips and error conditions of the binary packet formats.
+"""
+
+# Standard library imports
+
+# Third-party imports
+import pytest
+
+# Local application imports
+from protocol import codec
+from protocol.codec import ProtocolError
+
+
+def payload_of(packet):
+    """Validate a frame and return its payload bytes."""
+    _, _, payload = codec.decode_packet(packet)
+    return bytes(payload)
+
+
+def test_packet_round_trip():
+    packet = codec.encode_packet(codec.ID_SETTINGS, codec.TYPE_COMMAND, b'\x01\x02')
+    id_, typ, payload = codec.decode_packet(packet)
+    assert (id_, typ) == (codec.ID_SETTINGS, codec.TYPE_COMMAND)
+    assert bytes(payload) == b'\x01\x02'
+
+
+def test_packet_rejects_bad_checksum():
+    packet = bytearray(
+        codec.encode_packet(codec.ID_SETTINGS, codec.TYPE_COMMAND, b'\x01'))
+    packet[-1] ^= 0xFF
+    with pytest.raises(ProtocolError):
+        codec.decode_packet(packet)
+
+
+def test_checksum_matches_byte_loop():
+    data = bytes(range(256)) * 3
+    expected = 0
+    for byte in data:
+        expected ^= byte
+    assert codec.checksum(data) == expected
+    assert codec.checksum(data[:7], 0x5A) == codec.checksum(b'\x5a' + data[:7])
+
+
+def test_single_sample_packet_matches_generic_encoder():
+    packet = codec.encode_data_sample(42, 1700000000123)
+    expected = codec.encode_packet(codec.ID_DATA, codec.TYPE_RESPONSE,
+                                   codec.SAMPLE_STRUCT.pack(42, 1700000000123))
+    assert packet == expected
+
+
+def test_batch_round_trip(samples):
+    assert codec.decode_samples(payload_of(codec.encode_data_batch(samples))) == samples
+
+
+def test_batch_rejects_partial_samples():
+    with pytest.raises(ProtocolError):
+        codec.decode_samples(b'\x00' * (codec.SAMPLE_SIZE + 1))
+
+
+def test_sequenced_round_trip_wraps_sequence(samples):
+    packet = codec.encode_sequenced_samples(codec.SEQUENCE_MODULO + 5, samples)
+    assert codec.decode_sequenced_samples(payload_of(packet)) == (5, samples)
+
+
+def test_sequenced_rejects_truncated_payload():
+    with pytest.raises(ProtocolError):
+        codec.decode_sequenced_samples(b'\x00\x01')
+
+
+@pytest.mark.parametrize('kind, value', [(codec.BACKFILL_LAST, 5000),
+                                         (codec.BACKFILL_SINCE, 1700000000000)])
+def test_backfill_request_round_trip(kind, value):
+    packet = codec.encode_backfill_request(kind, value)
+    assert codec.decode_backfill_request(payload_of(packet)) == (kind, value)
+
+
+def test_backfill_request_rejects_unknown_kind():
+    with pytest.raises(ProtocolError):
+        codec.decode_backfill_request(codec.BACKFILL_STRUCT.pack(9, 0))
+    with pytest.raises(ProtocolError):
+        codec.decode_backfill_request(b'\x00')
+
+
+def test_clock_round_trip():
+    packet = codec.encode_clock_request(123)
+    assert codec.decode_clock_request(payload_of(packet)) == 123
+    packet = codec.encode_clock_response(1, 2, 3)
+    assert codec.decode_clock_response(payload_of(packet)) == (1, 2, 3)
+    with pytest.raises(ProtocolError):
+        codec.decode_clock_response(b'\x00' * 8)
+
+
+def test_stream_encoding_round_trip():
+    packet = codec.encode_stream_encoding(codec.ENCODING_COMPACT)
+    assert codec.decode_stream_encoding(payload_of(packet)) == codec.ENCODING_COMPACT
+    with pytest.raises(ProtocolError):
+        codec.decode_stream_encoding(b'\x07')
+
+
+@pytest.mark.parametrize('value', [0, 1, 0x7F, 0x80, 0x3FFF, 0x4000, (1 << 64) - 1])
+def test_varint_round_trip(value):
+    buffer = bytearray()
+    codec._append_varint(buffer, value)
+    assert codec._read_varint(buffer, 0) == (value, len(buffer))
+
+
+def test_varint_rejects_truncated_and_overlong():
+    with pytest.raises(ProtocolError):
+        codec._read_varint(b'\x80', 0)
+    with pytest.raises(ProtocolError):
+        codec._read_varint(b'\xff' * 10 + b'\x01', 0)
+
+
+def test_compact_key_packet_round_trip(samples):
+    payload = payload_of(codec.encode_compact_samples(samples))
+    assert codec.decode_compact_samples(payload) == samples
+
+
+def test_compact_packet_chains_on_reference(samples):
+    first, second = samples[:4], samples[4:]
+    reference = first[-1][1]
+    payload = payload_of(codec.encode_compact_samples(second, reference))
+    assert not payload[0] & codec.COMPACT_KEY
+    assert codec.decode_compact_samples(payload, reference) == second
+    with pytest.raises(ProtocolError):
+        codec.decode_compact_samples(payload)
+
+
+def test_compact_uses_runs_for_repeated_values():
+    repeated = [(9, 1000 + index) for index in range(100)]
+    payload = payload_of(codec.encode_compact_samples(repeated))
+    assert payload[0] & codec.COMPACT_RLE
+    assert len(payload) < 2 * len(repeated)
+    assert codec.decode_compact_samples(payload) == repeated
+
+
+def test_compact_handles_timestamps_going_backwards():
+    samples = [(1, 5000), (2, 4990), (3, 5010)]
+    payload = payload_of(codec.encode_compact_samples(samples))
+    assert codec.decode_compact_samples(payload) == samples
+
+
+def test_deadband_command_and_state_round_trip():
+    packet = codec.encode_deadband_command(True, 5, 500)
+    assert codec.decode_deadband_command(payload_of(packet)) == (True, 5, 500)
+    packet = codec.encode_deadband_state(False, 0, 1000, 41666)
+    assert codec.decode_deadband_state(payload_of(packet)) == (False, 0, 1000, 41666)
+    with pytest.raises(ProtocolError):
+        codec.decode_deadband_command(b'\x01')
+    with pytest.raises(ProtocolError):
+        codec.decode_deadband_state(b'\x01\x00\x00\x00')
+
+
+def test_compact_rejects_empty_sample_list():
+    with pytest.raises(ProtocolError):
+        codec.encode_compact_samples([], 1000)
+
+
+@pytest.mark.parametrize('payload', [
+    b'',
+    bytes([codec.COMPACT_KEY, 0x05, 0x00]),  # No samples
+    bytes([codec.COMPACT_KEY, 0x05, 0x02, 0x01]),  # Truncated values and deltas
+    bytes([codec.COMPACT_KEY, 0x05, 0x01, 0x01, 0x00, 0x00]),  # Trailing byte
+])
+def test_compact_rejects_malformed_payloads(payload):
+    with pytest.raises(ProtocolError):
+        codec.decode_compact_samples(payload)
+
+
+def test_compact_rejects_runs_beyond_count_before_expanding():
+    # One sample announced, then a run of 2**63 samples
+    payload = bytearray([codec.COMPACT_KEY | codec.COMPACT_RLE, 0x05, 0x01, 0x07])
+    codec._append_varint(payload, 1 << 63)
+    payload.append(0x00)
+    with pytest.raises(ProtocolError):
+        codec.decode_compact_samples(payload)
+
+
+def test_compact_rejects_count_beyond_payload():
+    payload = bytearray([codec.COMPACT_KEY | codec.COMPACT_RLE, 0x05])
+    codec._append_varint(payload, 1 << 40)
+    payload += b'\x07\x01\x00'
+    with pytest.raises(ProtocolError):
+        codec.decode_compact_samples(payload)
@@ -0,0 +1,46 @@
+"""
+Heartbeat Tests
+Ping packets and the rolling round-trip time window.
+"""
+
+# Standard library imports
+
+# Third-party imports
+import pytest
+
+# Local application imports
+from protocol import codec
+from protocol.codec import ProtocolError
+from protocol.heartbeat import RttWindow
+
+
+def test_ping_and_pong_echo_token():
+    for typ in (codec.TYPE_COMMAND, codec.TYPE_RESPONSE):
+        id_, packet_typ, payload = codec.decode_packet(codec.encode_ping(1 << 40, typ))
+        assert (id_, packet_typ) == (codec.ID_PING, typ)
+        assert codec.decode_ping(payload) == 1 << 40
+    with pytest.raises(ProtocolError):
+        codec.decode_ping(b'\x00' * 4)
+
+
+def test_empty_window_has_no_statistics():
+    stats = RttWindow().get_stats()
+    assert stats['last_ms'] is None and stats['p99_ms'] is None
+    assert stats['window'] == stats['count'] == 0
+
+
+def test_window_keeps_latest_measurements():
+    window = RttWindow(size=4)
+    for rtt in (0.5, 0.001, 0.002, 0.003, 0.004):
+        window.add(rtt)
+    stats = window.get_stats()
+    assert (stats['window'], stats['count']) == (4, 5)
+    assert (stats['min_ms'], stats['max_ms'], stats['last_ms']) == (1.0, 4.0, 4.0)
+    assert stats['p50_ms'] == 3.0
+
+
+def test_histogram_counts_per_bucket():
+    window = RttWindow(buckets=(0.001, 0.01))
+    for rtt in (0.0005, 0.001, 0.005, 0.5, -1.0):
+        window.add(rtt)
+    assert window.histogram() == {'1': 3, '10': 1, '+Inf': 1}
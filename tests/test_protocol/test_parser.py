@@ -0,0 +1,80 @@
+"""
+Parser Tests
+Frame reassembly and resynchronisation of the streaming parser.
+"""
+
+# Standard library imports
+
+# Third-party imports
+
+# Local application imports
+from protocol import codec
+from protocol.parser import FrameParser
+
+
+def parse(parser):
+    """Collect the parsed frames as (id, type, payload bytes)."""
+    return [(id_, typ, bytes(payload)) for id_, typ, payload in parser.frames()]
+
+
+def test_reassembles_frames_split_at_every_byte():
+    stream = (codec.encode_data_sample(1, 1000) + codec.encode_data_sample(2, 1005)
+              + codec.encode_packet(codec.ID_SETTINGS, codec.TYPE_RESPONSE, b'ok'))
+    parser = FrameParser(initial_size=4)
+    frames = []
+    for index in range(len(stream)):
+        parser.feed(stream[index:index + 1])
+        frames += parse(parser)
+    assert [frame[0] for frame in frames] == [
+        codec.ID_DATA, codec.ID_DATA, codec.ID_SETTINGS]
+    assert frames[2][2] == b'ok'
+    assert parser.buffered == 0
+
+
+def test_skips_leading_garbage():
+    parser = FrameParser()
+    parser.feed(b'\x13\x37\x00\x42' + codec.encode_data_sample(7, 1000))
+    frames = parse(parser)
+    assert len(frames) == 1
+    assert codec.decode_sample(frames[0][2]) == (7, 1000)
+    assert parser.discarded_bytes == 4
+
+
+def test_resyncs_after_corrupt_frame():
+    corrupt = bytearray(codec.encode_data_sample(1, 1000))
+    corrupt[-1] ^= 0xFF
+    parser = FrameParser()
+    parser.feed(bytes(corrupt) + codec.encode_data_sample(2, 2000))
+    frames = parse(parser)
+    assert [codec.decode_sample(frame[2]) for frame in frames] == [(2, 2000)]
+    assert parser.checksum_errors == 1
+
+
+def test_resyncs_to_marker_inside_corrupt_frame():
+    inner = codec.encode_data_sample(4, 4000)
+    outer = bytearray(
+        codec.encode_packet(codec.ID_SETTINGS, codec.TYPE_RESPONSE, inner))
+    outer[-1] ^= 0xFF
+    parser = FrameParser()
+    parser.feed(bytes(outer))
+    frames = parse(parser)
+    assert [codec.decode_sample(frame[2]) for frame in frames] == [(4, 4000)]
+    assert parser.checksum_errors == 1
+
+
+def test_waits_for_incomplete_frame():
+    packet = codec.encode_data_batch([(1, 1000), (2, 1005)])
+    parser = FrameParser()
+    parser.feed(packet[:-1])
+    assert parse(parser) == []
+    parser.feed(packet[-1:])
+    assert len(parse(parser)) == 1
+
+
+def test_keeps_trailing_marker_byte():
+    parser = FrameParser()
+    parser.feed(b'\x11\x22\x33\x44\x55\x66\x00')
+    assert parse(parser) == []
+    parser.feed(codec.encode_data_sample(3, 3000)[1:])
+    frames = parse(parser)
+    assert [codec.decode_sample(frame[2]) for frame in frames] == [(3, 3000)]